@@ -26,8 +26,10 @@ from .customer_billing import (
     StripeEventSummaryReadOnlySerializer
 )
 from .provisioning import (
+    ProvisioningAcceptedResponseSerializer,
     ProvisioningRequestSerializer,
     ProvisioningResponseSerializer,
+    ProvisioningStatusResponseSerializer,
     SubscriptionPlanOLIUpdateResponseSerializer,
     SubscriptionPlanOLIUpdateSerializer
 )
@@ -233,6 +233,53 @@ class ProvisioningResponseSerializer(BaseSerializer):
     subscription_plan_renewal = SubscriptionPlanRenewalResponseSerializer()
 
 
+class ProvisioningAcceptedResponseSerializer(BaseSerializer):
+    """
+    Response serializer for async provisioning create requests.
+    """
+    workflow_uuid = serializers.UUIDField(
+        help_text='The UUID of the provisioning workflow, whose progress is served by the provisioning status view.',
+    )
+
+
+class ProvisioningStepStatusResponseSerializer(BaseSerializer):
+    """
+    Serializer for the progress of a single step of a provisioning workflow.
+    """
+    step = serializers.CharField(
+        help_text='The name of the workflow step.',
+    )
+    status = serializers.ChoiceField(
+        choices=['pending', 'succeeded', 'failed'],
+        help_text='Whether the step is yet to (successfully) run, has succeeded, or has failed.',
+    )
+    succeeded_at = serializers.DateTimeField(allow_null=True)
+    failed_at = serializers.DateTimeField(allow_null=True)
+    exception_message = serializers.CharField(allow_null=True)
+
+
+class ProvisioningStatusResponseSerializer(BaseSerializer):
+    """
+    Response serializer for the provisioning status view.
+    """
+    workflow_uuid = serializers.UUIDField()
+    status = serializers.ChoiceField(
+        choices=['pending', 'in_progress', 'succeeded', 'failed'],
+        help_text='The overall status of the provisioning workflow.',
+    )
+    succeeded_at = serializers.DateTimeField(allow_null=True)
+    failed_at = serializers.DateTimeField(allow_null=True)
+    exception_message = serializers.CharField(allow_null=True)
+    steps = ProvisioningStepStatusResponseSerializer(
+        many=True,
+        help_text='The progress of each step of the workflow, in order.',
+    )
+    result = ProvisioningResponseSerializer(
+        allow_null=True,
+        help_text='The provisioned records, once the workflow has succeeded.',
+    )
+
+
 class SubscriptionPlanOLIUpdateSerializer(BaseSerializer):
     """
     Request serializer for updating a SubscriptionPlan's Salesforce OLI.
@@ -2,9 +2,11 @@
 Celery tasks for Enterprise Access API.
 """
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from celery import shared_task
 from django.conf import settings
+from django.core.cache import cache as django_cache
 
 from enterprise_access.apps.api.serializers import CouponCodeRequestSerializer, LicenseRequestSerializer
 from enterprise_access.apps.api_client.braze_client import BrazeApiClient
@@ -13,7 +15,7 @@ from enterprise_access.apps.api_client.license_manager_client import LicenseMana
 from enterprise_access.apps.api_client.lms_client import LmsApiClient
 from enterprise_access.apps.core.models import User
 from enterprise_access.apps.events.signals import COUPON_CODE_REQUEST_APPROVED
-from enterprise_access.apps.events.utils import send_coupon_code_request_event_to_event_bus
+from enterprise_access.apps.events.utils import batched_event_bus_events, send_coupon_code_request_event_to_event_bus
 from enterprise_access.apps.subsidy_request.constants import (
     SUBSIDY_TYPE_CHANGE_DECLINATION,
     SegmentEvents,
@@ -21,7 +23,8 @@ from enterprise_access.apps.subsidy_request.constants import (
     SubsidyTypeChoices
 )
 from enterprise_access.apps.subsidy_request.models import CouponCodeRequest, LicenseRequest
-from enterprise_access.apps.track.segment import track_event
+from enterprise_access.apps.track.segment import track_event, track_events
+from enterprise_access.cache_utils import versioned_cache_key
 from enterprise_access.tasks import LoggedTaskWithRetry
 from enterprise_access.utils import get_subsidy_model
 
@@ -135,11 +138,56 @@ def send_notification_email_for_request(
     )
 
 
+def license_assignment_chunk_cache_key(task_id, user_emails):
+    return versioned_cache_key('license_assignment_chunk', task_id, *user_emails)
+
+
+def _assign_licenses_for_chunk(user_emails, subscription_uuid, task_id):
+    """
+    Calls License Manager API to assign licenses to a chunk of user emails, unless an earlier
+    attempt of the same assignment task already did.
+
+    Returns:
+        dict: The assigned licenses, keyed by user email
+    """
+    cache_key = license_assignment_chunk_cache_key(task_id, user_emails) if task_id else None
+    if cache_key:
+        assigned_licenses = django_cache.get(cache_key)
+        if assigned_licenses is not None:
+            logger.info(f'Licenses were already assigned for {len(user_emails)} users by task {task_id}.')
+            return assigned_licenses
+
+    response = LicenseManagerApiClient().assign_licenses(user_emails, subscription_uuid)
+    assigned_licenses = {
+        assignment['user_email']: assignment['license'] for assignment in response['license_assignments']
+    }
+
+    if cache_key:
+        django_cache.set(cache_key, assigned_licenses, settings.LICENSE_ASSIGNMENT_PROGRESS_TIMEOUT)
+    return assigned_licenses
+
+
+def _is_final_assignment_attempt(exc):
+    """
+    Returns whether ``assign_licenses_task`` won't be retried after failing with the given exception.
+    """
+    if not isinstance(exc, assign_licenses_task.autoretry_for):
+        return True
+    max_retries = assign_licenses_task.retry_kwargs.get('max_retries', assign_licenses_task.max_retries)
+    return assign_licenses_task.request.retries >= max_retries
+
+
 @shared_task(base=LoggedTaskWithRetry)
 def assign_licenses_task(license_request_uuids, subscription_uuid):
     """
     Call License Manager API to assign licenses for the given license requests.
 
+    User emails are sent in chunks of ``LICENSE_ASSIGNMENT_CHUNK_SIZE``, with at most
+    ``LICENSE_ASSIGNMENT_MAX_CONCURRENCY`` chunks in flight. The licenses assigned for each
+    chunk are recorded, so that when the task is retried after a failed chunk, only the
+    chunks that were not assigned yet are sent again. If a chunk still fails on the last
+    attempt, the requests are updated from the chunks that were assigned before raising.
+
     Args:
         license_request_uuids (list of UUID): list of license request UUIDs to assign licenses for
         subscription_uuid (UUID): the UUID of the subscription to assign licenses from
@@ -162,13 +210,48 @@ def assign_licenses_task(license_request_uuids, subscription_uuid):
         logger.info(f'No pending/errored license requests with uuids: {license_request_uuids} found.')
         return None
 
-    user_emails = [license_request.user.email for license_request in license_requests]
-
-    license_manager_api_client = LicenseManagerApiClient()
-    response = license_manager_api_client.assign_licenses(user_emails, subscription_uuid)
-    assigned_licenses = {
-        assignment['user_email']: assignment['license'] for assignment in response['license_assignments']
-    }
+    # Sorted, so that a retried task splits the same emails into the same chunks.
+    user_emails = sorted({license_request.user.email for license_request in license_requests})
+    chunk_size = settings.LICENSE_ASSIGNMENT_CHUNK_SIZE
+    chunks = [user_emails[index:index + chunk_size] for index in range(0, len(user_emails), chunk_size)]
+    task_id = assign_licenses_task.request.id
+
+    with ThreadPoolExecutor(
+        max_workers=min(settings.LICENSE_ASSIGNMENT_MAX_CONCURRENCY, len(chunks)),
+        thread_name_prefix='license-assignment',
+    ) as executor:
+        futures = [
+            executor.submit(_assign_licenses_for_chunk, chunk, subscription_uuid, task_id)
+            for chunk in chunks
+        ]
+
+    # All chunks have been attempted by now, so a failed one is raised (and the task retried)
+    # only after the progress of the others was recorded.
+    assigned_licenses = {}
+    chunk_failure = None
+    for future in futures:
+        try:
+            assigned_licenses.update(future.result())
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            chunk_failure = chunk_failure or exc
+    if chunk_failure:
+        if _is_final_assignment_attempt(chunk_failure):
+            # The chained update task won't run, so update the requests here: those of the assigned
+            # chunks are approved, and the others are errored so that they can be approved again.
+            logger.error(
+                f'Failed to assign licenses for {len(user_emails) - len(assigned_licenses)} of '
+                f'{len(user_emails)} users from subscription {subscription_uuid}, giving up.'
+            )
+            update_license_requests_after_assignments_task({
+                'license_request_uuids': license_request_uuids,
+                'assigned_licenses': assigned_licenses,
+                'subscription_uuid': subscription_uuid,
+            })
+        raise chunk_failure
+    logger.info(
+        f'Assigned {len(assigned_licenses)} licenses for {len(user_emails)} users '
+        f'in {len(chunks)} chunks from subscription {subscription_uuid}.'
+    )
 
     return {
         'license_request_uuids': license_request_uuids,
@@ -182,6 +265,9 @@ def update_license_requests_after_assignments_task(license_assignment_results):
     """
     Update license requests after license assignments.
 
+    The requests are updated in bulk first, and the approval events of the assigned ones are
+    then serialized and emitted together.
+
     Args:
         license_assignment_results (dict): a dict representing license assignment results in the form of:
             {
@@ -202,10 +288,13 @@ def update_license_requests_after_assignments_task(license_assignment_results):
     assigned_licenses = license_assignment_results['assigned_licenses']
     subscription_uuid = license_assignment_results['subscription_uuid']
 
-    license_requests = LicenseRequest.objects.filter(
-        uuid__in=license_request_uuids
-    ).select_related('user', 'reviewer')
+    license_requests = list(
+        LicenseRequest.objects.filter(
+            uuid__in=license_request_uuids
+        ).select_related('user', 'reviewer')
+    )
 
+    approved_license_requests = []
     for license_request in license_requests:
         user_email = license_request.user.email
 
@@ -217,14 +306,18 @@ def update_license_requests_after_assignments_task(license_assignment_results):
             license_request.state = SubsidyRequestStates.APPROVED
             license_request.subscription_plan_uuid = subscription_uuid
             license_request.license_uuid = assigned_licenses[user_email]
-            track_event(
-                lms_user_id=license_request.user.lms_user_id,
-                event_name=SegmentEvents.LICENSE_REQUEST_APPROVED,
-                properties=LicenseRequestSerializer(license_request).data
-            )
+            approved_license_requests.append(license_request)
 
     LicenseRequest.bulk_update(license_requests, ['state', 'subscription_plan_uuid', 'license_uuid'])
 
+    serialized_license_requests = LicenseRequestSerializer(approved_license_requests, many=True).data
+    track_events([
+        (license_request.user.lms_user_id, SegmentEvents.LICENSE_REQUEST_APPROVED, serialized_license_request)
+        for license_request, serialized_license_request in zip(
+            approved_license_requests, serialized_license_requests
+        )
+    ])
+
 
 @shared_task(base=LoggedTaskWithRetry)
 def assign_coupon_codes_task(coupon_code_request_uuids, coupon_id):
@@ -295,23 +388,24 @@ def update_coupon_code_requests_after_assignments_task(coupon_code_assignment_re
         uuid__in=coupon_code_request_uuids
     ).select_related('user', 'reviewer')
 
-    for coupon_code_request in coupon_code_requests:
-        coupon_code_request.state = SubsidyRequestStates.APPROVED
-        coupon_code_request.coupon_id = coupon_id
-        coupon_code_request.coupon_code = assigned_codes[coupon_code_request.user.email]
+    with batched_event_bus_events():
+        for coupon_code_request in coupon_code_requests:
+            coupon_code_request.state = SubsidyRequestStates.APPROVED
+            coupon_code_request.coupon_id = coupon_id
+            coupon_code_request.coupon_code = assigned_codes[coupon_code_request.user.email]
 
-        track_event(
-            lms_user_id=coupon_code_request.user.lms_user_id,
-            event_name=SegmentEvents.COUPON_CODE_REQUEST_APPROVED,
-            properties=CouponCodeRequestSerializer(coupon_code_request).data
-        )
-
-        if settings.KAFKA_ENABLED:  # pragma: no cover
-            send_coupon_code_request_event_to_event_bus(
-                COUPON_CODE_REQUEST_APPROVED.event_type,
-                CouponCodeRequestSerializer(coupon_code_request).data
+            track_event(
+                lms_user_id=coupon_code_request.user.lms_user_id,
+                event_name=SegmentEvents.COUPON_CODE_REQUEST_APPROVED,
+                properties=CouponCodeRequestSerializer(coupon_code_request).data
             )
 
+            if settings.KAFKA_ENABLED:  # pragma: no cover
+                send_coupon_code_request_event_to_event_bus(
+                    COUPON_CODE_REQUEST_APPROVED.event_type,
+                    CouponCodeRequestSerializer(coupon_code_request).data
+                )
+
     CouponCodeRequest.bulk_update(coupon_code_requests, ['state', 'coupon_id', 'coupon_code'])
 
 
@@ -6,7 +6,10 @@ from unittest import mock
 from uuid import uuid4
 
 import ddt
+from django.conf import settings
+from django.core.cache import cache as django_cache
 from django.test import override_settings
+from requests.exceptions import HTTPError
 
 from enterprise_access.apps.api.serializers import CouponCodeRequestSerializer, LicenseRequestSerializer
 from enterprise_access.apps.api.tasks import (
@@ -249,6 +252,100 @@ class TestLicenseAssignmentTasks(APITestWithMocks):
             }
         )
 
+    @override_settings(LICENSE_ASSIGNMENT_CHUNK_SIZE=2)
+    @mock.patch('enterprise_access.apps.api.tasks.LicenseManagerApiClient')
+    def test_assign_license_task_chunks(self, mock_license_manager_client):
+        """
+        Verify assign_licenses_task sends the user emails to License Manager in chunks.
+        """
+        license_requests = [self.pending_license_request] + LicenseRequestFactory.create_batch(
+            4,
+            enterprise_customer_uuid=self.enterprise_customer_uuid,
+            state=SubsidyRequestStates.PENDING,
+        )
+        mock_license_manager_client().assign_licenses.side_effect = lambda user_emails, _: {
+            'license_assignments': [{'user_email': email, 'license': f'license-{email}'} for email in user_emails]
+        }
+
+        license_assignment_results = assign_licenses_task(
+            [license_request.uuid for license_request in license_requests],
+            self.mock_subscription_uuid
+        )
+
+        chunks = [call.args[0] for call in mock_license_manager_client().assign_licenses.call_args_list]
+        assert sorted(len(chunk) for chunk in chunks) == [1, 2, 2]
+        user_emails = {license_request.user.email for license_request in license_requests}
+        assert sorted(email for chunk in chunks for email in chunk) == sorted(user_emails)
+        assert license_assignment_results['assigned_licenses'] == {
+            email: f'license-{email}' for email in user_emails
+        }
+
+    @override_settings(LICENSE_ASSIGNMENT_CHUNK_SIZE=1)
+    @mock.patch('enterprise_access.apps.api.tasks.LicenseManagerApiClient')
+    def test_assign_license_task_retry_skips_assigned_chunks(self, mock_license_manager_client):
+        """
+        Verify a retried assign_licenses_task only resends the chunks that failed.
+        """
+        self.addCleanup(django_cache.clear)
+        other_license_request = LicenseRequestFactory(
+            enterprise_customer_uuid=self.enterprise_customer_uuid,
+            state=SubsidyRequestStates.PENDING,
+        )
+        failing_email = other_license_request.user.email
+        failed_emails = []
+
+        def assign_licenses(user_emails, _):
+            if user_emails == [failing_email] and not failed_emails:
+                failed_emails.append(failing_email)
+                raise HTTPError('license-manager is unavailable')
+            return {'license_assignments': [{'user_email': user_emails[0], 'license': 'license'}]}
+        mock_license_manager_client().assign_licenses.side_effect = assign_licenses
+
+        result = assign_licenses_task.apply(
+            args=[[self.pending_license_request.uuid, other_license_request.uuid], self.mock_subscription_uuid],
+            task_id=str(uuid4()),
+        )
+
+        assert result.successful()
+        chunks = [call.args[0] for call in mock_license_manager_client().assign_licenses.call_args_list]
+        assert chunks.count([self.user.email]) == 1
+        assert chunks.count([failing_email]) == 2
+        assert result.result['assigned_licenses'] == {self.user.email: 'license', failing_email: 'license'}
+
+    @override_settings(LICENSE_ASSIGNMENT_CHUNK_SIZE=1)
+    @mock.patch('enterprise_access.apps.api.tasks.LicenseManagerApiClient')
+    def test_assign_license_task_permanently_failing_chunk(self, mock_license_manager_client):
+        """
+        Verify that when a chunk still fails on the last attempt of assign_licenses_task, the requests
+        of the assigned chunks are approved and the others errored, so that they can be approved again.
+        """
+        self.addCleanup(django_cache.clear)
+        other_license_request = LicenseRequestFactory(
+            enterprise_customer_uuid=self.enterprise_customer_uuid,
+            state=SubsidyRequestStates.PENDING,
+        )
+        failing_email = other_license_request.user.email
+
+        def assign_licenses(user_emails, _):
+            if user_emails == [failing_email]:
+                raise HTTPError('license-manager is unavailable')
+            return {'license_assignments': [{'user_email': user_emails[0], 'license': self.mock_license_uuid}]}
+        mock_license_manager_client().assign_licenses.side_effect = assign_licenses
+
+        result = assign_licenses_task.apply(
+            args=[[self.pending_license_request.uuid, other_license_request.uuid], self.mock_subscription_uuid],
+            task_id=str(uuid4()),
+            retries=settings.TASK_MAX_RETRIES,
+        )
+
+        assert result.failed()
+        assert isinstance(result.result, HTTPError)
+        self.pending_license_request.refresh_from_db()
+        assert self.pending_license_request.state == SubsidyRequestStates.APPROVED
+        assert self.pending_license_request.license_uuid == self.mock_license_uuid
+        other_license_request.refresh_from_db()
+        assert other_license_request.state == SubsidyRequestStates.ERROR
+
     def test_update_license_requests_after_assignments_task(self):
         mock_license_assignments = [{'user_email': self.user.email, 'license': self.mock_license_uuid}]
         license_assignment_results = {
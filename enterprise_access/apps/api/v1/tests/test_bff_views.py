@@ -6,6 +6,7 @@ from urllib.parse import urlencode
 
 import ddt
 from django.core.cache import cache as django_cache
+from django.test import override_settings
 from pytest_dictsdiff import check_objects
 from rest_framework import status
 from rest_framework.reverse import reverse
@@ -194,6 +195,7 @@ class TestLearnerPortalBFFViewSet(TestHandlerContextMixin, MockLicenseManagerMet
                 COURSE_ENROLLMENT_STATUSES.COMPLETED: [],
                 COURSE_ENROLLMENT_STATUSES.SAVED_FOR_LATER: [],
             },
+            'default_enterprise_enrollment_realizations': [],
         }
         self.mock_search_route_response_data = {
             **self.mock_common_response_data,
@@ -945,6 +947,86 @@ class TestLearnerPortalBFFViewSet(TestHandlerContextMixin, MockLicenseManagerMet
         self.assertEqual(response.status_code, expected_status_code)
         assert check_objects(response.json(), self.mock_search_route_response_data)
 
+    @ddt.data(True, False)
+    @override_settings(BFF_SERVER_TIMING_HEADER_ENABLED=True)
+    @mock_search_dependencies
+    def test_search_server_timing_header(
+        self,
+        is_staff_request_user,
+        mock_get_enterprise_customers_for_user,
+        mock_get_secured_algolia_api_key_for_user,
+        mock_get_default_enrollment_intentions_learner_status,
+        mock_get_subscription_licenses_for_learner,
+    ):
+        """
+        Test that per-stage timings are exposed via the Server-Timing header to staff request users only.
+        """
+        self.user.is_staff = is_staff_request_user
+        self.user.save()
+        self.set_jwt_cookie([{
+            'system_wide_role': SYSTEM_ENTERPRISE_LEARNER_ROLE,
+            'context': self.mock_enterprise_customer_uuid,
+        }])
+        mock_get_enterprise_customers_for_user.return_value = self.mock_enterprise_learner_response_data
+        mock_get_secured_algolia_api_key_for_user.return_value = self.mock_secured_algolia_api_key_response
+        mock_get_subscription_licenses_for_learner.return_value = self.mock_subscription_licenses_data
+        mock_get_default_enrollment_intentions_learner_status.return_value =\
+            self.mock_default_enterprise_enrollment_intentions_learner_status_data
+
+        query_params = {
+            'enterprise_customer_slug': self.mock_enterprise_customer_slug,
+        }
+        url = reverse('api:v1:learner-portal-bff-search')
+        url += f"?{urlencode(query_params)}"
+
+        response = self.client.post(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        if not is_staff_request_user:
+            self.assertNotIn('Server-Timing', response.headers)
+            return
+        stage_names = [entry.split(';')[0] for entry in response.headers['Server-Timing'].split(', ')]
+        for expected_stage_name in (
+            'context_init',
+            'initialize_enterprise_customer_users',
+            'load_and_process',
+            'load_and_process_subscription_licenses',
+            'serialize_response',
+            'total',
+        ):
+            self.assertIn(expected_stage_name, stage_names)
+
+    @mock.patch('enterprise_access.apps.api.v1.views.bffs.learner_portal.prefetch_learner_portal_data')
+    @mock.patch('enterprise_access.apps.api_client.lms_client.LmsUserApiClient.get_enterprise_customers_for_user')
+    def test_prefetch(self, mock_get_enterprise_customers_for_user, mock_prefetch_learner_portal_data):
+        """
+        Test the prefetch route starts the background loaders and returns immediately.
+        """
+        self.set_jwt_cookie([{
+            'system_wide_role': SYSTEM_ENTERPRISE_LEARNER_ROLE,
+            'context': self.mock_enterprise_customer_uuid,
+        }])
+        mock_get_enterprise_customers_for_user.return_value = self.mock_enterprise_learner_response_data
+        mock_prefetch_learner_portal_data.return_value = {
+            'enterprise_customer_users': mock.Mock(),
+            'subscription_licenses': mock.Mock(),
+        }
+
+        query_params = {
+            'enterprise_customer_slug': self.mock_enterprise_customer_slug,
+        }
+        url = reverse('api:v1:learner-portal-bff-prefetch')
+        url += f"?{urlencode(query_params)}"
+
+        response = self.client.post(url)
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.json(), {
+            'enterprise_customer_uuid': self.mock_enterprise_customer_uuid,
+            'prefetching': ['enterprise_customer_users', 'subscription_licenses'],
+        })
+        mock_prefetch_learner_portal_data.assert_called_once_with(mock.ANY, self.mock_enterprise_customer_uuid)
+
     @mock_academy_dependencies
     def test_academy_base_response(
         self,
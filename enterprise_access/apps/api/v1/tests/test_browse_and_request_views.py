@@ -10,6 +10,7 @@ from uuid import uuid4
 import ddt
 from django.conf import settings
 from django.test import override_settings
+from edx_django_utils.cache import TieredCache
 from rest_framework import status
 from rest_framework.reverse import reverse
 
@@ -744,6 +745,43 @@ class TestLicenseRequestViewSet(BaseEnterpriseAccessTestCase):
                 state=state
             ).count()
 
+    def test_overview_cached_counts(self):
+        """
+        Test that unfiltered overviews are served from the cached counts, which are
+        invalidated by state changes, while filtered overviews are computed as before.
+        """
+        self.addCleanup(TieredCache.dangerous_clear_all_tiers)
+        self.set_jwt_cookie([{
+            'system_wide_role': SYSTEM_ENTERPRISE_ADMIN_ROLE,
+            'context': str(self.enterprise_customer_uuid_1)
+        }])
+
+        LicenseRequest.objects.all().delete()
+        license_requests = LicenseRequestFactory.create_batch(
+            3,
+            enterprise_customer_uuid=self.enterprise_customer_uuid_1,
+            user=self.user,
+            state=SubsidyRequestStates.REQUESTED,
+        )
+
+        url = f'{LICENSE_REQUESTS_OVERVIEW_ENDPOINT}?enterprise_customer_uuid={self.enterprise_customer_uuid_1}'
+        response = self.client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == [{'state': SubsidyRequestStates.REQUESTED, 'count': 3}]
+
+        license_requests[0].decline(self.user)
+
+        response = self.client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == [
+            {'state': SubsidyRequestStates.REQUESTED, 'count': 2},
+            {'state': SubsidyRequestStates.DECLINED, 'count': 1},
+        ]
+
+        response = self.client.get(f'{url}&state={SubsidyRequestStates.DECLINED}')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == [{'state': SubsidyRequestStates.DECLINED, 'count': 1}]
+
 
 @ddt.ddt
 @override_settings(SEGMENT_KEY='test_key')
@@ -583,7 +583,7 @@ class CheckoutBFFSuccessViewSetTests(APITest):
 
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_ssp_product_pricing')
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_and_cache_enterprise_customer_users')
-    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_checkout_session')
+    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_checkout_session_details')
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_payment_intent')
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_payment_method')
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_subscription')
@@ -364,7 +364,7 @@ class StripeWebhookTests(APITest):
             HTTP_STRIPE_SIGNATURE=signature,
         )
 
-    @override_settings(STRIPE_WEBHOOK_ENDPOINT_SECRET='whsec_test_secret')
+    @override_settings(STRIPE_WEBHOOK_ENDPOINT_SECRET='whsec_test_secret', ENABLE_ASYNC_STRIPE_EVENT_HANDLING=False)
     @mock.patch('enterprise_access.apps.customer_billing.stripe_event_handlers.StripeEventHandler.dispatch')
     @mock.patch('stripe.Webhook.construct_event')
     def test_webhook_success_with_valid_signature(self, mock_construct_event, mock_dispatch):
@@ -382,6 +382,26 @@ class StripeWebhookTests(APITest):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         mock_dispatch.assert_called_once_with(mock_event)
 
+    @override_settings(STRIPE_WEBHOOK_ENDPOINT_SECRET='whsec_test_secret')
+    @mock.patch('enterprise_access.apps.api.v1.views.customer_billing.enqueue_stripe_event')
+    @mock.patch('enterprise_access.apps.customer_billing.stripe_event_handlers.StripeEventHandler.dispatch')
+    @mock.patch('stripe.Webhook.construct_event')
+    def test_webhook_async_enqueues_event(self, mock_construct_event, mock_dispatch, mock_enqueue):
+        """
+        Test webhook endpoint only queues the event, as asynchronous handling is enabled by default.
+        """
+        mock_event = {'id': 'evt_test', 'type': 'invoice.paid'}
+        mock_construct_event.return_value = mock_event
+
+        response = self._post_webhook_with_signature(
+            self.valid_event_payload,
+            't=1234567890,v1=valid_signature'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        mock_enqueue.assert_called_once_with(mock_event)
+        mock_dispatch.assert_not_called()
+
     @override_settings(STRIPE_WEBHOOK_ENDPOINT_SECRET='whsec_test_secret')
     @mock.patch('stripe.Webhook.construct_event')
     def test_webhook_fails_with_invalid_signature(self, mock_construct_event):
@@ -445,7 +465,7 @@ class StripeWebhookTests(APITest):
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
         self.assertIn('invalid', str(response.data).lower())
 
-    @override_settings(STRIPE_WEBHOOK_ENDPOINT_SECRET='whsec_test_secret')
+    @override_settings(STRIPE_WEBHOOK_ENDPOINT_SECRET='whsec_test_secret', ENABLE_ASYNC_STRIPE_EVENT_HANDLING=False)
     @mock.patch('enterprise_access.apps.customer_billing.stripe_event_handlers.StripeEventHandler.dispatch')
     @mock.patch('stripe.Webhook.construct_event')
     def test_webhook_propagates_handler_exceptions(self, mock_construct_event, mock_dispatch):
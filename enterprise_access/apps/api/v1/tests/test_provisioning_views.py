@@ -1,6 +1,7 @@
 """
 Tests for the provisioning views.
 """
+import copy
 import random
 import uuid
 from datetime import timedelta
@@ -1200,6 +1201,161 @@ class TestCheckoutIntentSynchronization(APITest):
         self.assertIsNotNone(workflow)
 
 
+class TestAsyncProvisioning(APITest):
+    """
+    Tests for async provisioning requests and the provisioning status view.
+    """
+    def setUp(self):
+        super().setUp()
+        self.set_jwt_cookie([
+            {
+                'system_wide_role': SYSTEM_ENTERPRISE_PROVISIONING_ADMIN_ROLE,
+                'context': ALL_ACCESS_CONTEXT,
+            },
+        ])
+        self.checkout_intent = CheckoutIntent.objects.create(
+            user=UserFactory(),
+            **DEFAULT_CHECKOUT_INTENT_RECORD,
+        )
+        event_data = StripeEventDataFactory.create(checkout_intent=self.checkout_intent)
+        StripeEventSummaryFactory.create(stripe_event_data=event_data)
+
+    def _status_endpoint(self, workflow_uuid):
+        return reverse('api:v1:provisioning-status', kwargs={'workflow_uuid': workflow_uuid})
+
+    def _request_payload(self):
+        payload = copy.deepcopy(DEFAULT_REQUEST_PAYLOAD)
+        payload['enterprise_customer']['slug'] = self.checkout_intent.enterprise_slug
+        return payload
+
+    @mock.patch('enterprise_access.apps.provisioning.models.get_or_create_customer_agreement')
+    @mock.patch('enterprise_access.apps.provisioning.models.get_or_create_enterprise_catalog')
+    @mock.patch('enterprise_access.apps.provisioning.models.get_or_create_enterprise_admin_users')
+    @mock.patch('enterprise_access.apps.provisioning.models.get_or_create_enterprise_customer')
+    @mock.patch('enterprise_access.apps.provisioning.models.get_or_create_subscription_plan_renewal')
+    def test_async_provisioning(
+        self,
+        mock_create_renewal,
+        mock_create_customer,
+        mock_create_admins,
+        mock_create_catalog,
+        mock_create_agreement,
+    ):
+        """
+        Tests that an async provisioning request is accepted right away, that the workflow
+        is executed by a task once the request commits, and that its outcome is served by the status view.
+        """
+        mock_create_customer.return_value = DEFAULT_CUSTOMER_RECORD
+        mock_create_admins.return_value = {'created_admins': [], 'existing_admins': []}
+        mock_create_catalog.return_value = DEFAULT_CATALOG_RECORD
+        mock_create_agreement.return_value = DEFAULT_AGREEMENT_RECORD
+        mock_create_renewal.return_value = EXPECTED_SUBSCRIPTION_PLAN_RENEWAL_RESPONSE
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'{PROVISIONING_CREATE_ENDPOINT}?async=true', data=self._request_payload())
+            # Nothing is provisioned within the request itself.
+            self.assertFalse(mock_create_customer.called)
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        workflow = ProvisionNewCustomerWorkflow.objects.get()
+        self.assertEqual(response.json(), {'workflow_uuid': str(workflow.uuid)})
+        self.assertTrue(response['Location'].endswith(self._status_endpoint(workflow.uuid)))
+
+        response = self.client.get(self._status_endpoint(workflow.uuid))
+        assert response.status_code == status.HTTP_200_OK
+        response_data = response.json()
+        self.assertEqual(response_data['status'], 'succeeded')
+        self.assertEqual(
+            [step['step'] for step in response_data['steps']],
+            [step_class.__name__ for step_class in ProvisionNewCustomerWorkflow.steps],
+        )
+        self.assertTrue(all(step['status'] == 'succeeded' for step in response_data['steps']))
+        self.assertEqual(response_data['result']['enterprise_customer'], DEFAULT_CUSTOMER_RECORD)
+        self.assertEqual(response_data['result']['enterprise_catalog'], EXPECTED_CATALOG_RESPONSE)
+
+    @mock.patch('enterprise_access.apps.api.v1.views.provisioning.execute_provisioning_workflow_task')
+    def test_async_provisioning_pending(self, mock_task):
+        """
+        Tests that a workflow is pending until its task has executed any of its steps.
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'{PROVISIONING_CREATE_ENDPOINT}?async=1', data=self._request_payload())
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        workflow_uuid = response.json()['workflow_uuid']
+        mock_task.delay.assert_called_once_with(workflow_uuid)
+
+        response = self.client.get(self._status_endpoint(workflow_uuid))
+        assert response.status_code == status.HTTP_200_OK
+        response_data = response.json()
+        self.assertEqual(response_data['status'], 'pending')
+        self.assertTrue(all(step['status'] == 'pending' for step in response_data['steps']))
+        self.assertIsNone(response_data['result'])
+
+    @mock.patch('enterprise_access.apps.provisioning.models.get_or_create_enterprise_admin_users')
+    @mock.patch('enterprise_access.apps.provisioning.models.get_or_create_enterprise_customer')
+    def test_status_while_first_step_is_running(self, mock_create_customer, mock_create_admins):
+        """
+        Tests that a workflow is in progress while its first step is running.
+        """
+        status_responses = []
+
+        def create_customer(*args, **kwargs):  # pylint: disable=unused-argument
+            workflow_uuid = ProvisionNewCustomerWorkflow.objects.get().uuid
+            status_responses.append(self.client.get(self._status_endpoint(workflow_uuid)).json())
+            return DEFAULT_CUSTOMER_RECORD
+
+        mock_create_customer.side_effect = create_customer
+        mock_create_admins.side_effect = Exception('admins could not be created')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'{PROVISIONING_CREATE_ENDPOINT}?async=true', data=self._request_payload())
+
+        self.assertEqual(len(status_responses), 1)
+        self.assertEqual(status_responses[0]['status'], 'in_progress')
+        self.assertTrue(all(step['status'] == 'pending' for step in status_responses[0]['steps']))
+        self.assertIsNone(status_responses[0]['result'])
+
+    @mock.patch('enterprise_access.apps.provisioning.models.get_or_create_enterprise_admin_users')
+    @mock.patch('enterprise_access.apps.provisioning.models.get_or_create_enterprise_customer')
+    def test_status_of_failed_workflow(self, mock_create_customer, mock_create_admins):
+        """
+        Tests that the status view serves the progress of a failed workflow.
+        """
+        mock_create_customer.return_value = DEFAULT_CUSTOMER_RECORD
+        mock_create_admins.side_effect = Exception('admins could not be created')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'{PROVISIONING_CREATE_ENDPOINT}?async=true', data=self._request_payload())
+        workflow_uuid = response.json()['workflow_uuid']
+
+        response = self.client.get(self._status_endpoint(workflow_uuid))
+        assert response.status_code == status.HTTP_200_OK
+        response_data = response.json()
+        self.assertEqual(response_data['status'], 'failed')
+        self.assertEqual(response_data['exception_message'], 'admins could not be created')
+        self.assertIsNone(response_data['result'])
+        steps_by_name = {step['step']: step for step in response_data['steps']}
+        self.assertEqual(steps_by_name['GetCreateCustomerStep']['status'], 'succeeded')
+        self.assertEqual(steps_by_name['GetCreateEnterpriseAdminUsersStep']['status'], 'failed')
+        self.assertEqual(
+            steps_by_name['GetCreateEnterpriseAdminUsersStep']['exception_message'],
+            'admins could not be created',
+        )
+        self.assertEqual(steps_by_name['NotificationStep']['status'], 'pending')
+
+    def test_status_not_found(self):
+        response = self.client.get(self._status_endpoint(uuid.uuid4()))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_status_forbidden(self):
+        workflow = ProvisionNewCustomerWorkflow.objects.create(input_data={})
+        self.set_jwt_cookie([{'system_wide_role': SYSTEM_ENTERPRISE_ADMIN_ROLE, 'context': ALL_ACCESS_CONTEXT}])
+
+        response = self.client.get(self._status_endpoint(workflow.uuid))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
 @ddt.ddt
 class TestSubscriptionPlanOLIUpdateView(APITest):
     """
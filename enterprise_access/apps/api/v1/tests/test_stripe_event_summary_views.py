@@ -261,3 +261,47 @@ class StripeEventUpcomingInvoiceAmountDueTests(APITest):
             'currency': 'usd',
             'upcoming_invoice_amount_due': 200,
         }
+
+    def test_get_latest_upcoming_invoice_amount_due(self):
+        """
+        The amount materialized on the latest summary of the subscription plan is returned.
+        """
+        self.set_jwt_cookie([{
+            'system_wide_role': SYSTEM_ENTERPRISE_ADMIN_ROLE,
+            'context': self.enterprise_uuid,
+        }])
+        StripeEventSummary.objects.filter(event_id='evt_test_subscription').update(
+            stripe_event_created_at=timezone.now() - timedelta(days=30),
+        )
+        StripeEventData.objects.create(
+            event_id='evt_test_subscription_updated',
+            event_type='customer.subscription.updated',
+            checkout_intent=self.checkout_intent,
+            data={
+                'id': 'evt_test_subscription_updated',
+                'type': 'customer.subscription.updated',
+                'data': {
+                    'object': {
+                        'object': 'subscription',
+                        'id': 'sub_test_789',
+                        'status': 'active',
+                        'currency': 'usd',
+                    },
+                },
+            },
+        )
+        StripeEventSummary.objects.filter(event_id='evt_test_subscription_updated').update(
+            upcoming_invoice_amount_due=300,
+            subscription_plan_uuid=self.subscription_plan_uuid,
+            stripe_event_created_at=timezone.now(),
+        )
+
+        url = reverse('api:v1:stripe-event-summary-first-upcoming-invoice-amount-due')
+        url += f"?{urlencode({'subscription_plan_uuid': self.subscription_plan_uuid})}"
+        response = self.client.get(url)
+
+        assert response.status_code == 200
+        assert response.data == {
+            'currency': 'usd',
+            'upcoming_invoice_amount_due': 300,
+        }
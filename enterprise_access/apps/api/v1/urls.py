@@ -62,6 +62,11 @@ urlpatterns = [
         views.ProvisioningCreateView.as_view(),
         name='provisioning-create',
     ),
+    path(
+        'provisioning/<uuid:workflow_uuid>',
+        views.ProvisioningStatusView.as_view(),
+        name='provisioning-status',
+    ),
     path(
         'provisioning/subscription-plan-oli-update',
         views.SubscriptionPlanOLIUpdateView.as_view(),
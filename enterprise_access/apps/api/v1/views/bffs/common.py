@@ -16,6 +16,14 @@ from rest_framework.throttling import AnonRateThrottle
 from rest_framework.viewsets import ViewSet
 
 from enterprise_access.apps.bffs.context import BaseHandlerContext, HandlerContext
+from enterprise_access.apps.bffs.profiling import (
+    SERVER_TIMING_HEADER,
+    activate_profile,
+    deactivate_profile,
+    get_active_profile,
+    profile_stage,
+    should_add_server_timing_header
+)
 from enterprise_access.apps.bffs.serializers import BaseResponseSerializer
 
 logger = logging.getLogger(__name__)
@@ -142,8 +150,10 @@ class BaseBFFViewSetMixin:
             tuple: (response_data, status_code)
         """
         response_builder = response_builder_class(context)
-        response_builder.build()
-        response_data, status_code = response_builder.serialize()
+        with profile_stage('build_response'):
+            response_builder.build()
+        with profile_stage('serialize_response'):
+            response_data, status_code = response_builder.serialize()
 
         ordered_representation = OrderedDict(response_data)
 
@@ -170,18 +180,44 @@ class BaseBFFViewSetMixin:
         Returns:
             tuple: (response_data, status_code)
         """
+        # Profile each stage of the route; metrics are emitted in `finalize_response`.
+        profile = activate_profile(route=handler_class.__name__)
+
         # Create the context based on the request
-        context, error_response, error_status = self._create_context(request, context_class)
+        with profile.stage('context_init'):
+            context, error_response, error_status = self._create_context(request, context_class)
         if context is None:
             return error_response, error_status
 
         # Create and process the route handler
-        handler = self._instantiate_handler(handler_class, context)
-        self._process_handler(handler, handler_class, context)
+        with profile.stage('handler_init'):
+            handler = self._instantiate_handler(handler_class, context)
+        with profile.stage('load_and_process'):
+            self._process_handler(handler, handler_class, context)
 
         # Build and return the response
         return self._build_response(context, response_builder_class)
 
+    def finalize_response(self, request, response, *args, **kwargs):
+        """
+        Emits the profiled stage metrics for the route, if any, as custom monitoring
+        attributes and, for staff request users, as a ``Server-Timing`` response header.
+        """
+        response = super().finalize_response(request, response, *args, **kwargs)
+        profile = get_active_profile()
+        if profile is None:
+            return response
+
+        try:
+            profile.emit_monitoring_attributes()
+            if should_add_server_timing_header(request):
+                response[SERVER_TIMING_HEADER] = profile.server_timing_header_value()
+        except Exception:  # pylint: disable=broad-except
+            logger.exception('Could not emit BFF profiling metrics for route %s.', profile.route)
+        finally:
+            deactivate_profile()
+        return response
+
 
 class BaseBFFViewSet(BaseBFFViewSetMixin, ViewSet):
     """
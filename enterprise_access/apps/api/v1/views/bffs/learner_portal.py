@@ -10,6 +10,7 @@ from rest_framework.response import Response
 
 from enterprise_access.apps.api.utils import get_or_fetch_enterprise_uuid_for_bff_request
 from enterprise_access.apps.api.v1.views.bffs.common import COMMON_BFF_QUERY_PARAMETERS, BaseBFFViewSet
+from enterprise_access.apps.bffs.api import prefetch_learner_portal_data
 from enterprise_access.apps.bffs.handlers import AcademyHandler, DashboardHandler, SearchHandler, SkillsQuizHandler
 from enterprise_access.apps.bffs.response_builder import (
     LearnerAcademyResponseBuilder,
@@ -22,6 +23,8 @@ from enterprise_access.apps.bffs.serializers import (
     LearnerAcademyResponseSerializer,
     LearnerDashboardRequestSerializer,
     LearnerDashboardResponseSerializer,
+    LearnerPrefetchRequestSerializer,
+    LearnerPrefetchResponseSerializer,
     LearnerSearchRequestSerializer,
     LearnerSearchResponseSerializer,
     LearnerSkillsQuizRequestSerializer,
@@ -154,3 +157,41 @@ class LearnerPortalBFFViewSet(BaseBFFViewSet):
             response_builder_class=LearnerSkillsQuizResponseBuilder,
         )
         return Response(response_data, status=status_code)
+
+    @extend_schema(
+        tags=['Learner Portal BFF'],
+        summary='Prefetch route',
+        request=LearnerPrefetchRequestSerializer,
+        parameters=COMMON_BFF_QUERY_PARAMETERS,
+        responses={
+            status.HTTP_202_ACCEPTED: OpenApiResponse(
+                response=LearnerPrefetchResponseSerializer,
+                description='The learner portal data being prefetched in the background.',
+            ),
+        },
+        description=(
+            'Warms the caches read by the learner portal routes in the background, '
+            'so that the first route request after login does not do the cold work.'
+        ),
+    )
+    @action(detail=False, methods=['post'])
+    @permission_required(BFF_READ_PERMISSION, fn=get_or_fetch_enterprise_uuid_for_bff_request)
+    def prefetch(self, request, *args, **kwargs):
+        """
+        Starts loading learner portal data for the request user in the background and returns immediately.
+        Args:
+            request (Request): The request object.
+        Returns:
+            Response: The names of the data being prefetched.
+        """
+        enterprise_customer_uuid = get_or_fetch_enterprise_uuid_for_bff_request(request)
+        if not enterprise_customer_uuid:
+            response_data = LearnerPrefetchResponseSerializer({'enterprise_customer_uuid': None}).data
+            return Response(response_data, status=status.HTTP_404_NOT_FOUND)
+
+        prefetching = prefetch_learner_portal_data(request, enterprise_customer_uuid)
+        response_data = LearnerPrefetchResponseSerializer({
+            'enterprise_customer_uuid': enterprise_customer_uuid,
+            'prefetching': list(prefetching),
+        }).data
+        return Response(response_data, status=status.HTTP_202_ACCEPTED)
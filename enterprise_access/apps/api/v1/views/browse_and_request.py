@@ -208,6 +208,12 @@ class SubsidyRequestViewSet(UserDetailsFromJwtMixin, viewsets.ModelViewSet):
             msg = 'enterprise_customer_uuid query param is required'
             return Response(msg, status=status.HTTP_400_BAD_REQUEST)
 
+        # Admins of the enterprise can see all of its requests, so unless the overview is
+        # further filtered, the cached per-enterprise counts can be served as is.
+        if set(self.request.query_params) == {'enterprise_customer_uuid'}:
+            requests_overview = self.queryset.model.get_state_counts(validate_uuid(enterprise_customer_uuid))
+            return Response(requests_overview, status=status.HTTP_200_OK)
+
         queryset = self.filter_queryset(self.get_queryset()).filter(enterprise_customer_uuid=enterprise_customer_uuid)
         queryset_values = queryset.values('state').annotate(count=Count('state')).order_by('-count')
         requests_overview = list(queryset_values)
@@ -30,7 +30,9 @@ from enterprise_access.apps.customer_billing.api import (
     create_free_trial_checkout_session
 )
 from enterprise_access.apps.customer_billing.models import CheckoutIntent, StripeEventSummary
+from enterprise_access.apps.customer_billing.stripe_api import sync_stripe_cache_with_event
 from enterprise_access.apps.customer_billing.stripe_event_handlers import StripeEventHandler
+from enterprise_access.apps.customer_billing.stripe_event_queue import enqueue_stripe_event
 
 from .constants import CHECKOUT_INTENT_EXAMPLES, ERROR_RESPONSES, PATCH_REQUEST_EXAMPLES
 
@@ -98,13 +100,8 @@ class CustomerBillingViewSet(viewsets.ViewSet):
 
         Authentication is performed via Stripe signature validation in StripeWebhookAuthentication.
 
-        TODO:
-        * For a real production implementation we should implement event de-duplication:
-          - https://docs.stripe.com/webhooks/process-undelivered-events
-          - This is a safeguard against the remote possibility that an event is sent twice. This could happen if the
-            network connection cuts out at the exact moment between successfully processing an event and responding with
-            HTTP 200, in which case Stripe will attempt to re-send the event since it does not know we successfully
-            received it.
+        When ENABLE_ASYNC_STRIPE_EVENT_HANDLING is set, the event is only persisted (deduplicated on its id)
+        and queued for handling by a celery worker, so that Stripe is not kept waiting on the handlers.
         """
         # Event must be parsed and verified by the authentication class.
         event = getattr(request, '_stripe_event', None)
@@ -115,6 +112,13 @@ class CustomerBillingViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        # Bring cached Stripe objects up to date before any handler reads them.
+        sync_stripe_cache_with_event(event)
+
+        if settings.ENABLE_ASYNC_STRIPE_EVENT_HANDLING:
+            enqueue_stripe_event(event)
+            return Response(status=status.HTTP_200_OK)
+
         # Could throw an exception. Do NOT swallow the exception because we
         # need the error response to trigger webhook retries.
         StripeEventHandler.dispatch(event)
@@ -606,13 +610,15 @@ class StripeEventSummaryViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
         """
         Given a license-manager SubscriptionPlan uuid, returns an upcoming
         invoice amount due, dervied from Stripe's preview invoice API.
+
+        The amount is materialized on the latest subscription event summary by the
+        subscription and invoice webhook handlers, so this is a single indexed read.
         """
         subscription_plan_uuid = self.request.query_params.get('subscription_plan_uuid')
-        summary = StripeEventSummary.objects.filter(
-            event_type='customer.subscription.created',
-            subscription_plan_uuid=subscription_plan_uuid,
-        ).first()
-        if not (subscription_plan_uuid and summary):
+        if not subscription_plan_uuid:
+            return Response({})
+        summary = StripeEventSummary.get_latest_upcoming_invoice_for_subscription_plan(subscription_plan_uuid)
+        if not summary:
             return Response({})
         return Response({
             'upcoming_invoice_amount_due': summary.upcoming_invoice_amount_due,
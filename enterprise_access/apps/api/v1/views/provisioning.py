@@ -5,11 +5,15 @@ import copy
 import logging
 
 from django.conf import settings
-from drf_spectacular.utils import extend_schema
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from edx_rbac.mixins import PermissionRequiredMixin
 from edx_rest_framework_extensions.auth.jwt.authentication import JwtAuthentication
 from rest_framework import exceptions, generics, permissions, status
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 from rest_framework.views import APIView
 
 from enterprise_access.apps.api import serializers
@@ -20,6 +24,7 @@ from enterprise_access.apps.provisioning.models import (
     GetCreateFirstPaidSubscriptionPlanStep,
     ProvisionNewCustomerWorkflow
 )
+from enterprise_access.apps.provisioning.tasks import execute_provisioning_workflow_task
 from enterprise_access.apps.workflow.exceptions import UnitOfWorkException
 
 logger = logging.getLogger(__name__)
@@ -36,13 +41,41 @@ class ProvisioningException(exceptions.APIException):
     default_code = 'provisioning_error'
 
 
+def _provisioning_response_data(workflow):
+    """
+    Returns the serialized records provisioned by the given (succeeded) workflow.
+    """
+    return serializers.ProvisioningResponseSerializer({
+        'enterprise_customer': workflow.customer_output_dict(),
+        'customer_admins': workflow.admin_users_output_dict(),
+        'enterprise_catalog': workflow.catalog_output_dict(),
+        'customer_agreement': workflow.customer_agreement_output_dict(),
+        'trial_subscription_plan': workflow.trial_subscription_plan_output_dict(),
+        'first_paid_subscription_plan': workflow.first_paid_subscription_plan_output_dict(),
+        'subscription_plan_renewal': workflow.subscription_plan_renewal_output_dict(),
+    }).data
+
+
 @extend_schema(
     tags=[PROVISIONING_API_TAG],
     summary='Create a new provisioning request.',
     request=serializers.ProvisioningRequestSerializer,
+    parameters=[
+        OpenApiParameter(
+            name='async',
+            type=OpenApiTypes.BOOL,
+            location=OpenApiParameter.QUERY,
+            required=False,
+            description=(
+                'If true, the provisioning workflow is executed in the background and its uuid is returned '
+                'right away, with a Location header pointing at the provisioning status view.'
+            ),
+        ),
+    ],
     responses={
         status.HTTP_200_OK: serializers.ProvisioningResponseSerializer,
         status.HTTP_201_CREATED: serializers.ProvisioningResponseSerializer,
+        status.HTTP_202_ACCEPTED: serializers.ProvisioningAcceptedResponseSerializer,
     },
 )
 class ProvisioningCreateView(PermissionRequiredMixin, generics.CreateAPIView):
@@ -129,6 +162,18 @@ class ProvisioningCreateView(PermissionRequiredMixin, generics.CreateAPIView):
         )
         workflow = ProvisionNewCustomerWorkflow.objects.create(input_data=workflow_input_dict)
 
+        if request.query_params.get('async', '').lower() in ('1', 'true'):
+            transaction.on_commit(lambda: execute_provisioning_workflow_task.delay(str(workflow.uuid)))
+            response_serializer = serializers.ProvisioningAcceptedResponseSerializer({
+                'workflow_uuid': workflow.uuid,
+            })
+            status_url = reverse('api:v1:provisioning-status', kwargs={'workflow_uuid': workflow.uuid}, request=request)
+            return Response(
+                response_serializer.data,
+                status=status.HTTP_202_ACCEPTED,
+                headers={'Location': status_url},
+            )
+
         try:
             workflow.execute()
         except UnitOfWorkException as exc:
@@ -137,21 +182,73 @@ class ProvisioningCreateView(PermissionRequiredMixin, generics.CreateAPIView):
                 code=exc.code,
             ) from exc
 
-        response_serializer = serializers.ProvisioningResponseSerializer({
-            'enterprise_customer': workflow.customer_output_dict(),
-            'customer_admins': workflow.admin_users_output_dict(),
-            'enterprise_catalog': workflow.catalog_output_dict(),
-            'customer_agreement': workflow.customer_agreement_output_dict(),
-            'trial_subscription_plan': workflow.trial_subscription_plan_output_dict(),
-            'first_paid_subscription_plan': workflow.first_paid_subscription_plan_output_dict(),
-            'subscription_plan_renewal': workflow.subscription_plan_renewal_output_dict(),
-        })
         return Response(
-            response_serializer.data,
+            _provisioning_response_data(workflow),
             status=status.HTTP_201_CREATED,
         )
 
 
+@extend_schema(
+    tags=[PROVISIONING_API_TAG],
+    summary='Retrieve the progress of a provisioning workflow.',
+    responses={
+        status.HTTP_200_OK: serializers.ProvisioningStatusResponseSerializer,
+    },
+)
+class ProvisioningStatusView(PermissionRequiredMixin, APIView):
+    """
+    Serves the progress of a provisioning workflow, e.g. as created by an async provisioning request,
+    from its stored workflow and step records.
+    """
+    authentication_classes = (JwtAuthentication,)
+    permission_classes = (permissions.IsAuthenticated,)
+    permission_required = constants.PROVISIONING_CREATE_PERMISSION
+
+    @staticmethod
+    def _get_status(unit_of_work):
+        """
+        Returns whether the given workflow or step record has succeeded, failed or is pending.
+        """
+        if unit_of_work.succeeded_at:
+            return 'succeeded'
+        if unit_of_work.failed_at:
+            return 'failed'
+        return 'pending'
+
+    def get(self, request, workflow_uuid):
+        """
+        Returns the status of the workflow and each of its steps, and the provisioned records once it succeeded.
+        """
+        workflow = get_object_or_404(ProvisionNewCustomerWorkflow, uuid=workflow_uuid)
+
+        step_records = workflow.get_step_records()
+        steps = []
+        for step_class, step_record in step_records.items():
+            steps.append({
+                'step': step_class.__name__,
+                'status': self._get_status(step_record) if step_record else 'pending',
+                'succeeded_at': step_record.succeeded_at if step_record else None,
+                'failed_at': step_record.failed_at if step_record else None,
+                'exception_message': step_record.exception_message if step_record else None,
+            })
+
+        workflow_status = self._get_status(workflow)
+        # The step records are all created once the workflow starts executing its first step.
+        if workflow_status == 'pending' and any(step_records.values()):
+            workflow_status = 'in_progress'
+
+        response_serializer = serializers.ProvisioningStatusResponseSerializer({
+            'workflow_uuid': workflow.uuid,
+            'status': workflow_status,
+            'succeeded_at': workflow.succeeded_at,
+            'failed_at': workflow.failed_at,
+            'exception_message': workflow.exception_message,
+            'steps': steps,
+            'result': _provisioning_response_data(workflow) if workflow.succeeded_at else None,
+        })
+        return Response(response_serializer.data, status=status.HTTP_200_OK)
+
+
 @extend_schema(
     tags=[PROVISIONING_API_TAG],
     summary='Update a SubscriptionPlan with Salesforce Opportunity Line Item.',
@@ -1,14 +1,23 @@
 """
 API methods for retrieving data from downstream services in the bffs app.
 """
+import datetime
+import functools
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from django.conf import settings
+from django.core.cache import cache as django_cache
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from edx_django_utils.cache import TieredCache
+from edx_rest_framework_extensions.auth.jwt.cookies import jwt_cookie_name
 
 from enterprise_access.apps.api_client import EnterpriseCatalogUserV1ApiClient
 from enterprise_access.apps.api_client.license_manager_client import LicenseManagerUserApiClient
 from enterprise_access.apps.api_client.lms_client import LmsApiClient, LmsUserApiClient
+from enterprise_access.apps.bffs.deadlines import call_in_worker_thread
+from enterprise_access.apps.bffs.profiling import record_cache_hit, record_cache_miss, record_upstream_call
 from enterprise_access.cache_utils import request_cache, versioned_cache_key
 
 logger = logging.getLogger(__name__)
@@ -22,6 +31,10 @@ def enterprise_customer_users_cache_key(username):
     return versioned_cache_key('get_subsidy_learners_aggregate_data', username)
 
 
+def prefetched_enterprise_customer_users_cache_key(username):
+    return versioned_cache_key('prefetched_enterprise_customer_users', username)
+
+
 def enterprise_customer_cache_key(enterprise_customer_slug, enterprise_customer_uuid):
     return versioned_cache_key('enterprise_customer', enterprise_customer_slug, enterprise_customer_uuid)
 
@@ -30,6 +43,10 @@ def secured_algolia_api_key_cache_key(enterprise_customer_uuid, request_user_id)
     return versioned_cache_key('secured_algolia_api_key', enterprise_customer_uuid, request_user_id)
 
 
+def secured_algolia_api_key_renewal_cache_key(enterprise_customer_uuid, request_user_id):
+    return versioned_cache_key('secured_algolia_api_key_renewal', enterprise_customer_uuid, request_user_id)
+
+
 def subscription_licenses_cache_key(enterprise_customer_uuid, lms_user_id):
     return versioned_cache_key('get_subscription_licenses_for_learner', enterprise_customer_uuid, lms_user_id)
 
@@ -46,6 +63,44 @@ def enterprise_course_enrollments_cache_key(enterprise_customer_uuid, lms_user_i
     return versioned_cache_key('get_enterprise_course_enrollments', enterprise_customer_uuid, lms_user_id)
 
 
+def pending_default_enterprise_enrollment_realizations_cache_key(enterprise_customer_uuid, lms_user_id):
+    return versioned_cache_key(
+        'pending_default_enterprise_enrollment_realizations',
+        enterprise_customer_uuid,
+        lms_user_id,
+    )
+
+
+def last_known_value_cache_key(cache_key):
+    return versioned_cache_key('last_known_value', cache_key)
+
+
+def set_last_known_value(cache_key, value, timeout=settings.BFF_LAST_KNOWN_VALUE_CACHE_TIMEOUT):
+    """
+    Stores a longer-lived copy of the value cached under ``cache_key``, to serve as
+    a fallback when loading a fresh value does not complete within its deadline.
+    """
+    TieredCache.set_all_tiers(last_known_value_cache_key(cache_key), value, timeout)
+
+
+def get_last_known_value(cache_key, default=None):
+    """
+    Returns the last-known value for ``cache_key``, or ``default`` if there is none.
+    """
+    cached_response = TieredCache.get_cached_response(last_known_value_cache_key(cache_key))
+    if cached_response.is_found:
+        return cached_response.value
+    return default
+
+
+def delete_last_known_value(cache_key):
+    """
+    Deletes the last-known value for ``cache_key``, so that a value which is known to be
+    stale is not served as a fallback.
+    """
+    TieredCache.delete_all_tiers(last_known_value_cache_key(cache_key))
+
+
 def get_and_cache_enterprise_customer_users(request, **kwargs):
     """
     Retrieves and caches enterprise learner data.
@@ -54,8 +109,22 @@ def get_and_cache_enterprise_customer_users(request, **kwargs):
     cache_key = enterprise_customer_users_cache_key(username)
     cached_response = request_cache(namespace=REQUEST_CACHE_NAMESPACE).get_cached_response(cache_key)
     if cached_response.is_found:
+        record_cache_hit()
         return cached_response.value
 
+    # Consume a value warmed by `prefetch_learner_portal_data`, if any. It is deleted on read so that
+    # only the first request after prefetching uses it, i.e. a stale active enterprise customer is never
+    # served beyond that first request.
+    prefetched_cache_key = prefetched_enterprise_customer_users_cache_key(username)
+    prefetched_response = TieredCache.get_cached_response(prefetched_cache_key)
+    if prefetched_response.is_found:
+        record_cache_hit()
+        TieredCache.delete_all_tiers(prefetched_cache_key)
+        request_cache(namespace=REQUEST_CACHE_NAMESPACE).set(cache_key, prefetched_response.value)
+        return prefetched_response.value
+    record_cache_miss()
+
+    record_upstream_call()
     client = LmsUserApiClient(request)
     response_payload = client.get_enterprise_customers_for_user(
         username=username,
@@ -80,8 +149,11 @@ def get_and_cache_enterprise_customer(
 
     cached_response = TieredCache.get_cached_response(cache_key)
     if cached_response.is_found:
+        record_cache_hit()
         return cached_response.value
+    record_cache_miss()
 
+    record_upstream_call()
     response_payload = LmsApiClient().get_enterprise_customer_data(
         enterprise_customer_uuid=enterprise_customer_uuid,
         enterprise_customer_slug=enterprise_customer_slug,
@@ -90,6 +162,97 @@ def get_and_cache_enterprise_customer(
     return response_payload
 
 
+def secured_algolia_api_key_expires_in(secured_algolia_api_key_response):
+    """
+    Returns the number of seconds until the secured algolia api key in the given response
+    expires, per its 'valid_until' field, or None if the response has no parseable 'valid_until'.
+    """
+    valid_until = (secured_algolia_api_key_response or {}).get('algolia', {}).get('valid_until')
+    if isinstance(valid_until, str):
+        valid_until = parse_datetime(valid_until)
+    if not valid_until:
+        return None
+    if timezone.is_naive(valid_until):
+        valid_until = timezone.make_aware(valid_until, datetime.timezone.utc)
+    return (valid_until - timezone.now()).total_seconds()
+
+
+def secured_algolia_api_key_cache_timeout(secured_algolia_api_key_response, default_timeout):
+    """
+    Returns how long the given secured algolia api key may be cached: until its 'valid_until',
+    less ``SECURED_ALGOLIA_API_KEY_EXPIRY_MARGIN``, so that an expired key is never served from
+    the cache. Falls back to ``default_timeout`` if the response has no 'valid_until'.
+    """
+    expires_in = secured_algolia_api_key_expires_in(secured_algolia_api_key_response)
+    if expires_in is None:
+        return default_timeout
+    return max(int(expires_in - settings.SECURED_ALGOLIA_API_KEY_EXPIRY_MARGIN), 0)
+
+
+def _fetch_and_cache_secured_algolia_search_keys(request, enterprise_customer_uuid, cache_key, timeout):
+    """
+    Fetches a new secured algolia api key for the request user and caches it until shortly before it expires.
+    """
+    record_upstream_call()
+    client = EnterpriseCatalogUserV1ApiClient(request)
+    response_payload = client.get_secured_algolia_api_key(
+        enterprise_customer_uuid=enterprise_customer_uuid,
+    )
+
+    cache_timeout = secured_algolia_api_key_cache_timeout(response_payload, timeout)
+    if cache_timeout > 0:
+        TieredCache.set_all_tiers(cache_key, response_payload, cache_timeout)
+    return response_payload
+
+
+def _renew_secured_algolia_search_keys(request, enterprise_customer_uuid, cache_key, timeout):
+    """
+    Replaces the cached secured algolia api key for the request user, logging (rather than
+    raising) any failure; the cached key remains usable until it expires.
+    """
+    try:
+        _fetch_and_cache_secured_algolia_search_keys(request, enterprise_customer_uuid, cache_key, timeout)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception(
+            'Error renewing secured algolia api key for request user %s and enterprise customer %s',
+            request.user.id,
+            enterprise_customer_uuid,
+        )
+
+
+def maybe_renew_secured_algolia_search_keys(request, enterprise_customer_uuid, cached_response_payload, timeout):
+    """
+    Renews a cached secured algolia api key in the background once its remaining cacheable
+    lifetime falls within ``SECURED_ALGOLIA_API_KEY_RENEWAL_WINDOW``, so that active learners
+    are handed a fresh key before the cached one expires, without blocking on its generation.
+
+    Returns:
+        Future: The renewal, if one was started by this call; otherwise None.
+    """
+    expires_in = secured_algolia_api_key_expires_in(cached_response_payload)
+    if expires_in is None:
+        return None
+    remaining = expires_in - settings.SECURED_ALGOLIA_API_KEY_EXPIRY_MARGIN
+    renewal_window = settings.SECURED_ALGOLIA_API_KEY_RENEWAL_WINDOW
+    if remaining > renewal_window:
+        return None
+
+    # Only one renewal per learner and enterprise customer is started per renewal window.
+    renewal_cache_key = secured_algolia_api_key_renewal_cache_key(enterprise_customer_uuid, request.user.id)
+    if not django_cache.add(renewal_cache_key, True, renewal_window):
+        return None
+
+    cache_key = secured_algolia_api_key_cache_key(enterprise_customer_uuid, request.user.id)
+    return get_prefetch_executor().submit(
+        call_in_worker_thread,
+        _renew_secured_algolia_search_keys,
+        DetachedRequest(request),
+        enterprise_customer_uuid,
+        cache_key,
+        timeout,
+    )
+
+
 def get_and_cache_secured_algolia_search_keys(
     request,
     enterprise_customer_uuid,
@@ -97,10 +260,9 @@ def get_and_cache_secured_algolia_search_keys(
 ):
     """
     Retrieves and caches secured algolia api key for a learner.
-    This function does not cache this data if cache time remaining
-    is within this endpoints response field: 'valid_until'
 
-    We parse the 'valid_until' field to compute a timeout value
+    The key is cached until its 'valid_until', less a safety margin, and renewed in the
+    background shortly before then. ``timeout`` is only used for keys without a 'valid_until'.
     """
     cache_key = secured_algolia_api_key_cache_key(
         enterprise_customer_uuid,
@@ -108,15 +270,12 @@ def get_and_cache_secured_algolia_search_keys(
     )
     cached_response = TieredCache.get_cached_response(cache_key)
     if cached_response.is_found:
+        record_cache_hit()
+        maybe_renew_secured_algolia_search_keys(request, enterprise_customer_uuid, cached_response.value, timeout)
         return cached_response.value
+    record_cache_miss()
 
-    client = EnterpriseCatalogUserV1ApiClient(request)
-    response_payload = client.get_secured_algolia_api_key(
-        enterprise_customer_uuid=enterprise_customer_uuid,
-    )
-
-    TieredCache.set_all_tiers(cache_key, response_payload, timeout)
-    return response_payload
+    return _fetch_and_cache_secured_algolia_search_keys(request, enterprise_customer_uuid, cache_key, timeout)
 
 
 def get_and_cache_subscription_licenses_for_learner(
@@ -131,14 +290,18 @@ def get_and_cache_subscription_licenses_for_learner(
     cache_key = subscription_licenses_cache_key(enterprise_customer_uuid, request.user.id)
     cached_response = TieredCache.get_cached_response(cache_key)
     if cached_response.is_found:
+        record_cache_hit()
         return cached_response.value
+    record_cache_miss()
 
+    record_upstream_call()
     client = LicenseManagerUserApiClient(request)
     response_payload = client.get_subscription_licenses_for_learner(
         enterprise_customer_uuid=enterprise_customer_uuid,
         **kwargs,
     )
     TieredCache.set_all_tiers(cache_key, response_payload, timeout)
+    set_last_known_value(cache_key, response_payload)
     return response_payload
 
 
@@ -158,8 +321,11 @@ def get_and_cache_default_enterprise_enrollment_intentions_learner_status(
     )
     cached_response = TieredCache.get_cached_response(cache_key)
     if cached_response.is_found:
+        record_cache_hit()
         return cached_response.value
+    record_cache_miss()
 
+    record_upstream_call()
     client = LmsUserApiClient(request)
     response_payload = client.get_default_enterprise_enrollment_intentions_learner_status(
         enterprise_customer_uuid=enterprise_customer_uuid,
@@ -172,6 +338,7 @@ def get_and_cache_default_enterprise_enrollment_intentions_learner_status(
             return response_payload
 
     TieredCache.set_all_tiers(cache_key, response_payload, timeout)
+    set_last_known_value(cache_key, response_payload)
     return response_payload
 
 
@@ -187,14 +354,18 @@ def get_and_cache_enterprise_course_enrollments(
     cache_key = enterprise_course_enrollments_cache_key(enterprise_customer_uuid, request.user.id)
     cached_response = TieredCache.get_cached_response(cache_key)
     if cached_response.is_found:
+        record_cache_hit()
         return cached_response.value
+    record_cache_miss()
 
+    record_upstream_call()
     client = LmsUserApiClient(request)
     response_payload = client.get_enterprise_course_enrollments(
         enterprise_customer_uuid=enterprise_customer_uuid,
         **kwargs,
     )
     TieredCache.set_all_tiers(cache_key, response_payload, timeout)
+    set_last_known_value(cache_key, response_payload)
     return response_payload
 
 
@@ -207,6 +378,7 @@ def invalidate_default_enterprise_enrollment_intentions_learner_status_cache(ent
         lms_user_id,
     )
     TieredCache.delete_all_tiers(cache_key)
+    delete_last_known_value(cache_key)
 
 
 def invalidate_enterprise_course_enrollments_cache(enterprise_customer_uuid, lms_user_id):
@@ -215,6 +387,7 @@ def invalidate_enterprise_course_enrollments_cache(enterprise_customer_uuid, lms
     """
     cache_key = enterprise_course_enrollments_cache_key(enterprise_customer_uuid, lms_user_id)
     TieredCache.delete_all_tiers(cache_key)
+    delete_last_known_value(cache_key)
 
 
 def invalidate_subscription_licenses_cache(enterprise_customer_uuid, lms_user_id):
@@ -223,6 +396,161 @@ def invalidate_subscription_licenses_cache(enterprise_customer_uuid, lms_user_id
     """
     cache_key = subscription_licenses_cache_key(enterprise_customer_uuid, lms_user_id)
     TieredCache.delete_all_tiers(cache_key)
+    delete_last_known_value(cache_key)
+
+
+def prefetch_enterprise_customer_users(request, timeout=settings.BFF_PREFETCH_CACHE_TIMEOUT, **kwargs):
+    """
+    Retrieves enterprise learner data and caches it for consumption by the
+    next call to `get_and_cache_enterprise_customer_users` for the request user.
+    """
+    username = request.user.username
+    client = LmsUserApiClient(request)
+    response_payload = client.get_enterprise_customers_for_user(
+        username=username,
+        **kwargs,
+    )
+    TieredCache.set_all_tiers(prefetched_enterprise_customer_users_cache_key(username), response_payload, timeout)
+    return response_payload
+
+
+class DetachedRequest:
+    """
+    The parts of a request needed by the user API clients, i.e. its user and the JWT
+    it was authenticated with, for use by pool threads after the request has completed.
+    """
+
+    def __init__(self, request):
+        self.user = request.user
+        self.headers = {}
+        if 'Authorization' in request.headers:
+            self.headers['Authorization'] = request.headers['Authorization']
+        self.COOKIES = {}  # pylint: disable=invalid-name
+        jwt_token = request.COOKIES.get(jwt_cookie_name())
+        if jwt_token is not None:
+            self.COOKIES[jwt_cookie_name()] = jwt_token
+
+
+@functools.cache
+def get_prefetch_executor():
+    """
+    Returns the (process-wide) thread pool used to run prefetch loaders in the background.
+    """
+    return ThreadPoolExecutor(
+        max_workers=settings.BFF_PREFETCH_MAX_WORKERS,
+        thread_name_prefix='bff-prefetch',
+    )
+
+
+def _run_prefetch_loader(loader_name, loader, request, enterprise_customer_uuid):
+    """
+    Runs a single prefetch loader, logging (rather than raising) any failure; the
+    corresponding BFF route simply falls back to loading the data itself.
+    """
+    try:
+        loader()
+    except Exception:  # pylint: disable=broad-except
+        logger.exception(
+            'Error prefetching %s for request user %s and enterprise customer %s',
+            loader_name,
+            request.user.id,
+            enterprise_customer_uuid,
+        )
+
+
+def prefetch_learner_portal_data(request, enterprise_customer_uuid):
+    """
+    Starts the cold, read-only loaders for the learner portal BFF routes in the background,
+    writing their results into the same cache keys the routes read from. Loaders with side
+    effects (e.g., license auto-apply and default enrollment realization) are left to the routes.
+
+    Returns:
+        dict: Mapping of loader name to the `Future` running it.
+    """
+    request = DetachedRequest(request)
+    loaders = {
+        'enterprise_customer_users': functools.partial(
+            prefetch_enterprise_customer_users,
+            request,
+            traverse_pagination=True,
+        ),
+        'secured_algolia_api_key': functools.partial(
+            get_and_cache_secured_algolia_search_keys,
+            request,
+            enterprise_customer_uuid,
+        ),
+        # The cache key is independent of these kwargs, so they must match those used by
+        # `BaseLearnerPortalHandler.load_subscription_licenses`.
+        'subscription_licenses': functools.partial(
+            get_and_cache_subscription_licenses_for_learner,
+            request,
+            enterprise_customer_uuid,
+            include_revoked=True,
+            current_plans_only=False,
+        ),
+        'default_enterprise_enrollment_intentions': functools.partial(
+            get_and_cache_default_enterprise_enrollment_intentions_learner_status,
+            request,
+            enterprise_customer_uuid,
+        ),
+    }
+    executor = get_prefetch_executor()
+    return {
+        loader_name: executor.submit(
+            call_in_worker_thread, _run_prefetch_loader, loader_name, loader, request, enterprise_customer_uuid,
+        )
+        for loader_name, loader in loaders.items()
+    }
+
+
+def get_pending_default_enterprise_enrollment_realizations(enterprise_customer_uuid, lms_user_id):
+    """
+    Returns the license uuids by course run key of default enterprise enrollment intentions
+    whose asynchronous realization is pending for a learner, or None.
+    """
+    cache_key = pending_default_enterprise_enrollment_realizations_cache_key(enterprise_customer_uuid, lms_user_id)
+    cached_response = TieredCache.get_cached_response(cache_key)
+    if cached_response.is_found:
+        return cached_response.value
+    return None
+
+
+def set_pending_default_enterprise_enrollment_realizations(
+    enterprise_customer_uuid,
+    lms_user_id,
+    license_uuids_by_course_run_key,
+    timeout=settings.PENDING_DEFAULT_ENTERPRISE_ENROLLMENT_REALIZATIONS_TIMEOUT,
+):
+    """
+    Marks the realization of default enterprise enrollment intentions as pending for a learner, so
+    that consecutive requests don't enqueue it again. The marker expires on its own should the
+    realization never complete.
+    """
+    cache_key = pending_default_enterprise_enrollment_realizations_cache_key(enterprise_customer_uuid, lms_user_id)
+    TieredCache.set_all_tiers(cache_key, license_uuids_by_course_run_key, timeout)
+
+
+def invalidate_pending_default_enterprise_enrollment_realizations(enterprise_customer_uuid, lms_user_id):
+    """
+    Clears the pending realization marker of default enterprise enrollment intentions for a learner.
+    """
+    cache_key = pending_default_enterprise_enrollment_realizations_cache_key(enterprise_customer_uuid, lms_user_id)
+    TieredCache.delete_all_tiers(cache_key)
+
+
+def build_default_enterprise_enrollment_realizations_payload(lms_user_id, license_uuids_by_course_run_key):
+    """
+    Builds the LMS bulk enrollment payload to realize default enterprise enrollment intentions.
+    """
+    return [
+        {
+            'user_id': lms_user_id,
+            'course_run_key': course_run_key,
+            'license_uuid': license_uuid,
+            'is_default_auto_enrollment': True,
+        }
+        for course_run_key, license_uuid in license_uuids_by_course_run_key.items()
+    ]
 
 
 def _get_active_enterprise_customer(enterprise_customer_users):
@@ -26,7 +26,7 @@ from enterprise_access.apps.customer_billing.embargo import get_embargoed_countr
 from enterprise_access.apps.customer_billing.models import CheckoutIntent
 from enterprise_access.apps.customer_billing.pricing_api import get_ssp_product_pricing
 from enterprise_access.apps.customer_billing.stripe_api import (
-    get_stripe_checkout_session,
+    get_stripe_checkout_session_details,
     get_stripe_customer,
     get_stripe_invoice,
     get_stripe_payment_intent,
@@ -345,7 +345,8 @@ class CheckoutSuccessHandler(CheckoutContextHandler):
             return
 
         try:
-            session = get_stripe_checkout_session(session_id)
+            # The related objects are expanded, so the page is usually built from this one request.
+            session = get_stripe_checkout_session_details(session_id)
         except stripe.StripeError:
             logger.exception("Error retrieving Stripe checkout session: %s", session_id)
             return
@@ -364,14 +365,13 @@ class CheckoutSuccessHandler(CheckoutContextHandler):
         # THIS IS THE SIDE-EFFECT INITIALIZATION
         checkout_intent_data['first_billable_invoice'] = first_billable_invoice
 
-        payment_method = self._get_payment_method(session)
+        subscription = self._get_related_object(session, 'subscription', get_stripe_subscription)
+
+        payment_method = self._get_payment_method(session, subscription)
         if payment_method:
             first_billable_invoice.update(self._get_card_billing_details(payment_method))
 
-        invoice_id = session.get('invoice')
-        subscription_id = session.get('subscription')
-
-        invoice = self._get_invoice_record(invoice_id, subscription_id)
+        invoice = self._get_invoice_record(session, subscription)
         if not invoice:
             return
 
@@ -388,35 +388,40 @@ class CheckoutSuccessHandler(CheckoutContextHandler):
         first_billable_invoice.update(self._get_customer_info(invoice))
 
     @staticmethod
-    def _get_payment_method(session):
+    def _get_related_object(stripe_object, field, getter):
+        """
+        Helper to get the Stripe object related to ``stripe_object`` by ``field``. The related object
+        is used as-is when it was expanded, otherwise it's retrieved by its id with ``getter``.
+        """
+        related = stripe_object.get(field)
+        if not related or not isinstance(related, str):
+            return related or None
+        try:
+            return getter(related)
+        except stripe.StripeError:
+            logger.exception("Error retrieving Stripe %s: %s", field, related)
+            return None
+
+    @classmethod
+    def _get_payment_method(cls, session, subscription):
         """ Helper to fetch payment method record from Stripe. """
-        payment_method_id = None
+        payment_method = None
 
         # Try payment intent first (for paid subscriptions)
-        if payment_intent_id := session.get('payment_intent'):
-            try:
-                payment_intent = get_stripe_payment_intent(payment_intent_id)
-                payment_method_id = payment_intent.get('payment_method')
-            except stripe.StripeError:
-                logger.exception("Error retrieving Stripe payment intent: %s", payment_intent_id)
+        if payment_intent := cls._get_related_object(session, 'payment_intent', get_stripe_payment_intent):
+            payment_method = cls._get_related_object(payment_intent, 'payment_method', get_stripe_payment_method)
 
         # If no payment method yet, try subscription (for trial subscriptions)
-        if not payment_method_id and (subscription_id := session.get('subscription')):
-            try:
-                subscription = get_stripe_subscription(subscription_id)
-                payment_method_id = subscription.get('default_payment_method')
-            except stripe.StripeError:
-                logger.exception("Error retrieving Stripe subscription: %s", subscription_id)
-
-        if not payment_method_id:
+        if not payment_method and subscription:
+            payment_method = cls._get_related_object(
+                subscription, 'default_payment_method', get_stripe_payment_method,
+            )
+
+        if not payment_method:
             logger.warning('No payment method found on stripe session %s', session.get('id'))
             return None
 
-        try:
-            return get_stripe_payment_method(payment_method_id)
-        except stripe.StripeError:
-            logger.exception("Error retrieving Stripe payment method: %s", payment_method_id)
-            return None
+        return payment_method
 
     @staticmethod
     def _get_card_billing_details(payment_method):
@@ -429,29 +434,27 @@ class CheckoutSuccessHandler(CheckoutContextHandler):
             result['billing_address'] = billing_details.get('address')
         return result
 
-    @staticmethod
-    def _get_invoice_record(invoice_id, subscription_id):
+    @classmethod
+    def _get_invoice_record(cls, session, subscription):
         """ Helper to fetch invoice record via Stripe API. """
-        if not invoice_id and subscription_id:
-            # If there's no invoice directly on the session, try to get it from the subscription
-            try:
-                subscription = get_stripe_subscription(subscription_id)
-                invoice_id = subscription.get('latest_invoice')
-            except stripe.StripeError:
-                logger.exception("Error retrieving Stripe subscription: %s", subscription_id)
-                return None
-
-        if not invoice_id:
-            logger.warning(
-                'Could not find invoice in Stripe subscription %s', subscription_id,
-            )
-            return None
+        if invoice := cls._get_related_object(session, 'invoice', get_stripe_invoice):
+            return invoice
 
-        try:
-            return get_stripe_invoice(invoice_id)
-        except stripe.StripeError:
-            logger.exception("Error retrieving Stripe invoice: %s", invoice_id)
-            return None
+        # If there's no invoice directly on the session, try to get it from the subscription
+        if subscription and (invoice := cls._get_related_object(subscription, 'latest_invoice', get_stripe_invoice)):
+            return invoice
+
+        logger.warning(
+            'Could not find invoice in Stripe subscription %s', cls._get_id(session.get('subscription')),
+        )
+        return None
+
+    @staticmethod
+    def _get_id(stripe_object_or_id):
+        """ Helper to get the id of a Stripe object that may or may not be expanded. """
+        if isinstance(stripe_object_or_id, str) or stripe_object_or_id is None:
+            return stripe_object_or_id
+        return stripe_object_or_id.get('id')
 
     @staticmethod
     def _get_subscription_item(invoice):
@@ -477,20 +480,17 @@ class CheckoutSuccessHandler(CheckoutContextHandler):
                 result['end_time'] = datetime.fromtimestamp(end_timestamp).replace(tzinfo=UTC)
         return result
 
-    @staticmethod
-    def _get_customer_info(invoice):
+    @classmethod
+    def _get_customer_info(cls, invoice):
         """ Helper to get dict of customer info from an invoice. """
         result = {}
-        if not (customer_id := invoice.get('customer')):
+        if not invoice.get('customer'):
             logger.warning('No customer available on invoice %s', invoice.get('id'))
             return result
 
-        try:
-            customer = get_stripe_customer(customer_id)
+        if customer := cls._get_related_object(invoice, 'customer', get_stripe_customer):
             result['customer_name'] = customer.get('name')
             result['customer_phone'] = customer.get('phone')
-        except stripe.StripeError:
-            logger.exception("Error retrieving Stripe customer: %s", customer_id)
 
         if customer_address := invoice.get('customer_address'):
             logger.info(
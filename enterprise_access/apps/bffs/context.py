@@ -13,6 +13,8 @@ from enterprise_access.apps.bffs.api import (
     transform_enterprise_customer_users_data,
     transform_secured_algolia_api_key_response
 )
+from enterprise_access.apps.bffs.deadlines import RequestDeadline
+from enterprise_access.apps.bffs.profiling import profiled_stage
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +31,7 @@ class BaseHandlerContext:
         errors: A list to store errors that occur during request processing.
         warnings: A list to store warnings that occur during the request processing.
         status_code: The HTTP status code to return in the response.
+        deadline: The deadline bounding how long loaders may wait on upstream services.
     """
 
     def __init__(self, request):
@@ -38,6 +41,7 @@ class BaseHandlerContext:
             request: The incoming HTTP request.
         """
         self._request = request
+        self._deadline = RequestDeadline.from_settings()
         self._status_code = status.HTTP_200_OK
         self._errors = []  # Stores any errors that occur during processing
         self._warnings = []  # Stores any warnings that occur during processing
@@ -51,6 +55,10 @@ class BaseHandlerContext:
     def user(self):
         return self._request.user
 
+    @property
+    def deadline(self):
+        return self._deadline
+
     @property
     def status_code(self):
         return self._status_code
@@ -322,6 +330,7 @@ class HandlerContext(BaseHandlerContext):
             )
             return
 
+    @profiled_stage('initialize_enterprise_customer_users')
     def _initialize_enterprise_customer_users(self):
         """
         Initializes the enterprise customer users for the request user.
@@ -364,6 +373,7 @@ class HandlerContext(BaseHandlerContext):
             )
         })
 
+    @profiled_stage('initialize_secured_algolia_api_keys')
     def _initialize_secured_algolia_api_keys(self):
         """
         Initializes the secured algolia api key for the request user.
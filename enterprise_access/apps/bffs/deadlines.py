@@ -0,0 +1,117 @@
+"""
+Deadlines for BFF loaders that call upstream services.
+
+Each loader may be given its own deadline (``BFF_LOADER_DEADLINES``), and the request as a whole may be
+given an overall deadline (``BFF_REQUEST_DEADLINE``). A loader is allowed to run for the lesser of its own
+deadline and the time remaining in the request. A loader that exceeds its deadline keeps running in the
+background (so it still warms its cache for subsequent requests), while the handler falls back to a
+last-known or empty value.
+"""
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+from django.db import connections
+from edx_django_utils.cache import RequestCache
+
+from enterprise_access.apps.bffs.profiling import get_active_profile, set_active_profile
+
+
+class LoaderDeadlineExceeded(Exception):
+    """
+    Raised when a BFF loader does not complete within its deadline.
+    """
+
+    def __init__(self, loader_name, timeout):
+        self.loader_name = loader_name
+        self.timeout = timeout
+        super().__init__(f'Loader {loader_name} did not complete within {timeout:.2f}s')
+
+
+class RequestDeadline:
+    """
+    Tracks the overall deadline of a BFF request and derives per-loader timeouts from it.
+    """
+
+    def __init__(self, budget_seconds=None, loader_deadlines=None):
+        """
+        Args:
+            budget_seconds (float): The overall budget for the request, or None for no overall deadline.
+            loader_deadlines (dict): Mapping of loader name to its own deadline, in seconds.
+        """
+        self.loader_deadlines = loader_deadlines or {}
+        self.expires_at = time.monotonic() + budget_seconds if budget_seconds is not None else None
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            budget_seconds=getattr(settings, 'BFF_REQUEST_DEADLINE', None),
+            loader_deadlines=getattr(settings, 'BFF_LOADER_DEADLINES', {}),
+        )
+
+    def remaining(self):
+        """
+        Returns the seconds remaining before the request deadline, or None if there is no request deadline.
+        """
+        if self.expires_at is None:
+            return None
+        return max(self.expires_at - time.monotonic(), 0)
+
+    def timeout_for(self, loader_name):
+        """
+        Returns the timeout (in seconds) for the given loader, or None if it is unbounded.
+        """
+        timeouts = [
+            timeout
+            for timeout in (self.loader_deadlines.get(loader_name), self.remaining())
+            if timeout is not None
+        ]
+        return min(timeouts) if timeouts else None
+
+
+@functools.cache
+def get_loader_executor():
+    """
+    Returns the (process-wide) thread pool used to run loaders that are subject to a deadline.
+    """
+    return ThreadPoolExecutor(
+        max_workers=settings.BFF_LOADER_MAX_WORKERS,
+        thread_name_prefix='bff-loader',
+    )
+
+
+def call_in_worker_thread(func, *args, profile=None, **kwargs):
+    """
+    Calls ``func`` from a thread of a process-wide pool, within the given BFF profile (if any).
+
+    Unlike those of request threads, the request cache and database connections of pool threads are
+    never cleared or closed by Django itself, so they are cleared and closed around each call; otherwise
+    values cached in a pool thread's request cache would be served by it indefinitely.
+    """
+    RequestCache.clear_all_namespaces()
+    if profile is not None:
+        set_active_profile(profile)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        RequestCache.clear_all_namespaces()
+        connections.close_all()
+
+
+def run_with_deadline(loader_name, loader, timeout):
+    """
+    Runs ``loader`` and returns its result, raising ``LoaderDeadlineExceeded`` if it does not complete
+    within ``timeout`` seconds. Loaders without a timeout run inline in the calling thread.
+    """
+    if timeout is None:
+        return loader()
+    if timeout <= 0:
+        raise LoaderDeadlineExceeded(loader_name, timeout)
+
+    future = get_loader_executor().submit(call_in_worker_thread, loader, profile=get_active_profile())
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError as exc:
+        raise LoaderDeadlineExceeded(loader_name, timeout) from exc
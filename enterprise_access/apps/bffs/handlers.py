@@ -1,22 +1,35 @@
 """"
 Handlers for bffs app.
 """
+import functools
 import json
 import logging
 
+from django.conf import settings
+
 from enterprise_access.apps.api_client.constants import LicenseStatuses
 from enterprise_access.apps.api_client.license_manager_client import LicenseManagerUserApiClient
 from enterprise_access.apps.api_client.lms_client import LmsApiClient
 from enterprise_access.apps.bffs.api import (
+    build_default_enterprise_enrollment_realizations_payload,
+    default_enterprise_enrollment_intentions_learner_status_cache_key,
     get_and_cache_default_enterprise_enrollment_intentions_learner_status,
     get_and_cache_subscription_licenses_for_learner,
+    get_last_known_value,
+    get_pending_default_enterprise_enrollment_realizations,
     invalidate_default_enterprise_enrollment_intentions_learner_status_cache,
     invalidate_enterprise_course_enrollments_cache,
-    invalidate_subscription_licenses_cache
+    invalidate_pending_default_enterprise_enrollment_realizations,
+    invalidate_subscription_licenses_cache,
+    set_pending_default_enterprise_enrollment_realizations,
+    subscription_licenses_cache_key
 )
 from enterprise_access.apps.bffs.context import BaseHandlerContext, HandlerContext
+from enterprise_access.apps.bffs.deadlines import LoaderDeadlineExceeded, run_with_deadline
 from enterprise_access.apps.bffs.mixins import BaseLearnerDataMixin, LearnerDashboardDataMixin
+from enterprise_access.apps.bffs.profiling import profiled_stage, record_upstream_call
 from enterprise_access.apps.bffs.serializers import EnterpriseCustomerUserSubsidiesSerializer
+from enterprise_access.apps.bffs.tasks import realize_default_enterprise_enrollment_intentions_task
 
 logger = logging.getLogger(__name__)
 
@@ -63,6 +76,33 @@ class BaseHandler:
             developer_message=developer_message,
         )
 
+    def load_with_deadline(self, loader_name, loader, fallback_cache_key, default):
+        """
+        Runs the loader within its deadline (see `bffs.deadlines`). If the deadline is exceeded, returns the
+        last-known value cached under `fallback_cache_key` (or `default`) and adds a warning to the context.
+        """
+        timeout = self.context.deadline.timeout_for(loader_name)
+        try:
+            return run_with_deadline(loader_name, loader, timeout)
+        except LoaderDeadlineExceeded as exc:
+            fallback_value = get_last_known_value(fallback_cache_key)
+            fallback_source = 'last-known value' if fallback_value is not None else 'empty default'
+            logger.warning(
+                'BFF loader %s exceeded its %.2fs deadline for request user %s; using the %s.',
+                loader_name,
+                exc.timeout,
+                getattr(self.context, 'lms_user_id', None),
+                fallback_source,
+            )
+            self.add_warning(
+                user_message='Some data may be out of date or unavailable.',
+                developer_message=(
+                    f'[{loader_name}] Loader exceeded its {exc.timeout:.2f}s deadline; '
+                    f'using the {fallback_source}.'
+                ),
+            )
+            return fallback_value if fallback_value is not None else default
+
 
 class BaseLearnerPortalHandler(BaseHandler, BaseLearnerDataMixin):
     """
@@ -225,11 +265,20 @@ class BaseLearnerPortalHandler(BaseHandler, BaseLearnerDataMixin):
         Load subscription licenses for the learner.
         """
         try:
-            subscriptions_result = get_and_cache_subscription_licenses_for_learner(
-                request=self.context.request,
-                enterprise_customer_uuid=self.context.enterprise_customer_uuid,
-                include_revoked=True,
-                current_plans_only=False,
+            subscriptions_result = self.load_with_deadline(
+                'subscription_licenses',
+                functools.partial(
+                    get_and_cache_subscription_licenses_for_learner,
+                    request=self.context.request,
+                    enterprise_customer_uuid=self.context.enterprise_customer_uuid,
+                    include_revoked=True,
+                    current_plans_only=False,
+                ),
+                fallback_cache_key=subscription_licenses_cache_key(
+                    self.context.enterprise_customer_uuid,
+                    self.context.user.id,
+                ),
+                default={'customer_agreement': None, 'results': []},
             )
         except Exception as exc:  # pylint: disable=broad-exception-caught
             logger.exception(
@@ -388,6 +437,7 @@ class BaseLearnerPortalHandler(BaseHandler, BaseLearnerDataMixin):
         # Check if the user should be auto-applied a license
         self.check_and_auto_apply_license()
 
+    @profiled_stage('load_and_process_subscription_licenses')
     def load_and_process_subscription_licenses(self):
         """
         Helper to load subscription licenses into the context then processes them
@@ -399,6 +449,7 @@ class BaseLearnerPortalHandler(BaseHandler, BaseLearnerDataMixin):
         self.load_subscription_licenses()
         self.process_subscription_licenses()
 
+    @profiled_stage('check_and_activate_assigned_license')
     def check_and_activate_assigned_license(self):
         """
         Check if there are assigned licenses that need to be activated.
@@ -410,6 +461,7 @@ class BaseLearnerPortalHandler(BaseHandler, BaseLearnerDataMixin):
             if activation_key:
                 try:
                     # Perform side effect: Activate the assigned license
+                    record_upstream_call()
                     activated_license = self.license_manager_user_api_client.activate_license(activation_key)
 
                     # Invalidate the subscription licenses cache as the cached data changed
@@ -481,6 +533,7 @@ class BaseLearnerPortalHandler(BaseHandler, BaseLearnerDataMixin):
             'subscription_plan': subscription_plan,
         })
 
+    @profiled_stage('check_and_auto_apply_license')
     def check_and_auto_apply_license(self):
         """
         Check if auto-apply licenses are available and apply them to the user.
@@ -510,6 +563,7 @@ class BaseLearnerPortalHandler(BaseHandler, BaseLearnerDataMixin):
 
         try:
             # Perform side effect: Auto-apply license
+            record_upstream_call()
             auto_applied_license = self.license_manager_user_api_client.auto_apply_license(
                 customer_agreement.get('uuid')
             )
@@ -543,6 +597,7 @@ class BaseLearnerPortalHandler(BaseHandler, BaseLearnerDataMixin):
                 )
             )
 
+    @profiled_stage('load_default_enterprise_enrollment_intentions')
     def load_default_enterprise_enrollment_intentions(self):
         """
         Load default enterprise course enrollments (stubbed)
@@ -559,11 +614,19 @@ class BaseLearnerPortalHandler(BaseHandler, BaseLearnerDataMixin):
             return
 
         try:
-            default_enterprise_enrollment_intentions =\
-                get_and_cache_default_enterprise_enrollment_intentions_learner_status(
+            default_enterprise_enrollment_intentions = self.load_with_deadline(
+                'default_enterprise_enrollment_intentions',
+                functools.partial(
+                    get_and_cache_default_enterprise_enrollment_intentions_learner_status,
                     request=self.context.request,
                     enterprise_customer_uuid=self.context.enterprise_customer_uuid,
-                )
+                ),
+                fallback_cache_key=default_enterprise_enrollment_intentions_learner_status_cache_key(
+                    self.context.enterprise_customer_uuid,
+                    self.context.user.id,
+                ),
+                default={},
+            )
             self.context.data['default_enterprise_enrollment_intentions'] = default_enterprise_enrollment_intentions
         except Exception as e:  # pylint: disable=broad-exception-caught
             logger.exception(
@@ -576,6 +639,7 @@ class BaseLearnerPortalHandler(BaseHandler, BaseLearnerDataMixin):
                 developer_message=f"Could not load default enterprise enrollment intentions. Error: {e}",
             )
 
+    @profiled_stage('enroll_in_redeemable_default_enterprise_enrollment_intentions')
     def enroll_in_redeemable_default_enterprise_enrollment_intentions(self):
         """
         Enroll in redeemable courses.
@@ -615,6 +679,11 @@ class BaseLearnerPortalHandler(BaseHandler, BaseLearnerDataMixin):
                 course_run_key = enrollment_intention['course_run_key']
                 license_uuids_by_course_run_key[course_run_key] = self.current_activated_license['uuid']
 
+        is_async_realization_enabled = settings.ENABLE_ASYNC_DEFAULT_ENTERPRISE_ENROLLMENT_REALIZATION
+        if is_async_realization_enabled and license_uuids_by_course_run_key:
+            if self._enqueue_default_enrollment_realizations(license_uuids_by_course_run_key):
+                return
+
         response_payload = self._request_default_enrollment_realizations(license_uuids_by_course_run_key)
 
         if failures := response_payload.get('failures'):
@@ -654,16 +723,13 @@ class BaseLearnerPortalHandler(BaseHandler, BaseLearnerDataMixin):
         Sends the request to bulk enroll into default enrollment intentions via the LMS
         API client.
         """
-        bulk_enrollment_payload = []
-        for course_run_key, license_uuid in license_uuids_by_course_run_key.items():
-            bulk_enrollment_payload.append({
-                'user_id': self.context.lms_user_id,
-                'course_run_key': course_run_key,
-                'license_uuid': license_uuid,
-                'is_default_auto_enrollment': True,
-            })
+        bulk_enrollment_payload = build_default_enterprise_enrollment_realizations_payload(
+            self.context.lms_user_id,
+            license_uuids_by_course_run_key,
+        )
 
         try:
+            record_upstream_call()
             response_payload = self.lms_api_client.bulk_enroll_enterprise_learners(
                 self.context.enterprise_customer_uuid,
                 bulk_enrollment_payload,
@@ -678,6 +744,54 @@ class BaseLearnerPortalHandler(BaseHandler, BaseLearnerDataMixin):
 
         return response_payload
 
+    def _enqueue_default_enrollment_realizations(self, license_uuids_by_course_run_key):
+        """
+        Enqueues the realization of default enrollment intentions, unless one is already pending for the
+        request user, and reports the realizations as pending in the context.
+
+        Returns:
+            bool: False if the realization could not be enqueued, in which case the caller should realize
+            the default enrollment intentions synchronously instead.
+        """
+        pending_license_uuids_by_course_run_key = get_pending_default_enterprise_enrollment_realizations(
+            enterprise_customer_uuid=self.context.enterprise_customer_uuid,
+            lms_user_id=self.context.lms_user_id,
+        )
+        if pending_license_uuids_by_course_run_key is None:
+            try:
+                set_pending_default_enterprise_enrollment_realizations(
+                    enterprise_customer_uuid=self.context.enterprise_customer_uuid,
+                    lms_user_id=self.context.lms_user_id,
+                    license_uuids_by_course_run_key=license_uuids_by_course_run_key,
+                )
+                realize_default_enterprise_enrollment_intentions_task.delay(
+                    enterprise_customer_uuid=str(self.context.enterprise_customer_uuid),
+                    lms_user_id=self.context.lms_user_id,
+                    license_uuids_by_course_run_key=license_uuids_by_course_run_key,
+                )
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception(
+                    'Error enqueueing realization of default enterprise enrollment intentions for request user %s '
+                    'and enterprise customer %s. Realizing them synchronously instead.',
+                    self.context.lms_user_id,
+                    self.context.enterprise_customer_uuid,
+                )
+                invalidate_pending_default_enterprise_enrollment_realizations(
+                    enterprise_customer_uuid=self.context.enterprise_customer_uuid,
+                    lms_user_id=self.context.lms_user_id,
+                )
+                return False
+            pending_license_uuids_by_course_run_key = license_uuids_by_course_run_key
+
+        realizations = self.context.data.setdefault('default_enterprise_enrollment_realizations', [])
+        for course_run_key, license_uuid in pending_license_uuids_by_course_run_key.items():
+            realizations.append({
+                'course_key': course_run_key,
+                'enrollment_status': 'pending',
+                'subscription_license_uuid': license_uuid,
+            })
+        return True
+
     def invalidate_default_enrollment_intentions_cache(self):
         invalidate_default_enterprise_enrollment_intentions_learner_status_cache(
             enterprise_customer_uuid=self.context.enterprise_customer_uuid,
@@ -2,10 +2,15 @@
 Mixins for accessing `HandlerContext` data for bffs app
 """
 
+import functools
 import logging
 
-from enterprise_access.apps.bffs.api import get_and_cache_enterprise_course_enrollments
+from enterprise_access.apps.bffs.api import (
+    enterprise_course_enrollments_cache_key,
+    get_and_cache_enterprise_course_enrollments
+)
 from enterprise_access.apps.bffs.constants import COURSE_ENROLLMENT_STATUSES, UNENROLLABLE_COURSE_STATUSES
+from enterprise_access.apps.bffs.profiling import profiled_stage
 
 logger = logging.getLogger(__name__)
 
@@ -111,6 +116,13 @@ class BaseLearnerDataMixin(LearnerSubsidiesDataMixin, BFFContextDataMixin):
         """
         return self.context.data.get('default_enterprise_enrollment_intentions', {})
 
+    @property
+    def default_enterprise_enrollment_realizations(self):
+        """
+        Get the realizations (enrolled or pending) of default enterprise enrollment intentions from the context.
+        """
+        return self.context.data.get('default_enterprise_enrollment_realizations', [])
+
 
 class EnterpriseCourseEnrollmentsDataMixin(BaseLearnerDataMixin):
     """
@@ -131,6 +143,7 @@ class EnterpriseCourseEnrollmentsDataMixin(BaseLearnerDataMixin):
         """
         return self.context.data.get('all_enrollments_by_status', {})
 
+    @profiled_stage('load_enterprise_course_enrollments')
     def load_enterprise_course_enrollments(self):
         """
         Loads enterprise course enrollments data.
@@ -148,10 +161,19 @@ class EnterpriseCourseEnrollmentsDataMixin(BaseLearnerDataMixin):
             return
 
         try:
-            enterprise_course_enrollments = get_and_cache_enterprise_course_enrollments(
-                request=self.context.request,
-                enterprise_customer_uuid=self.context.enterprise_customer_uuid,
-                is_active=True,
+            enterprise_course_enrollments = self.load_with_deadline(
+                'enterprise_course_enrollments',
+                functools.partial(
+                    get_and_cache_enterprise_course_enrollments,
+                    request=self.context.request,
+                    enterprise_customer_uuid=self.context.enterprise_customer_uuid,
+                    is_active=True,
+                ),
+                fallback_cache_key=enterprise_course_enrollments_cache_key(
+                    self.context.enterprise_customer_uuid,
+                    self.context.user.id,
+                ),
+                default=[],
             )
         except Exception as exc:  # pylint: disable=broad-exception-caught
             logger.exception("Error retrieving enterprise course enrollments")
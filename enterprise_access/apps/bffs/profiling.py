@@ -0,0 +1,222 @@
+"""
+Stage-level profiling for BFF routes.
+
+A ``BFFRequestProfile`` is activated for the duration of a BFF request by the BFF viewsets. Handlers,
+response builders, and the ``bffs.api`` module record timings, upstream calls, and cache hits/misses
+into whichever profile is active for the current request. When no profile is active (e.g., a handler
+used outside of a BFF view), recording is a no-op.
+"""
+import functools
+import logging
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from edx_django_utils.monitoring import set_custom_attribute
+
+from enterprise_access.cache_utils import request_cache
+
+logger = logging.getLogger(__name__)
+
+PROFILING_REQUEST_CACHE_NAMESPACE = 'bff_profiling'
+ACTIVE_PROFILE_CACHE_KEY = 'active_profile'
+
+MONITORING_ATTRIBUTE_PREFIX = 'bff'
+SERVER_TIMING_HEADER = 'Server-Timing'
+
+
+class StageMetrics:
+    """
+    Timing and upstream/cache counters for a single named stage of a BFF request.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.duration_ms = 0.0
+        self.upstream_calls = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+
+class BFFRequestProfile:
+    """
+    Collects per-stage metrics for a single BFF request.
+
+    Stages may be nested; durations and counters are inclusive, i.e. an upstream call made
+    while a nested stage is open is counted against the nested stage and every enclosing stage.
+    """
+
+    def __init__(self, route):
+        self.route = route
+        self.stages = {}
+        self.total_duration_ms = None
+        self._open_stages = []
+        self._started_at = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Times the wrapped block as the stage ``name``. Re-entering a stage accumulates its metrics.
+        """
+        if name not in self.stages:
+            self.stages[name] = StageMetrics(name)
+        metrics = self.stages[name]
+        self._open_stages.append(metrics)
+        started_at = time.perf_counter()
+        try:
+            yield metrics
+        finally:
+            metrics.duration_ms += (time.perf_counter() - started_at) * 1000
+            self._open_stages.pop()
+
+    def record_upstream_call(self):
+        for metrics in self._open_stages:
+            metrics.upstream_calls += 1
+
+    def record_cache_hit(self):
+        for metrics in self._open_stages:
+            metrics.cache_hits += 1
+
+    def record_cache_miss(self):
+        for metrics in self._open_stages:
+            metrics.cache_misses += 1
+
+    def finish(self):
+        """
+        Marks the end of the request and computes its total duration.
+        """
+        if self.total_duration_ms is None:
+            self.total_duration_ms = (time.perf_counter() - self._started_at) * 1000
+        return self.total_duration_ms
+
+    @property
+    def latency_budget_ms(self):
+        """
+        The configured latency budget for this route, if any.
+        """
+        return getattr(settings, 'BFF_ROUTE_LATENCY_BUDGETS_MS', {}).get(self.route)
+
+    @property
+    def is_over_budget(self):
+        budget = self.latency_budget_ms
+        return budget is not None and self.finish() > budget
+
+    def emit_monitoring_attributes(self):
+        """
+        Emits the route total and per-stage metrics as custom monitoring attributes.
+        """
+        total_duration_ms = self.finish()
+        set_custom_attribute(f'{MONITORING_ATTRIBUTE_PREFIX}_route', self.route)
+        set_custom_attribute(f'{MONITORING_ATTRIBUTE_PREFIX}_total_ms', round(total_duration_ms, 1))
+        for metrics in self.stages.values():
+            prefix = f'{MONITORING_ATTRIBUTE_PREFIX}_stage.{metrics.name}'
+            set_custom_attribute(f'{prefix}.duration_ms', round(metrics.duration_ms, 1))
+            set_custom_attribute(f'{prefix}.upstream_calls', metrics.upstream_calls)
+            set_custom_attribute(f'{prefix}.cache_hits', metrics.cache_hits)
+            set_custom_attribute(f'{prefix}.cache_misses', metrics.cache_misses)
+
+        budget = self.latency_budget_ms
+        if budget is None:
+            return
+        set_custom_attribute(f'{MONITORING_ATTRIBUTE_PREFIX}_latency_budget_ms', budget)
+        set_custom_attribute(f'{MONITORING_ATTRIBUTE_PREFIX}_over_latency_budget', self.is_over_budget)
+        if self.is_over_budget:
+            logger.warning(
+                'BFF route %s took %.1fms, exceeding its latency budget of %sms. Stage durations: %s',
+                self.route,
+                total_duration_ms,
+                budget,
+                {name: round(metrics.duration_ms, 1) for name, metrics in self.stages.items()},
+            )
+
+    def server_timing_header_value(self):
+        """
+        Formats the stage durations as a ``Server-Timing`` header value.
+        """
+        entries = [
+            f'{metrics.name};dur={metrics.duration_ms:.1f}'
+            for metrics in self.stages.values()
+        ]
+        entries.append(f'total;dur={self.finish():.1f}')
+        return ', '.join(entries)
+
+
+def activate_profile(route):
+    """
+    Creates a new profile for the given route and makes it the active profile for the current request.
+    """
+    profile = BFFRequestProfile(route)
+    set_active_profile(profile)
+    return profile
+
+
+def set_active_profile(profile):
+    """
+    Makes the given profile the active profile for the current thread, e.g. a worker thread running a loader.
+    """
+    request_cache(namespace=PROFILING_REQUEST_CACHE_NAMESPACE).set(ACTIVE_PROFILE_CACHE_KEY, profile)
+
+
+def get_active_profile():
+    """
+    Returns the active profile for the current request, or None.
+    """
+    cached_response = request_cache(namespace=PROFILING_REQUEST_CACHE_NAMESPACE).get_cached_response(
+        ACTIVE_PROFILE_CACHE_KEY,
+    )
+    return cached_response.value if cached_response.is_found else None
+
+
+def deactivate_profile():
+    request_cache(namespace=PROFILING_REQUEST_CACHE_NAMESPACE).delete(ACTIVE_PROFILE_CACHE_KEY)
+
+
+@contextmanager
+def profile_stage(name):
+    """
+    Times the wrapped block as the stage ``name`` of the active profile, if any.
+    """
+    profile = get_active_profile()
+    if profile is None:
+        yield None
+        return
+    with profile.stage(name) as metrics:
+        yield metrics
+
+
+def profiled_stage(name):
+    """
+    Decorator that times each call of the wrapped function as the stage ``name`` of the active profile.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with profile_stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_upstream_call():
+    if profile := get_active_profile():
+        profile.record_upstream_call()
+
+
+def record_cache_hit():
+    if profile := get_active_profile():
+        profile.record_cache_hit()
+
+
+def record_cache_miss():
+    if profile := get_active_profile():
+        profile.record_cache_miss()
+
+
+def should_add_server_timing_header(request):
+    """
+    The ``Server-Timing`` header is only exposed to staff request users, and only when enabled.
+    """
+    if not getattr(settings, 'BFF_SERVER_TIMING_HEADER_ENABLED', False):
+        return False
+    user = getattr(request, 'user', None)
+    return bool(user and user.is_staff)
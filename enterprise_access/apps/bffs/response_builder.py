@@ -179,6 +179,7 @@ class LearnerDashboardResponseBuilder(BaseLearnerResponseBuilder, LearnerDashboa
         self.response_data.update({
             'enterprise_course_enrollments': self.enterprise_course_enrollments,
             'all_enrollments_by_status': self.all_enrollments_by_status,
+            'default_enterprise_enrollment_realizations': self.default_enterprise_enrollment_realizations,
             'has_bnr_enabled_policy': bool(SubsidyAccessPolicy.has_bnr_enabled_policy_for_enterprise(
                 self.context.enterprise_customer_uuid
             )),
@@ -369,6 +369,21 @@ class LearnerSkillsQuizRequestSerializer(BFFRequestSerializer):
     """
 
 
+class LearnerPrefetchRequestSerializer(BFFRequestSerializer):
+    """
+    Serializer for the learner portal prefetch request.
+    """
+
+
+class LearnerPrefetchResponseSerializer(BaseBffSerializer):
+    """
+    Serializer for the learner portal prefetch response.
+    """
+
+    enterprise_customer_uuid = serializers.UUIDField(allow_null=True)
+    prefetching = serializers.ListField(child=serializers.CharField(), default=list)
+
+
 class LearnerEnrollmentsByStatusSerializer(BaseBffSerializer):
     """
     Serializer for subscription license status.
@@ -380,6 +395,16 @@ class LearnerEnrollmentsByStatusSerializer(BaseBffSerializer):
     saved_for_later = EnterpriseCourseEnrollmentSerializer(many=True, required=False, default=list)
 
 
+class DefaultEnterpriseEnrollmentRealizationSerializer(BaseBffSerializer):
+    """
+    Serializer for the realization of a default enterprise enrollment intention.
+    """
+
+    course_key = serializers.CharField()
+    enrollment_status = serializers.ChoiceField(choices=['enrolled', 'pending'])
+    subscription_license_uuid = serializers.UUIDField(allow_null=True)
+
+
 class LearnerDashboardResponseSerializer(BaseLearnerPortalResponseSerializer):
     """
     Serializer for the learner dashboard response.
@@ -387,6 +412,11 @@ class LearnerDashboardResponseSerializer(BaseLearnerPortalResponseSerializer):
 
     enterprise_course_enrollments = EnterpriseCourseEnrollmentSerializer(many=True)
     all_enrollments_by_status = LearnerEnrollmentsByStatusSerializer()
+    default_enterprise_enrollment_realizations = DefaultEnterpriseEnrollmentRealizationSerializer(
+        many=True,
+        required=False,
+        default=list,
+    )
     has_bnr_enabled_policy = serializers.BooleanField()
 
 
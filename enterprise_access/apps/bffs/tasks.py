@@ -0,0 +1,69 @@
+"""
+Tasks for the bffs app.
+"""
+import json
+import logging
+
+from celery import shared_task
+
+from enterprise_access.apps.api_client.lms_client import LmsApiClient
+from enterprise_access.apps.bffs.api import (
+    build_default_enterprise_enrollment_realizations_payload,
+    invalidate_default_enterprise_enrollment_intentions_learner_status_cache,
+    invalidate_enterprise_course_enrollments_cache,
+    invalidate_pending_default_enterprise_enrollment_realizations
+)
+from enterprise_access.tasks import LoggedTaskWithRetry
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(base=LoggedTaskWithRetry)
+def realize_default_enterprise_enrollment_intentions_task(
+    enterprise_customer_uuid,
+    lms_user_id,
+    license_uuids_by_course_run_key,
+):
+    """
+    Realizes a learner's redeemable default enterprise enrollment intentions with a single
+    bulk enrollment request to the LMS, then invalidates the learner's cached enrollment
+    intentions and enrollments so the next learner portal request reflects them.
+
+    Args:
+        enterprise_customer_uuid (str): The enterprise customer the intentions belong to.
+        lms_user_id (int): The learner to enroll.
+        license_uuids_by_course_run_key (dict): Mapping of course run key to the uuid of the
+          subscription license with which to enroll in it.
+    """
+    bulk_enrollment_payload = build_default_enterprise_enrollment_realizations_payload(
+        lms_user_id,
+        license_uuids_by_course_run_key,
+    )
+    response_payload = LmsApiClient().bulk_enroll_enterprise_learners(
+        enterprise_customer_uuid,
+        bulk_enrollment_payload,
+    )
+
+    if failures := response_payload.get('failures'):
+        logger.error(
+            'Default realization enrollment failures for user %s and enterprise customer %s: %s',
+            lms_user_id,
+            enterprise_customer_uuid,
+            json.dumps(failures),
+        )
+
+    if response_payload.get('successes'):
+        invalidate_default_enterprise_enrollment_intentions_learner_status_cache(
+            enterprise_customer_uuid=enterprise_customer_uuid,
+            lms_user_id=lms_user_id,
+        )
+        invalidate_enterprise_course_enrollments_cache(
+            enterprise_customer_uuid=enterprise_customer_uuid,
+            lms_user_id=lms_user_id,
+        )
+
+    invalidate_pending_default_enterprise_enrollment_realizations(
+        enterprise_customer_uuid=enterprise_customer_uuid,
+        lms_user_id=lms_user_id,
+    )
+    return response_payload
@@ -0,0 +1,293 @@
+"""
+Tests for the bffs app API methods.
+"""
+from concurrent.futures import wait
+from datetime import timedelta
+from unittest import mock
+
+import ddt
+from django.core.cache import cache as django_cache
+from django.test import override_settings
+from django.utils import timezone
+from edx_django_utils.cache import TieredCache
+
+from enterprise_access.apps.bffs.api import (
+    DetachedRequest,
+    default_enterprise_enrollment_intentions_learner_status_cache_key,
+    enterprise_course_enrollments_cache_key,
+    get_and_cache_enterprise_customer_users,
+    get_and_cache_secured_algolia_search_keys,
+    get_last_known_value,
+    get_prefetch_executor,
+    invalidate_default_enterprise_enrollment_intentions_learner_status_cache,
+    invalidate_enterprise_course_enrollments_cache,
+    invalidate_subscription_licenses_cache,
+    prefetch_learner_portal_data,
+    prefetched_enterprise_customer_users_cache_key,
+    secured_algolia_api_key_cache_key,
+    secured_algolia_api_key_cache_timeout,
+    set_last_known_value,
+    subscription_licenses_cache_key
+)
+from enterprise_access.apps.bffs.tests.utils import TestHandlerContextMixin, mock_common_dependencies
+
+
+class TestPrefetchLearnerPortalData(TestHandlerContextMixin):
+    """
+    Tests for prefetching learner portal data.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(django_cache.clear)
+        self.addCleanup(TieredCache.dangerous_clear_all_tiers)
+
+    @mock_common_dependencies
+    def test_prefetch_learner_portal_data(
+        self,
+        mock_get_enterprise_customers_for_user,
+        mock_get_secured_algolia_api_key_for_user,
+        mock_get_default_enrollment_intentions_learner_status,
+        mock_get_subscription_licenses_for_learner,
+    ):
+        mock_get_enterprise_customers_for_user.return_value = self.mock_enterprise_learner_response_data
+        mock_get_secured_algolia_api_key_for_user.return_value = self.mock_secured_algolia_api_key_response
+        mock_get_subscription_licenses_for_learner.return_value = {'customer_agreement': None, 'results': []}
+        mock_get_default_enrollment_intentions_learner_status.return_value = {'enrollment_statuses': {}}
+
+        futures = prefetch_learner_portal_data(self.request, self.mock_enterprise_customer_uuid)
+        wait(futures.values())
+
+        self.assertEqual(
+            set(futures),
+            {
+                'enterprise_customer_users',
+                'secured_algolia_api_key',
+                'subscription_licenses',
+                'default_enterprise_enrollment_intentions',
+            },
+        )
+        mock_get_subscription_licenses_for_learner.assert_called_once_with(
+            enterprise_customer_uuid=self.mock_enterprise_customer_uuid,
+            include_revoked=True,
+            current_plans_only=False,
+        )
+        self.assertTrue(
+            TieredCache.get_cached_response(
+                secured_algolia_api_key_cache_key(self.mock_enterprise_customer_uuid, self.mock_user.id)
+            ).is_found
+        )
+        self.assertTrue(
+            TieredCache.get_cached_response(
+                subscription_licenses_cache_key(self.mock_enterprise_customer_uuid, self.mock_user.id)
+            ).is_found
+        )
+
+        # The prefetched enterprise customer users are consumed by the next read, without an upstream call.
+        mock_get_enterprise_customers_for_user.reset_mock()
+        result = get_and_cache_enterprise_customer_users(self.request, traverse_pagination=True)
+        self.assertEqual(result, self.mock_enterprise_learner_response_data)
+        mock_get_enterprise_customers_for_user.assert_not_called()
+        self.assertFalse(
+            TieredCache.get_cached_response(
+                prefetched_enterprise_customer_users_cache_key(self.mock_user.username)
+            ).is_found
+        )
+
+    @mock_common_dependencies
+    def test_prefetch_learner_portal_data_loader_failure(
+        self,
+        mock_get_enterprise_customers_for_user,
+        mock_get_secured_algolia_api_key_for_user,
+        mock_get_default_enrollment_intentions_learner_status,
+        mock_get_subscription_licenses_for_learner,
+    ):
+        mock_get_enterprise_customers_for_user.return_value = self.mock_enterprise_learner_response_data
+        mock_get_secured_algolia_api_key_for_user.return_value = self.mock_secured_algolia_api_key_response
+        mock_get_subscription_licenses_for_learner.side_effect = Exception('license-manager is down')
+        mock_get_default_enrollment_intentions_learner_status.return_value = {'enrollment_statuses': {}}
+
+        with mock.patch('enterprise_access.apps.bffs.api.logger') as mock_logger:
+            futures = prefetch_learner_portal_data(self.request, self.mock_enterprise_customer_uuid)
+            wait(futures.values())
+
+        # A failing loader is logged, and does not prevent the others from warming their caches.
+        self.assertIsNone(futures['subscription_licenses'].exception())
+        mock_logger.exception.assert_called_once()
+        self.assertFalse(
+            TieredCache.get_cached_response(
+                subscription_licenses_cache_key(self.mock_enterprise_customer_uuid, self.mock_user.id)
+            ).is_found
+        )
+        self.assertTrue(
+            TieredCache.get_cached_response(
+                secured_algolia_api_key_cache_key(self.mock_enterprise_customer_uuid, self.mock_user.id)
+            ).is_found
+        )
+
+    @override_settings(BFF_PREFETCH_MAX_WORKERS=1)
+    @mock_common_dependencies
+    def test_prefetch_learner_portal_data_after_invalidation(
+        self,
+        mock_get_enterprise_customers_for_user,
+        mock_get_secured_algolia_api_key_for_user,
+        mock_get_default_enrollment_intentions_learner_status,
+        mock_get_subscription_licenses_for_learner,
+    ):
+        """
+        Test that a later prefetch re-warms an invalidated cache, rather than finding the
+        value of an earlier prefetch in the request cache of its pool thread.
+        """
+        get_prefetch_executor.cache_clear()
+        self.addCleanup(get_prefetch_executor.cache_clear)
+        self.addCleanup(lambda: get_prefetch_executor().shutdown(wait=True))
+        mock_get_enterprise_customers_for_user.return_value = self.mock_enterprise_learner_response_data
+        mock_get_secured_algolia_api_key_for_user.return_value = self.mock_secured_algolia_api_key_response
+        mock_get_default_enrollment_intentions_learner_status.return_value = {'enrollment_statuses': {}}
+        mock_get_subscription_licenses_for_learner.return_value = {'customer_agreement': None, 'results': []}
+        cache_key = subscription_licenses_cache_key(self.mock_enterprise_customer_uuid, self.mock_user.id)
+
+        wait(prefetch_learner_portal_data(self.request, self.mock_enterprise_customer_uuid).values())
+        invalidate_subscription_licenses_cache(self.mock_enterprise_customer_uuid, self.mock_user.id)
+        self.assertFalse(TieredCache.get_cached_response(cache_key).is_found)
+
+        wait(prefetch_learner_portal_data(self.request, self.mock_enterprise_customer_uuid).values())
+
+        self.assertEqual(mock_get_subscription_licenses_for_learner.call_count, 2)
+        self.assertTrue(TieredCache.get_cached_response(cache_key).is_found)
+
+    def test_detached_request(self):
+        self.request.META['HTTP_AUTHORIZATION'] = 'JWT test-token'
+
+        detached_request = DetachedRequest(self.request)
+
+        self.assertEqual(detached_request.user, self.mock_user)
+        self.assertEqual(detached_request.headers, {'Authorization': 'JWT test-token'})
+        self.assertEqual(detached_request.COOKIES, {})
+
+
+@ddt.ddt
+@override_settings(SECURED_ALGOLIA_API_KEY_EXPIRY_MARGIN=60 * 5, SECURED_ALGOLIA_API_KEY_RENEWAL_WINDOW=60 * 10)
+class TestSecuredAlgoliaApiKeyCaching(TestHandlerContextMixin):
+    """
+    Tests for caching secured algolia api keys until they expire.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(django_cache.clear)
+        self.addCleanup(TieredCache.dangerous_clear_all_tiers)
+        self.cache_key = secured_algolia_api_key_cache_key(self.mock_enterprise_customer_uuid, self.mock_user.id)
+
+    def _algolia_response(self, expires_in_seconds):
+        valid_until = timezone.now() + timedelta(seconds=expires_in_seconds)
+        return {
+            'algolia': {
+                'secured_api_key': 'secured-key',
+                'valid_until': valid_until.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            },
+            'catalog_uuids_to_catalog_query_uuids': {},
+        }
+
+    @ddt.data(
+        # The key is cached until its valid_until less the 5 minute margin.
+        (60 * 60, 60 * 55),
+        # Keys expiring within the margin are not cached.
+        (60 * 2, 0),
+        (-60, 0),
+    )
+    @ddt.unpack
+    def test_cache_timeout_from_valid_until(self, expires_in_seconds, expected_timeout):
+        timeout = secured_algolia_api_key_cache_timeout(self._algolia_response(expires_in_seconds), 1800)
+        self.assertAlmostEqual(timeout, expected_timeout, delta=2)
+
+    @ddt.data(
+        {},
+        {'algolia': {'secured_api_key': 'secured-key'}},
+        {'algolia': {'secured_api_key': 'secured-key', 'valid_until': 'not-a-date'}},
+    )
+    def test_cache_timeout_without_valid_until(self, response):
+        self.assertEqual(secured_algolia_api_key_cache_timeout(response, 1800), 1800)
+
+    @mock.patch(
+        'enterprise_access.apps.api_client.enterprise_catalog_client'
+        '.EnterpriseCatalogUserV1ApiClient.get_secured_algolia_api_key'
+    )
+    def test_key_expiring_within_margin_is_not_cached(self, mock_get_secured_algolia_api_key):
+        mock_get_secured_algolia_api_key.return_value = self._algolia_response(60)
+
+        get_and_cache_secured_algolia_search_keys(self.request, self.mock_enterprise_customer_uuid)
+
+        self.assertFalse(TieredCache.get_cached_response(self.cache_key).is_found)
+
+    @mock.patch(
+        'enterprise_access.apps.api_client.enterprise_catalog_client'
+        '.EnterpriseCatalogUserV1ApiClient.get_secured_algolia_api_key'
+    )
+    def test_cached_key_outside_renewal_window_is_not_renewed(self, mock_get_secured_algolia_api_key):
+        cached_response = self._algolia_response(60 * 60)
+        TieredCache.set_all_tiers(self.cache_key, cached_response, 60)
+
+        with mock.patch('enterprise_access.apps.bffs.api.get_prefetch_executor') as mock_get_executor:
+            result = get_and_cache_secured_algolia_search_keys(self.request, self.mock_enterprise_customer_uuid)
+
+        self.assertEqual(result, cached_response)
+        mock_get_executor.assert_not_called()
+        mock_get_secured_algolia_api_key.assert_not_called()
+
+    @mock.patch(
+        'enterprise_access.apps.api_client.enterprise_catalog_client'
+        '.EnterpriseCatalogUserV1ApiClient.get_secured_algolia_api_key'
+    )
+    def test_cached_key_within_renewal_window_is_renewed(self, mock_get_secured_algolia_api_key):
+        cached_response = self._algolia_response(60 * 10)
+        renewed_response = self._algolia_response(60 * 60)
+        TieredCache.set_all_tiers(self.cache_key, cached_response, 60)
+        mock_get_secured_algolia_api_key.return_value = renewed_response
+
+        with mock.patch('enterprise_access.apps.bffs.api.get_prefetch_executor') as mock_get_executor:
+            # Run the renewal inline rather than in the thread pool.
+            mock_get_executor.return_value.submit.side_effect = lambda fn, *args: fn(*args)
+            # The cached key is returned without waiting for its renewal, and only one renewal is started.
+            self.assertEqual(
+                get_and_cache_secured_algolia_search_keys(self.request, self.mock_enterprise_customer_uuid),
+                cached_response,
+            )
+            TieredCache.set_all_tiers(self.cache_key, cached_response, 60)
+            get_and_cache_secured_algolia_search_keys(self.request, self.mock_enterprise_customer_uuid)
+
+        mock_get_secured_algolia_api_key.assert_called_once_with(
+            enterprise_customer_uuid=self.mock_enterprise_customer_uuid,
+        )
+        mock_get_executor.return_value.submit.assert_called_once()
+
+
+@ddt.ddt
+class TestCacheInvalidation(TestHandlerContextMixin):
+    """
+    Tests for invalidating cached learner data.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(django_cache.clear)
+        self.addCleanup(TieredCache.dangerous_clear_all_tiers)
+
+    @ddt.data(
+        (subscription_licenses_cache_key, invalidate_subscription_licenses_cache),
+        (enterprise_course_enrollments_cache_key, invalidate_enterprise_course_enrollments_cache),
+        (
+            default_enterprise_enrollment_intentions_learner_status_cache_key,
+            invalidate_default_enterprise_enrollment_intentions_learner_status_cache,
+        ),
+    )
+    @ddt.unpack
+    def test_invalidation_deletes_last_known_value(self, get_cache_key, invalidate_cache):
+        cache_key = get_cache_key(self.mock_enterprise_customer_uuid, self.mock_user.id)
+        TieredCache.set_all_tiers(cache_key, {'results': []}, 60)
+        set_last_known_value(cache_key, {'results': []})
+
+        invalidate_cache(self.mock_enterprise_customer_uuid, self.mock_user.id)
+
+        self.assertFalse(TieredCache.get_cached_response(cache_key).is_found)
+        self.assertIsNone(get_last_known_value(cache_key))
@@ -0,0 +1,94 @@
+"""
+Tests for the bffs app tasks.
+"""
+from unittest import mock
+
+from django.core.cache import cache as django_cache
+from django.test import TestCase
+from edx_django_utils.cache import TieredCache
+
+from enterprise_access.apps.bffs.api import (
+    get_pending_default_enterprise_enrollment_realizations,
+    set_pending_default_enterprise_enrollment_realizations
+)
+from enterprise_access.apps.bffs.tasks import realize_default_enterprise_enrollment_intentions_task
+
+
+class TestRealizeDefaultEnterpriseEnrollmentIntentionsTask(TestCase):
+    """
+    Tests for realize_default_enterprise_enrollment_intentions_task.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(django_cache.clear)
+        self.addCleanup(TieredCache.dangerous_clear_all_tiers)
+        self.enterprise_customer_uuid = 'ec-uuid-1'
+        self.lms_user_id = 42
+        self.license_uuids_by_course_run_key = {'course-run-1': 'license-1', 'course-run-2': 'license-1'}
+        set_pending_default_enterprise_enrollment_realizations(
+            self.enterprise_customer_uuid,
+            self.lms_user_id,
+            self.license_uuids_by_course_run_key,
+        )
+
+    @mock.patch('enterprise_access.apps.bffs.tasks.invalidate_enterprise_course_enrollments_cache')
+    @mock.patch(
+        'enterprise_access.apps.bffs.tasks.invalidate_default_enterprise_enrollment_intentions_learner_status_cache'
+    )
+    @mock.patch('enterprise_access.apps.bffs.tasks.LmsApiClient')
+    def test_realize_default_enrollment_intentions(
+        self, mock_lms_client, mock_invalidate_intentions, mock_invalidate_enrollments,
+    ):
+        mock_bulk_enroll = mock_lms_client.return_value.bulk_enroll_enterprise_learners
+        mock_bulk_enroll.return_value = {
+            'successes': [{'course_run_key': 'course-run-1'}],
+            'failures': [{'course_run_key': 'course-run-2'}],
+        }
+
+        result = realize_default_enterprise_enrollment_intentions_task(
+            self.enterprise_customer_uuid,
+            self.lms_user_id,
+            self.license_uuids_by_course_run_key,
+        )
+
+        self.assertEqual(result, mock_bulk_enroll.return_value)
+        mock_bulk_enroll.assert_called_once_with(
+            self.enterprise_customer_uuid,
+            [
+                {'user_id': self.lms_user_id, 'course_run_key': 'course-run-1',
+                 'license_uuid': 'license-1', 'is_default_auto_enrollment': True},
+                {'user_id': self.lms_user_id, 'course_run_key': 'course-run-2',
+                 'license_uuid': 'license-1', 'is_default_auto_enrollment': True},
+            ],
+        )
+        mock_invalidate_intentions.assert_called_once_with(
+            enterprise_customer_uuid=self.enterprise_customer_uuid,
+            lms_user_id=self.lms_user_id,
+        )
+        mock_invalidate_enrollments.assert_called_once_with(
+            enterprise_customer_uuid=self.enterprise_customer_uuid,
+            lms_user_id=self.lms_user_id,
+        )
+        self.assertIsNone(
+            get_pending_default_enterprise_enrollment_realizations(self.enterprise_customer_uuid, self.lms_user_id)
+        )
+
+    @mock.patch('enterprise_access.apps.bffs.tasks.invalidate_enterprise_course_enrollments_cache')
+    @mock.patch('enterprise_access.apps.bffs.tasks.LmsApiClient')
+    def test_realize_default_enrollment_intentions_all_failures(self, mock_lms_client, mock_invalidate_enrollments):
+        mock_lms_client.return_value.bulk_enroll_enterprise_learners.return_value = {
+            'successes': [],
+            'failures': [{'course_run_key': 'course-run-1'}, {'course_run_key': 'course-run-2'}],
+        }
+
+        realize_default_enterprise_enrollment_intentions_task(
+            self.enterprise_customer_uuid,
+            self.lms_user_id,
+            self.license_uuids_by_course_run_key,
+        )
+
+        mock_invalidate_enrollments.assert_not_called()
+        self.assertIsNone(
+            get_pending_default_enterprise_enrollment_realizations(self.enterprise_customer_uuid, self.lms_user_id)
+        )
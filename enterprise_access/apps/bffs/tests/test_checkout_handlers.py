@@ -725,7 +725,7 @@ class TestCheckoutSuccessHandler(APITest):
         self.assertEqual(self.context.checkout_intent, checkout_intent_no_session)
 
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.CheckoutSuccessHandler._get_checkout_intent')
-    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_checkout_session')
+    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_checkout_session_details')
     def test_enhance_with_stripe_data_session_error(self, mock_session, mock_get_checkout_intent):
         """Test when there's an error retrieving the Stripe session."""
         mock_get_checkout_intent.return_value = self.checkout_intent_data
@@ -736,7 +736,7 @@ class TestCheckoutSuccessHandler(APITest):
         self.assertEqual(self.context.checkout_intent, self.checkout_intent_data)
 
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.CheckoutSuccessHandler._get_checkout_intent')
-    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_checkout_session')
+    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_checkout_session_details')
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_payment_intent')
     def test_enhance_with_stripe_data_payment_intent_error(
         self, mock_payment_intent, mock_session, mock_get_checkout_intent,
@@ -753,7 +753,7 @@ class TestCheckoutSuccessHandler(APITest):
         self.assertIsNone(self.context.checkout_intent['first_billable_invoice']['last4'])
 
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.CheckoutSuccessHandler._get_checkout_intent')
-    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_checkout_session')
+    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_checkout_session_details')
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_payment_intent')
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_payment_method')
     def test_enhance_with_stripe_data_payment_method_error(
@@ -773,7 +773,7 @@ class TestCheckoutSuccessHandler(APITest):
         self.assertIsNone(self.context.checkout_intent['first_billable_invoice']['last4'])
 
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.CheckoutSuccessHandler._get_checkout_intent')
-    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_checkout_session')
+    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_checkout_session_details')
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_payment_intent')
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_payment_method')
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_subscription')
@@ -794,7 +794,7 @@ class TestCheckoutSuccessHandler(APITest):
         self.assertIsNone(self.context.checkout_intent['first_billable_invoice']['quantity'])
 
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.CheckoutSuccessHandler._get_checkout_intent')
-    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_checkout_session')
+    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_checkout_session_details')
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_payment_intent')
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_payment_method')
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_subscription')
@@ -818,7 +818,7 @@ class TestCheckoutSuccessHandler(APITest):
         self.assertIsNone(self.context.checkout_intent['first_billable_invoice']['quantity'])
 
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.CheckoutSuccessHandler._get_checkout_intent')
-    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_checkout_session')
+    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_checkout_session_details')
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_payment_intent')
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_payment_method')
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_subscription')
@@ -863,7 +863,41 @@ class TestCheckoutSuccessHandler(APITest):
         self.assertEqual(first_billable_invoice['end_time'], expected_end)
 
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.CheckoutSuccessHandler._get_checkout_intent')
-    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_checkout_session')
+    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_checkout_session_details')
+    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_payment_intent')
+    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_payment_method')
+    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_subscription')
+    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_invoice')
+    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_customer')
+    def test_enhance_with_expanded_stripe_data(
+        self, mock_customer, mock_invoice, mock_subscription, mock_payment_method,
+        mock_payment_intent, mock_session, mock_get_checkout_intent,
+    ):
+        """Test that expanded related objects are used without any further Stripe requests."""
+        mock_get_checkout_intent.return_value = self.checkout_intent_data
+        mock_session.return_value = {
+            **self.stripe_session,
+            'payment_intent': {**self.stripe_payment_intent, 'payment_method': self.stripe_payment_method},
+            'subscription': {
+                **self.stripe_subscription,
+                'latest_invoice': {**self.stripe_invoice, 'customer': self.stripe_customer},
+            },
+            'invoice': None,
+        }
+
+        self.handler.load_and_process()
+
+        first_billable_invoice = self.context.checkout_intent['first_billable_invoice']
+        self.assertEqual(first_billable_invoice['last4'], '4242')
+        self.assertEqual(first_billable_invoice['quantity'], 35)
+        self.assertEqual(first_billable_invoice['unit_amount_decimal'], 396.00)
+        self.assertEqual(first_billable_invoice['customer_name'], 'Test Customer')
+        mock_session.assert_called_once_with('cs_test_123')
+        for mock_getter in (mock_customer, mock_invoice, mock_subscription, mock_payment_method, mock_payment_intent):
+            mock_getter.assert_not_called()
+
+    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.CheckoutSuccessHandler._get_checkout_intent')
+    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_checkout_session_details')
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_subscription')
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_payment_method')
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_invoice')
@@ -896,7 +930,7 @@ class TestCheckoutSuccessHandler(APITest):
         self.assertEqual(first_billable_invoice['quantity'], 35)
 
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.CheckoutSuccessHandler._get_checkout_intent')
-    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_checkout_session')
+    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_checkout_session_details')
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_subscription')
     def test_no_payment_intent_in_session(self, mock_subscription, mock_session, mock_get_checkout_intent):
         """Test when session has no payment intent but has subscription (trial subscription case)."""
@@ -914,7 +948,7 @@ class TestCheckoutSuccessHandler(APITest):
         self.assertIsNone(self.context.checkout_intent['first_billable_invoice']['last4'])
 
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.CheckoutSuccessHandler._get_checkout_intent')
-    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_checkout_session')
+    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_checkout_session_details')
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_payment_intent')
     def test_no_payment_method_in_payment_intent(self, mock_payment_intent, mock_session, mock_get_checkout_intent):
         """Test when payment intent has no payment method."""
@@ -931,7 +965,7 @@ class TestCheckoutSuccessHandler(APITest):
         self.assertIsNone(self.context.checkout_intent['first_billable_invoice']['last4'])
 
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.CheckoutSuccessHandler._get_checkout_intent')
-    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_checkout_session')
+    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_checkout_session_details')
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_payment_intent')
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_payment_method')
     def test_no_card_in_payment_method(
@@ -954,7 +988,7 @@ class TestCheckoutSuccessHandler(APITest):
         self.assertEqual(address['city'], 'New York')
 
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.CheckoutSuccessHandler._get_checkout_intent')
-    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_checkout_session')
+    @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_checkout_session_details')
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_payment_intent')
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_payment_method')
     @mock.patch('enterprise_access.apps.bffs.checkout.handlers.get_stripe_invoice')
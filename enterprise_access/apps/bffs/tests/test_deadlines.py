@@ -0,0 +1,116 @@
+"""
+Tests for BFF loader deadlines.
+"""
+import threading
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from edx_django_utils.cache import TieredCache
+
+from enterprise_access.apps.bffs.deadlines import (
+    LoaderDeadlineExceeded,
+    RequestDeadline,
+    get_loader_executor,
+    run_with_deadline
+)
+from enterprise_access.apps.bffs.profiling import activate_profile, deactivate_profile, record_cache_hit
+
+
+class TestRequestDeadline(TestCase):
+    """
+    Tests for RequestDeadline.
+    """
+
+    def test_unbounded(self):
+        deadline = RequestDeadline()
+        self.assertIsNone(deadline.remaining())
+        self.assertIsNone(deadline.timeout_for('subscription_licenses'))
+
+    def test_loader_deadline_only(self):
+        deadline = RequestDeadline(loader_deadlines={'subscription_licenses': 2})
+        self.assertEqual(deadline.timeout_for('subscription_licenses'), 2)
+        self.assertIsNone(deadline.timeout_for('enterprise_course_enrollments'))
+
+    @mock.patch('enterprise_access.apps.bffs.deadlines.time.monotonic')
+    def test_request_deadline_bounds_loader_deadline(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        deadline = RequestDeadline(budget_seconds=5, loader_deadlines={'subscription_licenses': 2})
+        self.assertEqual(deadline.timeout_for('subscription_licenses'), 2)
+        self.assertEqual(deadline.timeout_for('enterprise_course_enrollments'), 5)
+
+        mock_monotonic.return_value = 104
+        self.assertEqual(deadline.timeout_for('subscription_licenses'), 1)
+
+        mock_monotonic.return_value = 110
+        self.assertEqual(deadline.timeout_for('subscription_licenses'), 0)
+
+    @override_settings(BFF_REQUEST_DEADLINE=3, BFF_LOADER_DEADLINES={'subscription_licenses': 1})
+    def test_from_settings(self):
+        deadline = RequestDeadline.from_settings()
+        self.assertEqual(deadline.loader_deadlines, {'subscription_licenses': 1})
+        self.assertLessEqual(deadline.timeout_for('subscription_licenses'), 1)
+        self.assertLessEqual(deadline.remaining(), 3)
+
+
+class TestRunWithDeadline(TestCase):
+    """
+    Tests for run_with_deadline.
+    """
+
+    def test_runs_inline_without_timeout(self):
+        self.assertEqual(run_with_deadline('loader', threading.get_ident, None), threading.get_ident())
+
+    def test_returns_result_within_timeout(self):
+        self.assertEqual(run_with_deadline('loader', lambda: 'result', 5), 'result')
+
+    def test_expired_deadline_does_not_run_loader(self):
+        loader = mock.Mock()
+        with self.assertRaises(LoaderDeadlineExceeded):
+            run_with_deadline('loader', loader, 0)
+        loader.assert_not_called()
+
+    def test_raises_when_deadline_exceeded(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        with self.assertRaises(LoaderDeadlineExceeded) as exc_context:
+            run_with_deadline('slow_loader', release.wait, 0.01)
+        self.assertEqual(exc_context.exception.loader_name, 'slow_loader')
+
+    def test_loader_exceptions_propagate(self):
+        with self.assertRaises(ValueError):
+            run_with_deadline('loader', mock.Mock(side_effect=ValueError), 5)
+
+    @override_settings(BFF_LOADER_MAX_WORKERS=1)
+    def test_loader_does_not_serve_request_cache_of_previous_loads(self):
+        """
+        Test that a value cached by a loader is not served from the request cache of its
+        pool thread once it has been invalidated.
+        """
+        get_loader_executor.cache_clear()
+        self.addCleanup(get_loader_executor.cache_clear)
+        self.addCleanup(lambda: get_loader_executor().shutdown(wait=True))
+        cache_key = 'test-deadline-loader-cache-key'
+        self.addCleanup(TieredCache.delete_all_tiers, cache_key)
+        fetched_values = []
+
+        def loader():
+            cached_response = TieredCache.get_cached_response(cache_key)
+            if cached_response.is_found:
+                return cached_response.value
+            fetched_values.append(f'fetched-{len(fetched_values)}')
+            TieredCache.set_all_tiers(cache_key, fetched_values[-1], 60)
+            return fetched_values[-1]
+
+        self.assertEqual(run_with_deadline('loader', loader, 5), 'fetched-0')
+        self.assertEqual(run_with_deadline('loader', loader, 5), 'fetched-0')
+        TieredCache.delete_all_tiers(cache_key)
+        self.assertEqual(run_with_deadline('loader', loader, 5), 'fetched-1')
+
+    def test_loader_records_into_active_profile(self):
+        profile = activate_profile('test-route')
+        self.addCleanup(deactivate_profile)
+
+        with profile.stage('load'):
+            run_with_deadline('loader', record_cache_hit, 5)
+
+        self.assertEqual(profile.stages['load'].cache_hits, 1)
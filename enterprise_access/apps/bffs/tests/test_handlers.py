@@ -3,8 +3,11 @@ Tests for BFF handlers
 """
 from unittest import mock
 
+from django.core.cache import cache as django_cache
+from django.test import override_settings
 from rest_framework import status
 
+from enterprise_access.apps.bffs.api import set_last_known_value, subscription_licenses_cache_key
 from enterprise_access.apps.bffs.context import HandlerContext
 from enterprise_access.apps.bffs.handlers import BaseHandler, BaseLearnerPortalHandler, DashboardHandler
 from enterprise_access.apps.bffs.tests.utils import TestHandlerContextMixin
@@ -430,6 +433,117 @@ class TestBaseLearnerPortalHandler(TestHandlerContextMixin):
             mock_get_intentions.return_value,
         )
 
+    @override_settings(ENABLE_ASYNC_DEFAULT_ENTERPRISE_ENROLLMENT_REALIZATION=True)
+    @mock.patch('enterprise_access.apps.bffs.handlers.realize_default_enterprise_enrollment_intentions_task')
+    @mock.patch(
+        'enterprise_access.apps.api_client.lms_client.LmsUserApiClient'
+        '.get_default_enterprise_enrollment_intentions_learner_status'
+    )
+    @mock.patch('enterprise_access.apps.api_client.lms_client.LmsUserApiClient.get_enterprise_customers_for_user')
+    def test_realize_default_enrollments_async(self, mock_get_customers, mock_get_intentions, mock_task):
+        self.addCleanup(django_cache.clear)
+        mock_get_customers.return_value = self.mock_enterprise_learner_response_data
+        mock_get_intentions.return_value = {
+            'enrollment_statuses': {
+                'needs_enrollment': {
+                    'enrollable': [{
+                        'applicable_enterprise_catalog_uuids': ['catalog-1'],
+                        'course_run_key': 'course-run-1',
+                    }],
+                    'not_enrollable': [],
+                },
+                'already_enrolled': [],
+            },
+        }
+        expected_realizations = [{
+            'course_key': 'course-run-1',
+            'enrollment_status': 'pending',
+            'subscription_license_uuid': 'license-1',
+        }]
+
+        for _ in range(2):
+            context = HandlerContext(self.request)
+            context.data['enterprise_customer_user_subsidies'] = {
+                'subscriptions': {
+                    'subscription_licenses_by_status': {
+                        'activated': [{
+                            'uuid': 'license-1',
+                            'subscription_plan': {'is_current': True, 'enterprise_catalog_uuid': 'catalog-1'},
+                        }]
+                    }
+                }
+            }
+            handler = BaseLearnerPortalHandler(context)
+            handler.load_default_enterprise_enrollment_intentions()
+            handler.enroll_in_redeemable_default_enterprise_enrollment_intentions()
+            self.assertEqual(context.data['default_enterprise_enrollment_realizations'], expected_realizations)
+
+        # The realization is only enqueued once while it is pending.
+        mock_task.delay.assert_called_once_with(
+            enterprise_customer_uuid=str(context.enterprise_customer_uuid),
+            lms_user_id=context.lms_user_id,
+            license_uuids_by_course_run_key={'course-run-1': 'license-1'},
+        )
+
+    @override_settings(BFF_LOADER_DEADLINES={'subscription_licenses': 0})
+    @mock.patch('enterprise_access.apps.api_client.lms_client.LmsUserApiClient.get_enterprise_customers_for_user')
+    @mock.patch(
+        'enterprise_access.apps.api_client.license_manager_client.LicenseManagerUserApiClient'
+        '.get_subscription_licenses_for_learner'
+    )
+    def test_load_subscription_licenses_deadline_exceeded(
+        self,
+        mock_get_subscription_licenses_for_learner,
+        mock_get_enterprise_customers_for_user,
+    ):
+        """
+        Test that a loader exceeding its deadline falls back to the last-known value and adds a warning.
+        """
+        self.addCleanup(django_cache.clear)
+        mock_get_enterprise_customers_for_user.return_value = self.mock_enterprise_learner_response_data
+        mock_license = {
+            'uuid': 'mock-license-uuid',
+            'status': 'activated',
+            'subscription_plan': {'is_current': True},
+        }
+        last_known_subscription_licenses = {
+            'customer_agreement': None,
+            'results': [mock_license],
+        }
+        set_last_known_value(
+            subscription_licenses_cache_key(self.mock_enterprise_customer_uuid, self.mock_user.id),
+            last_known_subscription_licenses,
+        )
+        context = HandlerContext(self.request)
+        handler = BaseLearnerPortalHandler(context)
+        handler.load_and_process_subsidies()
+
+        mock_get_subscription_licenses_for_learner.assert_not_called()
+        self.assertEqual(handler.subscription_licenses, [mock_license])
+        self.assertEqual(handler.context.warnings[-1]['developer_message'], (
+            '[subscription_licenses] Loader exceeded its 0.00s deadline; using the last-known value.'
+        ))
+
+    @override_settings(BFF_LOADER_DEADLINES={'subscription_licenses': 0})
+    @mock.patch('enterprise_access.apps.api_client.lms_client.LmsUserApiClient.get_enterprise_customers_for_user')
+    def test_load_subscription_licenses_deadline_exceeded_without_last_known_value(
+        self,
+        mock_get_enterprise_customers_for_user,
+    ):
+        """
+        Test that a loader exceeding its deadline falls back to an empty default without a last-known value.
+        """
+        self.addCleanup(django_cache.clear)
+        mock_get_enterprise_customers_for_user.return_value = self.mock_enterprise_learner_response_data
+        context = HandlerContext(self.request)
+        handler = BaseLearnerPortalHandler(context)
+        handler.load_and_process_subsidies()
+
+        self.assertEqual(handler.subscription_licenses, [])
+        self.assertEqual(handler.context.warnings[-1]['developer_message'], (
+            '[subscription_licenses] Loader exceeded its 0.00s deadline; using the empty default.'
+        ))
+
 
 class TestDashboardHandler(TestHandlerContextMixin):
     """
@@ -0,0 +1,109 @@
+"""
+Tests for BFF route profiling.
+"""
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from enterprise_access.apps.bffs import profiling
+from enterprise_access.apps.bffs.profiling import (
+    BFFRequestProfile,
+    activate_profile,
+    deactivate_profile,
+    get_active_profile,
+    profiled_stage,
+    record_cache_hit,
+    record_cache_miss,
+    record_upstream_call,
+    should_add_server_timing_header
+)
+
+
+class TestBFFRequestProfile(TestCase):
+    """
+    Tests for BFFRequestProfile and the module-level recording helpers.
+    """
+
+    def tearDown(self):
+        super().tearDown()
+        deactivate_profile()
+
+    def test_recording_without_active_profile_is_noop(self):
+        @profiled_stage('some_stage')
+        def some_stage():
+            record_upstream_call()
+            record_cache_hit()
+            record_cache_miss()
+            return 'result'
+
+        self.assertIsNone(get_active_profile())
+        self.assertEqual(some_stage(), 'result')
+
+    def test_nested_stages_record_inclusive_metrics(self):
+        profile = activate_profile(route='DashboardHandler')
+        self.assertIs(get_active_profile(), profile)
+
+        @profiled_stage('inner')
+        def inner():
+            record_upstream_call()
+            record_cache_miss()
+
+        with profile.stage('outer'):
+            record_cache_hit()
+            inner()
+            inner()
+
+        outer_metrics = profile.stages['outer']
+        inner_metrics = profile.stages['inner']
+        self.assertEqual(outer_metrics.upstream_calls, 2)
+        self.assertEqual(outer_metrics.cache_hits, 1)
+        self.assertEqual(outer_metrics.cache_misses, 2)
+        self.assertEqual(inner_metrics.upstream_calls, 2)
+        self.assertEqual(inner_metrics.cache_hits, 0)
+        self.assertEqual(inner_metrics.cache_misses, 2)
+        self.assertGreaterEqual(outer_metrics.duration_ms, inner_metrics.duration_ms)
+
+    def test_server_timing_header_value(self):
+        profile = BFFRequestProfile(route='SearchHandler')
+        with profile.stage('context_init'):
+            pass
+        with profile.stage('load_and_process'):
+            pass
+
+        header_value = profile.server_timing_header_value()
+        entries = [entry.split(';')[0] for entry in header_value.split(', ')]
+        self.assertEqual(entries, ['context_init', 'load_and_process', 'total'])
+
+    @override_settings(BFF_ROUTE_LATENCY_BUDGETS_MS={'DashboardHandler': 100})
+    @mock.patch.object(profiling, 'set_custom_attribute')
+    def test_emit_monitoring_attributes_over_budget(self, mock_set_custom_attribute):
+        profile = BFFRequestProfile(route='DashboardHandler')
+        with profile.stage('load_and_process'):
+            profile.record_upstream_call()
+        profile.total_duration_ms = 250
+
+        with self.assertLogs(profiling.logger, level='WARNING'):
+            profile.emit_monitoring_attributes()
+
+        mock_set_custom_attribute.assert_any_call('bff_route', 'DashboardHandler')
+        mock_set_custom_attribute.assert_any_call('bff_total_ms', 250)
+        mock_set_custom_attribute.assert_any_call('bff_stage.load_and_process.upstream_calls', 1)
+        mock_set_custom_attribute.assert_any_call('bff_latency_budget_ms', 100)
+        mock_set_custom_attribute.assert_any_call('bff_over_latency_budget', True)
+
+    @mock.patch.object(profiling, 'set_custom_attribute')
+    def test_emit_monitoring_attributes_without_budget(self, mock_set_custom_attribute):
+        profile = BFFRequestProfile(route='AcademyHandler')
+        profile.emit_monitoring_attributes()
+
+        attribute_names = [call_args[0][0] for call_args in mock_set_custom_attribute.call_args_list]
+        self.assertNotIn('bff_over_latency_budget', attribute_names)
+
+    def test_should_add_server_timing_header(self):
+        staff_request = mock.Mock(user=mock.Mock(is_staff=True))
+        learner_request = mock.Mock(user=mock.Mock(is_staff=False))
+
+        self.assertFalse(should_add_server_timing_header(staff_request))
+        with override_settings(BFF_SERVER_TIMING_HEADER_ENABLED=True):
+            self.assertTrue(should_add_server_timing_header(staff_request))
+            self.assertFalse(should_add_server_timing_header(learner_request))
@@ -1,10 +1,16 @@
 """ Core models. """
+from collections import defaultdict
 
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.dispatch import receiver
 from django.utils.translation import gettext_lazy as _
+from edx_django_utils.cache import TieredCache
 from edx_rbac.models import UserRole, UserRoleAssignment
-from edx_rbac.utils import ALL_ACCESS_CONTEXT
+from edx_rbac.utils import ALL_ACCESS_CONTEXT, set_from_collection_or_single_item
+
+from enterprise_access.cache_utils import delete_tiered_cache_keys_on_commit, versioned_cache_key
 
 
 class User(AbstractUser):
@@ -91,6 +97,46 @@ class EnterpriseAccessRoleAssignment(UserRoleAssignment):
         """
         return cls.objects.filter(user__id=user.id, role__name=role_name)
 
+    @classmethod
+    def contexts_by_role_cache_key(cls, user_id):
+        return versioned_cache_key('enterprise_access_role_assignment_contexts_by_role', user_id)
+
+    @classmethod
+    def get_contexts_by_role(cls, user):
+        """
+        Returns a dict mapping each role name assigned to the given user to the set of
+        contexts (enterprise customer uuids, or ``*``) it is assigned for.
+
+        The result is cached per user until the user's assignments change (see
+        ``invalidate_contexts_by_role()``), and reloaded at least every
+        ``ROLE_ASSIGNMENTS_CACHE_TIMEOUT`` seconds.
+        """
+        if getattr(user, 'is_anonymous', False):
+            return {}
+
+        cache_key = cls.contexts_by_role_cache_key(user.id)
+        cached_response = TieredCache.get_cached_response(cache_key)
+        if cached_response.is_found:
+            return cached_response.value
+
+        contexts_by_role = defaultdict(set)
+        for role_name, context in cls.get_assignments(user):
+            contexts_by_role[role_name].update(set_from_collection_or_single_item(context))
+        contexts_by_role = dict(contexts_by_role)
+
+        TieredCache.set_all_tiers(cache_key, contexts_by_role, settings.ROLE_ASSIGNMENTS_CACHE_TIMEOUT)
+        return contexts_by_role
+
+    @classmethod
+    def invalidate_contexts_by_role(cls, user_ids):
+        """
+        Drops the cached role contexts of the given users. Bulk writes that bypass model
+        signals, e.g. ``QuerySet.update()`` or ``bulk_create()``, must call this themselves.
+        """
+        delete_tiered_cache_keys_on_commit(
+            cls.contexts_by_role_cache_key(user_id) for user_id in set(user_ids)
+        )
+
     def __str__(self):
         """
         Return human-readable string representation.
@@ -105,3 +151,18 @@ class EnterpriseAccessRoleAssignment(UserRoleAssignment):
         Return uniquely identifying string representation.
         """
         return self.__str__()
+
+
+@receiver(models.signals.post_save, sender=EnterpriseAccessRoleAssignment)
+@receiver(models.signals.post_delete, sender=EnterpriseAccessRoleAssignment)
+def invalidate_contexts_by_role_of_assignment_user(sender, **kwargs):
+    sender.invalidate_contexts_by_role([kwargs['instance'].user_id])
+
+
+@receiver(models.signals.post_save, sender=EnterpriseAccessFeatureRole)
+def invalidate_contexts_by_role_of_renamed_role_users(sender, **kwargs):  # pylint: disable=unused-argument
+    if kwargs['created']:
+        return
+    EnterpriseAccessRoleAssignment.invalidate_contexts_by_role(
+        EnterpriseAccessRoleAssignment.objects.filter(role=kwargs['instance']).values_list('user_id', flat=True)
+    )
@@ -3,10 +3,57 @@ Rules needed to restrict access to the enterprise access service.
 """
 import crum
 import rules
-from edx_rbac.utils import get_decoded_jwt, request_user_has_implicit_access_via_jwt, user_has_access_via_database
+from edx_rbac.utils import feature_roles_from_jwt, get_decoded_jwt
 
 from enterprise_access.apps.core import constants
 from enterprise_access.apps.core.models import EnterpriseAccessRoleAssignment
+from enterprise_access.cache_utils import request_cache
+
+RBAC_REQUEST_CACHE_NAMESPACE = 'enterprise_access_rbac'
+
+
+def _memoized_for_current_request(cache_key, load):
+    """
+    Returns ``load()``, memoized for the duration of the current request, whose cache is reset
+    by the ``RequestCacheMiddleware``. Outside of a request, nothing is memoized.
+    """
+    if crum.get_current_request() is None:
+        return load()
+
+    cache = request_cache(namespace=RBAC_REQUEST_CACHE_NAMESPACE)
+    cached_response = cache.get_cached_response(cache_key)
+    if cached_response.is_found:
+        return cached_response.value
+
+    value = load()
+    cache.set(cache_key, value)
+    return value
+
+
+def _get_implicit_contexts_by_role():
+    """
+    Returns the contexts of each feature role granted by the request's JWT, which is
+    decoded once per request.
+    """
+    return _memoized_for_current_request(
+        'implicit_contexts_by_role',
+        lambda: feature_roles_from_jwt(get_decoded_jwt(crum.get_current_request())),
+    )
+
+
+def _get_explicit_contexts_by_role(user):
+    """
+    Returns the contexts of each feature role assigned to the user in the database, which
+    are cached per user across requests and invalidated whenever the user's assignments change.
+    """
+    return EnterpriseAccessRoleAssignment.get_contexts_by_role(user)
+
+
+def _has_access_to_context(assigned_contexts, enterprise_customer_uuid):
+    """
+    Whether the assigned contexts of a role grant access to the given enterprise customer uuid.
+    """
+    return constants.ALL_ACCESS_CONTEXT in assigned_contexts or str(enterprise_customer_uuid) in assigned_contexts
 
 
 def _has_implicit_access_to_role(_, enterprise_customer_uuid, feature_role):
@@ -20,10 +67,9 @@ def _has_implicit_access_to_role(_, enterprise_customer_uuid, feature_role):
     if not enterprise_customer_uuid:
         return False
 
-    return request_user_has_implicit_access_via_jwt(
-        get_decoded_jwt(crum.get_current_request()),
-        feature_role,
-        str(enterprise_customer_uuid),
+    return _has_access_to_context(
+        _get_implicit_contexts_by_role().get(feature_role, ()),
+        enterprise_customer_uuid,
     )
 
 
@@ -37,11 +83,9 @@ def _has_explicit_access_to_role(user, enterprise_customer_uuid, feature_role):
     if not enterprise_customer_uuid:
         return False
 
-    return user_has_access_via_database(
-        user,
-        feature_role,
-        EnterpriseAccessRoleAssignment,
-        str(enterprise_customer_uuid),
+    return _has_access_to_context(
+        _get_explicit_contexts_by_role(user).get(feature_role, ()),
+        enterprise_customer_uuid,
     )
 
 
@@ -288,11 +332,7 @@ def has_implicit_access_to_provisioning_admin(_, *args, **kwargs):
     Returns:
         boolean: whether the request user has access.
     """
-    return request_user_has_implicit_access_via_jwt(
-        get_decoded_jwt(crum.get_current_request()),
-        constants.PROVISIONING_ADMIN_ROLE,
-        context=None,
-    )
+    return bool(_get_implicit_contexts_by_role().get(constants.PROVISIONING_ADMIN_ROLE))
 
 
 # Customer Billing rule predicates:
@@ -1,10 +1,15 @@
 """ Tests for core models. """
+from uuid import uuid4
 
+from django.core.cache import cache as django_cache
 from django.test import TestCase
 from django_dynamic_fixture import G
+from edx_django_utils.cache import RequestCache
 from social_django.models import UserSocialAuth
 
-from enterprise_access.apps.core.models import User
+from enterprise_access.apps.core import constants
+from enterprise_access.apps.core.models import EnterpriseAccessFeatureRole, EnterpriseAccessRoleAssignment, User
+from enterprise_access.apps.core.tests.factories import UserFactory
 
 
 class UserTests(TestCase):
@@ -43,3 +48,76 @@ class UserTests(TestCase):
         email = 'Bob@edx.org'
         user = G(User, email=email)
         self.assertEqual(str(user), email)
+
+
+class EnterpriseAccessRoleAssignmentTests(TestCase):
+    """ EnterpriseAccessRoleAssignment model tests. """
+
+    def setUp(self):
+        super().setUp()
+        self.user = UserFactory()
+        self.role = EnterpriseAccessFeatureRole.objects.get(name=constants.REQUESTS_ADMIN_ROLE)
+        self.enterprise_customer_uuid = uuid4()
+        self.addCleanup(django_cache.clear)
+        self.addCleanup(RequestCache.clear_all_namespaces)
+
+    def _get_contexts_by_role_from_shared_cache(self):
+        # Drop the request-local tier, as happens between requests.
+        RequestCache.clear_all_namespaces()
+        return EnterpriseAccessRoleAssignment.get_contexts_by_role(self.user)
+
+    def test_get_contexts_by_role_is_cached(self):
+        EnterpriseAccessRoleAssignment.objects.create(
+            user=self.user, role=self.role, enterprise_customer_uuid=self.enterprise_customer_uuid,
+        )
+        EnterpriseAccessRoleAssignment.objects.create(user=self.user, role=self.role)
+        expected = {constants.REQUESTS_ADMIN_ROLE: {str(self.enterprise_customer_uuid), constants.ALL_ACCESS_CONTEXT}}
+
+        with self.assertNumQueries(1):
+            self.assertEqual(EnterpriseAccessRoleAssignment.get_contexts_by_role(self.user), expected)
+        with self.assertNumQueries(0):
+            self.assertEqual(self._get_contexts_by_role_from_shared_cache(), expected)
+
+    def test_get_contexts_by_role_invalidated_on_save_and_delete(self):
+        self.assertEqual(EnterpriseAccessRoleAssignment.get_contexts_by_role(self.user), {})
+
+        assignment = EnterpriseAccessRoleAssignment.objects.create(
+            user=self.user, role=self.role, enterprise_customer_uuid=self.enterprise_customer_uuid,
+        )
+        self.assertEqual(
+            self._get_contexts_by_role_from_shared_cache(),
+            {constants.REQUESTS_ADMIN_ROLE: {str(self.enterprise_customer_uuid)}},
+        )
+
+        other_enterprise_customer_uuid = uuid4()
+        assignment.enterprise_customer_uuid = other_enterprise_customer_uuid
+        assignment.save()
+        self.assertEqual(
+            self._get_contexts_by_role_from_shared_cache(),
+            {constants.REQUESTS_ADMIN_ROLE: {str(other_enterprise_customer_uuid)}},
+        )
+
+        assignment.delete()
+        self.assertEqual(self._get_contexts_by_role_from_shared_cache(), {})
+
+    def test_get_contexts_by_role_invalidated_on_role_rename(self):
+        EnterpriseAccessRoleAssignment.objects.create(user=self.user, role=self.role)
+        self.assertIn(constants.REQUESTS_ADMIN_ROLE, EnterpriseAccessRoleAssignment.get_contexts_by_role(self.user))
+
+        self.role.name = 'renamed_role'
+        self.role.save()
+
+        self.assertEqual(
+            self._get_contexts_by_role_from_shared_cache(),
+            {'renamed_role': {constants.ALL_ACCESS_CONTEXT}},
+        )
+
+    def test_get_contexts_by_role_is_per_user(self):
+        other_user = UserFactory()
+        EnterpriseAccessRoleAssignment.objects.create(user=other_user, role=self.role)
+
+        self.assertEqual(EnterpriseAccessRoleAssignment.get_contexts_by_role(self.user), {})
+        self.assertEqual(
+            EnterpriseAccessRoleAssignment.get_contexts_by_role(other_user),
+            {constants.REQUESTS_ADMIN_ROLE: {constants.ALL_ACCESS_CONTEXT}},
+        )
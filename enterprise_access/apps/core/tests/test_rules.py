@@ -0,0 +1,94 @@
+""" Tests for core rules. """
+from unittest import mock
+from uuid import uuid4
+
+import crum
+from django.core.cache import cache as django_cache
+from django.test import RequestFactory, TestCase
+from edx_django_utils.cache import RequestCache
+
+from enterprise_access.apps.core import constants
+from enterprise_access.apps.core.models import EnterpriseAccessFeatureRole, EnterpriseAccessRoleAssignment
+from enterprise_access.apps.core.rules import (
+    has_explicit_access_to_bff_admin,
+    has_explicit_access_to_requests_admin,
+    has_implicit_access_to_policy_operator,
+    has_implicit_access_to_provisioning_admin,
+    has_implicit_access_to_requests_admin
+)
+from enterprise_access.apps.core.tests.factories import UserFactory
+
+
+class RulesTests(TestCase):
+    """
+    Tests for the per-request memoization of RBAC rule predicates.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = UserFactory()
+        self.enterprise_customer_uuid = uuid4()
+        self.addCleanup(django_cache.clear)
+        self.addCleanup(RequestCache.clear_all_namespaces)
+
+    def _set_current_request(self):
+        crum.set_current_request(RequestFactory().get('/'))
+        self.addCleanup(crum.set_current_request, None)
+
+    def _assign_role(self, role_name, enterprise_customer_uuid=None):
+        EnterpriseAccessRoleAssignment.objects.create(
+            user=self.user,
+            role=EnterpriseAccessFeatureRole.objects.get_or_create(name=role_name)[0],
+            enterprise_customer_uuid=enterprise_customer_uuid,
+        )
+
+    @mock.patch('enterprise_access.apps.core.rules.get_decoded_jwt')
+    def test_jwt_is_decoded_once_per_request(self, mock_get_decoded_jwt):
+        self._set_current_request()
+        mock_get_decoded_jwt.return_value = {
+            'roles': [f'{constants.SYSTEM_ENTERPRISE_ADMIN_ROLE}:{self.enterprise_customer_uuid}'],
+        }
+
+        assert has_implicit_access_to_requests_admin(self.user, self.enterprise_customer_uuid)
+        assert not has_implicit_access_to_requests_admin(self.user, uuid4())
+        assert not has_implicit_access_to_policy_operator(self.user, self.enterprise_customer_uuid)
+        assert not has_implicit_access_to_provisioning_admin(self.user)
+        mock_get_decoded_jwt.assert_called_once()
+
+    @mock.patch('enterprise_access.apps.core.rules.get_decoded_jwt')
+    def test_all_access_context_from_jwt(self, mock_get_decoded_jwt):
+        self._set_current_request()
+        mock_get_decoded_jwt.return_value = {
+            'roles': [f'{constants.SYSTEM_ENTERPRISE_OPERATOR_ROLE}:{constants.ALL_ACCESS_CONTEXT}'],
+        }
+
+        assert has_implicit_access_to_policy_operator(self.user, self.enterprise_customer_uuid)
+        assert has_implicit_access_to_provisioning_admin(self.user)
+        assert not has_implicit_access_to_policy_operator(self.user, None)
+
+    def test_role_assignments_are_cached_across_requests(self):
+        self._set_current_request()
+        self._assign_role(constants.REQUESTS_ADMIN_ROLE, self.enterprise_customer_uuid)
+        self._assign_role(constants.BFF_ADMIN_ROLE)
+
+        with self.assertNumQueries(1):
+            assert has_explicit_access_to_requests_admin(self.user, self.enterprise_customer_uuid)
+            assert has_explicit_access_to_requests_admin(self.user, str(self.enterprise_customer_uuid))
+            assert not has_explicit_access_to_requests_admin(self.user, uuid4())
+            assert has_explicit_access_to_bff_admin(self.user, uuid4())
+
+        RequestCache.clear_all_namespaces()
+        self._set_current_request()
+        with self.assertNumQueries(0):
+            assert has_explicit_access_to_requests_admin(self.user, self.enterprise_customer_uuid)
+
+    def test_role_assignment_changes_are_seen_by_later_checks(self):
+        assert not has_explicit_access_to_requests_admin(self.user, self.enterprise_customer_uuid)
+
+        self._assign_role(constants.REQUESTS_ADMIN_ROLE, self.enterprise_customer_uuid)
+
+        assert has_explicit_access_to_requests_admin(self.user, self.enterprise_customer_uuid)
+
+        EnterpriseAccessRoleAssignment.objects.filter(user=self.user).delete()
+
+        assert not has_explicit_access_to_requests_admin(self.user, self.enterprise_customer_uuid)
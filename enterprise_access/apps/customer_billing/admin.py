@@ -11,7 +11,13 @@ from django.utils.html import format_html
 from djangoql.admin import DjangoQLSearchMixin
 
 from .constants import CheckoutIntentState
-from .models import CheckoutIntent, SelfServiceSubscriptionRenewal, StripeEventData, StripeEventSummary
+from .models import (
+    CheckoutIntent,
+    SelfServiceSubscriptionRenewal,
+    StripeEventData,
+    StripeEventSummary,
+    StripePricingSnapshot
+)
 from .stripe_event_handlers import StripeEventHandler
 
 
@@ -336,6 +342,21 @@ class StripeEventSummaryAdmin(DjangoQLSearchMixin, admin.ModelAdmin):
         return obj.checkout_intent.state if obj.checkout_intent else None
 
 
+@admin.register(StripePricingSnapshot)
+class StripePricingSnapshotAdmin(admin.ModelAdmin):
+    """
+    The admin class for StripePricingSnapshot.
+    """
+    list_display = [
+        'version',
+        'created',
+    ]
+    readonly_fields = [
+        'version',
+        'prices',
+    ]
+
+
 @admin.register(SelfServiceSubscriptionRenewal)
 class SelfServiceSubscriptionRenewalAdmin(DjangoQLSearchMixin, admin.ModelAdmin):
     """
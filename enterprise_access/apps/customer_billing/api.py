@@ -6,10 +6,12 @@ from collections.abc import Mapping
 from typing import TypedDict, Unpack, cast
 
 import stripe
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AbstractUser
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email, validate_slug
+from edx_django_utils.cache import TieredCache
 from requests.exceptions import HTTPError
 
 from enterprise_access.apps.api_client.lms_client import LmsApiClient
@@ -21,6 +23,7 @@ from enterprise_access.apps.customer_billing.models import (
 )
 from enterprise_access.apps.customer_billing.pricing_api import get_ssp_product_pricing
 from enterprise_access.apps.customer_billing.stripe_api import create_subscription_checkout_session
+from enterprise_access.cache_utils import versioned_cache_key
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -71,6 +74,40 @@ def _get_lms_user_id(email: str | None) -> int | None:
     return user_data[0].get('id')
 
 
+def get_and_cache_existing_enterprise_customer(slug: str | None = None, name: str | None = None) -> dict | None:
+    """
+    Return the existing enterprise customer with the given slug (or, if no slug is given, name),
+    or None if there is no such customer. Checkout form fields are validated as they're typed,
+    so the LMS response, including the absence of a customer, is briefly cached.
+
+    Raises:
+        HTTPError: For any error response from the LMS other than a 404.
+    """
+    cache_key = versioned_cache_key('checkout_existing_enterprise_customer', slug, None if slug else name)
+    cached_response = TieredCache.get_cached_response(cache_key)
+    if cached_response.is_found:
+        return cached_response.value
+
+    lms_client = LmsApiClient()
+    try:
+        if slug:
+            existing_customer = lms_client.get_enterprise_customer_data(enterprise_customer_slug=slug)
+        else:
+            existing_customer = lms_client.get_enterprise_customer_data(enterprise_customer_name=name)
+    except HTTPError as exc:
+        if exc.response.status_code != 404:
+            raise
+        existing_customer = None
+
+    existing_customer = existing_customer or None
+    TieredCache.set_all_tiers(
+        cache_key,
+        existing_customer,
+        django_cache_timeout=settings.CHECKOUT_EXISTING_ENTERPRISE_CUSTOMER_CACHE_TIMEOUT,
+    )
+    return existing_customer
+
+
 class CheckoutSessionInputValidator():
     """
     Loosely modeled after RegistrationValidationView:
@@ -82,6 +119,24 @@ class CheckoutSessionInputValidator():
             self._cached_lms_user_id = _get_lms_user_id(email)  # pylint: disable=attribute-defined-outside-init
         return self._cached_lms_user_id
 
+    def get_reserved_fields(self, input_data: CheckoutSessionInputValidatorData) -> set[str]:
+        """
+        Return which of the given enterprise slug and company name are reserved by other users,
+        looking both up with a single query that's shared by the slug and company name handlers.
+        """
+        slug = input_data.get('enterprise_slug')
+        name = input_data.get('company_name')
+        user = input_data.get('user')
+        # handle_user() may fill in the user between handlers, which changes whose reservations are excluded.
+        lookup = (slug, name, user.pk if user else None)
+        if getattr(self, '_cached_reserved_fields_lookup', None) != lookup:
+            self._cached_reserved_fields_lookup = lookup  # pylint: disable=attribute-defined-outside-init
+            self._cached_reserved_fields = (  # pylint: disable=attribute-defined-outside-init
+                CheckoutIntent.get_reserved_fields(slug=slug, name=name, exclude_user=user)
+                if (slug or name) else set()
+            )
+        return self._cached_reserved_fields
+
     def handle_admin_email(self, input_data: CheckoutSessionInputValidatorData) -> FieldValidationResult:
         """
         Ensure the provided email is registered.
@@ -132,7 +187,6 @@ class CheckoutSessionInputValidator():
         """
         admin_email = input_data.get('admin_email')
         enterprise_slug = input_data.get('enterprise_slug')
-        user = input_data.get('user')
 
         # We need multiple form fields to validate enterprise_slug.
         if not all([admin_email, enterprise_slug]):
@@ -150,22 +204,13 @@ class CheckoutSessionInputValidator():
             return {'error_code': error_code, 'developer_message': developer_message}
 
         # Check if slug is available (considering user's own reservation)
-        if not CheckoutIntent.can_reserve(slug=enterprise_slug, exclude_user=user):
+        if 'slug' in self.get_reserved_fields(input_data):
             error_code, developer_message = slug_error_codes['SLUG_RESERVED']
             return {'error_code': error_code, 'developer_message': developer_message}
 
         # Fetch any existing customers with the same slug, and make a distinction
         # if the given email is already an admin of any found customer.
-        lms_client = LmsApiClient()
-        try:
-            existing_customer_for_slug = lms_client.get_enterprise_customer_data(
-                enterprise_customer_slug=enterprise_slug
-            )
-        except HTTPError as exc:
-            if exc.response.status_code == 404:
-                existing_customer_for_slug = None
-            else:
-                raise
+        existing_customer_for_slug = get_and_cache_existing_enterprise_customer(slug=enterprise_slug)
         if existing_customer_for_slug:
             admin_emails_for_existing_customer = [
                 admin['email']
@@ -310,7 +355,6 @@ class CheckoutSessionInputValidator():
         also want to check for any reserved customer names that match the provided company name.
         """
         company_name = input_data.get('company_name')
-        user = input_data.get('user')
 
         # Check if company_name is provided
         if not company_name:
@@ -319,24 +363,18 @@ class CheckoutSessionInputValidator():
             return {'error_code': error_code, 'developer_message': developer_message}
 
         # Check if this name is already reserved
-        if not CheckoutIntent.can_reserve(name=company_name, exclude_user=user):
+        if 'name' in self.get_reserved_fields(input_data):
             error_code, developer_message = CHECKOUT_SESSION_ERROR_CODES['company_name']['EXISTING_ENTERPRISE_CUSTOMER']
             return {'error_code': error_code, 'developer_message': developer_message}
 
         # Check for existing customers with the same name
-        lms_client = LmsApiClient()
         try:
-            existing_customer = lms_client.get_enterprise_customer_data(
-                enterprise_customer_name=company_name,
-            )
+            existing_customer = get_and_cache_existing_enterprise_customer(name=company_name)
         except HTTPError as exc:
-            if exc.response.status_code == 404:
-                existing_customer = None
-            else:
-                # If we get an unexpected error, let's fail safely
-                error_code, developer_message = CHECKOUT_SESSION_ERROR_CODES['common']['API_ERROR']
-                logger.error(f'Error checking company name: {exc}')
-                return {'error_code': error_code, 'developer_message': developer_message}
+            # If we get an unexpected error, let's fail safely
+            error_code, developer_message = CHECKOUT_SESSION_ERROR_CODES['common']['API_ERROR']
+            logger.error(f'Error checking company name: {exc}')
+            return {'error_code': error_code, 'developer_message': developer_message}
 
         if existing_customer:
             error_code, developer_message = CHECKOUT_SESSION_ERROR_CODES['company_name']['EXISTING_ENTERPRISE_CUSTOMER']
@@ -9,4 +9,8 @@ class CustomerBillingConfig(AppConfig):
     name = 'enterprise_access.apps.customer_billing'
 
     def ready(self):
-        import enterprise_access.apps.customer_billing.signals  # pylint: disable=import-outside-toplevel,unused-import
+        # pylint: disable=import-outside-toplevel,unused-import
+        import enterprise_access.apps.customer_billing.signals
+        # Registers the stripe event queue tasks, which live outside of the tasks module
+        # because they dispatch to the stripe event handlers, which enqueue the tasks in it.
+        import enterprise_access.apps.customer_billing.stripe_event_queue
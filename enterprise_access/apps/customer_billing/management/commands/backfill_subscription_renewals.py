@@ -3,16 +3,14 @@ Management command to backfill SelfServiceSubscriptionRenewal records from exist
 """
 from django.core.management.base import BaseCommand
 from django.db import transaction
+from simple_history.utils import bulk_create_with_history
 
 from enterprise_access.apps.customer_billing.models import (
     CheckoutIntent,
     SelfServiceSubscriptionRenewal,
     StripeEventSummary
 )
-from enterprise_access.apps.provisioning.models import (
-    GetCreateSubscriptionPlanRenewalStep,
-    ProvisionNewCustomerWorkflow
-)
+from enterprise_access.apps.provisioning.models import GetCreateSubscriptionPlanRenewalStep
 
 
 class Command(BaseCommand):
@@ -21,6 +19,16 @@ class Command(BaseCommand):
 
     This command finds completed provisioning workflows that have subscription plan renewals
     but no corresponding SelfServiceSubscriptionRenewal tracking records, and creates them.
+
+    Steps are read in batches keyed on their ``uuid``, with the related checkout intents, existing
+    renewals and Stripe event summaries of each batch loaded in bulk, and the batch's renewals
+    created with a single bulk insert. If the bulk insert fails, the batch's renewals are created
+    one at a time, so that a bad record only fails its own step. The last step of each batch is
+    reported as a checkpoint, from which an interrupted run can be resumed with ``--start-after``.
+    A batch that fails as a whole is reported with the checkpoint to rerun it from, and the run
+    continues with the next batch.
+
+    This command only creates tracking records, and makes no license-manager calls.
     """
     help = 'Backfill SelfServiceSubscriptionRenewal records from existing provisioning workflows'
 
@@ -36,6 +44,11 @@ class Command(BaseCommand):
             action='store_true',
             help='Show what would be processed without actually creating records',
         )
+        parser.add_argument(
+            '--start-after',
+            type=str,
+            help='Resume after the renewal step with this uuid, i.e. the last reported checkpoint',
+        )
 
     def _write(self, msg):
         self.stdout.write(msg)
@@ -49,12 +62,28 @@ class Command(BaseCommand):
     def _write_success(self, msg):
         self._write(self.style.SUCCESS(msg))
 
+    def _iter_step_batches(self, steps_queryset, batch_size, start_after):
+        """
+        Yields batches of renewal steps, paginating on ``uuid``.
+        """
+        last_uuid = start_after
+        while True:
+            page_queryset = steps_queryset.order_by('uuid')
+            if last_uuid:
+                page_queryset = page_queryset.filter(uuid__gt=last_uuid)
+            batch_steps = list(page_queryset[:batch_size])
+            if not batch_steps:
+                return
+            last_uuid = batch_steps[-1].uuid
+            yield batch_steps
+
     def handle(self, *args, **options):
         """
         Execute the backfill command.
         """
         batch_size = options['batch_size']
         dry_run = options['dry_run']
+        start_after = options.get('start_after')
 
         if dry_run:
             self._write_warning('DRY RUN MODE - No records will be created')
@@ -68,90 +97,197 @@ class Command(BaseCommand):
 
         total_steps = steps_queryset.count()
         self._write(f'Found {total_steps} successful subscription renewal steps')
+        if start_after:
+            self._write(f'Resuming after renewal step {start_after}')
 
         created_count = 0
         skipped_count = 0
         error_count = 0
+        processed = 0
+        checkpoint = start_after
+        # The checkpoint preceding the first batch that failed as a whole, if any.
+        failed_batch_checkpoint = None
+        has_failed_batch = False
 
-        for i in range(0, total_steps, batch_size):
-            batch_steps = steps_queryset[i:i + batch_size]
-
-            for step in batch_steps:
-                try:
-                    result = self._handle_renewal_step(step, dry_run)
-                    if result == 'created':
-                        created_count += 1
-                    elif result == 'skipped':
-                        skipped_count += 1
-                except Exception as exc:  # pylint: disable=broad-exception-caught
-                    error_count += 1
-                    self._write_error(f'Error processing renewal step {step.uuid}: {exc}')
+        for batch_steps in self._iter_step_batches(steps_queryset, batch_size, start_after):
+            try:
+                results = self._handle_renewal_step_batch(batch_steps, dry_run)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                results = ['error'] * len(batch_steps)
+                self._write_error(
+                    f'Error processing batch of renewal steps after checkpoint {checkpoint}: {exc}'
+                )
+                if not has_failed_batch:
+                    has_failed_batch = True
+                    failed_batch_checkpoint = checkpoint
+            created_count += results.count('created')
+            skipped_count += results.count('skipped')
+            error_count += results.count('error')
 
             # Progress update
-            processed = min(i + batch_size, total_steps)
-            self._write(f'Processed {processed}/{total_steps} renewal steps...')
+            processed += len(batch_steps)
+            checkpoint = batch_steps[-1].uuid
+            self._write(
+                f'Processed {processed}/{total_steps} renewal steps... '
+                f'(checkpoint: {checkpoint})'
+            )
 
         self._write_success(
             f'\nBackfill complete! Created: {created_count}, '
             f'Skipped: {skipped_count}, Errors: {error_count}'
         )
+        if has_failed_batch:
+            rerun_from = 'from the start'
+            if failed_batch_checkpoint:
+                rerun_from = f'with --start-after {failed_batch_checkpoint}'
+            self._write_error(f'Some batches failed, rerun {rerun_from} to retry them')
 
-    def _handle_renewal_step(self, step: GetCreateSubscriptionPlanRenewalStep, dry_run: bool) -> str:
+    def _handle_renewal_step_batch(self, batch_steps, dry_run: bool) -> list[str]:
         """
-        Process a single renewal step to create missing SelfServiceSubscriptionRenewal records.
+        Process a batch of renewal steps to create missing SelfServiceSubscriptionRenewal records.
 
         Returns:
-            str: 'created', 'skipped', or raises exception
+            list: The result of each step, one of 'created', 'skipped' or 'error'
         """
-        # Find the related workflow for this step
-        try:
-            workflow = ProvisionNewCustomerWorkflow.objects.get(uuid=step.workflow_record_uuid)
-        except ProvisionNewCustomerWorkflow.DoesNotExist:
-            return 'skipped'
+        # Only steps of workflows with a checkout intent are relevant.
+        checkout_intents_by_workflow_uuid = {
+            checkout_intent.workflow_id: checkout_intent
+            for checkout_intent in CheckoutIntent.objects.filter(
+                workflow_id__in={step.workflow_record_uuid for step in batch_steps},
+            )
+        }
+        checkout_intent_ids = [checkout_intent.id for checkout_intent in checkout_intents_by_workflow_uuid.values()]
 
-        # Check if there's a checkout intent on the related workflow
-        try:
-            checkout_intent = workflow.checkoutintent
-        except CheckoutIntent.DoesNotExist:
-            return 'skipped'
+        existing_renewal_keys = set(
+            SelfServiceSubscriptionRenewal.objects.filter(
+                checkout_intent_id__in=checkout_intent_ids,
+            ).values_list('checkout_intent_id', 'subscription_plan_renewal_id')
+        )
 
-        renewal_id = step.output_object.id
+        # The latest summary of each checkout intent, whose event data the renewal is linked to.
+        latest_summaries_by_checkout_intent_id = {}
+        for summary in StripeEventSummary.objects.filter(
+            checkout_intent_id__in=checkout_intent_ids,
+            stripe_subscription_id__isnull=False,
+            stripe_event_data__isnull=False,
+        ).order_by('checkout_intent_id', '-stripe_event_created_at'):
+            latest_summaries_by_checkout_intent_id.setdefault(summary.checkout_intent_id, summary)
 
-        # Check if SelfServiceSubscriptionRenewal already exists for this checkout intent
-        existing_renewal = SelfServiceSubscriptionRenewal.objects.filter(
-            checkout_intent=checkout_intent,
-            subscription_plan_renewal_id=renewal_id
-        ).first()
+        # Each event can only be linked to one renewal.
+        linked_event_ids = set(
+            SelfServiceSubscriptionRenewal.objects.filter(
+                stripe_event_data_id__in=[
+                    summary.stripe_event_data_id for summary in latest_summaries_by_checkout_intent_id.values()
+                ],
+            ).values_list('stripe_event_data_id', flat=True)
+        )
 
-        if existing_renewal:
-            return 'skipped'
+        results = []
+        renewals_to_create_by_step_uuid = {}
+        for step in batch_steps:
+            try:
+                renewal = self._build_renewal_for_step(
+                    step,
+                    checkout_intents_by_workflow_uuid,
+                    existing_renewal_keys,
+                    latest_summaries_by_checkout_intent_id,
+                    linked_event_ids,
+                )
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                results.append('error')
+                self._write_error(f'Error processing renewal step {step.uuid}: {exc}')
+                continue
 
-        if dry_run:
+            if renewal is None:
+                results.append('skipped')
+                continue
+
+            results.append('created')
+            existing_renewal_keys.add((renewal.checkout_intent_id, renewal.subscription_plan_renewal_id))
+            linked_event_ids.add(renewal.stripe_event_data_id)
+            renewals_to_create_by_step_uuid[step.uuid] = renewal
+
+        for renewal in renewals_to_create_by_step_uuid.values():
+            verb = 'Would create' if dry_run else 'Created'
             self._write(
-                f'Would create SelfServiceSubscriptionRenewal for '
-                f'checkout_intent {checkout_intent.id}, renewal {renewal_id}'
+                f'{verb} SelfServiceSubscriptionRenewal for '
+                f'checkout_intent {renewal.checkout_intent_id}, renewal {renewal.subscription_plan_renewal_id}'
             )
-            return 'created'
 
-        # Get the latest summary and then create a SelfServiceSubscriptionRenewal record
-        latest_summary = StripeEventSummary.get_latest_for_checkout_intent(
-            checkout_intent,
-            stripe_subscription_id__isnull=False,
-            stripe_event_data__isnull=False
-        )
+        if not dry_run and renewals_to_create_by_step_uuid:
+            failed_step_uuids = self._create_renewals(renewals_to_create_by_step_uuid)
+            for index, step in enumerate(batch_steps):
+                if step.uuid in failed_step_uuids:
+                    results[index] = 'error'
+
+        return results
+
+    def _create_renewals(self, renewals_by_step_uuid):
+        """
+        Creates the given renewals, keyed by the uuid of their step, with a single bulk insert
+        or, if that fails, one at a time.
+
+        Returns:
+            set: The uuids of the steps whose renewal could not be created
+        """
+        try:
+            with transaction.atomic():
+                bulk_create_with_history(list(renewals_by_step_uuid.values()), SelfServiceSubscriptionRenewal)
+            return set()
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            self._write_warning(
+                f'Bulk creation of {len(renewals_by_step_uuid)} renewals failed, creating them one by one: {exc}'
+            )
+
+        failed_step_uuids = set()
+        for step_uuid, renewal in renewals_by_step_uuid.items():
+            try:
+                with transaction.atomic():
+                    renewal.save()
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                failed_step_uuids.add(step_uuid)
+                self._write_error(f'Error processing renewal step {step_uuid}: {exc}')
+        return failed_step_uuids
+
+    @staticmethod
+    def _build_renewal_for_step(
+        step: GetCreateSubscriptionPlanRenewalStep,
+        checkout_intents_by_workflow_uuid,
+        existing_renewal_keys,
+        latest_summaries_by_checkout_intent_id,
+        linked_event_ids,
+    ) -> SelfServiceSubscriptionRenewal | None:
+        """
+        Builds the missing SelfServiceSubscriptionRenewal record of a single renewal step.
+
+        Returns:
+            SelfServiceSubscriptionRenewal: The unsaved record, or None if the step should be skipped
+
+        Raises:
+            Exception: If the record can't be built
+        """
+        # Check if there's a checkout intent on the related workflow
+        checkout_intent = checkout_intents_by_workflow_uuid.get(step.workflow_record_uuid)
+        if not checkout_intent:
+            return None
+
+        renewal_id = step.output_object.id
+
+        # Check if SelfServiceSubscriptionRenewal already exists for this checkout intent
+        if (checkout_intent.id, renewal_id) in existing_renewal_keys:
+            return None
+
+        latest_summary = latest_summaries_by_checkout_intent_id.get(checkout_intent.id)
         if not latest_summary:
             raise Exception(f'No summary for checkout intent {checkout_intent}')
-
-        with transaction.atomic():
-            SelfServiceSubscriptionRenewal.objects.create(
-                checkout_intent=checkout_intent,
-                subscription_plan_renewal_id=renewal_id,
-                stripe_event_data=latest_summary.stripe_event_data,
-                stripe_subscription_id=latest_summary.stripe_subscription_id,
+        if latest_summary.stripe_event_data_id in linked_event_ids:
+            raise Exception(
+                f'Stripe event {latest_summary.stripe_event_data_id} is already linked to a renewal'
             )
 
-        self._write(
-            f'Created SelfServiceSubscriptionRenewal for '
-            f'checkout_intent {checkout_intent.id}, renewal {renewal_id}'
+        return SelfServiceSubscriptionRenewal(
+            checkout_intent=checkout_intent,
+            subscription_plan_renewal_id=renewal_id,
+            stripe_event_data_id=latest_summary.stripe_event_data_id,
+            stripe_subscription_id=latest_summary.stripe_subscription_id,
         )
-        return 'created'
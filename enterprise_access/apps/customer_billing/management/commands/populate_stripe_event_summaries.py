@@ -1,11 +1,29 @@
 """
 Management command to populate StripeEventSummary records from existing StripeEventData.
 """
+import zlib
+
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
+from django.utils import timezone
 
 from enterprise_access.apps.customer_billing.models import StripeEventData, StripeEventSummary
 
+# Summary fields that are (re)computed by ``populate_with_summary_data()``, which
+# are the fields written when updating existing summaries in bulk.
+SUMMARY_UPDATE_FIELDS = [
+    field.name
+    for field in StripeEventSummary._meta.concrete_fields
+    if not field.primary_key and field.name not in ('created', 'stripe_event_data')
+]
+
+
+def event_shard(event_id, shard_count):
+    """
+    Returns the shard, in ``range(shard_count)``, to which the given event id belongs.
+    """
+    return zlib.crc32(event_id.encode()) % shard_count
+
 
 class Command(BaseCommand):
     """
@@ -13,6 +31,12 @@ class Command(BaseCommand):
 
     This command creates normalized summary records for existing Stripe events,
     extracting key fields for easier querying and API access.
+
+    Records are read in batches keyed on ``event_id`` (rather than by offset), and each batch's
+    summaries are built in memory and written with a bulk create/update. The work can be split
+    across concurrent invocations with ``--shard-count`` and ``--shard-index``, e.g.:
+
+    ./manage.py populate_stripe_event_summaries --force --shard-count=4 --shard-index=0
     """
     help = 'Populate StripeEventSummary records from existing StripeEventData'
 
@@ -38,6 +62,18 @@ class Command(BaseCommand):
             action='store_true',
             help='Recreate summary records even if they already exist',
         )
+        parser.add_argument(
+            '--shard-count',
+            type=int,
+            default=1,
+            help='Number of shards the events are split into, one per concurrent invocation (default: 1)',
+        )
+        parser.add_argument(
+            '--shard-index',
+            type=int,
+            default=0,
+            help='The shard, from 0 to shard-count - 1, processed by this invocation (default: 0)',
+        )
 
     def _execute_dry_run(self, queryset, total_count):
         """
@@ -46,7 +82,7 @@ class Command(BaseCommand):
         self.stdout.write(self.style.WARNING('DRY RUN - Would process:'))
 
         # Show sample of records that would be processed
-        sample_records = queryset[:min(10, total_count)]
+        sample_records = queryset.select_related('checkout_intent')[:min(10, total_count)]
         for event_data in sample_records:
             checkout_intent_info = ""
             if event_data.checkout_intent:
@@ -60,58 +96,85 @@ class Command(BaseCommand):
         if total_count > 10:
             self.stdout.write(f"  ... and {total_count - 10} more")
 
-    def _process_summary_batch(self, queryset, index, batch_size, force):
+    def _iter_event_id_batches(self, queryset, batch_size, shard_count, shard_index):
         """
-        Helper to process a batch of records from the given queryset.
+        Yields batches of the event ids in this invocation's shard, paginating on ``event_id``
+        so that rows gaining a summary during the run don't shift later batches.
         """
-        batch_queryset = queryset[index:index + batch_size]
-        batch_records = list(batch_queryset)
-        created_count, updated_count, error_count = (0, 0, 0)
+        last_event_id = None
+        while True:
+            page_queryset = queryset.order_by('event_id')
+            if last_event_id is not None:
+                page_queryset = page_queryset.filter(event_id__gt=last_event_id)
+            event_ids = list(page_queryset.values_list('event_id', flat=True)[:batch_size])
+            if not event_ids:
+                return
+            last_event_id = event_ids[-1]
+            yield event_ids, [
+                event_id for event_id in event_ids
+                if event_shard(event_id, shard_count) == shard_index
+            ]
+
+    def _process_summary_batch(self, event_ids, force):
+        """
+        Helper to build and write the summaries of the given events.
+        """
+        batch_records = list(
+            StripeEventData.objects.filter(
+                event_id__in=event_ids,
+            ).select_related(
+                'checkout_intent__workflow',
+                'summary',
+            )
+        )
+        steps_by_workflow_uuid = StripeEventSummary.get_trial_subscription_plan_steps_by_workflow_uuid({
+            event_data.checkout_intent.workflow.uuid
+            for event_data in batch_records
+            if event_data.checkout_intent and event_data.checkout_intent.workflow
+        })
+
+        summaries_to_create, summaries_to_update, error_count = [], [], 0
+        now = timezone.now()
+        for event_data in batch_records:
+            try:
+                existing_summary = getattr(event_data, 'summary', None)
+                if existing_summary and not force:
+                    continue
+                summary = existing_summary or StripeEventSummary(stripe_event_data=event_data)
+                summary.populate_with_summary_data(steps_by_workflow_uuid)
+                if existing_summary:
+                    summary.modified = now
+                    summaries_to_update.append(summary)
+                else:
+                    summaries_to_create.append(summary)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                error_count += 1
+                self.stdout.write(
+                    self.style.ERROR(
+                        f'Error processing event {event_data.event_id}: {str(e)}'
+                    )
+                )
 
         with transaction.atomic():
-            for event_data in batch_records:
-                try:
-                    if force and hasattr(event_data, 'summary'):
-                        # Update existing summary
-                        summary = event_data.summary
-                        summary.populate_with_summary_data()
-                        summary.save()
-                        updated_count += 1
-
-                        self.stdout.write(
-                            f'Updated summary for event {event_data.event_id}',
-                            ending='\r'
-                        )
-                    else:
-                        # Create new summary
-                        summary = StripeEventSummary(stripe_event_data=event_data)
-                        summary.populate_with_summary_data()
-                        summary.save()
-                        created_count += 1
-
-                        self.stdout.write(
-                            f'Created summary for event {event_data.event_id}',
-                            ending='\r'
-                        )
-
-                except Exception as e:  # pylint: disable=broad-exception-caught
-                    error_count += 1
-                    self.stdout.write(
-                        self.style.ERROR(
-                            f'Error processing event {event_data.event_id}: {str(e)}'
-                        )
-                    )
-        return created_count, updated_count, error_count
+            # Summaries may concurrently be created by the StripeEventData post_save signal.
+            StripeEventSummary.objects.bulk_create(summaries_to_create, ignore_conflicts=True)
+            StripeEventSummary.objects.bulk_update(summaries_to_update, SUMMARY_UPDATE_FIELDS)
+
+        return len(summaries_to_create), len(summaries_to_update), error_count
 
     def handle(self, *args, **options):
         batch_size = options['batch_size']
         dry_run = options['dry_run']
         event_type = options.get('event_type')
         force = options['force']
+        shard_count = options['shard_count']
+        shard_index = options['shard_index']
 
         # Validate batch size
         if batch_size < 1 or batch_size > 1000:
             raise CommandError('Batch size must be between 1 and 1000')
+        if shard_count < 1 or not 0 <= shard_index < shard_count:
+            raise CommandError('Shard index must be between 0 and shard count - 1')
 
         # Build queryset
         queryset = StripeEventData.objects.all()
@@ -131,24 +194,36 @@ class Command(BaseCommand):
             return
 
         self.stdout.write(f'Found {total_count} StripeEventData records to process')
+        if shard_count > 1:
+            self.stdout.write(f'Processing shard {shard_index} of {shard_count}')
 
         if dry_run:
             self._execute_dry_run(queryset, total_count)
             return
 
-        created_count, updated_count, error_count = (0, 0, 0)
+        created_count, updated_count, error_count, scanned_count = (0, 0, 0, 0)
         self.stdout.write(f'Processing {total_count} records in batches of {batch_size}...')
 
-        # Process in batches to avoid memory issues
-        for index in range(0, total_count, batch_size):
-            created_count, updated_count, error_count = self._process_summary_batch(
-                queryset, index, batch_size, force,
-            )
+        for batch_event_ids, shard_event_ids in self._iter_event_id_batches(
+            queryset, batch_size, shard_count, shard_index,
+        ):
+            scanned_count += len(batch_event_ids)
+            if not shard_event_ids:
+                continue
+            try:
+                batch_created, batch_updated, batch_errors = self._process_summary_batch(shard_event_ids, force)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                batch_created, batch_updated, batch_errors = (0, 0, len(shard_event_ids))
+                self.stdout.write(
+                    self.style.ERROR(f'Error writing summaries for batch ending {batch_event_ids[-1]}: {str(e)}')
+                )
+            created_count += batch_created
+            updated_count += batch_updated
+            error_count += batch_errors
 
             # Progress update
-            processed = min(index + batch_size, total_count)
             self.stdout.write(
-                f'\nProcessed {processed}/{total_count} records '
+                f'\nScanned {scanned_count}/{total_count} records '
                 f'(Created: {created_count}, Updated: {updated_count}, Errors: {error_count})'
             )
 
@@ -0,0 +1,25 @@
+"""
+Management command to refresh the versioned snapshot of Stripe prices read by checkout.
+"""
+from django.core.management.base import BaseCommand
+
+from enterprise_access.apps.customer_billing.pricing_api import refresh_stripe_pricing_snapshot
+
+
+class Command(BaseCommand):
+    """
+    Command to list the active Stripe prices and store them as the latest StripePricingSnapshot.
+    A new snapshot version is only created when the prices changed.
+
+    Intended to be scheduled, so that prices changed without a corresponding webhook
+    event reaching us are still picked up.
+
+    Usage:
+        ./manage.py refresh_stripe_pricing_snapshot
+    """
+
+    help = 'Refresh the versioned snapshot of Stripe prices read by checkout'
+
+    def handle(self, *args, **options):
+        snapshot = refresh_stripe_pricing_snapshot()
+        self.stdout.write(self.style.SUCCESS(f'Stripe pricing snapshot is at {snapshot}'))
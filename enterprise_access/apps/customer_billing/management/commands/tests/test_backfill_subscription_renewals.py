@@ -11,6 +11,7 @@ from django.test import TestCase
 from django.utils import timezone
 
 from enterprise_access.apps.core.tests.factories import UserFactory
+from enterprise_access.apps.customer_billing.management.commands.backfill_subscription_renewals import Command
 from enterprise_access.apps.customer_billing.models import CheckoutIntent, SelfServiceSubscriptionRenewal
 from enterprise_access.apps.customer_billing.tests.factories import (
     CheckoutIntentFactory,
@@ -185,3 +186,103 @@ class TestBackfillSubscriptionRenewalsCommand(TestCase):
 
         # Verify no renewal record was created for uncompleted step
         self.assertEqual(SelfServiceSubscriptionRenewal.objects.count(), 0)
+
+    def _create_workflow_with_summary(self, subscription_id):
+        """ Helper to create a workflow whose checkout intent has a subscription event summary. """
+        workflow = ProvisionNewCustomerWorkflowFactory()
+        checkout_intent = CheckoutIntentFactory(user=UserFactory(), workflow=workflow)
+        event_data = StripeEventDataFactory.create(checkout_intent=checkout_intent)
+        summary = event_data.summary
+        summary.stripe_subscription_id = subscription_id
+        summary.save()
+        return workflow, checkout_intent
+
+    def test_backfill_in_batches(self):
+        """Test that renewals are created across batches, with a checkpoint reported per batch."""
+        checkout_intents = []
+        for index in range(3):
+            workflow, checkout_intent = self._create_workflow_with_summary(f'sub_batch_{index}')
+            self._create_renewal_step(workflow, output_data={'id': 200 + index})
+            checkout_intents.append(checkout_intent)
+
+        out = StringIO()
+        call_command('backfill_subscription_renewals', batch_size=2, stdout=out)
+
+        self.assertEqual(
+            set(SelfServiceSubscriptionRenewal.objects.values_list(
+                'checkout_intent_id', 'subscription_plan_renewal_id',
+            )),
+            {(checkout_intent.id, 200 + index) for index, checkout_intent in enumerate(checkout_intents)},
+        )
+        output = out.getvalue()
+        last_step = GetCreateSubscriptionPlanRenewalStep.objects.order_by('uuid').last()
+        self.assertIn('Processed 2/3 renewal steps', output)
+        self.assertIn(f'Processed 3/3 renewal steps... (checkpoint: {last_step.uuid})', output)
+        self.assertIn('Created: 3, Skipped: 0, Errors: 0', output)
+
+    def test_backfill_resumes_after_checkpoint(self):
+        """Test that steps up to and including the --start-after checkpoint are not processed."""
+        for index in range(2):
+            workflow, _ = self._create_workflow_with_summary(f'sub_resume_{index}')
+            self._create_renewal_step(workflow, output_data={'id': 300 + index})
+        first_step, last_step = GetCreateSubscriptionPlanRenewalStep.objects.order_by('uuid')
+
+        out = StringIO()
+        call_command('backfill_subscription_renewals', start_after=str(first_step.uuid), stdout=out)
+
+        renewal = SelfServiceSubscriptionRenewal.objects.get()
+        self.assertEqual(renewal.subscription_plan_renewal_id, last_step.output_object.id)
+        self.assertIn('Created: 1, Skipped: 0, Errors: 0', out.getvalue())
+
+    @mock.patch(
+        'enterprise_access.apps.customer_billing.management.commands.backfill_subscription_renewals'
+        '.bulk_create_with_history',
+        side_effect=Exception('bulk insert failed'),
+    )
+    def test_backfill_failed_bulk_insert_only_fails_bad_records(self, mock_bulk_create):
+        """Test that when a batch's bulk insert fails, its renewals are created one by one."""
+        for index in range(2):
+            workflow, _ = self._create_workflow_with_summary(f'sub_fallback_{index}')
+            self._create_renewal_step(workflow, output_data={'id': 400 + index})
+        original_save = SelfServiceSubscriptionRenewal.save
+
+        def save(renewal, *args, **kwargs):
+            if renewal.subscription_plan_renewal_id == 400:
+                raise Exception('bad record')
+            return original_save(renewal, *args, **kwargs)
+
+        out = StringIO()
+        err = StringIO()
+        with mock.patch.object(SelfServiceSubscriptionRenewal, 'save', autospec=True, side_effect=save):
+            call_command('backfill_subscription_renewals', stdout=out, stderr=err)
+
+        mock_bulk_create.assert_called_once()
+        renewal = SelfServiceSubscriptionRenewal.objects.get()
+        self.assertEqual(renewal.subscription_plan_renewal_id, 401)
+        self.assertIn('Created: 1, Skipped: 0, Errors: 1', out.getvalue())
+        self.assertIn('Error processing renewal step', err.getvalue())
+
+    def test_backfill_continues_after_failed_batch(self):
+        """Test that a failed batch is reported with the checkpoint to rerun it from, and the run continues."""
+        for index in range(2):
+            workflow, _ = self._create_workflow_with_summary(f'sub_failed_batch_{index}')
+            self._create_renewal_step(workflow, output_data={'id': 500 + index})
+        first_step, last_step = GetCreateSubscriptionPlanRenewalStep.objects.order_by('uuid')
+
+        original_handle_batch = Command._handle_renewal_step_batch  # pylint: disable=protected-access
+
+        def handle_batch(command, batch_steps, dry_run):
+            if batch_steps[0] == last_step:
+                raise Exception('database unavailable')
+            return original_handle_batch(command, batch_steps, dry_run)
+
+        out = StringIO()
+        err = StringIO()
+        with mock.patch.object(Command, '_handle_renewal_step_batch', autospec=True, side_effect=handle_batch):
+            call_command('backfill_subscription_renewals', batch_size=1, stdout=out, stderr=err)
+
+        renewal = SelfServiceSubscriptionRenewal.objects.get()
+        self.assertEqual(renewal.subscription_plan_renewal_id, first_step.output_object.id)
+        self.assertIn('Created: 1, Skipped: 0, Errors: 1', out.getvalue())
+        self.assertIn(f'Error processing batch of renewal steps after checkpoint {first_step.uuid}', err.getvalue())
+        self.assertIn(f'rerun with --start-after {first_step.uuid}', err.getvalue())
@@ -0,0 +1,76 @@
+"""
+Tests for the populate_stripe_event_summaries management command.
+"""
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from enterprise_access.apps.customer_billing.management.commands.populate_stripe_event_summaries import event_shard
+from enterprise_access.apps.customer_billing.models import StripeEventData, StripeEventSummary
+from enterprise_access.apps.customer_billing.tests.factories import StripeEventDataFactory
+
+
+class PopulateStripeEventSummariesCommandTests(TestCase):
+    """Tests for the populate_stripe_event_summaries management command."""
+
+    def setUp(self):
+        self.event_records = [
+            StripeEventDataFactory(event_type='customer.subscription.updated')
+            for _ in range(5)
+        ]
+        # Summaries are created by a post_save signal; drop them to exercise the backfill.
+        StripeEventSummary.objects.all().delete()
+
+    def _call_command(self, *args):
+        out = StringIO()
+        call_command('populate_stripe_event_summaries', *args, stdout=out)
+        return out.getvalue()
+
+    def test_creates_missing_summaries_in_batches(self):
+        output = self._call_command('--batch-size=2')
+
+        self.assertIn('Successfully created: 5 summary records', output)
+        for event_record in self.event_records:
+            summary = StripeEventSummary.objects.get(stripe_event_data=event_record)
+            self.assertEqual(summary.event_id, event_record.event_id)
+            self.assertEqual(summary.stripe_subscription_id, event_record.data['data']['object']['id'])
+
+        # A second run has nothing left to do.
+        self.assertIn('No StripeEventData records found to process', self._call_command())
+
+    def test_force_updates_existing_summaries(self):
+        self._call_command()
+        event_record = self.event_records[0]
+        event_record.data['data']['object']['status'] = 'past_due'
+        StripeEventData.objects.filter(event_id=event_record.event_id).update(data=event_record.data)
+
+        output = self._call_command('--force', '--batch-size=3')
+
+        self.assertIn('Successfully updated: 5 summary records', output)
+        self.assertEqual(StripeEventSummary.objects.get(event_id=event_record.event_id).subscription_status, 'past_due')
+
+    def test_shards_partition_events(self):
+        shard_zero_event_ids = {
+            event_record.event_id for event_record in self.event_records
+            if event_shard(event_record.event_id, 2) == 0
+        }
+
+        self._call_command('--shard-count=2', '--shard-index=0', '--batch-size=2')
+        self.assertEqual(
+            set(StripeEventSummary.objects.values_list('event_id', flat=True)),
+            shard_zero_event_ids,
+        )
+
+        self._call_command('--shard-count=2', '--shard-index=1', '--batch-size=2')
+        self.assertEqual(StripeEventSummary.objects.count(), len(self.event_records))
+
+    def test_dry_run(self):
+        output = self._call_command('--dry-run')
+
+        self.assertIn('DRY RUN', output)
+        self.assertEqual(StripeEventSummary.objects.count(), 0)
+
+    def test_invalid_shard_index(self):
+        with self.assertRaises(CommandError):
+            self._call_command('--shard-count=2', '--shard-index=2')
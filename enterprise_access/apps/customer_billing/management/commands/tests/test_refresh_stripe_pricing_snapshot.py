@@ -0,0 +1,31 @@
+"""
+Tests for the refresh_stripe_pricing_snapshot management command.
+"""
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from edx_django_utils.cache import TieredCache
+
+from enterprise_access.apps.customer_billing.models import StripePricingSnapshot
+
+
+class RefreshStripePricingSnapshotCommandTests(TestCase):
+    """Tests for the refresh_stripe_pricing_snapshot management command."""
+
+    def setUp(self):
+        self.addCleanup(TieredCache.dangerous_clear_all_tiers)
+
+    @mock.patch('enterprise_access.apps.customer_billing.pricing_api._fetch_all_stripe_prices')
+    def test_command_refreshes_snapshot(self, mock_fetch_all_stripe_prices):
+        mock_fetch_all_stripe_prices.return_value = {
+            'price_yearly_0001': {'id': 'price_123', 'unit_amount': 10000, 'unit_amount_decimal': 100},
+        }
+        out = StringIO()
+
+        call_command('refresh_stripe_pricing_snapshot', stdout=out)
+
+        snapshot = StripePricingSnapshot.objects.get()
+        self.assertEqual(snapshot.version, 1)
+        self.assertIn('version=1', out.getvalue())
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.10 on 2026-10-18 22:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customer_billing', '0025_add_renewal_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stripeeventdata',
+            name='stripe_subscription_id',
+            field=models.CharField(blank=True, help_text='The Stripe subscription the event relates to, by which unhandled events are queued.', max_length=255, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='stripeeventdata',
+            index=models.Index(fields=['stripe_subscription_id', 'handled_at'], name='customer_bi_stripe__c08fe5_idx'),
+        ),
+    ]
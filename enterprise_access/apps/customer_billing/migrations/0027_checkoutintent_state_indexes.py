@@ -0,0 +1,21 @@
+# Generated by Django 5.2.10 on 2026-10-18 22:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customer_billing', '0026_stripeeventdata_stripe_subscription_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='checkoutintent',
+            index=models.Index(fields=['state', 'expires_at'], name='customer_bi_state_ab3503_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='checkoutintent',
+            index=models.Index(fields=['state', 'modified'], name='customer_bi_state_86b4c3_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.10 on 2026-10-18 22:54
+
+import django.core.serializers.json
+import django_extensions.db.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customer_billing', '0027_checkoutintent_state_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StripePricingSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, verbose_name='created')),
+                ('modified', django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name='modified')),
+                ('version', models.PositiveIntegerField(help_text='Incremented each time the snapshotted prices change.', unique=True)),
+                ('prices', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Serialized Stripe price data, keyed by the lookup_key of each price.')),
+            ],
+            options={
+                'verbose_name': 'Stripe Pricing Snapshot',
+                'verbose_name_plural': 'Stripe Pricing Snapshots',
+                'ordering': ['-version'],
+            },
+        ),
+    ]
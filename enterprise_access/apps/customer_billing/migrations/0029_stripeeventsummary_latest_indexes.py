@@ -0,0 +1,21 @@
+# Generated by Django 5.2.10 on 2026-10-18 23:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customer_billing', '0028_stripepricingsnapshot'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='stripeeventsummary',
+            index=models.Index(fields=['checkout_intent', 'stripe_event_created_at'], name='customer_bi_checkou_b20f20_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stripeeventsummary',
+            index=models.Index(fields=['subscription_plan_uuid', 'stripe_event_created_at'], name='customer_bi_subscri_c15cc1_idx'),
+        ),
+    ]
@@ -16,7 +16,7 @@ from django.contrib.auth.models import AbstractUser
 from django.core.exceptions import ValidationError
 from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import validate_slug
-from django.db import models, transaction
+from django.db import IntegrityError, models, transaction
 from django.utils import timezone
 from django_countries.fields import CountryField
 from django_extensions.db.models import TimeStampedModel
@@ -24,7 +24,7 @@ from edx_django_utils.monitoring import set_custom_attribute
 from simple_history.models import HistoricalRecords
 from simple_history.utils import bulk_update_with_history
 
-from enterprise_access.apps.customer_billing import stripe_api
+from enterprise_access.apps.customer_billing import stripe_api, stripe_event_paths
 from enterprise_access.apps.customer_billing.constants import ALLOWED_CHECKOUT_INTENT_STATE_TRANSITIONS
 
 from .constants import INTENT_RESERVATION_DURATION_MINUTES, CheckoutIntentState
@@ -81,6 +81,11 @@ class CheckoutIntent(TimeStampedModel):
     class Meta:
         verbose_name = "Enterprise Checkout Intent"
         verbose_name_plural = "Enterprise Checkout Intents"
+        indexes = [
+            # Serve the periodic expiration and stall-detection sweeps.
+            models.Index(fields=['state', 'expires_at']),
+            models.Index(fields=['state', 'modified']),
+        ]
 
     class StateChoices(models.TextChoices):
         """
@@ -224,11 +229,17 @@ class CheckoutIntent(TimeStampedModel):
         if 'state' is specified in the ``update_fields`` kwarg.
         """
         if 'state' in kwargs.get('update_fields', []):
-            set_custom_attribute(CHECKOUT_LIFEYCLE_STATE_MONITORING_KEY, self.state)
-            if self.state in self.FAILURE_STATES:
-                set_custom_attribute(CHECKOUT_LIFEYCLE_IS_ERROR_MONITORING_KEY, 'true')
+            self.set_lifecycle_monitoring_attributes()
         super().save(*args, **kwargs)
 
+    def set_lifecycle_monitoring_attributes(self):
+        """
+        Adds custom lifecycle tracking attributes for the current state via monitoring utils.
+        """
+        set_custom_attribute(CHECKOUT_LIFEYCLE_STATE_MONITORING_KEY, self.state)
+        if self.state in self.FAILURE_STATES:
+            set_custom_attribute(CHECKOUT_LIFEYCLE_IS_ERROR_MONITORING_KEY, 'true')
+
     @classmethod
     def is_valid_state_transition(
         cls,
@@ -322,18 +333,44 @@ class CheckoutIntent(TimeStampedModel):
         return None
 
     @classmethod
-    def cleanup_expired(cls):
-        """Update expired intents."""
-        expired_intent_records = list(cls.objects.filter(
-            state=CheckoutIntentState.CREATED,
-            expires_at__lte=timezone.now(),
-        ))
-        for expired_record in expired_intent_records:
-            expired_record.state = CheckoutIntentState.EXPIRED
+    def _iter_batches(cls, queryset, batch_size):
+        """
+        Yields lists of at most ``batch_size`` records from the given queryset, paginating on the
+        primary key so that each batch is a bounded, index-driven query.
+        """
+        last_pk = None
+        while True:
+            page_queryset = queryset.order_by('pk')
+            if last_pk is not None:
+                page_queryset = page_queryset.filter(pk__gt=last_pk)
+            records = list(page_queryset[:batch_size])
+            if not records:
+                return
+            last_pk = records[-1].pk
+            yield records
+
+    @classmethod
+    def cleanup_expired(cls, batch_size=100):
+        """
+        Update expired intents, in batches of ``batch_size``.
 
-        return bulk_update_with_history(
-            expired_intent_records, cls, ['state', 'modified'], batch_size=100,
+        Returns:
+            int: The number of intents that were expired.
+        """
+        now = timezone.now()
+        expired_intents = cls.objects.filter(
+            state=CheckoutIntentState.CREATED,
+            expires_at__lte=now,
         )
+        updated_count = 0
+        for expired_intent_records in cls._iter_batches(expired_intents, batch_size):
+            for expired_record in expired_intent_records:
+                expired_record.state = CheckoutIntentState.EXPIRED
+                expired_record.modified = now
+            updated_count += bulk_update_with_history(
+                expired_intent_records, cls, ['state', 'modified'], batch_size=batch_size,
+            )
+        return updated_count
 
     @classmethod
     def find_stalled_fulfillment_intents(cls, stalled_threshold_seconds=180, do_logging=False):
@@ -380,44 +417,59 @@ class CheckoutIntent(TimeStampedModel):
         return stalled_intents, updated_uuids, current_time
 
     @classmethod
-    def mark_stalled_fulfillment_intents(cls, stalled_threshold_seconds=180):
+    def mark_stalled_fulfillment_intents(cls, stalled_threshold_seconds=180, batch_size=100):
         """
         Find all CheckoutIntent records stuck in 'paid' state and transition them
-        to 'errored_fulfillment_stalled'.
+        to 'errored_fulfillment_stalled', in batches of ``batch_size``.
 
         Args:
             stalled_threshold_seconds (int): Number of seconds after which a 'paid'
                 CheckoutIntent is considered stalled. Default: 180 (3 minutes)
+            batch_size (int): Number of intents read and updated per query. Default: 100
 
         Returns:
             tuple: (updated_count, list_of_updated_uuids)
         """
-        stalled_intents, updated_uuids, current_time = cls.find_stalled_fulfillment_intents(
-            stalled_threshold_seconds
-        )
+        # Imported here because the signals module imports this one.
+        # pylint: disable=import-outside-toplevel
+        from enterprise_access.apps.customer_billing.signals import track_checkout_intent_lifecycle_event
 
-        if not stalled_intents:
-            return 0, []
+        current_time = timezone.now()
+        threshold_time = current_time - timedelta(seconds=stalled_threshold_seconds)
+        stalled_intents = cls.objects.filter(
+            state=CheckoutIntentState.PAID,
+            modified__lte=threshold_time,
+        ).select_related('user')
 
-        # Update each intent and save individually (django-simple-history tracks via post-save signal)
         updated_count = 0
-        for intent in stalled_intents:
-            time_stalled = (current_time - intent.modified).total_seconds()
-            intent.state = CheckoutIntentState.ERRORED_FULFILLMENT_STALLED
-            intent.last_provisioning_error = (
-                f'Fulfillment stalled for {int(time_stalled)} seconds '
-                f'(threshold: {stalled_threshold_seconds}s). '
-                f'Last modified: {intent.modified.isoformat()}. '
-                f'Provisioning workflow may have failed without proper error handling.'
-            )
-            logger.warning(
-                'Marking CheckoutIntent %s as ERRORED_FULFILLMENT_STALLED. '
-                'Stalled for %s seconds.',
-                intent.pk,
-                int(time_stalled),
+        updated_uuids = []
+        for intent_batch in cls._iter_batches(stalled_intents, batch_size):
+            for intent in intent_batch:
+                time_stalled = (current_time - intent.modified).total_seconds()
+                intent.state = CheckoutIntentState.ERRORED_FULFILLMENT_STALLED
+                intent.last_provisioning_error = (
+                    f'Fulfillment stalled for {int(time_stalled)} seconds '
+                    f'(threshold: {stalled_threshold_seconds}s). '
+                    f'Last modified: {intent.modified.isoformat()}. '
+                    f'Provisioning workflow may have failed without proper error handling.'
+                )
+                intent.modified = current_time
+                logger.warning(
+                    'Marking CheckoutIntent %s as ERRORED_FULFILLMENT_STALLED. '
+                    'Stalled for %s seconds.',
+                    intent.pk,
+                    int(time_stalled),
+                )
+            # bulk_update_with_history() records a history row per intent, as save() did.
+            updated_count += bulk_update_with_history(
+                intent_batch, cls, ['state', 'last_provisioning_error', 'modified'], batch_size=batch_size,
             )
-            intent.save(update_fields=['state', 'last_provisioning_error', 'modified'])
-            updated_count += 1
+            # A bulk update fires neither save() nor post_save, so emit their monitoring
+            # attributes and lifecycle events for each transition here.
+            for intent in intent_batch:
+                intent.set_lifecycle_monitoring_attributes()
+                track_checkout_intent_lifecycle_event(intent, previous_state=CheckoutIntentState.PAID)
+            updated_uuids.extend(str(intent.pk) for intent in intent_batch)
 
         return updated_count, updated_uuids
 
@@ -530,6 +582,38 @@ class CheckoutIntent(TimeStampedModel):
 
         return not queryset.exists()
 
+    @classmethod
+    def get_reserved_fields(cls, slug=None, name=None, exclude_user=None):
+        """
+        Check, in a single query, which of an enterprise slug and name are reserved by
+        non-expired intents.
+
+        Args:
+            slug: Enterprise slug to check
+            name: Enterprise name to check
+            exclude_user: User to exclude from check (for their own reservation)
+
+        Returns:
+            set: Containing 'slug' and/or 'name' for each of the given values that is reserved.
+        """
+        queryset = cls.filter_by_name_and_slug(slug=slug, name=name)
+        queryset = queryset.filter(state__in=cls.NON_EXPIRED_STATES)
+
+        if exclude_user:
+            queryset = queryset.exclude(user=exclude_user)
+
+        # Match each field in SQL, so that it's compared with the same collation as can_reserve().
+        field_filters = {}
+        if slug:
+            field_filters['slug'] = models.Q(enterprise_slug=slug)
+        if name:
+            field_filters['name'] = models.Q(enterprise_name=name)
+        match_counts = queryset.aggregate(**{
+            field: models.Count('pk', filter=field_filter)
+            for field, field_filter in field_filters.items()
+        })
+        return {field for field, match_count in match_counts.items() if match_count}
+
     @classmethod
     def create_intent(
         cls,
@@ -801,10 +885,28 @@ class StripeEventData(TimeStampedModel):
         blank=True,
         help_text='Timestamp when this Stripe event was successfully handled.'
     )
+    stripe_subscription_id = models.CharField(
+        max_length=255,
+        null=True,
+        blank=True,
+        help_text='The Stripe subscription the event relates to, by which unhandled events are queued.',
+    )
+
+    class Meta(TimeStampedModel.Meta):
+        indexes = [
+            models.Index(fields=['stripe_subscription_id', 'handled_at']),
+        ]
 
     def __str__(self):
         return f"id={self.event_id}, event_type={self.event_type}"
 
+    @property
+    def stripe_event_created(self):
+        """
+        The Stripe event's ``created`` epoch timestamp, from the event payload.
+        """
+        return stripe_event_paths.EVENT_CREATED(self.data)
+
     def mark_as_handled(self):
         """Mark this event as handled by setting handled_at to now."""
         self.handled_at = timezone.now()
@@ -951,14 +1053,40 @@ class StripeEventSummary(TimeStampedModel):
         verbose_name_plural = 'Stripe Event Summaries'
         indexes = [
             models.Index(fields=['event_type', 'checkout_intent']),
+            # Serve lookups of the latest summary per checkout intent or subscription plan.
+            models.Index(fields=['checkout_intent', 'stripe_event_created_at']),
+            models.Index(fields=['subscription_plan_uuid', 'stripe_event_created_at']),
         ]
 
     def __str__(self):
         return f"Summary of {self.event_type} - {self.event_id}"
 
-    def populate_with_summary_data(self):
+    @classmethod
+    def get_trial_subscription_plan_steps_by_workflow_uuid(cls, workflow_uuids):
+        """
+        Returns a mapping of workflow uuid to the first GetCreateTrialSubscriptionPlanStep
+        of that workflow, for the given workflow uuids, in a single query.
+        """
+        # Fetch model from the Django app registry to avoid
+        # a circular import.
+        subscription_step_model = apps.get_model(
+            'provisioning', 'GetCreateTrialSubscriptionPlanStep',
+        )
+        steps_by_workflow_uuid = {}
+        for subscription_step in subscription_step_model.objects.filter(
+            workflow_record_uuid__in=workflow_uuids,
+        ).order_by('pk'):
+            steps_by_workflow_uuid.setdefault(subscription_step.workflow_record_uuid, subscription_step)
+        return steps_by_workflow_uuid
+
+    def populate_with_summary_data(self, trial_subscription_plan_steps_by_workflow_uuid=None):
         """
         Extract and populate normalized fields from the related StripeEventData.
+
+        Args:
+            trial_subscription_plan_steps_by_workflow_uuid (dict): Optional prefetched result of
+              ``get_trial_subscription_plan_steps_by_workflow_uuid()``, used by batch callers
+              instead of querying for this record's subscription step.
         """
         stripe_event_data = self.stripe_event_data
 
@@ -970,21 +1098,19 @@ class StripeEventSummary(TimeStampedModel):
 
         # Extract Stripe event timestamp
         event_data = stripe_event_data.data
-        if 'created' in event_data:
-            self.stripe_event_created_at = self._timestamp_to_datetime(event_data['created'])
+        if (stripe_event_created := stripe_event_paths.EVENT_CREATED(event_data)) is not None:
+            self.stripe_event_created_at = self._timestamp_to_datetime(stripe_event_created)
         else:
             logger.warning(f"No 'created' timestamp found in event {stripe_event_data.event_id}")
 
         # Get subscription plan UUID from related workflow
         if checkout_intent and checkout_intent.workflow:
-            # Fetch model from the Django app registry to avoid
-            # a circular import.
-            subscription_step_model = apps.get_model(
-                'provisioning', 'GetCreateTrialSubscriptionPlanStep',
-            )
-            subscription_step = subscription_step_model.objects.filter(
-                workflow_record_uuid=checkout_intent.workflow.uuid,
-            ).first()
+            workflow_uuid = checkout_intent.workflow.uuid
+            if trial_subscription_plan_steps_by_workflow_uuid is None:
+                trial_subscription_plan_steps_by_workflow_uuid = (
+                    self.get_trial_subscription_plan_steps_by_workflow_uuid([workflow_uuid])
+                )
+            subscription_step = trial_subscription_plan_steps_by_workflow_uuid.get(workflow_uuid)
 
             try:
                 if subscription_step and subscription_step.output_object:
@@ -996,48 +1122,41 @@ class StripeEventSummary(TimeStampedModel):
                 )
 
         # Extract data from the Stripe event payload
-        event_data = stripe_event_data.data
-        stripe_object_data = event_data.get('data', {}).get('object', {})
+        stripe_object_data = stripe_event_paths.EVENT_OBJECT(event_data, {})
         self.stripe_object_type = stripe_object_data['object']
-        # pylint: disable=protected-access
-        stripe_object = stripe._util.convert_to_stripe_object(event_data['data']['object'])
 
         # Extract subscription-specific fields
         if self.stripe_object_type == 'subscription' or self.event_type.startswith('customer.subscription'):
-            subscription_obj = stripe_object
+            self.stripe_subscription_id = stripe_event_paths.OBJECT_ID(stripe_object_data)
+            self.subscription_status = stripe_event_paths.SUBSCRIPTION_STATUS(stripe_object_data)
+            self.currency = stripe_event_paths.OBJECT_CURRENCY(stripe_object_data)
 
-            self.stripe_subscription_id = subscription_obj.id
-            self.subscription_status = subscription_obj.get('status')
-            self.currency = subscription_obj.get('currency')
-
-            if 'items' not in subscription_obj or not subscription_obj['items'].get('data', []):
+            first_item = stripe_event_paths.SUBSCRIPTION_FIRST_ITEM(stripe_object_data)
+            if not first_item:
                 return
-            first_item = subscription_obj['items']['data'][0]
             self.subscription_period_start = self._timestamp_to_datetime(
-                first_item.get('current_period_start')
+                stripe_event_paths.SUBSCRIPTION_ITEM_PERIOD_START(first_item)
             )
             self.subscription_period_end = self._timestamp_to_datetime(
-                first_item.get('current_period_end')
+                stripe_event_paths.SUBSCRIPTION_ITEM_PERIOD_END(first_item)
             )
 
         # Extract invoice-specific fields
         elif self.stripe_object_type == 'invoice' or self.event_type.startswith('invoice'):
-            invoice_obj = stripe_object
-            self.stripe_invoice_id = invoice_obj.id
-            try:
-                self.stripe_subscription_id = invoice_obj.parent.subscription_details.subscription
-            except AttributeError:
-                pass
-            self.invoice_amount_paid = invoice_obj.get('amount_paid')
-            self.invoice_currency = invoice_obj.get('currency')
+            self.stripe_invoice_id = stripe_event_paths.OBJECT_ID(stripe_object_data)
+            if stripe_subscription_id := stripe_event_paths.INVOICE_SUBSCRIPTION_ID(stripe_object_data):
+                self.stripe_subscription_id = stripe_subscription_id
+            self.invoice_amount_paid = stripe_event_paths.INVOICE_AMOUNT_PAID(stripe_object_data)
+            self.invoice_currency = stripe_event_paths.OBJECT_CURRENCY(stripe_object_data)
 
             # Extract unit amount and quantity from line items
-            lines = invoice_obj.get('lines', {}).get('data', [])
-            if lines:
-                primary_line = lines[0]
-                self.invoice_unit_amount = getattr(primary_line.pricing, 'unit_amount', None)
-                self.invoice_unit_amount_decimal = Decimal(primary_line.pricing.unit_amount_decimal)
-                self.invoice_quantity = primary_line.quantity
+            primary_line = stripe_event_paths.INVOICE_PRIMARY_LINE(stripe_object_data)
+            if primary_line:
+                self.invoice_unit_amount = stripe_event_paths.INVOICE_LINE_UNIT_AMOUNT(primary_line)
+                self.invoice_unit_amount_decimal = Decimal(
+                    stripe_event_paths.INVOICE_LINE_UNIT_AMOUNT_DECIMAL(primary_line)
+                )
+                self.invoice_quantity = stripe_event_paths.INVOICE_LINE_QUANTITY(primary_line)
                 if self.invoice_unit_amount is None:
                     self.invoice_unit_amount = int(self.invoice_unit_amount_decimal)
 
@@ -1091,6 +1210,17 @@ class StripeEventSummary(TimeStampedModel):
             logger.warning('No Stripe event summary for checkout intent %s', checkout_intent.uuid)
         return result
 
+    @classmethod
+    def get_latest_upcoming_invoice_for_subscription_plan(cls, subscription_plan_uuid):
+        """
+        Helper to get the latest summary of the given subscription plan on which an
+        upcoming invoice amount due has been materialized.
+        """
+        return StripeEventSummary.objects.filter(
+            subscription_plan_uuid=subscription_plan_uuid,
+            upcoming_invoice_amount_due__isnull=False,
+        ).order_by('-stripe_event_created_at').first()
+
     @classmethod
     def get_latest_invoice_paid(cls, invoice_id):
         """
@@ -1106,3 +1236,74 @@ class StripeEventSummary(TimeStampedModel):
             stripe_invoice_id=invoice_id,
             event_type='invoice.paid',
         ).order_by('-stripe_event_created_at').first()
+
+
+class StripePricingSnapshot(TimeStampedModel):
+    """
+    A versioned snapshot of the active, validated, recurring Stripe prices, keyed by lookup_key.
+
+    Snapshots are refreshed out-of-band (periodically, and on Stripe price/product events), so that
+    checkout requests read prices locally rather than paginating through the Stripe price list.
+    A new version is only created when the prices change.
+
+    .. no_pii: This model has no PII
+    """
+    class Meta:
+        verbose_name = "Stripe Pricing Snapshot"
+        verbose_name_plural = "Stripe Pricing Snapshots"
+        ordering = ['-version']
+
+    CREATE_MAX_ATTEMPTS = 3
+
+    version = models.PositiveIntegerField(
+        unique=True,
+        help_text='Incremented each time the snapshotted prices change.',
+    )
+    prices = models.JSONField(
+        encoder=DjangoJSONEncoder,
+        help_text='Serialized Stripe price data, keyed by the lookup_key of each price.',
+    )
+
+    def __str__(self):
+        return f"version={self.version}, prices={len(self.prices)}"
+
+    @classmethod
+    def get_latest(cls):
+        return cls.objects.order_by('-version').first()
+
+    @classmethod
+    def create_if_changed(cls, prices):
+        """
+        Returns the latest snapshot if its prices equal the given ones, otherwise creates
+        and returns a new snapshot of the given prices with the next version number.
+
+        Concurrent refreshes may race for the same version number, in which case the losing
+        refresh compares its prices against the winner's snapshot and tries again.
+        """
+        failed_attempts = 0
+        while True:
+            latest = cls.get_latest()
+            if latest and latest.get_prices() == prices:
+                return latest
+            version = latest.version + 1 if latest else 1
+            try:
+                with transaction.atomic():
+                    return cls.objects.create(version=version, prices=prices)
+            except IntegrityError:
+                failed_attempts += 1
+                if failed_attempts >= cls.CREATE_MAX_ATTEMPTS:
+                    raise
+                logger.info('Pricing snapshot version %s was created concurrently, retrying', version)
+
+    def get_prices(self):
+        """
+        Returns the snapshotted prices, with the ``unit_amount_decimal`` of each
+        converted back from its JSON representation to a Decimal.
+        """
+        return {
+            lookup_key: {
+                **price_data,
+                'unit_amount_decimal': Decimal(price_data['unit_amount_decimal']),
+            }
+            for lookup_key, price_data in self.prices.items()
+        }
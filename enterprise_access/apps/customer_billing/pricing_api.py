@@ -20,6 +20,13 @@ Basic Format Structure:
             "metadata": {}
         }
     }
+
+Pricing Snapshots:
+    When ENABLE_STRIPE_PRICING_SNAPSHOT is set, ``get_all_stripe_prices()`` reads a versioned
+    ``StripePricingSnapshot`` (from the cache, falling back to the database) instead of listing
+    prices from Stripe. Snapshots are refreshed by ``refresh_stripe_pricing_snapshot()``, which
+    runs periodically via the ``refresh_stripe_pricing_snapshot`` management command and on
+    Stripe ``price.*`` and ``product.*`` events.
 """
 import logging
 from decimal import Decimal
@@ -29,6 +36,7 @@ import stripe
 from django.conf import settings
 from edx_django_utils.cache import TieredCache
 
+from enterprise_access.apps.customer_billing.models import StripePricingSnapshot
 from enterprise_access.cache_utils import versioned_cache_key
 
 logger = logging.getLogger(__name__)
@@ -187,28 +195,13 @@ def _validate_stripe_price_schema(stripe_price: stripe.Price) -> None:
     logger.debug(f'Stripe price {stripe_price.id} schema validation passed')
 
 
-def get_all_stripe_prices(
-    timeout: int = settings.STRIPE_PRICE_DATA_CACHE_TIMEOUT,
-) -> Dict[str, Dict]:
+def _fetch_all_stripe_prices() -> Dict[str, Dict]:
     """
-    Fetch all active Stripe prices and return a mapping by lookup_key.
-
-    Args:
-        timeout: Cache timeout in seconds
-
-    Returns:
-        Dict mapping lookup_key to serialized price data
+    List all active, recurring Stripe prices and return their serialized data by lookup_key.
 
     Raises:
-        StripePricingError: If there's an error fetching from Stripe or if prices lack lookup_keys
+        StripePricingError: If there's an error fetching from Stripe or if a price fails validation
     """
-    cache_key = versioned_cache_key('all_stripe_prices')
-
-    cached_response = TieredCache.get_cached_response(cache_key)
-    if cached_response.is_found:
-        logger.info('Cache hit for all Stripe prices')
-        return cached_response.value
-
     try:
         # Fetch all active prices from Stripe
         stripe_prices = stripe.Price.list(active=True, expand=['data.product'])
@@ -232,14 +225,6 @@ def get_all_stripe_prices(
             serialized_data = _serialize_basic_format(stripe_price)
             prices_by_lookup_key[lookup_key] = serialized_data
 
-        # Cache the results
-        TieredCache.set_all_tiers(
-            cache_key,
-            prices_by_lookup_key,
-            django_cache_timeout=timeout,
-        )
-        logger.info(f'Cached {len(prices_by_lookup_key)} Stripe prices by lookup_key')
-
         return prices_by_lookup_key
 
     except stripe.StripeError as exc:
@@ -250,6 +235,103 @@ def get_all_stripe_prices(
         raise StripePricingError(f'Unexpected error fetching all prices: {exc}') from exc
 
 
+def get_all_stripe_prices(
+    timeout: int = settings.STRIPE_PRICE_DATA_CACHE_TIMEOUT,
+) -> Dict[str, Dict]:
+    """
+    Fetch all active Stripe prices and return a mapping by lookup_key.
+
+    Args:
+        timeout: Cache timeout in seconds (not used when reading from a pricing snapshot)
+
+    Returns:
+        Dict mapping lookup_key to serialized price data
+
+    Raises:
+        StripePricingError: If there's an error fetching from Stripe or if prices lack lookup_keys
+    """
+    if settings.ENABLE_STRIPE_PRICING_SNAPSHOT:
+        return get_stripe_pricing_snapshot()['prices']
+
+    cache_key = versioned_cache_key('all_stripe_prices')
+
+    cached_response = TieredCache.get_cached_response(cache_key)
+    if cached_response.is_found:
+        logger.info('Cache hit for all Stripe prices')
+        return cached_response.value
+
+    prices_by_lookup_key = _fetch_all_stripe_prices()
+
+    # Cache the results
+    TieredCache.set_all_tiers(
+        cache_key,
+        prices_by_lookup_key,
+        django_cache_timeout=timeout,
+    )
+    logger.info(f'Cached {len(prices_by_lookup_key)} Stripe prices by lookup_key')
+
+    return prices_by_lookup_key
+
+
+def stripe_pricing_snapshot_cache_key():
+    return versioned_cache_key('stripe_pricing_snapshot')
+
+
+def _cache_stripe_pricing_snapshot(snapshot: StripePricingSnapshot) -> Dict:
+    """
+    Cache and return the version and prices of the given snapshot.
+    """
+    snapshot_data = {
+        'version': snapshot.version,
+        'prices': snapshot.get_prices(),
+    }
+    TieredCache.set_all_tiers(
+        stripe_pricing_snapshot_cache_key(),
+        snapshot_data,
+        django_cache_timeout=settings.STRIPE_PRICING_SNAPSHOT_CACHE_TIMEOUT,
+    )
+    return snapshot_data
+
+
+def refresh_stripe_pricing_snapshot() -> StripePricingSnapshot:
+    """
+    List the active Stripe prices and store them as the latest pricing snapshot, creating
+    a new snapshot version only if the prices changed. The latest snapshot is (re)cached.
+
+    Raises:
+        StripePricingError: If there's an error fetching from Stripe or if a price fails validation,
+          in which case the current snapshot is left in place.
+    """
+    prices_by_lookup_key = _fetch_all_stripe_prices()
+    snapshot = StripePricingSnapshot.create_if_changed(prices_by_lookup_key)
+    _cache_stripe_pricing_snapshot(snapshot)
+    logger.info(f'Refreshed Stripe pricing snapshot {snapshot}')
+    return snapshot
+
+
+def get_stripe_pricing_snapshot() -> Dict:
+    """
+    Return the version and prices (by lookup_key) of the latest pricing snapshot, reading
+    it from the cache or, on a cache miss, the database. Only when no snapshot has ever been
+    taken are the prices fetched from Stripe.
+
+    Returns:
+        Dict like ``{'version': 3, 'prices': {lookup_key: serialized price data}}``
+
+    Raises:
+        StripePricingError: If no snapshot exists and the prices cannot be fetched from Stripe
+    """
+    cached_response = TieredCache.get_cached_response(stripe_pricing_snapshot_cache_key())
+    if cached_response.is_found:
+        return cached_response.value
+
+    snapshot = StripePricingSnapshot.get_latest()
+    if snapshot is None:
+        logger.warning('No Stripe pricing snapshot exists, taking one now')
+        snapshot = refresh_stripe_pricing_snapshot()
+    return _cache_stripe_pricing_snapshot(snapshot)
+
+
 def get_ssp_product_pricing() -> Dict[str, Dict]:
     """
     Get pricing data for all configured SSP products using lookup_key.
@@ -14,6 +14,33 @@ from enterprise_access.apps.track.segment import track_event
 logger = logging.getLogger(__name__)
 
 
+def track_checkout_intent_lifecycle_event(instance, previous_state):
+    """
+    Tracks a CheckoutIntent lifecycle event for the transition from ``previous_state``
+    to the intent's current state.
+    """
+    properties = dict(CheckoutIntentReadOnlySerializer(instance).data)
+    properties["previous_state"] = previous_state
+    properties["new_state"] = instance.state
+
+    logger.info(
+        (
+            f"Tracking CheckoutIntent lifecycle event: "
+            f"user={instance.user.id}, "
+            f"intent_id={instance.id}, "
+            f"previous_state={previous_state}, "
+            f"new_state={instance.state}, "
+            f"event={CheckoutIntentSegmentEvents.LIFECYCLE_EVENT}"
+        )
+    )
+
+    track_event(
+        lms_user_id=str(instance.user.id),
+        event_name=CheckoutIntentSegmentEvents.LIFECYCLE_EVENT,
+        properties=properties,
+    )
+
+
 @receiver(post_save, sender=CheckoutIntent)
 def track_checkout_intent_changes(sender, instance, created, **kwargs):  # pylint: disable=unused-argument
     """Automatically track events after save."""
@@ -24,27 +51,7 @@ def track_checkout_intent_changes(sender, instance, created, **kwargs):  # pylin
     # Only track if it's a creation or if the state actually changed
     if created or (prev_record is not None and prev_record.state != instance.state):
         previous_state = None if created else (prev_record.state if prev_record else None)
-
-        properties = dict(CheckoutIntentReadOnlySerializer(instance).data)
-        properties["previous_state"] = previous_state
-        properties["new_state"] = instance.state
-
-        logger.info(
-            (
-                f"Tracking CheckoutIntent lifecycle event: "
-                f"user={instance.user.id}, "
-                f"intent_id={instance.id}, "
-                f"previous_state={previous_state}, "
-                f"new_state={instance.state}, "
-                f"event={CheckoutIntentSegmentEvents.LIFECYCLE_EVENT}"
-            )
-        )
-
-        track_event(
-            lms_user_id=str(instance.user.id),
-            event_name=CheckoutIntentSegmentEvents.LIFECYCLE_EVENT,
-            properties=properties,
-        )
+        track_checkout_intent_lifecycle_event(instance, previous_state)
 
 
 @receiver(post_save, sender=StripeEventData)
@@ -2,6 +2,8 @@
 Python API for interacting with Stripe (aside from functions contained in ``pricing_api.py``).
 """
 import logging
+import time
+from collections import defaultdict
 from functools import wraps
 from typing import Optional
 
@@ -79,22 +81,42 @@ def create_subscription_checkout_session(input_data, lms_user_id, checkout_inten
     return stripe.checkout.Session.create(**create_kwargs)
 
 
-def stripe_cache(timeout=settings.DEFAULT_STRIPE_CACHE_TIMEOUT):
+# Registry of the functions cached by ``stripe_cache`` which incoming Stripe events keep up to date,
+# keyed by the type of Stripe object (e.g. 'subscription') whose events concern their cached data.
+_synced_cache_functions_by_object_type = defaultdict(list)
+
+
+def stripe_cache_key(func_name, resource_id):
+    return f"stripe_{func_name}_{resource_id}"
+
+
+def stripe_cache_synced_at_key(func_name, resource_id):
+    return f"stripe_{func_name}_{resource_id}_synced_at"
+
+
+def stripe_cache(timeout=settings.DEFAULT_STRIPE_CACHE_TIMEOUT, synced_by=None):
     """
     Decorator for caching Stripe API responses.
 
     Args:
         timeout (int): Cache timeout in seconds, defaults to 60
+        synced_by (dict): Maps each type of Stripe object whose events concern the cached data
+            (e.g. 'subscription') to the field of that object holding the resource id the data is
+            cached by. With 'id', the cached data is the object itself, which its events overwrite;
+            any other field (e.g. 'customer') marks data derived from the object, which its events
+            invalidate. See ``sync_stripe_cache_with_event()``.
 
     Returns:
         function: Decorated function with caching
     """
     def decorator(func):
+        is_synced_object = 'id' in (synced_by or {}).values()
+
         @wraps(func)
         def wrapper(resource_id, *args, **kwargs):
             # Create cache key based on function name and resource ID
             func_name = func.__name__
-            cache_key = f"stripe_{func_name}_{resource_id}"
+            cache_key = stripe_cache_key(func_name, resource_id)
 
             # Try to get from cache first
             cached_response = TieredCache.get_cached_response(cache_key)
@@ -103,6 +125,7 @@ def stripe_cache(timeout=settings.DEFAULT_STRIPE_CACHE_TIMEOUT):
                 return cached_response.value
 
             # If not in cache, call the original function
+            fetched_at = int(time.time())
             result = func(resource_id, *args, **kwargs)
 
             # Cache the result
@@ -112,14 +135,73 @@ def stripe_cache(timeout=settings.DEFAULT_STRIPE_CACHE_TIMEOUT):
                     result,
                     django_cache_timeout=timeout,
                 )
+                if is_synced_object:
+                    # So that events created before this fetch don't overwrite the fetched object.
+                    TieredCache.set_all_tiers(
+                        stripe_cache_synced_at_key(func_name, resource_id),
+                        fetched_at,
+                        django_cache_timeout=timeout,
+                    )
                 logger.info(f'Cached Stripe {func_name} data for {resource_id}')
 
             return result
+
+        wrapper.cache_timeout = timeout
+        for object_type, resource_id_field in (synced_by or {}).items():
+            _synced_cache_functions_by_object_type[object_type].append((wrapper, resource_id_field))
         return wrapper
     return decorator
 
 
-@stripe_cache()
+def _is_latest_event_for_cached_object(func_name, resource_id, event_created, timeout):
+    """
+    Records that the cached object was last written from an event created at ``event_created``,
+    unless it was already written from a later event or fetched from the API after that event
+    (Stripe does not guarantee event order, and retries events for days).
+
+    Events older than the cache timeout are never considered the latest, since by then
+    the record of what the cached object was last written from may itself have expired.
+    """
+    if event_created < time.time() - timeout:
+        return False
+    synced_at_key = stripe_cache_synced_at_key(func_name, resource_id)
+    cached_response = TieredCache.get_cached_response(synced_at_key)
+    if cached_response.is_found and cached_response.value > event_created:
+        return False
+    TieredCache.set_all_tiers(synced_at_key, event_created, django_cache_timeout=timeout)
+    return True
+
+
+def sync_stripe_cache_with_event(event: stripe.Event) -> None:
+    """
+    Brings the cached Stripe data concerned by the given event up to date, using the object the
+    event carries: cached copies of the object itself are overwritten with it (or invalidated,
+    for deletion events and events older than the cached copy), and data derived from the
+    object is invalidated.
+    """
+    try:
+        stripe_object = event.data.object
+        object_type = stripe_object.get('object')
+        is_deletion = event.type.endswith('.deleted')
+        for cached_function, resource_id_field in _synced_cache_functions_by_object_type.get(object_type, []):
+            resource_id = stripe_object.get(resource_id_field)
+            if not resource_id:
+                continue
+            func_name = cached_function.__name__
+            cache_key = stripe_cache_key(func_name, resource_id)
+            if resource_id_field == 'id' and not is_deletion and _is_latest_event_for_cached_object(
+                func_name, resource_id, event.created, cached_function.cache_timeout,
+            ):
+                TieredCache.set_all_tiers(cache_key, stripe_object, django_cache_timeout=cached_function.cache_timeout)
+                logger.info(f'Overwrote cached Stripe {func_name} data for {resource_id} from event {event.id}')
+            else:
+                TieredCache.delete_all_tiers(cache_key)
+                logger.info(f'Invalidated cached Stripe {func_name} data for {resource_id} from event {event.id}')
+    except Exception:  # pylint: disable=broad-exception-caught
+        logger.exception('Could not sync cached Stripe data with event %s', event.get('id'))
+
+
+@stripe_cache(timeout=settings.SYNCED_STRIPE_CACHE_TIMEOUT, synced_by={'checkout.session': 'id'})
 def get_stripe_checkout_session(session_id) -> stripe.checkout.Session:
     """
     Retrieve a Stripe Checkout Session.
@@ -135,7 +217,36 @@ def get_stripe_checkout_session(session_id) -> stripe.checkout.Session:
     return stripe.checkout.Session.retrieve(session_id)
 
 
+# The objects related to a checkout session that the checkout success page displays.
+CHECKOUT_SESSION_DETAILS_EXPAND = [
+    'payment_intent.payment_method',
+    'subscription.default_payment_method',
+    'subscription.latest_invoice.customer',
+    'invoice.customer',
+]
+
+
 @stripe_cache()
+def get_stripe_checkout_session_details(session_id) -> stripe.checkout.Session:
+    """
+    Retrieve a Stripe Checkout Session, along with its payment intent, subscription, invoice,
+    payment method and customer, in a single request.
+
+    Unlike ``get_stripe_checkout_session()``, this is not kept up to date by Stripe events,
+    which don't carry the expanded objects.
+
+    Args:
+        session_id (str): The Stripe Checkout Session ID
+
+    Returns:
+        dict: The Stripe Checkout Session object, with CHECKOUT_SESSION_DETAILS_EXPAND expanded
+
+    Docs: https://docs.stripe.com/api/expanding_objects
+    """
+    return stripe.checkout.Session.retrieve(session_id, expand=CHECKOUT_SESSION_DETAILS_EXPAND)
+
+
+@stripe_cache(timeout=settings.SYNCED_STRIPE_CACHE_TIMEOUT, synced_by={'payment_intent': 'id'})
 def get_stripe_payment_intent(payment_intent_id) -> stripe.PaymentIntent:
     """
     Retrieve a Stripe Payment Intent.
@@ -151,7 +262,7 @@ def get_stripe_payment_intent(payment_intent_id) -> stripe.PaymentIntent:
     return stripe.PaymentIntent.retrieve(payment_intent_id)
 
 
-@stripe_cache()
+@stripe_cache(timeout=settings.SYNCED_STRIPE_CACHE_TIMEOUT, synced_by={'invoice': 'id'})
 def get_stripe_invoice(invoice_id) -> stripe.Invoice:
     """
     Retrieve a Stripe Invoice.
@@ -167,7 +278,7 @@ def get_stripe_invoice(invoice_id) -> stripe.Invoice:
     return stripe.Invoice.retrieve(invoice_id)
 
 
-@stripe_cache()
+@stripe_cache(timeout=settings.SYNCED_STRIPE_CACHE_TIMEOUT, synced_by={'payment_method': 'id'})
 def get_stripe_payment_method(payment_method_id) -> stripe.PaymentMethod:
     """
     Retrieve a Stripe Payment Method.
@@ -183,7 +294,7 @@ def get_stripe_payment_method(payment_method_id) -> stripe.PaymentMethod:
     return stripe.PaymentMethod.retrieve(payment_method_id)
 
 
-@stripe_cache()
+@stripe_cache(timeout=settings.SYNCED_STRIPE_CACHE_TIMEOUT, synced_by={'customer': 'id'})
 def get_stripe_customer(customer_id) -> stripe.Customer:
     """
     Retrieve a Stripe Customer.
@@ -199,7 +310,7 @@ def get_stripe_customer(customer_id) -> stripe.Customer:
     return stripe.Customer.retrieve(customer_id)
 
 
-@stripe_cache()
+@stripe_cache(timeout=settings.SYNCED_STRIPE_CACHE_TIMEOUT, synced_by={'subscription': 'id'})
 def get_stripe_subscription(subscription_id) -> stripe.Subscription:
     """
     Retrieve a Stripe Subscription.
@@ -215,7 +326,7 @@ def get_stripe_subscription(subscription_id) -> stripe.Subscription:
     return stripe.Subscription.retrieve(subscription_id)
 
 
-@stripe_cache()
+@stripe_cache(timeout=settings.SYNCED_STRIPE_CACHE_TIMEOUT, synced_by={'subscription': 'customer'})
 def get_stripe_trialing_subscription(
         stripe_customer_id: str, status: str = 'trialing'
 ) -> Optional[stripe.Subscription]:
@@ -242,7 +353,10 @@ def get_stripe_trialing_subscription(
     return subscription_list.data[0] if subscription_list.data else None
 
 
-@stripe_cache()
+@stripe_cache(
+    timeout=settings.SYNCED_STRIPE_CACHE_TIMEOUT,
+    synced_by={'subscription': 'customer', 'invoice': 'customer'},
+)
 def get_upcoming_invoice(stripe_customer_id: str, stripe_subscription_id: str):
     """
     Retrieve the upcoming invoice for a subscription in the trial period.
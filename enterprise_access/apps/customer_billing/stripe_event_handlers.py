@@ -8,21 +8,23 @@ from uuid import UUID
 
 import stripe
 from django.conf import settings
+from django.db import transaction
 
 from enterprise_access.apps.api_client.license_manager_client import LicenseManagerApiClient
 from enterprise_access.apps.customer_billing.models import (
     CheckoutIntent,
     SelfServiceSubscriptionRenewal,
-    StripeEventData,
-    StripeEventSummary
+    StripeEventData
 )
 from enterprise_access.apps.customer_billing.stripe_event_types import StripeEventType
 from enterprise_access.apps.customer_billing.tasks import (
+    refresh_stripe_pricing_snapshot_task,
     send_billing_error_email_task,
     send_payment_receipt_email,
     send_trial_cancellation_email_task,
     send_trial_end_and_subscription_started_email_task,
-    send_trial_ending_reminder_email_task
+    send_trial_ending_reminder_email_task,
+    update_upcoming_invoice_amount_due_task
 )
 
 logger = logging.getLogger(__name__)
@@ -51,9 +53,7 @@ def get_checkout_intent_id_from_subscription(stripe_subscription):
     if 'checkout_intent_id' in stripe_subscription.metadata:
         # The stripe subscription object may actually be a SubscriptionDetails
         # record from an invoice.
-        stripe_subscription_id = (
-            getattr(stripe_subscription, 'id', None) or getattr(stripe_subscription, 'subscription', None)
-        )
+        stripe_subscription_id = get_stripe_subscription_id(stripe_subscription)
         checkout_intent_id = int(stripe_subscription.metadata['checkout_intent_id'])
         logger.info(
             'Found checkout_intent_id=%s from subscription=%s',
@@ -63,6 +63,14 @@ def get_checkout_intent_id_from_subscription(stripe_subscription):
     return None
 
 
+def get_stripe_subscription_id(stripe_subscription):
+    """
+    Returns the identifier of the given stripe subscription, which may
+    actually be a SubscriptionDetails record from an invoice.
+    """
+    return getattr(stripe_subscription, 'id', None) or getattr(stripe_subscription, 'subscription', None)
+
+
 def persist_stripe_event(event: stripe.Event) -> StripeEventData:
     """
     Creates and returns a new ``StripeEventData`` object.
@@ -93,6 +101,7 @@ def persist_stripe_event(event: stripe.Event) -> StripeEventData:
             'event_type': event.type,
             'checkout_intent': checkout_intent,
             'data': dict(event),
+            'stripe_subscription_id': get_stripe_subscription_id(stripe_subscription),
         },
     )
     logger.info('Persisted StripeEventData %s', record)
@@ -157,10 +166,26 @@ def cancel_all_future_plans(checkout_intent):
     return deactivated
 
 
+def schedule_upcoming_invoice_amount_due_update(checkout_intent):
+    """
+    Schedules the refresh of the upcoming invoice amount due of the given CheckoutIntent
+    once the handled event is committed, so that webhook handling makes no extra Stripe call.
+    """
+    checkout_intent_id = checkout_intent.id
+    transaction.on_commit(lambda: update_upcoming_invoice_amount_due_task.delay(checkout_intent_id))
+
+
 class StripeEventHandler:
     """
     Container for Stripe event handler logic.
     """
+    @classmethod
+    def has_handler(cls, event_type: StripeEventType) -> bool:
+        """
+        Returns whether a handler is registered for the given event type.
+        """
+        return event_type in _handlers_by_type
+
     @classmethod
     def dispatch(cls, event: stripe.Event) -> None:
         if event.type not in _handlers_by_type:
@@ -169,9 +194,10 @@ class StripeEventHandler:
         _handlers_by_type[event.type](event)
 
     @staticmethod
-    def on_stripe_event(event_type: StripeEventType):
+    def on_stripe_event(*event_types: StripeEventType, persist: bool = True):
         """
-        Decorator to register a function as an event handler.
+        Decorator to register a function as the event handler of the given event types.
+        Events are persisted as ``StripeEventData`` unless ``persist`` is False.
         """
         def decorator(handler_method: Callable[[stripe.Event], None]):
 
@@ -181,7 +207,7 @@ class StripeEventHandler:
                 # The default __repr__ is really long because it just barfs out the entire payload.
                 event_short_repr = f'<stripe.Event id={event.id} type={event.type}>'
                 logger.info(f'[StripeEventHandler] handling {event_short_repr}.')
-                event_record = persist_stripe_event(event)
+                event_record = persist_stripe_event(event) if persist else None
                 handler_method(event)
                 # Mark event as handled if we persisted it successfully and no exception was raised
                 if event_record is not None:
@@ -190,7 +216,8 @@ class StripeEventHandler:
                 logger.info(f'[StripeEventHandler] handler for {event_short_repr} complete.')
 
             # Register the wrapped handler method.
-            _handlers_by_type[event_type] = wrapper
+            for event_type in event_types:
+                _handlers_by_type[event_type] = wrapper
 
             return wrapper
         return decorator
@@ -242,6 +269,9 @@ class StripeEventHandler:
             enterprise_slug=checkout_intent.enterprise_slug,
         )
 
+        # Paying an invoice starts a new billing period, with a new upcoming invoice.
+        schedule_upcoming_invoice_amount_due_update(checkout_intent)
+
     @on_stripe_event('customer.subscription.trial_will_end')
     @staticmethod
     def trial_will_end(event: stripe.Event) -> None:
@@ -286,6 +316,19 @@ class StripeEventHandler:
     def payment_method_attached(event: stripe.Event) -> None:
         pass
 
+    @on_stripe_event(
+        'price.created', 'price.updated', 'price.deleted',
+        'product.created', 'product.updated', 'product.deleted',
+        persist=False,
+    )
+    @staticmethod
+    def pricing_changed(event: stripe.Event) -> None:  # pylint: disable=unused-argument
+        """
+        Handle price and product events.
+        Refresh the pricing snapshot, which is rebuilt from the Stripe price list rather than from the event.
+        """
+        refresh_stripe_pricing_snapshot_task.delay()
+
     @on_stripe_event('customer.subscription.created')
     @staticmethod
     def subscription_created(event: stripe.Event) -> None:
@@ -317,13 +360,7 @@ class StripeEventHandler:
         except stripe.StripeError as e:
             logger.error('Failed to enable pending updates for subscription %s: %s', subscription.id, e)
 
-        summary = StripeEventSummary.objects.get(event_id=event.id)
-        try:
-            summary.update_upcoming_invoice_amount_due()
-        except stripe.StripeError as exc:
-            logger.warning('Error updating upcoming invoice amount due: %s', exc)
-            if not settings.STRIPE_GRACEFUL_EXCEPTION_MODE:
-                raise
+        schedule_upcoming_invoice_amount_due_update(checkout_intent)
 
     @on_stripe_event('customer.subscription.updated')
     @staticmethod
@@ -391,6 +428,8 @@ class StripeEventHandler:
                 )
             send_billing_error_email_task.delay(checkout_intent_id=checkout_intent.id)
 
+        schedule_upcoming_invoice_amount_due_update(checkout_intent)
+
     @on_stripe_event("customer.subscription.deleted")
     @staticmethod
     def subscription_deleted(event: stripe.Event) -> None:
@@ -409,6 +448,9 @@ def _process_trial_to_paid_renewal(checkout_intent: CheckoutIntent, stripe_subsc
     3. Calls license manager to process the renewal
     4. Marks the renewal as processed
 
+    With ENABLE_ASYNC_STRIPE_EVENT_HANDLING (the default), this runs on a celery worker, so that
+    renewals of many subscriptions are processed concurrently rather than within webhook requests.
+
     Args:
         checkout_intent: The CheckoutIntent associated with the subscription
         stripe_subscription_id: The Stripe subscription ID
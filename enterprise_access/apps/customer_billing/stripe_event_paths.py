@@ -0,0 +1,58 @@
+"""
+Precompiled accessors for the fields of persisted Stripe event payloads.
+
+Reading a handful of fields straight from the stored JSON avoids converting a
+whole event payload (e.g. an invoice with many line items) into Stripe objects.
+"""
+
+
+class JsonPath:
+    """
+    Accessor of a dotted path, e.g. ``'items.data.0.current_period_end'``, into JSON data.
+    Numeric path segments index into lists. The path is split once, when the accessor is created.
+    """
+
+    __slots__ = ('path', 'keys')
+
+    def __init__(self, path):
+        self.path = path
+        self.keys = tuple(int(key) if key.isdigit() else key for key in path.split('.'))
+
+    def __call__(self, data, default=None):
+        """
+        Returns the value at this path in ``data``, or ``default`` if any segment of it is missing.
+        """
+        value = data
+        for key in self.keys:
+            try:
+                value = value[key]
+            except (KeyError, IndexError, TypeError):
+                return default
+        return value
+
+    def __repr__(self):
+        return f'JsonPath({self.path!r})'
+
+
+# Paths into the event payload.
+EVENT_CREATED = JsonPath('created')
+EVENT_OBJECT = JsonPath('data.object')
+
+# Paths into the event's ``data.object``, common to all object types.
+OBJECT_TYPE = JsonPath('object')
+OBJECT_ID = JsonPath('id')
+OBJECT_CURRENCY = JsonPath('currency')
+
+# Paths into a subscription object.
+SUBSCRIPTION_STATUS = JsonPath('status')
+SUBSCRIPTION_FIRST_ITEM = JsonPath('items.data.0')
+SUBSCRIPTION_ITEM_PERIOD_START = JsonPath('current_period_start')
+SUBSCRIPTION_ITEM_PERIOD_END = JsonPath('current_period_end')
+
+# Paths into an invoice object.
+INVOICE_SUBSCRIPTION_ID = JsonPath('parent.subscription_details.subscription')
+INVOICE_AMOUNT_PAID = JsonPath('amount_paid')
+INVOICE_PRIMARY_LINE = JsonPath('lines.data.0')
+INVOICE_LINE_QUANTITY = JsonPath('quantity')
+INVOICE_LINE_UNIT_AMOUNT = JsonPath('pricing.unit_amount')
+INVOICE_LINE_UNIT_AMOUNT_DECIMAL = JsonPath('pricing.unit_amount_decimal')
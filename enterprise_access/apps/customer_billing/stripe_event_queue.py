@@ -0,0 +1,137 @@
+"""
+Asynchronous, per-subscription handling of Stripe events.
+
+When ENABLE_ASYNC_STRIPE_EVENT_HANDLING is set, the Stripe webhook only persists each event,
+and celery workers handle the persisted events of each subscription in the order Stripe created
+them, while events of different subscriptions are handled concurrently.
+"""
+import logging
+
+import stripe
+from celery import shared_task
+from django.conf import settings
+from django.core.cache import cache as django_cache
+from django.db import transaction
+
+from enterprise_access.apps.customer_billing.models import StripeEventData
+from enterprise_access.apps.customer_billing.stripe_event_handlers import StripeEventHandler, persist_stripe_event
+from enterprise_access.cache_utils import versioned_cache_key
+from enterprise_access.tasks import LoggedTaskWithRetry
+
+logger = logging.getLogger(__name__)
+
+
+def stripe_event_queue_lock_key(stripe_subscription_id):
+    return versioned_cache_key('stripe_event_queue_lock', stripe_subscription_id)
+
+
+def enqueue_stripe_event(event: stripe.Event) -> StripeEventData:
+    """
+    Persists the given event for asynchronous handling and, once the current transaction
+    commits, schedules the handling of the unhandled events of its Stripe subscription.
+    Duplicate deliveries of an event are deduplicated on its ``event_id``. Events that
+    cannot be queued by subscription are dispatched inline instead.
+    """
+    event_record = persist_stripe_event(event)
+    if event_record is None or not event_record.stripe_subscription_id:
+        StripeEventHandler.dispatch(event)
+        return event_record
+
+    if event_record.handled_at:
+        logger.info('[StripeEventHandler] event %s was already handled, ignoring it.', event.id)
+        return event_record
+
+    stripe_subscription_id = event_record.stripe_subscription_id
+    transaction.on_commit(lambda: handle_queued_stripe_events_task.delay(stripe_subscription_id))
+    logger.info(
+        '[StripeEventHandler] queued event %s for subscription %s.', event.id, stripe_subscription_id,
+    )
+    return event_record
+
+
+def get_unhandled_stripe_events(stripe_subscription_id) -> list[StripeEventData]:
+    """
+    Returns the unhandled events of the given Stripe subscription, in the order Stripe created them.
+    """
+    event_records = StripeEventData.objects.filter(
+        stripe_subscription_id=stripe_subscription_id,
+        handled_at__isnull=True,
+    )
+    return sorted(event_records, key=lambda record: (record.stripe_event_created or 0, record.created))
+
+
+def handle_persisted_stripe_event(event_record: StripeEventData) -> None:
+    """
+    Dispatches a persisted event to its handler, which marks it as handled.
+    Events without a handler are simply marked as handled.
+    """
+    event = stripe.Event.construct_from(event_record.data, stripe.api_key)
+    if not StripeEventHandler.has_handler(event.type):
+        logger.warning('No stripe event handler configured for event type %s', event.type)
+        event_record.mark_as_handled()
+        return
+    StripeEventHandler.dispatch(event)
+
+
+def handle_queued_stripe_events(stripe_subscription_id) -> list[str] | None:
+    """
+    Handles the unhandled events of the given Stripe subscription, in the order Stripe created them.
+
+    Events of different subscriptions may be handled concurrently, but a lock ensures only one
+    worker handles the events of a given subscription at a time. Handling stops at the first
+    event whose handler raises, so that no later event of the subscription is handled before it.
+
+    Returns:
+        The ids of the handled events, or None if another worker holds the subscription's lock.
+    """
+    lock_key = stripe_event_queue_lock_key(stripe_subscription_id)
+    if not django_cache.add(lock_key, True, settings.STRIPE_EVENT_QUEUE_LOCK_TIMEOUT):
+        logger.info(
+            '[StripeEventHandler] events for subscription %s are already being handled.', stripe_subscription_id,
+        )
+        return None
+
+    handled_event_ids = []
+    try:
+        # Keep draining until no new events arrived while the previous batch was being handled.
+        while event_records := [
+            record for record in get_unhandled_stripe_events(stripe_subscription_id)
+            if record.event_id not in handled_event_ids
+        ]:
+            for event_record in event_records:
+                handle_persisted_stripe_event(event_record)
+                handled_event_ids.append(event_record.event_id)
+    finally:
+        django_cache.delete(lock_key)
+
+    # An event persisted just before the lock was released would have found the lock held.
+    if StripeEventData.objects.filter(
+        stripe_subscription_id=stripe_subscription_id,
+        handled_at__isnull=True,
+    ).exclude(event_id__in=handled_event_ids).exists():
+        handle_queued_stripe_events_task.delay(stripe_subscription_id)
+
+    return handled_event_ids
+
+
+@shared_task(base=LoggedTaskWithRetry)
+def handle_queued_stripe_events_task(stripe_subscription_id):
+    """
+    Handles the queued (persisted but unhandled) Stripe events of the given subscription, in order.
+    """
+    return handle_queued_stripe_events(stripe_subscription_id)
+
+
+@shared_task(base=LoggedTaskWithRetry)
+def enqueue_unhandled_stripe_events_task():
+    """
+    Schedules the handling of every Stripe subscription with queued events, such as
+    those whose handling previously failed. Intended to be run periodically.
+    """
+    stripe_subscription_ids = StripeEventData.objects.filter(
+        handled_at__isnull=True,
+        stripe_subscription_id__isnull=False,
+    ).values_list('stripe_subscription_id', flat=True).distinct()
+    for stripe_subscription_id in stripe_subscription_ids:
+        handle_queued_stripe_events_task.delay(stripe_subscription_id)
+    return list(stripe_subscription_ids)
@@ -14,6 +14,7 @@ from enterprise_access.apps.api_client.braze_client import BrazeApiClient
 from enterprise_access.apps.api_client.lms_client import LmsApiClient
 from enterprise_access.apps.customer_billing.constants import BRAZE_TIMESTAMP_FORMAT
 from enterprise_access.apps.customer_billing.models import CheckoutIntent, StripeEventSummary
+from enterprise_access.apps.customer_billing.pricing_api import refresh_stripe_pricing_snapshot
 from enterprise_access.apps.customer_billing.stripe_api import get_stripe_subscription, get_stripe_trialing_subscription
 from enterprise_access.apps.provisioning.utils import validate_trial_subscription
 from enterprise_access.tasks import LoggedTaskWithRetry
@@ -561,3 +562,40 @@ def send_payment_receipt_email(
         organization_name=enterprise_customer_name,
         email_description='payment receipt confirmation email',
     )
+
+
+@shared_task(base=LoggedTaskWithRetry)
+def update_upcoming_invoice_amount_due_task(checkout_intent_id):
+    """
+    Materializes the upcoming invoice amount due on the latest subscription event summary
+    of the given CheckoutIntent, from which it's served to the admin portal.
+
+    This is a best-effort refresh, so Stripe errors are logged rather than raised.
+    """
+    checkout_intent = CheckoutIntent.objects.filter(id=checkout_intent_id).first()
+    if not checkout_intent:
+        logger.warning('Cannot update upcoming invoice amount due, no CheckoutIntent with id %s', checkout_intent_id)
+        return
+    summary = StripeEventSummary.get_latest_for_checkout_intent(
+        checkout_intent,
+        event_type__startswith='customer.subscription',
+    )
+    if not summary:
+        return
+    try:
+        summary.update_upcoming_invoice_amount_due()
+    except stripe.StripeError as exc:
+        logger.warning(
+            'Error updating upcoming invoice amount due for CheckoutIntent %s: %s',
+            checkout_intent_id,
+            exc,
+        )
+
+
+@shared_task(base=LoggedTaskWithRetry)
+def refresh_stripe_pricing_snapshot_task():
+    """
+    Refreshes the Stripe pricing snapshot that checkout reads its prices from.
+    Run on Stripe price and product events.
+    """
+    return refresh_stripe_pricing_snapshot().version
@@ -9,6 +9,7 @@ import requests
 from django.contrib.auth import get_user_model
 from django.test import TestCase, override_settings
 from django.utils import timezone
+from edx_django_utils.cache import TieredCache
 
 from enterprise_access.apps.core.tests.factories import UserFactory
 from enterprise_access.apps.customer_billing import api as customer_billing_api
@@ -74,6 +75,7 @@ class TestCreateFreeTrialCheckoutSession(TestCase):
     def setUp(self):
         self.user = UserFactory()
         self.other_user = UserFactory()
+        self.addCleanup(TieredCache.dangerous_clear_all_tiers)
 
     def tearDown(self):
         # Clean up any intents created during tests
@@ -494,3 +496,74 @@ class TestCreateFreeTrialCheckoutSession(TestCase):
 
         actual_validation_errors = cm.exception.validation_errors_by_field
         assert actual_validation_errors == expected_validation_errors
+
+
+class TestCheckoutSessionInputValidator(TestCase):
+    """
+    Tests for the slug and company name checks of ``CheckoutSessionInputValidator``.
+    """
+    def setUp(self):
+        self.user = UserFactory()
+        self.other_user = UserFactory()
+        self.addCleanup(TieredCache.dangerous_clear_all_tiers)
+
+    @mock.patch.object(customer_billing_api, 'LmsApiClient', autospec=True)
+    def test_slug_and_name_reservations_share_one_lookup(self, mock_lms_client_class):
+        CheckoutIntent.create_intent(
+            user=self.other_user,
+            quantity=10,
+            slug='reserved-slug',
+            name='Reserved company',
+        )
+        mock_lms_client_class.return_value.get_lms_user_account.return_value = [{'id': 9876}]
+
+        validator = customer_billing_api.CheckoutSessionInputValidator()
+        with mock.patch.object(
+            CheckoutIntent, 'get_reserved_fields', wraps=CheckoutIntent.get_reserved_fields,
+        ) as mock_get_reserved_fields:
+            validation_errors = validator.validate({
+                'user': self.user,
+                'admin_email': 'test@example.com',
+                'enterprise_slug': 'reserved-slug',
+                'company_name': 'Reserved company',
+            })
+
+        mock_get_reserved_fields.assert_called_once_with(
+            slug='reserved-slug', name='Reserved company', exclude_user=self.user,
+        )
+        self.assertEqual(validation_errors['enterprise_slug']['error_code'], 'slug_reserved')
+        self.assertEqual(validation_errors['company_name']['error_code'], 'existing_enterprise_customer')
+        mock_lms_client_class.return_value.get_enterprise_customer_data.assert_not_called()
+
+    @mock.patch.object(customer_billing_api, 'LmsApiClient', autospec=True)
+    def test_existing_customer_lookup_is_cached(self, mock_lms_client_class):
+        mock_lms_client = mock_lms_client_class.return_value
+        mock_lms_client.get_enterprise_customer_data.side_effect = raise_404_error
+
+        for _ in range(2):
+            self.assertIsNone(customer_billing_api.get_and_cache_existing_enterprise_customer(slug='new-slug'))
+
+        mock_lms_client.get_enterprise_customer_data.assert_called_once_with(enterprise_customer_slug='new-slug')
+
+        mock_lms_client.get_enterprise_customer_data.side_effect = None
+        mock_lms_client.get_enterprise_customer_data.return_value = {'name': 'Existing company'}
+        for _ in range(2):
+            self.assertEqual(
+                customer_billing_api.get_and_cache_existing_enterprise_customer(name='Existing company'),
+                {'name': 'Existing company'},
+            )
+        mock_lms_client.get_enterprise_customer_data.assert_called_with(enterprise_customer_name='Existing company')
+        self.assertEqual(mock_lms_client.get_enterprise_customer_data.call_count, 2)
+
+    @mock.patch.object(customer_billing_api, 'LmsApiClient', autospec=True)
+    def test_existing_customer_lookup_errors_are_not_cached(self, mock_lms_client_class):
+        mock_lms_client = mock_lms_client_class.return_value
+        error_response = requests.Response()
+        error_response.status_code = 500
+        mock_lms_client.get_enterprise_customer_data.side_effect = requests.HTTPError(response=error_response)
+
+        for _ in range(2):
+            with self.assertRaises(requests.HTTPError):
+                customer_billing_api.get_and_cache_existing_enterprise_customer(slug='new-slug')
+
+        self.assertEqual(mock_lms_client.get_enterprise_customer_data.call_count, 2)
@@ -18,14 +18,17 @@ from django.utils import timezone
 
 from enterprise_access.apps.core.tests.factories import UserFactory
 from enterprise_access.apps.customer_billing import stripe_api
-from enterprise_access.apps.customer_billing.constants import CheckoutIntentState
+from enterprise_access.apps.customer_billing.constants import CheckoutIntentSegmentEvents, CheckoutIntentState
 from enterprise_access.apps.customer_billing.models import (
+    CHECKOUT_LIFEYCLE_IS_ERROR_MONITORING_KEY,
+    CHECKOUT_LIFEYCLE_STATE_MONITORING_KEY,
     CheckoutIntent,
     FailedCheckoutIntentConflict,
     SelfServiceSubscriptionRenewal,
     SlugReservationConflict,
     StripeEventData,
-    StripeEventSummary
+    StripeEventSummary,
+    StripePricingSnapshot
 )
 from enterprise_access.apps.customer_billing.stripe_event_handlers import StripeEventHandler
 from enterprise_access.apps.customer_billing.tests.factories import StripeEventDataFactory
@@ -117,6 +120,28 @@ class TestCheckoutIntentModel(TestCase):
         paid_intent.refresh_from_db()
         self.assertEqual(paid_intent.state, CheckoutIntentState.PAID)
 
+    def test_cleanup_expired_in_batches(self):
+        """Test that cleanup_expired expires every intent across several batches, with history."""
+        expired_intents = [
+            CheckoutIntent.objects.create(
+                user=UserFactory(),
+                enterprise_name=f"Expired Enterprise {index}",
+                enterprise_slug=f"expired-enterprise-{index}",
+                state=CheckoutIntentState.CREATED,
+                quantity=10,
+                expires_at=timezone.now() - timedelta(minutes=5),
+            )
+            for index in range(5)
+        ]
+
+        updated_count = CheckoutIntent.cleanup_expired(batch_size=2)
+
+        self.assertEqual(updated_count, 5)
+        for intent in expired_intents:
+            intent.refresh_from_db()
+            self.assertEqual(intent.state, CheckoutIntentState.EXPIRED)
+            self.assertEqual(intent.history.first().state, CheckoutIntentState.EXPIRED)
+
     def test_create_intent_success(self):
         """Test successful creation of checkout intent."""
         terms_metadata = {'version': '1.0', 'accepted_at': '2024-01-15T10:30:00Z'}
@@ -414,6 +439,62 @@ class TestCheckoutIntentModel(TestCase):
             exclude_user=self.user1
         ))
 
+    def test_get_reserved_fields(self):
+        """Test that get_reserved_fields reports which of the slug and name are reserved."""
+        CheckoutIntent.create_intent(
+            user=cast(AbstractUser, self.user1),
+            slug=self.basic_data['enterprise_slug'],
+            name=self.basic_data['enterprise_name'],
+            quantity=self.basic_data['quantity']
+        )
+
+        with self.assertNumQueries(1):
+            reserved_fields = CheckoutIntent.get_reserved_fields(
+                slug=self.basic_data['enterprise_slug'],
+                name='Some Other Name',
+            )
+        self.assertEqual(reserved_fields, {'slug'})
+        self.assertEqual(
+            CheckoutIntent.get_reserved_fields(slug='other-slug', name=self.basic_data['enterprise_name']),
+            {'name'},
+        )
+        self.assertEqual(
+            CheckoutIntent.get_reserved_fields(
+                slug=self.basic_data['enterprise_slug'],
+                name=self.basic_data['enterprise_name'],
+            ),
+            {'slug', 'name'},
+        )
+        self.assertEqual(
+            CheckoutIntent.get_reserved_fields(
+                slug=self.basic_data['enterprise_slug'],
+                name=self.basic_data['enterprise_name'],
+                exclude_user=self.user1,
+            ),
+            set(),
+        )
+
+    def test_get_reserved_fields_matches_can_reserve(self):
+        """
+        Test that get_reserved_fields compares values in the database, as can_reserve does,
+        so that both agree on differently-cased slugs and names under the database's collation.
+        """
+        CheckoutIntent.create_intent(
+            user=cast(AbstractUser, self.user1),
+            slug=self.basic_data['enterprise_slug'],
+            name=self.basic_data['enterprise_name'],
+            quantity=self.basic_data['quantity']
+        )
+
+        for slug, name in [
+            (self.basic_data['enterprise_slug'].upper(), 'Some Other Name'),
+            ('other-slug', self.basic_data['enterprise_name'].lower()),
+        ]:
+            self.assertEqual(
+                not CheckoutIntent.get_reserved_fields(slug=slug, name=name),
+                CheckoutIntent.can_reserve(slug=slug, name=name),
+            )
+
     def test_can_reserve_with_expired_state_future_date(self):
         """
         Test that can_reserve returns True when an intent with matching name/slug
@@ -1147,8 +1228,9 @@ class TestStripeEventSummary(TestCase):
         fake_invoice = {'amount_due': '200'}
         mock_stripe.Invoice.create_preview.return_value = fake_invoice
 
-        # Dispatch creation event, which populates the upcoming_invoice_amount_due value
-        StripeEventHandler.dispatch(mock_event)
+        # Dispatch creation event, which populates the upcoming_invoice_amount_due value once committed
+        with self.captureOnCommitCallbacks(execute=True):
+            StripeEventHandler.dispatch(mock_event)
 
         summary = StripeEventSummary.objects.get(event_id=stripe_event_data.event_id)
         self.assertEqual(summary.upcoming_invoice_amount_due, 200)
@@ -1192,6 +1274,31 @@ class TestCheckoutIntentStalledFulfillment(TestCase):
         self.assertEqual(intent.state, CheckoutIntentState.ERRORED_FULFILLMENT_STALLED)
         self.assertIsNotNone(intent.last_provisioning_error)
 
+    @mock.patch('enterprise_access.apps.customer_billing.models.set_custom_attribute')
+    @mock.patch('enterprise_access.apps.customer_billing.signals.track_event')
+    def test_mark_stalled_fulfillment_intents_tracks_lifecycle_event(self, mock_track_event, mock_set_attribute):
+        """Test that marking intents as stalled tracks their lifecycle events and monitoring attributes."""
+        intent = self._create_intent(CheckoutIntentState.PAID)
+        CheckoutIntent.objects.filter(pk=intent.pk).update(
+            modified=timezone.now() - timedelta(minutes=5)
+        )
+        mock_track_event.reset_mock()
+
+        CheckoutIntent.mark_stalled_fulfillment_intents(stalled_threshold_seconds=180)
+
+        mock_track_event.assert_called_once()
+        call_kwargs = mock_track_event.call_args.kwargs
+        self.assertEqual(call_kwargs['lms_user_id'], str(self.user.id))
+        self.assertEqual(call_kwargs['event_name'], CheckoutIntentSegmentEvents.LIFECYCLE_EVENT)
+        self.assertEqual(call_kwargs['properties']['previous_state'], CheckoutIntentState.PAID)
+        self.assertEqual(
+            call_kwargs['properties']['new_state'], CheckoutIntentState.ERRORED_FULFILLMENT_STALLED,
+        )
+        mock_set_attribute.assert_has_calls([
+            mock.call(CHECKOUT_LIFEYCLE_STATE_MONITORING_KEY, CheckoutIntentState.ERRORED_FULFILLMENT_STALLED),
+            mock.call(CHECKOUT_LIFEYCLE_IS_ERROR_MONITORING_KEY, 'true'),
+        ])
+
     def test_mark_stalled_fulfillment_intents_ignores_non_paid_states(self):
         """Test that only PAID intents are marked as stalled."""
         created_intent = self._create_intent(CheckoutIntentState.CREATED, '-created')
@@ -1215,6 +1322,27 @@ class TestCheckoutIntentStalledFulfillment(TestCase):
             intent.refresh_from_db()
             self.assertEqual(intent.state, expected_state)
 
+    def test_mark_stalled_fulfillment_intents_in_batches(self):
+        """Test that stalled intents are marked across several batches, with history."""
+        intents = [
+            self._create_intent(CheckoutIntentState.PAID, f'-{index}', user=UserFactory())
+            for index in range(5)
+        ]
+        CheckoutIntent.objects.filter(
+            pk__in=[intent.pk for intent in intents]
+        ).update(modified=timezone.now() - timedelta(minutes=5))
+
+        count, uuids = CheckoutIntent.mark_stalled_fulfillment_intents(stalled_threshold_seconds=180, batch_size=2)
+
+        self.assertEqual(count, 5)
+        self.assertEqual(set(uuids), {str(intent.pk) for intent in intents})
+        for intent in intents:
+            intent.refresh_from_db()
+            self.assertEqual(intent.state, CheckoutIntentState.ERRORED_FULFILLMENT_STALLED)
+            self.assertIn('Fulfillment stalled for 300 seconds', intent.last_provisioning_error)
+            self.assertGreater(intent.modified, timezone.now() - timedelta(minutes=1))
+            self.assertEqual(intent.history.first().state, CheckoutIntentState.ERRORED_FULFILLMENT_STALLED)
+
 
 class TestSelfServiceSubscriptionRenewal(TestCase):
     """
@@ -1343,3 +1471,35 @@ class TestSelfServiceSubscriptionRenewal(TestCase):
             stripe_event_data__event_type='customer.subscription.updated'
         )
         self.assertIn(renewal, renewals_by_event)
+
+
+class TestStripePricingSnapshot(TestCase):
+    """
+    Tests for the StripePricingSnapshot model.
+    """
+
+    OLD_PRICES = {'plan_key': {'id': 'price_old', 'unit_amount_decimal': Decimal('100.00')}}
+    NEW_PRICES = {'plan_key': {'id': 'price_new', 'unit_amount_decimal': Decimal('200.00')}}
+
+    def test_create_if_changed_retries_taken_version(self):
+        """Test that a refresh racing a concurrent one for the same version retries with the next version."""
+        StripePricingSnapshot.objects.create(version=1, prices=self.OLD_PRICES)
+
+        # The first lookup misses the snapshot created concurrently above.
+        with mock.patch.object(
+            StripePricingSnapshot, 'get_latest', side_effect=[None, StripePricingSnapshot.objects.get()],
+        ):
+            snapshot = StripePricingSnapshot.create_if_changed(self.NEW_PRICES)
+
+        self.assertEqual(snapshot.version, 2)
+        self.assertEqual(snapshot.get_prices(), self.NEW_PRICES)
+
+    def test_create_if_changed_returns_concurrently_created_snapshot(self):
+        """Test that a refresh losing the race to a snapshot of the same prices returns that snapshot."""
+        concurrent_snapshot = StripePricingSnapshot.objects.create(version=1, prices=self.NEW_PRICES)
+
+        with mock.patch.object(StripePricingSnapshot, 'get_latest', side_effect=[None, concurrent_snapshot]):
+            snapshot = StripePricingSnapshot.create_if_changed(self.NEW_PRICES)
+
+        self.assertEqual(snapshot, concurrent_snapshot)
+        self.assertEqual(StripePricingSnapshot.objects.count(), 1)
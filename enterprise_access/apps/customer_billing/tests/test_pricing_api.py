@@ -10,6 +10,7 @@ from edx_django_utils.cache import TieredCache
 from stripe import InvalidRequestError
 
 from enterprise_access.apps.customer_billing import pricing_api
+from enterprise_access.apps.customer_billing.models import StripePricingSnapshot
 
 MOCK_SSP_PRODUCTS = {
     'quarterly_license_plan': {
@@ -163,6 +164,62 @@ class TestStripePricingAPI(TestCase):
         self.assertEqual(quarterly_data['ssp_product_key'], 'quarterly_license_plan')
         self.assertEqual(quarterly_data['quantity_range'], (5, 30))
 
+    @override_settings(ENABLE_STRIPE_PRICING_SNAPSHOT=True)
+    @mock.patch('enterprise_access.apps.customer_billing.pricing_api.stripe')
+    def test_get_all_stripe_prices_from_snapshot(self, mock_stripe):
+        """Test that prices are read from the latest snapshot, taking one only on a cold start."""
+        mock_stripe.Price.list().auto_paging_iter.return_value = [self._create_mock_stripe_price()]
+        lookup_key = MOCK_SSP_PRODUCTS['quarterly_license_plan']['lookup_key']
+
+        # No snapshot exists yet, so one is taken.
+        prices = pricing_api.get_all_stripe_prices()
+        self.assertEqual(prices[lookup_key]['unit_amount_decimal'], Decimal('100.00'))
+        self.assertEqual(StripePricingSnapshot.objects.get().version, 1)
+
+        # Subsequent reads use the cached, then the stored, snapshot without calling Stripe.
+        mock_stripe.Price.list().auto_paging_iter.reset_mock()
+        self.assertEqual(pricing_api.get_all_stripe_prices(), prices)
+        TieredCache.dangerous_clear_all_tiers()
+        db_prices = pricing_api.get_all_stripe_prices()
+        self.assertEqual(db_prices, prices)
+        self.assertIsInstance(db_prices[lookup_key]['unit_amount_decimal'], Decimal)
+        mock_stripe.Price.list().auto_paging_iter.assert_not_called()
+
+    @override_settings(ENABLE_STRIPE_PRICING_SNAPSHOT=True)
+    @mock.patch('enterprise_access.apps.customer_billing.pricing_api.stripe')
+    def test_refresh_stripe_pricing_snapshot(self, mock_stripe):
+        """Test that a new snapshot version is only created, and cached, when the prices change."""
+        mock_stripe.Price.list().auto_paging_iter.return_value = [self._create_mock_stripe_price()]
+        lookup_key = MOCK_SSP_PRODUCTS['quarterly_license_plan']['lookup_key']
+
+        self.assertEqual(pricing_api.refresh_stripe_pricing_snapshot().version, 1)
+        self.assertEqual(pricing_api.refresh_stripe_pricing_snapshot().version, 1)
+
+        mock_stripe.Price.list().auto_paging_iter.return_value = [
+            self._create_mock_stripe_price(unit_amount=12000),
+        ]
+        self.assertEqual(pricing_api.refresh_stripe_pricing_snapshot().version, 2)
+        self.assertEqual(StripePricingSnapshot.objects.count(), 2)
+
+        snapshot = pricing_api.get_stripe_pricing_snapshot()
+        self.assertEqual(snapshot['version'], 2)
+        self.assertEqual(snapshot['prices'][lookup_key]['unit_amount'], 12000)
+
+    @override_settings(ENABLE_STRIPE_PRICING_SNAPSHOT=True)
+    @mock.patch('enterprise_access.apps.customer_billing.pricing_api.stripe')
+    def test_failed_refresh_keeps_snapshot(self, mock_stripe):
+        """Test that a failure to list prices from Stripe leaves the current snapshot in place."""
+        mock_stripe.Price.list().auto_paging_iter.return_value = [self._create_mock_stripe_price()]
+        mock_stripe.StripeError = InvalidRequestError
+        prices = pricing_api.get_all_stripe_prices()
+
+        mock_stripe.Price.list().auto_paging_iter.side_effect = InvalidRequestError('Stripe is down', 'param')
+        with self.assertRaises(pricing_api.StripePricingError):
+            pricing_api.refresh_stripe_pricing_snapshot()
+
+        self.assertEqual(pricing_api.get_all_stripe_prices(), prices)
+        self.assertEqual(StripePricingSnapshot.objects.get().version, 1)
+
     def test_calculate_subtotal_basic_format(self):
         """Test subtotal calculation with basic format."""
         price_data = {
@@ -1,6 +1,7 @@
 """
 Unit tests for interacting with stripe via ``stripe_api.api``.
 """
+import time
 from unittest import mock
 
 import stripe
@@ -8,12 +9,17 @@ from django.test import TestCase
 from edx_django_utils.cache import TieredCache
 
 from enterprise_access.apps.customer_billing.stripe_api import (
+    CHECKOUT_SESSION_DETAILS_EXPAND,
     create_subscription_checkout_session,
     get_stripe_checkout_session,
+    get_stripe_checkout_session_details,
     get_stripe_invoice,
     get_stripe_payment_intent,
     get_stripe_payment_method,
-    stripe_cache
+    get_stripe_subscription,
+    get_stripe_trialing_subscription,
+    stripe_cache,
+    sync_stripe_cache_with_event
 )
 
 
@@ -52,6 +58,17 @@ class TestStripeCheckoutSession(StripeApiFunctionsTests):
         mock_retrieve.assert_called_once_with(self.session_id)
         self.assertEqual(result, self.session_response)
 
+    @mock.patch('enterprise_access.apps.customer_billing.stripe_api.stripe.checkout.Session.retrieve')
+    def test_get_stripe_checkout_session_details(self, mock_retrieve):
+        """Test that the session's related objects are expanded, and the result cached."""
+        mock_retrieve.return_value = self.session_response
+
+        for _ in range(2):
+            result = get_stripe_checkout_session_details(self.session_id)
+
+        mock_retrieve.assert_called_once_with(self.session_id, expand=CHECKOUT_SESSION_DETAILS_EXPAND)
+        self.assertEqual(result, self.session_response)
+
     @mock.patch('enterprise_access.apps.customer_billing.stripe_api.stripe.checkout.Session.retrieve')
     @mock.patch('edx_django_utils.cache.TieredCache.get_cached_response')
     @mock.patch('edx_django_utils.cache.TieredCache.set_all_tiers')
@@ -91,7 +108,9 @@ class TestStripeCheckoutSession(StripeApiFunctionsTests):
         # Verify behavior
         mock_get.assert_called_once()
         mock_retrieve.assert_called_once_with(self.session_id)
-        mock_set.assert_called_once()
+        # The fetched object is cached along with the time it was fetched at.
+        self.assertEqual(mock_set.call_count, 2)
+        mock_set.assert_any_call(mock.ANY, self.session_response, django_cache_timeout=mock.ANY)
         self.assertEqual(result, self.session_response)
 
     @mock.patch('enterprise_access.apps.customer_billing.stripe_api.stripe.checkout.Session.retrieve')
@@ -208,7 +227,9 @@ class TestStripePaymentIntent(StripeApiFunctionsTests):
         # Verify behavior
         mock_get.assert_called_once()
         mock_retrieve.assert_called_once_with(self.payment_intent_id)
-        mock_set.assert_called_once()
+        # The fetched object is cached along with the time it was fetched at.
+        self.assertEqual(mock_set.call_count, 2)
+        mock_set.assert_any_call(mock.ANY, self.payment_intent_response, django_cache_timeout=mock.ANY)
         self.assertEqual(result, self.payment_intent_response)
 
     @mock.patch('enterprise_access.apps.customer_billing.stripe_api.stripe.PaymentIntent.retrieve')
@@ -275,7 +296,9 @@ class TestStripeInvoice(StripeApiFunctionsTests):
         # Verify behavior
         mock_get.assert_called_once()
         mock_retrieve.assert_called_once_with(self.invoice_id)
-        mock_set.assert_called_once()
+        # The fetched object is cached along with the time it was fetched at.
+        self.assertEqual(mock_set.call_count, 2)
+        mock_set.assert_any_call(mock.ANY, self.invoice_response, django_cache_timeout=mock.ANY)
         self.assertEqual(result, self.invoice_response)
 
     @mock.patch('enterprise_access.apps.customer_billing.stripe_api.stripe.Invoice.retrieve')
@@ -342,7 +365,9 @@ class TestStripePaymentMethod(StripeApiFunctionsTests):
         # Verify behavior
         mock_get.assert_called_once()
         mock_retrieve.assert_called_once_with(self.payment_method_id)
-        mock_set.assert_called_once()
+        # The fetched object is cached along with the time it was fetched at.
+        self.assertEqual(mock_set.call_count, 2)
+        mock_set.assert_any_call(mock.ANY, self.payment_method_response, django_cache_timeout=mock.ANY)
         self.assertEqual(result, self.payment_method_response)
 
     @mock.patch('enterprise_access.apps.customer_billing.stripe_api.stripe.PaymentMethod.retrieve')
@@ -388,10 +413,8 @@ class TestStripeCacheDecorator(TestCase):
             mock_get.call_args_list[0][0][0],  # First call's cache key
             mock_get.call_args_list[1][0][0],  # Second call's cache key
         )
-        mock_set.assert_has_calls([
-            mock.call('stripe_get_stripe_checkout_session_test1', {'id': 'test1'}, django_cache_timeout=60),
-            mock.call('stripe_get_stripe_checkout_session_test2', {'id': 'test1'}, django_cache_timeout=60),
-        ])
+        mock_set.assert_any_call('stripe_get_stripe_checkout_session_test1', {'id': 'test1'}, django_cache_timeout=60)
+        mock_set.assert_any_call('stripe_get_stripe_checkout_session_test2', {'id': 'test1'}, django_cache_timeout=60)
 
     @mock.patch('edx_django_utils.cache.TieredCache.get_cached_response')
     @mock.patch('edx_django_utils.cache.TieredCache.set_all_tiers')
@@ -416,3 +439,97 @@ class TestStripeCacheDecorator(TestCase):
         # Third argument to set_all_tiers should be the timeout
         call_kwargs = mock_set.call_args[1]
         self.assertEqual(call_kwargs, {'django_cache_timeout': 120})
+
+
+class TestSyncStripeCacheWithEvent(TestCase):
+    """Tests for keeping stripe_cache entries up to date from Stripe events."""
+
+    def setUp(self):
+        TieredCache.dangerous_clear_all_tiers()
+        self.addCleanup(TieredCache.dangerous_clear_all_tiers)
+        self.subscription_id = 'sub_test_123'
+        self.customer_id = 'cus_test_123'
+        self.now = int(time.time())
+
+    def _subscription_event(self, event_type='customer.subscription.updated', created=None, **fields):
+        created = created or self.now
+        return stripe.Event.construct_from({
+            'id': f'evt_{created}',
+            'type': event_type,
+            'created': created,
+            'data': {
+                'object': {
+                    'id': self.subscription_id,
+                    'object': 'subscription',
+                    'customer': self.customer_id,
+                    'status': 'active',
+                    **fields,
+                },
+            },
+        }, 'sk_test')
+
+    @mock.patch('stripe.Subscription.retrieve')
+    def test_event_overwrites_cached_object(self, mock_retrieve):
+        mock_retrieve.return_value = {'id': self.subscription_id, 'status': 'trialing'}
+        self.assertEqual(get_stripe_subscription(self.subscription_id)['status'], 'trialing')
+
+        sync_stripe_cache_with_event(self._subscription_event(status='past_due'))
+
+        self.assertEqual(get_stripe_subscription(self.subscription_id)['status'], 'past_due')
+        mock_retrieve.assert_called_once()
+
+    @mock.patch('stripe.Subscription.retrieve')
+    def test_older_event_invalidates_instead_of_overwriting(self, mock_retrieve):
+        sync_stripe_cache_with_event(self._subscription_event(status='past_due'))
+        sync_stripe_cache_with_event(self._subscription_event(created=self.now - 10, status='trialing'))
+
+        mock_retrieve.return_value = {'id': self.subscription_id, 'status': 'past_due'}
+        self.assertEqual(get_stripe_subscription(self.subscription_id)['status'], 'past_due')
+        mock_retrieve.assert_called_once_with(self.subscription_id)
+
+    @mock.patch('stripe.Subscription.retrieve')
+    def test_event_older_than_fetched_object_invalidates_instead_of_overwriting(self, mock_retrieve):
+        mock_retrieve.return_value = {'id': self.subscription_id, 'status': 'past_due'}
+        get_stripe_subscription(self.subscription_id)
+
+        sync_stripe_cache_with_event(self._subscription_event(created=self.now - 10, status='trialing'))
+
+        self.assertEqual(get_stripe_subscription(self.subscription_id)['status'], 'past_due')
+        self.assertEqual(mock_retrieve.call_count, 2)
+
+    @mock.patch('stripe.Subscription.retrieve')
+    def test_event_older_than_cache_timeout_is_not_cached(self, mock_retrieve):
+        created = self.now - get_stripe_subscription.cache_timeout - 10
+        sync_stripe_cache_with_event(self._subscription_event(created=created, status='trialing'))
+
+        mock_retrieve.return_value = {'id': self.subscription_id, 'status': 'past_due'}
+        self.assertEqual(get_stripe_subscription(self.subscription_id)['status'], 'past_due')
+        mock_retrieve.assert_called_once_with(self.subscription_id)
+
+    @mock.patch('stripe.Subscription.retrieve')
+    def test_deletion_event_invalidates_cached_object(self, mock_retrieve):
+        sync_stripe_cache_with_event(self._subscription_event())
+        sync_stripe_cache_with_event(
+            self._subscription_event(event_type='customer.subscription.deleted', created=self.now + 10)
+        )
+
+        mock_retrieve.return_value = {'id': self.subscription_id, 'status': 'canceled'}
+        get_stripe_subscription(self.subscription_id)
+        mock_retrieve.assert_called_once_with(self.subscription_id)
+
+    @mock.patch('stripe.Subscription.list')
+    def test_event_invalidates_derived_data(self, mock_list):
+        mock_list.return_value = mock.Mock(data=[{'id': self.subscription_id}])
+        get_stripe_trialing_subscription(self.customer_id)
+        get_stripe_trialing_subscription(self.customer_id)
+        self.assertEqual(mock_list.call_count, 1)
+
+        sync_stripe_cache_with_event(self._subscription_event())
+
+        get_stripe_trialing_subscription(self.customer_id)
+        self.assertEqual(mock_list.call_count, 2)
+
+    def test_malformed_event_is_logged(self):
+        with mock.patch('enterprise_access.apps.customer_billing.stripe_api.logger') as mock_logger:
+            sync_stripe_cache_with_event(mock.Mock(data=None))
+        mock_logger.exception.assert_called_once()
@@ -155,6 +155,17 @@ class TestStripeEventHandler(TestCase):
 
         StripeEventHandler.dispatch(mock_event)
 
+    @ddt.data('price.created', 'price.updated', 'product.deleted')
+    @mock.patch('enterprise_access.apps.customer_billing.stripe_event_handlers.refresh_stripe_pricing_snapshot_task')
+    def test_pricing_events_refresh_pricing_snapshot(self, event_type, mock_refresh_task):
+        """Test that price and product events refresh the pricing snapshot, without persisting the event."""
+        mock_event = self._create_mock_stripe_event(event_type, {'id': 'price_123', 'object': 'price'})
+
+        StripeEventHandler.dispatch(mock_event)
+
+        mock_refresh_task.delay.assert_called_once_with()
+        self.assertFalse(StripeEventData.objects.filter(event_id=mock_event.id).exists())
+
     @ddt.data(
         # Happy Test case: successful invoice.paid handling
         {
@@ -267,6 +278,40 @@ class TestStripeEventHandler(TestCase):
         event_data = StripeEventData.objects.get(event_id=mock_event.id)
         self.assertEqual(event_data.checkout_intent, self.checkout_intent)
 
+    @mock.patch("enterprise_access.apps.customer_billing.stripe_event_handlers.send_payment_receipt_email")
+    @mock.patch("enterprise_access.apps.customer_billing.models.stripe_api.get_upcoming_invoice")
+    def test_invoice_paid_handler_updates_upcoming_invoice_amount_due(
+        self, mock_get_upcoming_invoice, mock_send_payment_receipt_email,  # pylint: disable=unused-argument
+    ):
+        """Test that invoice.paid materializes the upcoming invoice amount on the latest subscription summary."""
+        stripe_customer_id = 'cus_test_upcoming_456'
+        self.checkout_intent.mark_as_paid(stripe_customer_id=stripe_customer_id)
+        subscription_summary = StripeEventDataFactory(
+            checkout_intent=self.checkout_intent,
+            event_type='customer.subscription.created',
+        ).summary
+        subscription_summary.stripe_subscription_id = 'sub_test_upcoming_123'
+        subscription_summary.save()
+        mock_get_upcoming_invoice.return_value = {'amount_due': 12345}
+
+        invoice_data = {
+            'id': 'in_test_upcoming_123',
+            'object': 'invoice',
+            'customer': stripe_customer_id,
+            'parent': {
+                'subscription_details': {
+                    'metadata': self._create_mock_stripe_subscription(self.checkout_intent.id),
+                    'subscription': 'sub_test_upcoming_123',
+                },
+            },
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            StripeEventHandler.dispatch(self._create_mock_stripe_event('invoice.paid', invoice_data))
+
+        mock_get_upcoming_invoice.assert_called_once_with(stripe_customer_id, 'sub_test_upcoming_123')
+        subscription_summary.refresh_from_db()
+        self.assertEqual(subscription_summary.upcoming_invoice_amount_due, 12345)
+
     @mock.patch(
         "enterprise_access.apps.customer_billing.stripe_event_handlers.send_trial_cancellation_email_task"
     )
@@ -0,0 +1,37 @@
+"""
+Tests for the stripe_event_paths module.
+"""
+import ddt
+from django.test import TestCase
+
+from enterprise_access.apps.customer_billing.stripe_event_paths import JsonPath
+
+
+@ddt.ddt
+class TestJsonPath(TestCase):
+    """
+    Tests for JsonPath.
+    """
+
+    DATA = {
+        'id': 'in_123',
+        'lines': {'data': [{'quantity': 5, 'pricing': {'unit_amount': None}}]},
+        'parent': None,
+    }
+
+    @ddt.data(
+        ('id', 'in_123'),
+        ('lines.data.0.quantity', 5),
+        ('lines.data.0.pricing.unit_amount', None),
+        # Missing keys, indices out of range and traversal through non-containers yield the default.
+        ('currency', 'default'),
+        ('lines.data.1.quantity', 'default'),
+        ('parent.subscription_details.subscription', 'default'),
+        ('id.0.foo', 'default'),
+    )
+    @ddt.unpack
+    def test_call(self, path, expected_value):
+        self.assertEqual(JsonPath(path)(self.DATA, 'default'), expected_value)
+
+    def test_keys_are_precompiled(self):
+        self.assertEqual(JsonPath('items.data.0.current_period_end').keys, ('items', 'data', 0, 'current_period_end'))
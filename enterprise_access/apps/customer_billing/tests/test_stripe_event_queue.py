@@ -0,0 +1,131 @@
+"""
+Unit tests for the asynchronous, per-subscription Stripe event queue.
+"""
+from unittest import mock
+
+import stripe
+from django.core.cache import cache as django_cache
+from django.test import TestCase
+from django.utils import timezone
+
+from enterprise_access.apps.customer_billing.models import StripeEventData
+from enterprise_access.apps.customer_billing.stripe_event_handlers import StripeEventHandler
+from enterprise_access.apps.customer_billing.stripe_event_queue import (
+    enqueue_stripe_event,
+    handle_queued_stripe_events,
+    stripe_event_queue_lock_key
+)
+from enterprise_access.apps.customer_billing.tests.factories import CheckoutIntentFactory, StripeEventDataFactory
+
+
+class TestStripeEventQueue(TestCase):
+    """
+    Tests for the asynchronous, per-subscription stripe event queue.
+    """
+
+    def setUp(self):
+        self.addCleanup(django_cache.clear)
+        self.stripe_subscription_id = 'sub_test_queue_123'
+        self.handled_event_ids = []
+
+    def _create_queued_event(self, created, event_type='customer.subscription.updated', **kwargs):
+        """
+        Helper to create a queued StripeEventData record for the test subscription,
+        created at the given Stripe event timestamp.
+        """
+        event_record = StripeEventDataFactory(
+            event_type=event_type,
+            stripe_subscription_id=self.stripe_subscription_id,
+            **kwargs,
+        )
+        event_record.data['created'] = created
+        event_record.save()
+        return event_record
+
+    def _handle_event(self, event):
+        """Records the event as handled, standing in for the real event handler."""
+        self.handled_event_ids.append(event.id)
+        StripeEventData.objects.filter(event_id=event.id).update(handled_at=timezone.now())
+
+    @mock.patch('enterprise_access.apps.customer_billing.stripe_event_queue.handle_queued_stripe_events_task')
+    def test_enqueue_stripe_event_deduplicates(self, mock_task):
+        checkout_intent = CheckoutIntentFactory()
+        subscription_data = {
+            'id': self.stripe_subscription_id,
+            'object': 'subscription',
+            'status': 'active',
+            'customer': checkout_intent.stripe_customer_id,
+            'metadata': {'checkout_intent_id': str(checkout_intent.id)},
+        }
+        event = stripe.Event.construct_from({
+            'id': 'evt_test_queue_1',
+            'type': 'customer.subscription.updated',
+            'created': 1700000000,
+            'data': {'object': subscription_data},
+        }, 'sk_test')
+
+        with mock.patch.object(StripeEventHandler, 'dispatch') as mock_dispatch:
+            with self.captureOnCommitCallbacks(execute=True):
+                event_record = enqueue_stripe_event(event)
+            with self.captureOnCommitCallbacks(execute=True):
+                enqueue_stripe_event(event)
+
+        mock_dispatch.assert_not_called()
+        self.assertEqual(event_record.stripe_subscription_id, self.stripe_subscription_id)
+        self.assertEqual(event_record.checkout_intent, checkout_intent)
+        self.assertEqual(StripeEventData.objects.filter(event_id=event.id).count(), 1)
+        self.assertEqual(mock_task.delay.call_count, 2)
+        mock_task.delay.assert_called_with(self.stripe_subscription_id)
+
+        # Once handled, duplicate deliveries are not queued again.
+        mock_task.reset_mock()
+        event_record.mark_as_handled()
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue_stripe_event(event)
+        mock_task.delay.assert_not_called()
+
+    def test_handle_queued_stripe_events_in_created_order(self):
+        later_event = self._create_queued_event(created=1700000200)
+        earlier_event = self._create_queued_event(created=1700000100)
+        self._create_queued_event(created=1700000000, handled_at=timezone.now())
+        StripeEventDataFactory(event_type='customer.subscription.updated', stripe_subscription_id='sub_other')
+
+        with mock.patch.object(StripeEventHandler, 'dispatch', side_effect=self._handle_event):
+            handled_event_ids = handle_queued_stripe_events(self.stripe_subscription_id)
+
+        expected_event_ids = [earlier_event.event_id, later_event.event_id]
+        self.assertEqual(handled_event_ids, expected_event_ids)
+        self.assertEqual(self.handled_event_ids, expected_event_ids)
+        self.assertIsNone(django_cache.get(stripe_event_queue_lock_key(self.stripe_subscription_id)))
+
+    def test_handle_queued_stripe_events_lock_held(self):
+        self._create_queued_event(created=1700000000)
+        django_cache.add(stripe_event_queue_lock_key(self.stripe_subscription_id), True)
+
+        with mock.patch.object(StripeEventHandler, 'dispatch') as mock_dispatch:
+            self.assertIsNone(handle_queued_stripe_events(self.stripe_subscription_id))
+
+        mock_dispatch.assert_not_called()
+
+    def test_handle_queued_stripe_events_stops_at_failure(self):
+        failing_event = self._create_queued_event(created=1700000000)
+        later_event = self._create_queued_event(created=1700000100)
+
+        with mock.patch.object(StripeEventHandler, 'dispatch', side_effect=Exception('handler failed')):
+            with self.assertRaises(Exception):
+                handle_queued_stripe_events(self.stripe_subscription_id)
+
+        for event_record in (failing_event, later_event):
+            event_record.refresh_from_db()
+            self.assertIsNone(event_record.handled_at)
+        self.assertIsNone(django_cache.get(stripe_event_queue_lock_key(self.stripe_subscription_id)))
+
+    def test_handle_queued_stripe_events_without_handler(self):
+        event_record = self._create_queued_event(created=1700000000, event_type='customer.subscription.paused')
+
+        with mock.patch.object(StripeEventHandler, 'dispatch') as mock_dispatch:
+            handle_queued_stripe_events(self.stripe_subscription_id)
+
+        mock_dispatch.assert_not_called()
+        event_record.refresh_from_db()
+        self.assertIsNotNone(event_record.handled_at)
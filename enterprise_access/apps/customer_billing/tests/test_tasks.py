@@ -17,8 +17,10 @@ from enterprise_access.apps.customer_billing.tasks import (
     send_payment_receipt_email,
     send_trial_cancellation_email_task,
     send_trial_end_and_subscription_started_email_task,
-    send_trial_ending_reminder_email_task
+    send_trial_ending_reminder_email_task,
+    update_upcoming_invoice_amount_due_task
 )
+from enterprise_access.apps.customer_billing.tests.factories import StripeEventSummaryFactory
 from enterprise_access.utils import format_datetime_obj
 
 
@@ -890,3 +892,38 @@ class TestSendTrialEndAndSubscriptionStartedEmailTask(TestCase):
             send_trial_end_and_subscription_started_email_task('sub_123', 1)
 
         assert not mock_braze_client.return_value.send_campaign_message.called
+
+
+class TestUpdateUpcomingInvoiceAmountDueTask(TestCase):
+    """Tests for update_upcoming_invoice_amount_due_task."""
+
+    def setUp(self):
+        self.summary = StripeEventSummaryFactory(
+            stripe_event_data__event_type='customer.subscription.updated',
+        )
+        self.summary.upcoming_invoice_amount_due = 100
+        self.summary.save(update_fields=['upcoming_invoice_amount_due'])
+        self.checkout_intent = self.summary.checkout_intent
+
+    @mock.patch("enterprise_access.apps.customer_billing.models.stripe_api.get_upcoming_invoice")
+    def test_updates_latest_subscription_summary(self, mock_get_upcoming_invoice):
+        mock_get_upcoming_invoice.return_value = {'amount_due': 250}
+
+        update_upcoming_invoice_amount_due_task(self.checkout_intent.id)
+
+        mock_get_upcoming_invoice.assert_called_once_with(
+            self.checkout_intent.stripe_customer_id,
+            self.summary.stripe_subscription_id,
+        )
+        self.summary.refresh_from_db()
+        assert self.summary.upcoming_invoice_amount_due == 250
+
+    @mock.patch("enterprise_access.apps.customer_billing.models.stripe_api.get_upcoming_invoice")
+    def test_stripe_error_is_not_raised(self, mock_get_upcoming_invoice):
+        mock_get_upcoming_invoice.side_effect = stripe.APIConnectionError('Stripe is down')
+
+        with self.settings(STRIPE_GRACEFUL_EXCEPTION_MODE=False):
+            update_upcoming_invoice_amount_due_task(self.checkout_intent.id)
+
+        self.summary.refresh_from_db()
+        assert self.summary.upcoming_invoice_amount_due == 100
@@ -18,6 +18,7 @@ class EventsConfig(AppConfig):
     """
 
     name = 'enterprise_access.apps.events'
+    default_auto_field = 'django.db.models.BigAutoField'
 
     def ready(self):
         if settings.KAFKA_ENABLED:  # pragma: no cover
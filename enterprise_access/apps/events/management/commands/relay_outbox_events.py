@@ -0,0 +1,43 @@
+"""
+Management command to relay pending outbox events to the event bus and Segment.
+"""
+from django.core.management.base import BaseCommand
+
+from enterprise_access.apps.events.models import OutboxEvent
+from enterprise_access.apps.events.outbox import relay_outbox_events
+
+
+class Command(BaseCommand):
+    """
+    Command to relay the pending outbox events, and purge the events delivered, or given up on
+    after EVENT_OUTBOX_MAX_ATTEMPTS, longer than EVENT_OUTBOX_RETENTION_DAYS ago.
+
+    Events are relayed as soon as the transaction recording them commits; this command is
+    intended to be scheduled, so that events whose delivery failed are retried.
+
+    Usage:
+        ./manage.py relay_outbox_events --batch-size=500
+    """
+
+    help = 'Relay pending outbox events to the event bus and Segment'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Number of events to relay in each batch (default: EVENT_OUTBOX_BATCH_SIZE)',
+        )
+
+    def handle(self, *args, **options):
+        result = relay_outbox_events(batch_size=options['batch_size'])
+        if result is None:
+            self.stdout.write(self.style.WARNING('Outbox events are already being relayed'))
+        else:
+            sent_count, failed_count = result
+            self.stdout.write(self.style.SUCCESS(
+                f'Relayed outbox events. Delivered: {sent_count}, Failed: {failed_count}'
+            ))
+
+        purged_count = OutboxEvent.purge_expired()
+        self.stdout.write(f'Purged {purged_count} delivered or dead-lettered outbox events')
@@ -0,0 +1,66 @@
+"""
+Tests for the relay_outbox_events management command.
+"""
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from enterprise_access.apps.events.models import OutboxEvent, OutboxEventDestination
+
+
+class RelayOutboxEventsCommandTests(TestCase):
+    """Tests for the relay_outbox_events management command."""
+
+    def _create_outbox_event(self, sent_at=None):
+        return OutboxEvent.objects.create(
+            destination=OutboxEventDestination.SEGMENT,
+            lms_user_id='123',
+            event_name='edx.event.name',
+            properties={},
+            sent_at=sent_at,
+        )
+
+    @mock.patch('enterprise_access.apps.events.outbox.analytics')
+    def test_command_relays_and_purges_events(self, mock_analytics):
+        pending_event = self._create_outbox_event()
+        recently_sent_event = self._create_outbox_event(sent_at=timezone.now() - timedelta(days=1))
+        self._create_outbox_event(sent_at=timezone.now() - timedelta(days=30))
+        out = StringIO()
+
+        call_command('relay_outbox_events', stdout=out)
+
+        mock_analytics.track.assert_called_once_with(user_id='123', event='edx.event.name', properties={})
+        self.assertEqual(
+            set(OutboxEvent.objects.values_list('id', flat=True)),
+            {pending_event.id, recently_sent_event.id},
+        )
+        self.assertIn('Delivered: 1, Failed: 0', out.getvalue())
+        self.assertIn('Purged 1 delivered or dead-lettered outbox events', out.getvalue())
+
+    @mock.patch('enterprise_access.apps.events.outbox.analytics')
+    def test_command_purges_dead_lettered_events(self, mock_analytics):
+        recently_failed_event = self._create_outbox_event()
+        long_failed_event = self._create_outbox_event()
+        retrying_event = self._create_outbox_event()
+        OutboxEvent.objects.filter(id__in=[recently_failed_event.id, long_failed_event.id]).update(
+            attempts=settings.EVENT_OUTBOX_MAX_ATTEMPTS,
+            last_error='Delivery failed',
+        )
+        OutboxEvent.objects.filter(id__in=[long_failed_event.id, retrying_event.id]).update(
+            modified=timezone.now() - timedelta(days=30),
+        )
+        out = StringIO()
+
+        call_command('relay_outbox_events', stdout=out)
+
+        mock_analytics.track.assert_called_once_with(user_id='123', event='edx.event.name', properties={})
+        self.assertEqual(
+            set(OutboxEvent.objects.values_list('id', flat=True)),
+            {recently_failed_event.id, retrying_event.id},
+        )
+        self.assertIn('Purged 1 delivered or dead-lettered outbox events', out.getvalue())
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.10 on 2026-10-18 23:17
+
+import django.core.serializers.json
+import django_extensions.db.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, verbose_name='created')),
+                ('modified', django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name='modified')),
+                ('destination', models.CharField(choices=[('event_bus', 'Event bus'), ('segment', 'Segment')], help_text='Where the event is relayed to.', max_length=32)),
+                ('topic', models.CharField(blank=True, help_text='The event bus topic of the event.', max_length=255, null=True)),
+                ('event_name', models.CharField(help_text='The event bus message key, or the Segment event name.', max_length=255)),
+                ('lms_user_id', models.CharField(blank=True, help_text='The LMS user id with which Segment events are tracked.', max_length=255, null=True)),
+                ('properties', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='The properties of the event.')),
+                ('sent_at', models.DateTimeField(blank=True, help_text='When the event was delivered to its destination.', null=True)),
+                ('attempts', models.PositiveIntegerField(default=0, help_text='How many times delivering the event failed.')),
+                ('last_error', models.TextField(blank=True, help_text='The error of the last failed delivery attempt.', null=True)),
+            ],
+            options={
+                'verbose_name': 'Outbox Event',
+                'verbose_name_plural': 'Outbox Events',
+                'indexes': [models.Index(fields=['sent_at', 'attempts'], name='events_outb_sent_at_0bdc74_idx')],
+            },
+        ),
+    ]
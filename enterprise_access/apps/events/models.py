@@ -0,0 +1,119 @@
+"""
+Models for the events app.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+from django_extensions.db.models import TimeStampedModel
+
+
+class OutboxEventDestination:
+    """
+    Destinations to which outbox events are relayed.
+    """
+    EVENT_BUS = 'event_bus'
+    SEGMENT = 'segment'
+
+    CHOICES = (
+        (EVENT_BUS, 'Event bus'),
+        (SEGMENT, 'Segment'),
+    )
+
+
+class OutboxEvent(TimeStampedModel):
+    """
+    An event bus or Segment event, recorded in the same transaction as the change that produced it,
+    and relayed to its destination in batches once that transaction commits.
+
+    .. pii: The properties of Segment events may store PII,
+       which is purged after EVENT_OUTBOX_RETENTION_DAYS once the event is delivered
+       or has reached EVENT_OUTBOX_MAX_ATTEMPTS.
+    .. pii_types: email_address
+    .. pii_retirement: local_api
+    """
+    class Meta:
+        verbose_name = "Outbox Event"
+        verbose_name_plural = "Outbox Events"
+        indexes = [
+            # Serve the relay's lookups of undelivered events.
+            models.Index(fields=['sent_at', 'attempts']),
+        ]
+
+    destination = models.CharField(
+        max_length=32,
+        choices=OutboxEventDestination.CHOICES,
+        help_text='Where the event is relayed to.',
+    )
+    topic = models.CharField(
+        max_length=255,
+        null=True,
+        blank=True,
+        help_text='The event bus topic of the event.',
+    )
+    event_name = models.CharField(
+        max_length=255,
+        help_text='The event bus message key, or the Segment event name.',
+    )
+    lms_user_id = models.CharField(
+        max_length=255,
+        null=True,
+        blank=True,
+        help_text='The LMS user id with which Segment events are tracked.',
+    )
+    properties = models.JSONField(
+        encoder=DjangoJSONEncoder,
+        help_text='The properties of the event.',
+    )
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='When the event was delivered to its destination.',
+    )
+    attempts = models.PositiveIntegerField(
+        default=0,
+        help_text='How many times delivering the event failed.',
+    )
+    last_error = models.TextField(
+        null=True,
+        blank=True,
+        help_text='The error of the last failed delivery attempt.',
+    )
+
+    def __str__(self):
+        return f"<OutboxEvent id={self.id}, destination={self.destination}, event_name={self.event_name}>"
+
+    @classmethod
+    def pending(cls):
+        """
+        Returns the undelivered events that are still to be relayed, in the order they were recorded.
+        """
+        return cls.objects.filter(
+            sent_at__isnull=True,
+            attempts__lt=settings.EVENT_OUTBOX_MAX_ATTEMPTS,
+        ).order_by('id')
+
+    @classmethod
+    def purge_expired(cls, retention_days=None):
+        """
+        Deletes the events delivered more than ``retention_days`` ago, and the events whose
+        delivery last failed more than ``retention_days`` ago and that are no longer relayed
+        because they reached EVENT_OUTBOX_MAX_ATTEMPTS.
+
+        Returns:
+            int: The number of deleted events.
+        """
+        if retention_days is None:
+            retention_days = settings.EVENT_OUTBOX_RETENTION_DAYS
+        cutoff = timezone.now() - timedelta(days=retention_days)
+        deleted_count, _ = cls.objects.filter(
+            models.Q(sent_at__lt=cutoff) |
+            models.Q(
+                sent_at__isnull=True,
+                attempts__gte=settings.EVENT_OUTBOX_MAX_ATTEMPTS,
+                modified__lt=cutoff,
+            )
+        ).delete()
+        return deleted_count
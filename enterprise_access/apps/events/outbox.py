@@ -0,0 +1,241 @@
+"""
+Transactional outbox for event bus and Segment events.
+
+Rather than being emitted inline, events are recorded as ``OutboxEvent`` records within the
+transaction that produces them. Once it commits, a relay delivers the pending events to their
+destinations in batches, flushing the event bus producers (and Segment client) once per batch.
+A relay is enqueued at most once per transaction, and not while another one is still enqueued.
+Events are delivered at least once: undelivered events are retried by later relays.
+"""
+import logging
+from collections import defaultdict
+
+import analytics
+from django.conf import settings
+from django.core.cache import cache as django_cache
+from django.db import transaction
+from django.utils import timezone
+
+from enterprise_access.apps.events.models import OutboxEvent, OutboxEventDestination
+from enterprise_access.apps.events.tasks import relay_outbox_events_task
+from enterprise_access.apps.events.utils import produce_event_to_event_bus, verify_event
+from enterprise_access.cache_utils import versioned_cache_key
+
+logger = logging.getLogger(__name__)
+
+
+def outbox_relay_lock_key():
+    return versioned_cache_key('event_outbox_relay_lock')
+
+
+def outbox_relay_scheduled_key():
+    return versioned_cache_key('event_outbox_relay_scheduled')
+
+
+def _schedule_relay():
+    """
+    Enqueues a relay of the pending outbox events, unless one is already enqueued and has not yet started.
+    """
+    scheduled_key = outbox_relay_scheduled_key()
+    if not django_cache.add(scheduled_key, True, settings.EVENT_OUTBOX_RELAY_LOCK_TIMEOUT):
+        return
+    try:
+        relay_outbox_events_task.delay()
+    except Exception:
+        django_cache.delete(scheduled_key)
+        raise
+
+
+def _schedule_relay_on_commit():
+    """
+    Schedules a relay once the current transaction commits, at most once per transaction.
+    """
+    connection = transaction.get_connection()
+    if connection.in_atomic_block and any(func is _schedule_relay for _, func, _ in connection.run_on_commit):
+        return
+    transaction.on_commit(_schedule_relay)
+
+
+def _add_event_to_outbox(**outbox_event_fields):
+    """
+    Records an event in the outbox, and schedules its relay once the current transaction commits.
+    """
+    outbox_event = OutboxEvent.objects.create(**outbox_event_fields)
+    _schedule_relay_on_commit()
+    return outbox_event
+
+
+def add_event_bus_event_to_outbox(topic, event_name, event_properties):
+    """
+    Records an event to be sent to the given event bus topic.
+    """
+    return _add_event_to_outbox(
+        destination=OutboxEventDestination.EVENT_BUS,
+        topic=topic,
+        event_name=event_name,
+        properties=event_properties,
+    )
+
+
+def add_segment_event_to_outbox(lms_user_id, event_name, properties):
+    """
+    Records an event to be tracked in Segment.
+    """
+    return _add_event_to_outbox(
+        destination=OutboxEventDestination.SEGMENT,
+        lms_user_id=str(lms_user_id),
+        event_name=event_name,
+        properties=properties,
+    )
+
+
+def add_segment_events_to_outbox(events):
+    """
+    Records several events to be tracked in Segment, with a single insert per batch.
+
+    Args:
+        events (list of tuple): The ``(lms_user_id, event_name, properties)`` of each event.
+    """
+    outbox_events = OutboxEvent.objects.bulk_create(
+        [
+            OutboxEvent(
+                destination=OutboxEventDestination.SEGMENT,
+                lms_user_id=str(lms_user_id),
+                event_name=event_name,
+                properties=properties,
+            )
+            for lms_user_id, event_name, properties in events
+        ],
+        batch_size=settings.EVENT_OUTBOX_BATCH_SIZE,
+    )
+    if outbox_events:
+        _schedule_relay_on_commit()
+    return outbox_events
+
+
+def _relay_event_bus_events(outbox_events):
+    """
+    Produces the given events to the event bus, then flushes each producer once.
+
+    Returns:
+        dict: The delivery error of each event id, or None for delivered events.
+    """
+    errors_by_id = {}
+    producers_by_topic = {}
+    for outbox_event in outbox_events:
+        def on_delivery(err, msg, outbox_event_id=outbox_event.id):
+            verify_event(err, msg)
+            errors_by_id[outbox_event_id] = str(err) if err is not None else None
+
+        try:
+            producers_by_topic[outbox_event.topic] = produce_event_to_event_bus(
+                outbox_event.topic,
+                outbox_event.event_name,
+                outbox_event.properties,
+                on_delivery=on_delivery,
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.exception('Could not produce %s to the event bus.', outbox_event)
+            errors_by_id[outbox_event.id] = str(exc)
+
+    for producer in producers_by_topic.values():
+        producer.flush(settings.EVENT_OUTBOX_FLUSH_TIMEOUT)
+
+    for outbox_event in outbox_events:
+        errors_by_id.setdefault(outbox_event.id, 'Delivery was not acknowledged before the flush timeout.')
+    return errors_by_id
+
+
+def _relay_segment_events(outbox_events):
+    """
+    Tracks the given events in Segment, then flushes the Segment client once.
+
+    Returns:
+        dict: The delivery error of each event id, or None for delivered events.
+    """
+    errors_by_id = {}
+    for outbox_event in outbox_events:
+        try:
+            analytics.track(
+                user_id=outbox_event.lms_user_id,
+                event=outbox_event.event_name,
+                properties=outbox_event.properties,
+            )
+            errors_by_id[outbox_event.id] = None
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.exception('Could not track %s in Segment.', outbox_event)
+            errors_by_id[outbox_event.id] = str(exc)
+
+    analytics.flush()
+    return errors_by_id
+
+
+_RELAYS_BY_DESTINATION = {
+    OutboxEventDestination.EVENT_BUS: _relay_event_bus_events,
+    OutboxEventDestination.SEGMENT: _relay_segment_events,
+}
+
+
+def _relay_outbox_event_batch(outbox_events):
+    """
+    Relays a batch of events to their destinations, and records the outcome of each.
+
+    Returns:
+        tuple: The number of delivered and failed events.
+    """
+    events_by_destination = defaultdict(list)
+    for outbox_event in outbox_events:
+        events_by_destination[outbox_event.destination].append(outbox_event)
+
+    errors_by_id = {}
+    for destination, destination_events in events_by_destination.items():
+        errors_by_id.update(_RELAYS_BY_DESTINATION[destination](destination_events))
+
+    now = timezone.now()
+    for outbox_event in outbox_events:
+        outbox_event.modified = now
+        if (error := errors_by_id[outbox_event.id]) is None:
+            outbox_event.sent_at = now
+        else:
+            outbox_event.attempts += 1
+            outbox_event.last_error = error
+    OutboxEvent.objects.bulk_update(outbox_events, ['sent_at', 'attempts', 'last_error', 'modified'])
+
+    failed_count = sum(1 for outbox_event in outbox_events if outbox_event.sent_at is None)
+    return len(outbox_events) - failed_count, failed_count
+
+
+def relay_outbox_events(batch_size=None):
+    """
+    Relays the pending outbox events to their destinations, in batches and in the order they were recorded.
+
+    A lock ensures only one worker relays events at a time. Each pending event is attempted at most
+    once per relay, and failed events are retried by later relays.
+
+    Returns:
+        tuple: The number of delivered and failed events, or None if another worker holds the lock.
+    """
+    batch_size = batch_size or settings.EVENT_OUTBOX_BATCH_SIZE
+    lock_key = outbox_relay_lock_key()
+    if not django_cache.add(lock_key, True, settings.EVENT_OUTBOX_RELAY_LOCK_TIMEOUT):
+        logger.info('Outbox events are already being relayed.')
+        return None
+
+    # Events recorded from now on are not guaranteed to be relayed by this relay, so they schedule another.
+    django_cache.delete(outbox_relay_scheduled_key())
+    sent_count, failed_count, last_id = 0, 0, 0
+    try:
+        while outbox_events := list(OutboxEvent.pending().filter(id__gt=last_id)[:batch_size]):
+            last_id = outbox_events[-1].id
+            batch_sent_count, batch_failed_count = _relay_outbox_event_batch(outbox_events)
+            sent_count += batch_sent_count
+            failed_count += batch_failed_count
+    finally:
+        django_cache.delete(lock_key)
+
+    # An event recorded just before the lock was released would have found the lock held.
+    if OutboxEvent.pending().filter(id__gt=last_id).exists():
+        relay_outbox_events_task.delay()
+
+    logger.info('Relayed outbox events, delivered: %s, failed: %s', sent_count, failed_count)
+    return sent_count, failed_count
@@ -0,0 +1,16 @@
+"""
+Tasks for the events app.
+"""
+from celery import shared_task
+
+from enterprise_access.tasks import LoggedTaskWithRetry
+
+
+@shared_task(base=LoggedTaskWithRetry)
+def relay_outbox_events_task():
+    """
+    Relays the pending outbox events to their destinations.
+    """
+    # pylint: disable=import-outside-toplevel
+    from enterprise_access.apps.events.outbox import relay_outbox_events
+    return relay_outbox_events()
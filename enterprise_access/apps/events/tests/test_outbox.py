@@ -0,0 +1,156 @@
+"""
+Unit tests for the event outbox.
+"""
+from unittest import mock
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache as django_cache
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from enterprise_access.apps.events.models import OutboxEvent, OutboxEventDestination
+from enterprise_access.apps.events.outbox import _schedule_relay, outbox_relay_lock_key, relay_outbox_events
+from enterprise_access.apps.events.signals import ACCESS_POLICY_CREATED
+from enterprise_access.apps.events.utils import send_access_policy_event_to_event_bus
+from enterprise_access.apps.track.segment import track_event, track_events
+
+
+@override_settings(EVENT_OUTBOX_ENABLED=True, KAFKA_ENABLED=True, SEGMENT_KEY='123')
+class OutboxTests(TestCase):
+    """
+    Unit tests for recording and relaying outbox events.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(django_cache.clear)
+
+    def _add_event_bus_event(self):
+        send_access_policy_event_to_event_bus(
+            ACCESS_POLICY_CREATED.event_type,
+            {'uuid': uuid4(), 'active': True, 'subsidy_uuid': uuid4(), 'access_method': 'direct'},
+        )
+
+    def _mock_produce(self, mock_produce_event_to_event_bus, delivery_error=None):
+        """
+        Makes the mocked producer acknowledge the delivery of each produced event.
+        """
+        def produce(topic, event_name, event_properties, on_delivery):  # pylint: disable=unused-argument
+            on_delivery(delivery_error, mock.MagicMock())
+            return mock_produce_event_to_event_bus.producer
+        mock_produce_event_to_event_bus.producer = mock.MagicMock()
+        mock_produce_event_to_event_bus.side_effect = produce
+
+    @mock.patch('enterprise_access.apps.events.outbox.produce_event_to_event_bus')
+    @mock.patch('enterprise_access.apps.events.utils.SerializingProducer')
+    def test_event_bus_events_are_relayed_on_commit(self, mock_serializing_producer, mock_produce_event_to_event_bus):
+        self._mock_produce(mock_produce_event_to_event_bus)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self._add_event_bus_event()
+            self._add_event_bus_event()
+
+        # Recording an event only writes to the outbox.
+        mock_serializing_producer.assert_not_called()
+        outbox_event = OutboxEvent.objects.first()
+        self.assertEqual(outbox_event.destination, OutboxEventDestination.EVENT_BUS)
+        self.assertEqual(outbox_event.topic, settings.ACCESS_POLICY_TOPIC_NAME)
+        self.assertEqual(outbox_event.event_name, ACCESS_POLICY_CREATED.event_type)
+
+        for callback in callbacks:
+            callback()
+
+        # Events are produced, then the producer is flushed once per batch.
+        self.assertEqual(mock_produce_event_to_event_bus.call_count, 2)
+        mock_produce_event_to_event_bus.producer.flush.assert_called_with(settings.EVENT_OUTBOX_FLUSH_TIMEOUT)
+        self.assertFalse(OutboxEvent.pending().exists())
+        self.assertFalse(OutboxEvent.objects.filter(sent_at__isnull=True).exists())
+
+    @mock.patch('enterprise_access.apps.events.outbox.produce_event_to_event_bus')
+    def test_failed_events_are_retried(self, mock_produce_event_to_event_bus):
+        self._mock_produce(mock_produce_event_to_event_bus, delivery_error='broker unavailable')
+        self._add_event_bus_event()
+
+        self.assertEqual(relay_outbox_events(), (0, 1))
+        outbox_event = OutboxEvent.objects.get()
+        self.assertIsNone(outbox_event.sent_at)
+        self.assertEqual(outbox_event.attempts, 1)
+        self.assertEqual(outbox_event.last_error, 'broker unavailable')
+
+        self._mock_produce(mock_produce_event_to_event_bus)
+        self.assertEqual(relay_outbox_events(), (1, 0))
+        outbox_event.refresh_from_db()
+        self.assertIsNotNone(outbox_event.sent_at)
+
+    @override_settings(EVENT_OUTBOX_MAX_ATTEMPTS=1)
+    @mock.patch('enterprise_access.apps.events.outbox.produce_event_to_event_bus')
+    def test_events_are_not_relayed_after_max_attempts(self, mock_produce_event_to_event_bus):
+        self._mock_produce(mock_produce_event_to_event_bus, delivery_error='broker unavailable')
+        self._add_event_bus_event()
+
+        self.assertEqual(relay_outbox_events(), (0, 1))
+        self.assertEqual(relay_outbox_events(), (0, 0))
+        self.assertEqual(mock_produce_event_to_event_bus.call_count, 1)
+
+    @mock.patch('enterprise_access.apps.events.outbox.produce_event_to_event_bus')
+    def test_unacknowledged_events_fail(self, mock_produce_event_to_event_bus):
+        self._add_event_bus_event()
+
+        self.assertEqual(relay_outbox_events(), (0, 1))
+        mock_produce_event_to_event_bus.return_value.flush.assert_called_once()
+        self.assertIn('flush timeout', OutboxEvent.objects.get().last_error)
+
+    @mock.patch('enterprise_access.apps.events.outbox.analytics')
+    @mock.patch('enterprise_access.apps.track.segment.analytics')
+    def test_segment_events_are_relayed(self, mock_segment_analytics, mock_outbox_analytics):
+        track_event(123, 'edx.event.name', {'enterprise_customer_uuid': uuid4()})
+        track_event(456, 'edx.event.name', {})
+
+        mock_segment_analytics.track.assert_not_called()
+        self.assertEqual(relay_outbox_events(), (2, 0))
+        mock_outbox_analytics.track.assert_any_call(user_id='456', event='edx.event.name', properties={})
+        mock_outbox_analytics.flush.assert_called_once()
+
+    @mock.patch('enterprise_access.apps.events.outbox.analytics')
+    def test_bulk_segment_events_are_relayed(self, mock_outbox_analytics):
+        with self.assertNumQueries(1):
+            track_events([
+                (123, 'edx.event.name', {'enterprise_customer_uuid': uuid4()}),
+                (456, 'edx.event.name', {}),
+            ])
+
+        self.assertEqual(relay_outbox_events(), (2, 0))
+        mock_outbox_analytics.track.assert_any_call(user_id='456', event='edx.event.name', properties={})
+
+    def test_relay_is_skipped_while_locked(self):
+        self._add_event_bus_event()
+        django_cache.add(outbox_relay_lock_key(), True)
+
+        self.assertIsNone(relay_outbox_events())
+        self.assertTrue(OutboxEvent.pending().exists())
+
+    @mock.patch('enterprise_access.apps.events.outbox.relay_outbox_events_task')
+    def test_relay_is_scheduled_once_per_transaction(self, mock_relay_task):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self._add_event_bus_event()
+            track_event(123, 'edx.event.name', {})
+            track_events([(456, 'edx.event.name', {})])
+
+        self.assertEqual(len(callbacks), 1)
+        mock_relay_task.delay.assert_called_once_with()
+
+    @mock.patch('enterprise_access.apps.events.outbox.produce_event_to_event_bus')
+    @mock.patch('enterprise_access.apps.events.outbox.relay_outbox_events_task')
+    def test_relay_is_not_enqueued_again_until_it_starts(self, mock_relay_task, mock_produce_event_to_event_bus):
+        self._mock_produce(mock_produce_event_to_event_bus)
+        self._add_event_bus_event()
+
+        # E.g. outside of a transaction, where each recorded event schedules a relay right away.
+        _schedule_relay()
+        _schedule_relay()
+        mock_relay_task.delay.assert_called_once_with()
+
+        self.assertEqual(relay_outbox_events(), (1, 0))
+        _schedule_relay()
+        self.assertEqual(mock_relay_task.delay.call_count, 2)
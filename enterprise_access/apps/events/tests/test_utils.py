@@ -13,6 +13,9 @@ from faker import Faker
 
 from enterprise_access.apps.events.signals import ACCESS_POLICY_CREATED, SUBSIDY_REDEEMED
 from enterprise_access.apps.events.utils import (
+    ProducerFactory,
+    batched_event_bus_events,
+    get_active_event_bus_batch,
     send_access_policy_event_to_event_bus,
     send_subsidy_redemption_event_to_event_bus,
     verify_event
@@ -98,3 +101,60 @@ class UtilsTests(TestCase):
             on_delivery=verify_event
         )
         assert mock_logger.exception.call_count == 1
+
+
+class BatchedEventBusEventsTests(TestCase):
+    """
+    Unit tests for sending event bus events in batches.
+    """
+
+    def setUp(self):
+        super().setUp()
+        producers_patcher = mock.patch.dict(
+            ProducerFactory._type_to_producer, clear=True,  # pylint: disable=protected-access
+        )
+        producers_patcher.start()
+        self.addCleanup(producers_patcher.stop)
+
+    def _event_data(self):
+        return {
+            'enterprise_uuid': uuid4(),
+            'content_key': 'test-course',
+            'lms_user_id': FAKER.pyint(),
+        }
+
+    @override_settings(KAFKA_ENABLED=True, KAFKA_PRODUCER_CONFIG={'linger.ms': 20, 'compression.type': 'lz4'})
+    @mock.patch('enterprise_access.apps.events.utils.SerializingProducer')
+    def test_producer_config(self, mock_serializing_producer):
+        send_subsidy_redemption_event_to_event_bus(SUBSIDY_REDEEMED.event_type, self._event_data())
+
+        producer_settings = mock_serializing_producer.call_args.args[0]
+        self.assertEqual(producer_settings['linger.ms'], 20)
+        self.assertEqual(producer_settings['compression.type'], 'lz4')
+        self.assertEqual(producer_settings['bootstrap.servers'], settings.KAFKA_BOOTSTRAP_SERVER)
+
+    @override_settings(KAFKA_ENABLED=True)
+    @mock.patch('enterprise_access.apps.events.utils.set_custom_attribute')
+    @mock.patch('enterprise_access.apps.events.utils.SerializingProducer')
+    def test_batched_events_are_flushed_once(self, mock_serializing_producer, mock_set_custom_attribute):
+        mock_producer = mock_serializing_producer.return_value
+        # Acknowledge the delivery of every other event, and fail the rest.
+        mock_producer.produce.side_effect = lambda *args, on_delivery, **kwargs: on_delivery(
+            None if mock_producer.produce.call_count % 2 else 'broker unavailable', mock.MagicMock(),
+        )
+
+        with batched_event_bus_events() as batch:
+            for _ in range(3):
+                send_subsidy_redemption_event_to_event_bus(SUBSIDY_REDEEMED.event_type, self._event_data())
+            with batched_event_bus_events() as nested_batch:
+                send_subsidy_redemption_event_to_event_bus(SUBSIDY_REDEEMED.event_type, self._event_data())
+            mock_producer.flush.assert_not_called()
+
+        self.assertIs(nested_batch, batch)
+        self.assertIsNone(get_active_event_bus_batch())
+        self.assertEqual(mock_producer.produce.call_count, 4)
+        mock_producer.poll.assert_called_with(0)
+        mock_producer.flush.assert_called_once_with(settings.KAFKA_PRODUCER_FLUSH_TIMEOUT)
+        self.assertEqual((batch.produced, batch.delivered, batch.failed, batch.undelivered), (4, 2, 2, 0))
+        mock_set_custom_attribute.assert_any_call('event_bus_batch.delivered', 2)
+        mock_set_custom_attribute.assert_any_call('event_bus_batch.failed', 2)
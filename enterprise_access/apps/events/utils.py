@@ -4,12 +4,14 @@ temporary.
 """
 
 import logging
+from contextlib import contextmanager
 
 from confluent_kafka import KafkaError, KafkaException, SerializingProducer
 from confluent_kafka.admin import AdminClient, NewTopic
 from confluent_kafka.error import ValueSerializationError
 from confluent_kafka.serialization import StringSerializer
 from django.conf import settings
+from edx_django_utils.monitoring import set_custom_attribute
 
 from enterprise_access.apps.events.data import (
     AccessPolicyEvent,
@@ -19,9 +21,15 @@ from enterprise_access.apps.events.data import (
     SubsidyRedemptionEvent,
     SubsidyRedemptionSerializer
 )
+from enterprise_access.cache_utils import request_cache
 
 logger = logging.getLogger(__name__)
 
+EVENT_BUS_BATCH_REQUEST_CACHE_NAMESPACE = 'event_bus_batch'
+ACTIVE_BATCH_CACHE_KEY = 'active_batch'
+
+MONITORING_ATTRIBUTE_PREFIX = 'event_bus_batch'
+
 
 class ProducerFactory:
     """
@@ -45,6 +53,7 @@ class ProducerFactory:
             return existing_producer
 
         producer_settings = {
+            **settings.KAFKA_PRODUCER_CONFIG,
             'bootstrap.servers': settings.KAFKA_BOOTSTRAP_SERVER,
             'key.serializer': event_key_serializer,
             'value.serializer': event_value_serializer,
@@ -106,47 +115,171 @@ def create_topics(topic_names):
                 raise
 
 
-def send_coupon_code_request_event_to_event_bus(event_name, event_properties):
+def get_event_bus_topic_event_classes():
     """
-    Sends a coupon code request event to the event bus.
+    Returns the event class and serializer class of the events of each event bus topic.
+    """
+    return {
+        settings.COUPON_CODE_REQUEST_TOPIC_NAME: (CouponCodeRequestEvent, CouponCodeRequestEventSerializer),
+        settings.ACCESS_POLICY_TOPIC_NAME: (AccessPolicyEvent, AccessPolicyEventSerializer),
+        settings.SUBSIDY_REDEMPTION_TOPIC_NAME: (SubsidyRedemptionEvent, SubsidyRedemptionSerializer),
+    }
+
+
+def produce_event_to_event_bus(topic, event_name, event_properties, on_delivery=None):
+    """
+    Produces an event to the given event bus topic, without waiting for its delivery.
+
+    Returns:
+        SerializingProducer: The producer of the topic, to be polled or flushed by the caller.
+    """
+    event_class, event_serializer_class = get_event_bus_topic_event_classes()[topic]
+    event_producer = ProducerFactory.get_or_create_event_producer(
+        topic,
+        StringSerializer('utf-8'),
+        event_serializer_class.get_serializer()
+    )
+    event_producer.produce(
+        topic,
+        key=str(event_name),
+        value=event_class(**event_properties),
+        on_delivery=on_delivery or verify_event
+    )
+    return event_producer
+
+
+class EventBusBatch:
+    """
+    Collects the producers used, and the delivery outcomes of, the events
+    sent to the event bus within ``batched_event_bus_events()``.
+    """
+
+    def __init__(self):
+        self.producers_by_topic = {}
+        self.produced = 0
+        self.delivered = 0
+        self.failed = 0
+
+    def add(self, topic, producer):
+        self.producers_by_topic[topic] = producer
+        self.produced += 1
+
+    def on_delivery(self, err, evt):
+        """
+        Delivery callback of the events of the batch, which counts their delivery outcomes.
+        """
+        verify_event(err, evt)
+        if err is None:
+            self.delivered += 1
+        else:
+            self.failed += 1
+
+    def flush(self, timeout):
+        """
+        Waits, up to ``timeout`` seconds per producer, for the events of the batch to be delivered.
+        """
+        for producer in self.producers_by_topic.values():
+            producer.flush(timeout)
+
+    @property
+    def undelivered(self):
+        return self.produced - self.delivered - self.failed
+
+    def emit_monitoring_attributes(self):
+        """
+        Emits the delivery stats of the batch as custom monitoring attributes.
+        """
+        set_custom_attribute(f'{MONITORING_ATTRIBUTE_PREFIX}.produced', self.produced)
+        set_custom_attribute(f'{MONITORING_ATTRIBUTE_PREFIX}.delivered', self.delivered)
+        set_custom_attribute(f'{MONITORING_ATTRIBUTE_PREFIX}.failed', self.failed)
+        set_custom_attribute(f'{MONITORING_ATTRIBUTE_PREFIX}.undelivered', self.undelivered)
+        if self.failed or self.undelivered:
+            logger.warning(
+                'Event bus batch of %s events had %s failed and %s undelivered events.',
+                self.produced, self.failed, self.undelivered,
+            )
+
+
+def get_active_event_bus_batch():
     """
+    Returns the batch of event bus events active in the current request or task, or None.
+    """
+    cached_response = request_cache(namespace=EVENT_BUS_BATCH_REQUEST_CACHE_NAMESPACE).get_cached_response(
+        ACTIVE_BATCH_CACHE_KEY,
+    )
+    return cached_response.value if cached_response.is_found else None
+
+
+@contextmanager
+def batched_event_bus_events(flush_timeout=None):
+    """
+    Context manager within which events sent to the event bus are not individually waited for.
+    Instead, the producers used are flushed once on exit, and the delivery stats of the batch
+    are emitted as custom monitoring attributes. Nested batches are part of the outermost batch.
+
+    Usage:
+        with batched_event_bus_events():
+            for request in approved_requests:
+                send_coupon_code_request_event_to_event_bus(...)
+    """
+    if (active_batch := get_active_event_bus_batch()) is not None:
+        yield active_batch
+        return
+
+    batch = EventBusBatch()
+    cache = request_cache(namespace=EVENT_BUS_BATCH_REQUEST_CACHE_NAMESPACE)
+    cache.set(ACTIVE_BATCH_CACHE_KEY, batch)
+    try:
+        yield batch
+    finally:
+        cache.delete(ACTIVE_BATCH_CACHE_KEY)
+        if batch.produced:
+            batch.flush(flush_timeout or settings.KAFKA_PRODUCER_FLUSH_TIMEOUT)
+            batch.emit_monitoring_attributes()
+
+
+def send_event_to_event_bus(topic, event_name, event_properties):
+    """
+    Sends an event to the given event bus topic or, if the event outbox is enabled,
+    records it in the outbox to be relayed once the current transaction commits.
+
+    Within ``batched_event_bus_events()``, the event's delivery is waited for when the batch ends.
+    """
+    if settings.EVENT_OUTBOX_ENABLED:
+        # pylint: disable=import-outside-toplevel
+        from enterprise_access.apps.events.outbox import add_event_bus_event_to_outbox
+        add_event_bus_event_to_outbox(topic, event_name, event_properties)
+        return
+
     try:
-        event_producer = ProducerFactory.get_or_create_event_producer(
-            settings.COUPON_CODE_REQUEST_TOPIC_NAME,
-            StringSerializer('utf-8'),
-            CouponCodeRequestEventSerializer.get_serializer()
-        )
-        event_producer.produce(
-            settings.COUPON_CODE_REQUEST_TOPIC_NAME,
-            key=str(event_name),
-            value=CouponCodeRequestEvent(**event_properties),
-            on_delivery=verify_event
-        )
+        if (batch := get_active_event_bus_batch()) is not None:
+            event_producer = produce_event_to_event_bus(
+                topic, event_name, event_properties, on_delivery=batch.on_delivery,
+            )
+            batch.add(topic, event_producer)
+            # Serve the delivery reports of earlier events, without waiting.
+            event_producer.poll(0)
+            return
+
+        event_producer = produce_event_to_event_bus(topic, event_name, event_properties)
         event_producer.poll()
     except ValueSerializationError as vse:
         logger.exception(vse)
 
 
+def send_coupon_code_request_event_to_event_bus(event_name, event_properties):
+    """
+    Sends a coupon code request event to the event bus.
+    """
+    send_event_to_event_bus(settings.COUPON_CODE_REQUEST_TOPIC_NAME, event_name, event_properties)
+
+
 def send_access_policy_event_to_event_bus(event_name, event_properties):
     """
     Sends access policy event to the event bus.
     """
     if settings.KAFKA_ENABLED:  # pragma: no cover
-        try:
-            event_producer = ProducerFactory.get_or_create_event_producer(
-                settings.ACCESS_POLICY_TOPIC_NAME,
-                StringSerializer('utf-8'),
-                AccessPolicyEventSerializer.get_serializer()
-            )
-            event_producer.produce(
-                settings.ACCESS_POLICY_TOPIC_NAME,
-                key=str(event_name),
-                value=AccessPolicyEvent(**event_properties),
-                on_delivery=verify_event
-            )
-            event_producer.poll()
-        except ValueSerializationError as vse:
-            logger.exception(vse)
+        send_event_to_event_bus(settings.ACCESS_POLICY_TOPIC_NAME, event_name, event_properties)
 
 
 def send_subsidy_redemption_event_to_event_bus(event_name, event_properties):
@@ -154,21 +287,7 @@ def send_subsidy_redemption_event_to_event_bus(event_name, event_properties):
     Sends subsidy redemption and reversal events to the event bus.
     """
     if settings.KAFKA_ENABLED:  # pragma: no cover
-        try:
-            event_producer = ProducerFactory.get_or_create_event_producer(
-                settings.SUBSIDY_REDEMPTION_TOPIC_NAME,
-                StringSerializer('utf-8'),
-                SubsidyRedemptionSerializer.get_serializer()
-            )
-            event_producer.produce(
-                settings.SUBSIDY_REDEMPTION_TOPIC_NAME,
-                key=str(event_name),
-                value=SubsidyRedemptionEvent(**event_properties),
-                on_delivery=verify_event
-            )
-            event_producer.poll()
-        except ValueSerializationError as vse:
-            logger.exception(vse)
+        send_event_to_event_bus(settings.SUBSIDY_REDEMPTION_TOPIC_NAME, event_name, event_properties)
 
 
 def verify_event(err, evt):
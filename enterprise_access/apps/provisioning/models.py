@@ -44,12 +44,6 @@ class CheckoutIntentStepMixin:
     Centralized logic for interfacing with CheckoutIntent records from workflow steps.
     """
 
-    def get_workflow_record(self) -> 'ProvisionNewCustomerWorkflow':
-        """
-        Implemented by base class.
-        """
-        raise NotImplementedError()
-
     def get_fulfillable_checkout_intent_via_slug(self) -> CheckoutIntent:
         """
         Helper to get the checkout intent (related via the enterprise customer slug).
@@ -172,14 +166,11 @@ class GetCreateCustomerStep(CheckoutIntentStepMixin, AbstractWorkflowStep):
         self.link_checkout_intent(result_dict['uuid'])
         return self.output_class.from_dict(result_dict)
 
-    def get_workflow_record(self):
+    def load_workflow_record(self):
         return ProvisionNewCustomerWorkflow.objects.filter(
             uuid=self.workflow_record_uuid,
         ).first()
 
-    def get_preceding_step_record(self):
-        return None
-
 
 @define
 class GetCreateEnterpriseAdminUsersInput(BaseInputOutput):
@@ -243,12 +234,12 @@ class GetCreateEnterpriseAdminUsersStep(AbstractWorkflowStep):
         result_dict['enterprise_customer_uuid'] = customer_uuid_str
         return self.output_class.from_dict(result_dict)
 
-    def get_workflow_record(self):
+    def load_workflow_record(self):
         return ProvisionNewCustomerWorkflow.objects.filter(
             uuid=self.workflow_record_uuid,
         ).first()
 
-    def get_preceding_step_record(self):
+    def load_preceding_step_record(self):
         return GetCreateCustomerStep.objects.filter(uuid=self.preceding_step_uuid).first()
 
 
@@ -351,12 +342,12 @@ class GetCreateCatalogStep(AbstractWorkflowStep):
                 f"not found in mapping: {settings.PRODUCT_ID_TO_CATALOG_QUERY_ID_MAPPING}"
             )
 
-    def get_workflow_record(self):
+    def load_workflow_record(self):
         return ProvisionNewCustomerWorkflow.objects.filter(
             uuid=self.workflow_record_uuid,
         ).first()
 
-    def get_preceding_step_record(self):
+    def load_preceding_step_record(self):
         return GetCreateEnterpriseAdminUsersStep.objects.filter(
             uuid=self.preceding_step_uuid,
         ).first()
@@ -424,12 +415,12 @@ class GetCreateCustomerAgreementStep(AbstractWorkflowStep):
         )
         return self.output_class.from_dict(result_dict)
 
-    def get_workflow_record(self):
+    def load_workflow_record(self):
         return ProvisionNewCustomerWorkflow.objects.filter(
             uuid=self.workflow_record_uuid,
         ).first()
 
-    def get_preceding_step_record(self):
+    def load_preceding_step_record(self):
         return GetCreateCatalogStep.objects.filter(
             uuid=self.preceding_step_uuid,
         ).first()
@@ -532,12 +523,12 @@ class GetCreateTrialSubscriptionPlanStep(CheckoutIntentStepMixin, AbstractWorkfl
 
         return self.output_class.from_dict(result_dict)
 
-    def get_workflow_record(self) -> 'ProvisionNewCustomerWorkflow':
+    def load_workflow_record(self) -> 'ProvisionNewCustomerWorkflow':
         return ProvisionNewCustomerWorkflow.objects.filter(
             uuid=self.workflow_record_uuid,
         ).first()
 
-    def get_preceding_step_record(self):
+    def load_preceding_step_record(self):
         return GetCreateCustomerAgreementStep.objects.filter(
             uuid=self.preceding_step_uuid,
         ).first()
@@ -653,12 +644,12 @@ class GetCreateFirstPaidSubscriptionPlanStep(CheckoutIntentStepMixin, AbstractWo
 
         return self.output_class.from_dict(result_dict)
 
-    def get_workflow_record(self):
+    def load_workflow_record(self):
         return ProvisionNewCustomerWorkflow.objects.filter(
             uuid=self.workflow_record_uuid,
         ).first()
 
-    def get_preceding_step_record(self):
+    def load_preceding_step_record(self):
         return GetCreateTrialSubscriptionPlanStep.objects.filter(
             uuid=self.preceding_step_uuid,
         ).first()
@@ -789,12 +780,12 @@ class GetCreateSubscriptionPlanRenewalStep(CheckoutIntentStepMixin, AbstractWork
         )
         return self.output_class.from_dict(result_dict)
 
-    def get_workflow_record(self):
+    def load_workflow_record(self):
         return ProvisionNewCustomerWorkflow.objects.filter(
             uuid=self.workflow_record_uuid,
         ).first()
 
-    def get_preceding_step_record(self):
+    def load_preceding_step_record(self):
         return GetCreateFirstPaidSubscriptionPlanStep.objects.filter(
             uuid=self.preceding_step_uuid,
         ).first()
@@ -864,12 +855,12 @@ class NotificationStep(CheckoutIntentStepMixin, AbstractWorkflowStep):
         # TODO: Is there a better way than to just send an empty dict?
         return self.output_class.from_dict({})
 
-    def get_workflow_record(self):
+    def load_workflow_record(self):
         return ProvisionNewCustomerWorkflow.objects.filter(
             uuid=self.workflow_record_uuid,
         ).first()
 
-    def get_preceding_step_record(self):
+    def load_preceding_step_record(self):
         return GetCreateSubscriptionPlanRenewalStep.objects.filter(
             uuid=self.preceding_step_uuid,
         ).first()
@@ -890,6 +881,28 @@ class ProvisionNewCustomerWorkflow(AbstractWorkflow):
         GetCreateSubscriptionPlanRenewalStep,
         NotificationStep,
     ]
+    # Once the customer exists, its admins, catalog and customer agreement are independent of each other.
+    step_dependencies = {
+        GetCreateEnterpriseAdminUsersStep: [GetCreateCustomerStep],
+        GetCreateCatalogStep: [GetCreateCustomerStep],
+        GetCreateCustomerAgreementStep: [GetCreateCustomerStep],
+        GetCreateTrialSubscriptionPlanStep: [GetCreateCatalogStep, GetCreateCustomerAgreementStep],
+        GetCreateFirstPaidSubscriptionPlanStep: [
+            GetCreateCatalogStep,
+            GetCreateCustomerAgreementStep,
+            GetCreateTrialSubscriptionPlanStep,
+        ],
+        GetCreateSubscriptionPlanRenewalStep: [
+            GetCreateTrialSubscriptionPlanStep,
+            GetCreateFirstPaidSubscriptionPlanStep,
+        ],
+        # Notification fulfills the checkout intent, so must wait for every other step.
+        NotificationStep: [
+            GetCreateCustomerStep,
+            GetCreateEnterpriseAdminUsersStep,
+            GetCreateSubscriptionPlanRenewalStep,
+        ],
+    }
 
     @classmethod
     def generate_input_dict(
@@ -0,0 +1,31 @@
+"""
+Tasks for the provisioning app.
+"""
+import logging
+
+from celery import shared_task
+
+from enterprise_access.apps.provisioning.models import ProvisionNewCustomerWorkflow
+from enterprise_access.apps.workflow.exceptions import UnitOfWorkException
+from enterprise_access.tasks import LoggedTaskWithRetry
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(base=LoggedTaskWithRetry)
+def execute_provisioning_workflow_task(workflow_uuid):
+    """
+    Executes the given provisioning workflow, as requested by an async provisioning API request.
+    The outcome of the workflow and of each of its steps is stored on their records, which
+    are served by the provisioning status API.
+
+    Args:
+        workflow_uuid (str): The uuid of the ProvisionNewCustomerWorkflow record to execute.
+    """
+    workflow = ProvisionNewCustomerWorkflow.objects.get(uuid=workflow_uuid)
+    try:
+        workflow.execute()
+    except UnitOfWorkException:
+        logger.exception('Provisioning workflow %s failed', workflow_uuid)
+        return
+    logger.info('Provisioning workflow %s succeeded', workflow_uuid)
@@ -0,0 +1,36 @@
+"""
+Tests for provisioning tasks.
+"""
+from unittest import mock
+
+from django.test import TestCase
+
+from enterprise_access.apps.provisioning.models import ProvisionNewCustomerWorkflow
+from enterprise_access.apps.provisioning.tasks import execute_provisioning_workflow_task
+from enterprise_access.apps.workflow.exceptions import UnitOfWorkException
+
+
+class TestExecuteProvisioningWorkflowTask(TestCase):
+    """
+    Tests for the ``execute_provisioning_workflow_task`` task.
+    """
+    def setUp(self):
+        super().setUp()
+        self.workflow = ProvisionNewCustomerWorkflow.objects.create(input_data={})
+
+    @mock.patch.object(ProvisionNewCustomerWorkflow, 'execute')
+    def test_executes_workflow(self, mock_execute):
+        execute_provisioning_workflow_task.delay(str(self.workflow.uuid))
+
+        mock_execute.assert_called_once_with()
+
+    @mock.patch('enterprise_access.apps.provisioning.tasks.logger')
+    @mock.patch.object(ProvisionNewCustomerWorkflow, 'execute', side_effect=UnitOfWorkException('step failed'))
+    def test_workflow_failure_is_logged(self, mock_execute, mock_logger):
+        """
+        Tests that a failed workflow, whose failure is stored on its records, does not fail the task.
+        """
+        execute_provisioning_workflow_task.delay(str(self.workflow.uuid))
+
+        mock_execute.assert_called_once_with()
+        mock_logger.exception.assert_called_once_with('Provisioning workflow %s failed', str(self.workflow.uuid))
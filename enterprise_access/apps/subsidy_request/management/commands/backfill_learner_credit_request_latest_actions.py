@@ -0,0 +1,63 @@
+"""
+Management command to backfill the denormalized latest action fields of learner credit requests.
+"""
+
+import logging
+
+from django.core.management.base import BaseCommand
+
+from enterprise_access.apps.subsidy_request.models import LearnerCreditRequest
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Populates the ``latest_action_*`` and ``learner_request_state`` fields of existing
+    ``LearnerCreditRequest`` records from their ``LearnerCreditRequestActions``.
+
+    Requests are read in batches keyed on their ``uuid``, and each batch is synced with
+    a couple of bulk UPDATE statements. The command is idempotent, so it is safe to rerun,
+    and an interrupted run can be resumed with ``--start-after``.
+    """
+    help = 'Backfill the latest action fields of LearnerCreditRequest records.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            action='store',
+            dest='batch_size',
+            default=500,
+            help='How many requests to sync per batch.',
+            type=int,
+        )
+        parser.add_argument(
+            '--start-after',
+            action='store',
+            dest='start_after',
+            default=None,
+            help='Resume after the request with this uuid, i.e. the last reported checkpoint.',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_uuid = options['start_after']
+
+        queryset = LearnerCreditRequest.all_objects.order_by('uuid')
+        synced_count = 0
+        while True:
+            page_queryset = queryset.filter(uuid__gt=last_uuid) if last_uuid else queryset
+            batch_uuids = list(page_queryset.values_list('uuid', flat=True)[:batch_size])
+            if not batch_uuids:
+                break
+
+            LearnerCreditRequest.sync_latest_action_fields(batch_uuids)
+            synced_count += len(batch_uuids)
+            last_uuid = batch_uuids[-1]
+            logger.info(
+                'Synced latest action fields of %s learner credit requests (checkpoint: %s)',
+                synced_count,
+                last_uuid,
+            )
+
+        logger.info('Finished backfilling latest action fields of %s learner credit requests', synced_count)
@@ -0,0 +1,83 @@
+"""
+Tests for the ``backfill_learner_credit_request_latest_actions`` management command.
+"""
+from django.core.management import call_command
+from django.test import TestCase
+
+from enterprise_access.apps.subsidy_request.constants import (
+    LearnerCreditRequestActionErrorReasons,
+    LearnerCreditRequestUserMessages,
+    SubsidyRequestStates
+)
+from enterprise_access.apps.subsidy_request.models import LearnerCreditRequest
+from enterprise_access.apps.subsidy_request.tests import factories
+
+
+class BackfillLearnerCreditRequestLatestActionsTests(TestCase):
+    """
+    Tests for the ``backfill_learner_credit_request_latest_actions`` management command.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.requests = [
+            factories.LearnerCreditRequestFactory(state=SubsidyRequestStates.APPROVED)
+            for _ in range(3)
+        ]
+        self.actions = [
+            factories.LearnerCreditRequestActionsFactory(
+                learner_credit_request=request,
+                recent_action=SubsidyRequestStates.APPROVED,
+                status=LearnerCreditRequestUserMessages.CHOICES[3][0],
+                error_reason=LearnerCreditRequestActionErrorReasons.FAILED_APPROVAL if index == 0 else None,
+            )
+            for index, request in enumerate(self.requests)
+        ]
+        self.request_without_actions = factories.LearnerCreditRequestFactory(state=SubsidyRequestStates.DECLINED)
+
+        # Simulate rows that predate the denormalized columns.
+        LearnerCreditRequest.all_objects.update(
+            latest_action_status=None,
+            latest_action_time=None,
+            latest_action_type=None,
+            latest_action_error_reason=None,
+            learner_request_state=None,
+        )
+
+    def test_backfill(self):
+        """
+        All requests are synced from their latest action, across several batches.
+        """
+        with self.assertLogs(
+            'enterprise_access.apps.subsidy_request.management.commands.backfill_learner_credit_request_latest_actions',
+            level='INFO',
+        ) as logs:
+            call_command('backfill_learner_credit_request_latest_actions', batch_size=2)
+
+        self.assertIn('Finished backfilling latest action fields of 4 learner credit requests', logs.output[-1])
+
+        for index, (request, action) in enumerate(zip(self.requests, self.actions)):
+            request.refresh_from_db()
+            self.assertEqual(request.latest_action_type, SubsidyRequestStates.APPROVED)
+            self.assertEqual(request.latest_action_status, LearnerCreditRequestUserMessages.CHOICES[3][0])
+            self.assertEqual(request.latest_action_time, action.created)
+            self.assertEqual(request.learner_request_state, 'failed' if index == 0 else 'waiting')
+
+        self.request_without_actions.refresh_from_db()
+        self.assertIsNone(self.request_without_actions.latest_action_type)
+        self.assertEqual(self.request_without_actions.learner_request_state, SubsidyRequestStates.DECLINED)
+
+    def test_backfill_start_after(self):
+        """
+        Requests up to and including the checkpoint are left untouched when resuming.
+        """
+        ordered_uuids = sorted(request.uuid for request in [*self.requests, self.request_without_actions])
+
+        call_command('backfill_learner_credit_request_latest_actions', start_after=str(ordered_uuids[1]))
+
+        synced_uuids = set(
+            LearnerCreditRequest.all_objects.filter(
+                learner_request_state__isnull=False,
+            ).values_list('uuid', flat=True)
+        )
+        self.assertEqual(synced_uuids, set(ordered_uuids[2:]))
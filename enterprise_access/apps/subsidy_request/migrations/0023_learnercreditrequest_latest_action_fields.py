@@ -0,0 +1,50 @@
+# Generated by Django 5.2.10 on 2026-10-18 23:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subsidy_request', '0022_mariadb_uuid_conversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='learnercreditrequest',
+            name='latest_action_error_reason',
+            field=models.CharField(blank=True, choices=[('failed_approval', 'Failed: Approval'), ('failed_decline', 'Failed: Decline'), ('failed_cancellation', 'Failed: Cancellation'), ('failed_redemption', 'Failed: Redemption'), ('failed_reversal', 'Failed: Reversal'), ('email_error', 'Email error')], editable=False, help_text='The error reason of the most recent action taken on this request, if any.', max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='learnercreditrequest',
+            name='latest_action_status',
+            field=models.CharField(blank=True, choices=[('requested', 'Requested'), ('reminded', 'Waiting For Learner'), ('approved', 'Waiting For Learner'), ('accepted', 'Redeemed By Learner'), ('declined', 'Declined'), ('reversed', 'Refunded'), ('cancelled', 'Cancelled'), ('expired', 'Expired')], editable=False, help_text='The status of the most recent action taken on this request.', max_length=25, null=True),
+        ),
+        migrations.AddField(
+            model_name='learnercreditrequest',
+            name='latest_action_time',
+            field=models.DateTimeField(blank=True, editable=False, help_text='The time of the most recent action taken on this request.', null=True),
+        ),
+        migrations.AddField(
+            model_name='learnercreditrequest',
+            name='latest_action_type',
+            field=models.CharField(blank=True, choices=[('requested', 'Requested'), ('pending', 'Pending'), ('approved', 'Approved'), ('declined', 'Declined'), ('error', 'Error'), ('accepted', 'Accepted'), ('cancelled', 'Cancelled'), ('expired', 'Expired'), ('reversed', 'Reversed'), ('reminded', 'Reminded')], editable=False, help_text='The type of the most recent action taken on this request.', max_length=25, null=True),
+        ),
+        migrations.AddField(
+            model_name='learnercreditrequest',
+            name='learner_request_state',
+            field=models.CharField(blank=True, editable=False, help_text='Computed state based on the request state and the status and error reason of the most recent action taken on this request.', max_length=25, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='learnercreditrequest',
+            index=models.Index(fields=['enterprise_customer_uuid', 'latest_action_time'], name='subsidy_req_enterpr_7b311d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='learnercreditrequest',
+            index=models.Index(fields=['enterprise_customer_uuid', 'latest_action_status'], name='subsidy_req_enterpr_32e95c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='learnercreditrequest',
+            index=models.Index(fields=['enterprise_customer_uuid', 'learner_request_state'], name='subsidy_req_enterpr_4c6fdd_idx'),
+        ),
+    ]
@@ -4,15 +4,16 @@
 # pylint: skip-file
 
 import collections
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models
-from django.db.models import Case, CharField, F, IntegerField, OuterRef, Q, Subquery, Value, When
+from django.db.models import Case, CharField, Count, F, IntegerField, OuterRef, Q, Subquery, Value, When
 from django.dispatch import receiver
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
+from edx_django_utils.cache import TieredCache
 from jsonfield.encoder import JSONEncoder
 from jsonfield.fields import JSONField
 from model_utils.models import SoftDeletableModel, TimeStampedModel
@@ -28,6 +29,7 @@ from enterprise_access.apps.subsidy_request.constants import (
     SubsidyTypeChoices
 )
 from enterprise_access.apps.subsidy_request.tasks import update_course_info_for_subsidy_request_task
+from enterprise_access.cache_utils import delete_tiered_cache_keys_on_commit, versioned_cache_key
 from enterprise_access.utils import localized_utcnow
 
 
@@ -121,7 +123,9 @@ class SubsidyRequest(TimeStampedModel, SoftDeletableModel):
 
     def save(self, *args, **kwargs):
         self.full_clean()
-        return super().save(*args, **kwargs)
+        result = super().save(*args, **kwargs)
+        self.invalidate_state_counts([self.enterprise_customer_uuid])
+        return result
 
     @classmethod
     def bulk_update(cls, subsidy_requests, field_names, batch_size=SUBSIDY_REQUEST_BULK_OPERATION_BATCH_SIZE):
@@ -134,6 +138,46 @@ class SubsidyRequest(TimeStampedModel, SoftDeletableModel):
         https://django-simple-history.readthedocs.io/en/2.12.0/common_issues.html#bulk-creating-and-queryset-updating
         """
         bulk_update_with_history(subsidy_requests, cls, field_names, batch_size=batch_size)
+        if 'state' in field_names:
+            cls.invalidate_state_counts(request.enterprise_customer_uuid for request in subsidy_requests)
+
+    @classmethod
+    def state_counts_cache_key(cls, enterprise_customer_uuid):
+        # Instances that haven't been reloaded may hold the uuid as given, in any string format.
+        enterprise_customer_uuid = UUID(str(enterprise_customer_uuid))
+        return versioned_cache_key('subsidy_request_state_counts', cls.__name__, enterprise_customer_uuid)
+
+    @classmethod
+    def get_state_counts(cls, enterprise_customer_uuid):
+        """
+        Returns the number of requests of the given enterprise in each state, most frequent first,
+        as a list of ``{'state': ..., 'count': ...}`` dicts.
+
+        The counts are cached until a request of the enterprise is written (see
+        ``invalidate_state_counts()``), and recomputed at least every
+        ``SUBSIDY_REQUEST_STATE_COUNTS_CACHE_TIMEOUT`` seconds.
+        """
+        cache_key = cls.state_counts_cache_key(enterprise_customer_uuid)
+        cached_response = TieredCache.get_cached_response(cache_key)
+        if cached_response.is_found:
+            return cached_response.value
+
+        state_counts = list(
+            cls.objects.filter(
+                enterprise_customer_uuid=enterprise_customer_uuid,
+            ).values('state').annotate(count=Count('state')).order_by('-count')
+        )
+        TieredCache.set_all_tiers(cache_key, state_counts, settings.SUBSIDY_REQUEST_STATE_COUNTS_CACHE_TIMEOUT)
+        return state_counts
+
+    @classmethod
+    def invalidate_state_counts(cls, enterprise_customer_uuids):
+        """
+        Drops the cached state counts of the given enterprises.
+        """
+        delete_tiered_cache_keys_on_commit(
+            cls.state_counts_cache_key(uuid) for uuid in set(enterprise_customer_uuids)
+        )
 
     class Meta:
         abstract = True
@@ -403,9 +447,74 @@ class LearnerCreditRequest(SubsidyRequest):
         help_text="Cost of the content in USD Cents.",
     )
 
-    history = HistoricalRecords()
+    # The fields below are denormalized from the most recent LearnerCreditRequestActions record,
+    # and are kept in sync by ``sync_latest_action_fields()``.
+    latest_action_status = models.CharField(
+        max_length=25,
+        blank=True,
+        null=True,
+        editable=False,
+        choices=LearnerCreditRequestUserMessages.CHOICES,
+        help_text="The status of the most recent action taken on this request.",
+    )
+
+    latest_action_time = models.DateTimeField(
+        blank=True,
+        null=True,
+        editable=False,
+        help_text="The time of the most recent action taken on this request.",
+    )
+
+    latest_action_type = models.CharField(
+        max_length=25,
+        blank=True,
+        null=True,
+        editable=False,
+        choices=LearnerCreditRequestActionChoices,
+        help_text="The type of the most recent action taken on this request.",
+    )
+
+    latest_action_error_reason = models.CharField(
+        max_length=255,
+        blank=True,
+        null=True,
+        editable=False,
+        choices=LearnerCreditRequestActionErrorReasons.CHOICES,
+        help_text="The error reason of the most recent action taken on this request, if any.",
+    )
+
+    learner_request_state = models.CharField(
+        max_length=25,
+        blank=True,
+        null=True,
+        editable=False,
+        help_text=(
+            "Computed state based on the request state and the status and error reason "
+            "of the most recent action taken on this request."
+        ),
+    )
+
+    history = HistoricalRecords(excluded_fields=[
+        'latest_action_status',
+        'latest_action_time',
+        'latest_action_type',
+        'latest_action_error_reason',
+        'learner_request_state',
+    ])
+
+    LATEST_ACTION_FIELDS = (
+        'latest_action_status',
+        'latest_action_time',
+        'latest_action_type',
+        'latest_action_error_reason',
+    )
 
     class Meta:
+        indexes = [
+            models.Index(fields=['enterprise_customer_uuid', 'latest_action_time']),
+            models.Index(fields=['enterprise_customer_uuid', 'latest_action_status']),
+            models.Index(fields=['enterprise_customer_uuid', 'learner_request_state']),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['user', 'enterprise_customer_uuid', 'course_id'],
@@ -434,15 +543,11 @@ class LearnerCreditRequest(SubsidyRequest):
         Annotate extra dynamic fields used by this viewset for DRF-supported ordering and filtering.
 
         Fields added:
-        * latest_action_status (CharField) - Most recent action status from related actions
-        * latest_action_time (DateTimeField) - Most recent action timestamp
-        * latest_action_type (CharField) - Most recent action type
-        * learner_request_state (CharField) - Computed state based on action status and error conditions
         * state_sort_order (IntegerField) - Computed integer for LCRs state-based sorting
 
         Notes:
-        * Simple subquery approach for action-based sorting that matches viewset expectations.
-        * learner_request_state provides state-based logic with error overrides and waiting states.
+        * The action-based fields (``latest_action_status``, ``latest_action_time``, ``latest_action_type``
+          and ``learner_request_state``) are stored columns, see ``sync_latest_action_fields()``.
 
         Args:
             queryset (QuerySet): LearnerCreditRequest queryset, vanilla.
@@ -450,58 +555,7 @@ class LearnerCreditRequest(SubsidyRequest):
         Returns:
             QuerySet: LearnerCreditRequest queryset, same objects but with extra fields annotated.
         """
-        # Simple subquery annotations for action-based sorting
-        latest_action_subquery = LearnerCreditRequestActions.objects.filter(
-            learner_credit_request=OuterRef('pk')
-        ).order_by('-created')
-
-        new_queryset = queryset.annotate(
-            # Latest action status for sorting/filtering (what the viewset expects)
-            latest_action_status=Subquery(latest_action_subquery.values('status')[:1]),
-
-            # Latest action time for sorting
-            latest_action_time=Subquery(latest_action_subquery.values('created')[:1]),
-
-            # Latest action type for sorting
-            latest_action_type=Subquery(latest_action_subquery.values('recent_action')[:1]),
-
-            # Latest action error reason for state computation
-            latest_action_error_reason=Subquery(latest_action_subquery.values('error_reason')[:1]),
-
-            # Computed learner request state based on action status and error conditions
-            learner_request_state=Case(
-                When(
-                    Q(latest_action_error_reason__isnull=False),
-                    then=Value('failed')
-                ),
-                When(
-                    Q(latest_action_type__in=['approved', 'reminded']),
-                    then=Value('waiting')
-                ),
-                When(
-                    Q(state=SubsidyRequestStates.REQUESTED),
-                    then=Value(SubsidyRequestStates.REQUESTED)
-                ),
-                When(
-                    Q(state=SubsidyRequestStates.DECLINED),
-                    then=Value(SubsidyRequestStates.DECLINED)
-                ),
-                When(
-                    Q(state=SubsidyRequestStates.CANCELLED),
-                    then=Value(SubsidyRequestStates.CANCELLED)
-                ),
-                When(
-                    Q(state=SubsidyRequestStates.ERROR),
-                    then=Value(SubsidyRequestStates.ERROR)
-                ),
-                When(
-                    Q(state=SubsidyRequestStates.APPROVED),
-                    then=Value('waiting')
-                ),
-                default=None,
-                output_field=CharField()
-            ),
-
+        return queryset.annotate(
             # state-based sorting
             state_sort_order=Case(
                 When(state=SubsidyRequestStates.REQUESTED, then=Value(0)),
@@ -512,7 +566,150 @@ class LearnerCreditRequest(SubsidyRequest):
             )
         )
 
-        return new_queryset
+    @staticmethod
+    def _learner_request_state_expression():
+        """
+        Returns the expression that computes ``learner_request_state`` from the stored ``state``
+        and ``latest_action_*`` columns of a request.
+        """
+        return Case(
+            When(
+                Q(latest_action_error_reason__isnull=False),
+                then=Value('failed')
+            ),
+            When(
+                Q(latest_action_type__in=['approved', 'reminded']),
+                then=Value('waiting')
+            ),
+            When(
+                Q(state=SubsidyRequestStates.REQUESTED),
+                then=Value(SubsidyRequestStates.REQUESTED)
+            ),
+            When(
+                Q(state=SubsidyRequestStates.DECLINED),
+                then=Value(SubsidyRequestStates.DECLINED)
+            ),
+            When(
+                Q(state=SubsidyRequestStates.CANCELLED),
+                then=Value(SubsidyRequestStates.CANCELLED)
+            ),
+            When(
+                Q(state=SubsidyRequestStates.ERROR),
+                then=Value(SubsidyRequestStates.ERROR)
+            ),
+            When(
+                Q(state=SubsidyRequestStates.APPROVED),
+                then=Value('waiting')
+            ),
+            default=None,
+            output_field=CharField()
+        )
+
+    @classmethod
+    def sync_learner_request_state(cls, request_uuids):
+        """
+        Recomputes the stored ``learner_request_state`` of the given requests.
+        """
+        request_uuids = list(request_uuids)
+        for index in range(0, len(request_uuids), SUBSIDY_REQUEST_BULK_OPERATION_BATCH_SIZE):
+            cls.all_objects.filter(
+                uuid__in=request_uuids[index:index + SUBSIDY_REQUEST_BULK_OPERATION_BATCH_SIZE],
+            ).update(
+                learner_request_state=cls._learner_request_state_expression(),
+            )
+
+    @classmethod
+    def sync_latest_action_fields(cls, request_uuids):
+        """
+        Copies the status, time, type and error reason of the most recent action of each of
+        the given requests onto the request, then recomputes its ``learner_request_state``.
+
+        Each chunk of requests is updated with a single UPDATE statement, so this is cheap
+        enough to run every time actions are created.
+        """
+        request_uuids = list(request_uuids)
+        latest_action_subquery = LearnerCreditRequestActions.objects.filter(
+            learner_credit_request=OuterRef('pk')
+        ).order_by('-created')
+
+        for index in range(0, len(request_uuids), SUBSIDY_REQUEST_BULK_OPERATION_BATCH_SIZE):
+            cls.all_objects.filter(
+                uuid__in=request_uuids[index:index + SUBSIDY_REQUEST_BULK_OPERATION_BATCH_SIZE],
+            ).update(
+                latest_action_status=Subquery(latest_action_subquery.values('status')[:1]),
+                latest_action_time=Subquery(latest_action_subquery.values('created')[:1]),
+                latest_action_type=Subquery(latest_action_subquery.values('recent_action')[:1]),
+                latest_action_error_reason=Subquery(latest_action_subquery.values('error_reason')[:1]),
+            )
+
+        cls.sync_learner_request_state(request_uuids)
+
+    def get_learner_request_state(self):
+        """
+        Computes the ``learner_request_state`` of this instance from its own ``state`` and
+        ``latest_action_*`` fields, as ``_learner_request_state_expression()`` does in the database.
+        """
+        if self.latest_action_error_reason is not None:
+            return 'failed'
+        if self.latest_action_type in ('approved', 'reminded'):
+            return 'waiting'
+        if self.state in (
+            SubsidyRequestStates.REQUESTED,
+            SubsidyRequestStates.DECLINED,
+            SubsidyRequestStates.CANCELLED,
+            SubsidyRequestStates.ERROR,
+        ):
+            return self.state
+        if self.state == SubsidyRequestStates.APPROVED:
+            return 'waiting'
+        return None
+
+    def refresh_latest_action_fields(self):
+        """
+        Reloads the denormalized latest action fields of this instance from the database.
+        """
+        self.refresh_from_db(fields=[*self.LATEST_ACTION_FIELDS, 'learner_request_state'])
+
+    def set_latest_action(self, action):
+        """
+        Copies the fields of ``action``, which must be this request's most recent action,
+        onto this instance and its database record with a single UPDATE.
+        """
+        self.latest_action_status = action.status
+        self.latest_action_time = action.created
+        self.latest_action_type = action.recent_action
+        self.latest_action_error_reason = action.error_reason
+        self.learner_request_state = self.get_learner_request_state()
+        denormalized_fields = [*self.LATEST_ACTION_FIELDS, 'learner_request_state']
+        type(self).all_objects.filter(uuid=self.uuid).update(
+            **{field: getattr(self, field) for field in denormalized_fields}
+        )
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the request without overwriting its denormalized latest action fields,
+        which are only ever written by ``sync_latest_action_fields()`` and ``set_latest_action()``,
+        so that saving a stale instance can't clobber them. The ``learner_request_state``,
+        which depends on the request ``state``, is written only when it has changed.
+        """
+        learner_request_state = self.get_learner_request_state()
+        learner_request_state_changed = learner_request_state != self.learner_request_state
+        self.learner_request_state = learner_request_state
+
+        update_fields = kwargs.get('update_fields')
+        is_update = not self._state.adding
+        if is_update and update_fields is None and not kwargs.get('force_insert'):
+            denormalized_fields = {*self.LATEST_ACTION_FIELDS, 'learner_request_state'}
+            update_fields = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in denormalized_fields
+            ]
+            if learner_request_state_changed:
+                update_fields.append('learner_request_state')
+            kwargs['update_fields'] = update_fields
+        elif update_fields is not None and 'state' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'learner_request_state'}
+        super().save(*args, **kwargs)
 
     def approve(self, reviewer):
         self.reviewer = reviewer
@@ -549,12 +746,16 @@ class LearnerCreditRequest(SubsidyRequest):
         for record in lcr_records:
             record.modified = timezone.now()
 
-        return bulk_update_with_history(
+        result = bulk_update_with_history(
             lcr_records,
             cls,
             updated_field_names + ['modified'],
             batch_size=SUBSIDY_REQUEST_BULK_OPERATION_BATCH_SIZE,
         )
+        if 'state' in updated_field_names:
+            cls.sync_learner_request_state([record.uuid for record in lcr_records])
+            cls.invalidate_state_counts(record.enterprise_customer_uuid for record in lcr_records)
+        return result
 
 
 class LearnerCreditRequestActions(TimeStampedModel):
@@ -622,18 +823,39 @@ class LearnerCreditRequestActions(TimeStampedModel):
         return (f"<LearnerCreditRequestActions for request {self.learner_credit_request}"
                 f" with action {self.recent_action}>")
 
+    def save(self, *args, **kwargs):
+        """
+        Saves the action, then syncs the latest action fields of its request.
+        """
+        is_new = self._state.adding
+        super().save(*args, **kwargs)
+        if is_new and self._meta.get_field('learner_credit_request').is_cached(self):
+            # A new action is its request's most recent one, so it's copied straight onto the
+            # already loaded request, which also keeps the callers holding it in step.
+            self.learner_credit_request.set_latest_action(self)
+        else:
+            LearnerCreditRequest.sync_latest_action_fields([self.learner_credit_request_id])
+            if self._meta.get_field('learner_credit_request').is_cached(self):
+                self.learner_credit_request.refresh_latest_action_fields()
+
     @classmethod
     def bulk_create(cls, lcr_action_records):
         """
         Creates new ``LearnerCreditRequestActions`` records in bulk,
         while saving their history:
         https://django-simple-history.readthedocs.io/en/latest/common_issues.html#bulk-creating-a-model-with-history
+
+        The latest action fields of the affected requests are then synced in bulk.
         """
-        return bulk_create_with_history(
+        created_records = bulk_create_with_history(
             lcr_action_records,
             cls,
             batch_size=SUBSIDY_REQUEST_BULK_OPERATION_BATCH_SIZE,
         )
+        LearnerCreditRequest.sync_latest_action_fields(
+            {record.learner_credit_request_id for record in lcr_action_records}
+        )
+        return created_records
 
     @classmethod
     def create_action(
@@ -694,3 +916,10 @@ def update_course_info_for_subsidy_request(sender, **kwargs):
         model_name,
         str(subsidy_request.uuid),
     )
+
+
+@receiver(models.signals.post_delete, sender=CouponCodeRequest)
+@receiver(models.signals.post_delete, sender=LicenseRequest)
+@receiver(models.signals.post_delete, sender=LearnerCreditRequest)
+def invalidate_state_counts_of_deleted_subsidy_request(sender, **kwargs):
+    sender.invalidate_state_counts([kwargs['instance'].enterprise_customer_uuid])
@@ -4,8 +4,11 @@ from datetime import datetime
 from uuid import uuid4
 
 import ddt
+from django.db import connection
 from django.forms import ValidationError
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from edx_django_utils.cache import TieredCache
 from pytest import mark
 
 from enterprise_access.apps.core.tests.factories import UserFactory
@@ -22,7 +25,8 @@ from enterprise_access.apps.subsidy_request.constants import (
 from enterprise_access.apps.subsidy_request.models import (
     LearnerCreditRequest,
     LearnerCreditRequestActions,
-    LearnerCreditRequestConfiguration
+    LearnerCreditRequestConfiguration,
+    LicenseRequest
 )
 from enterprise_access.apps.subsidy_request.tasks import update_course_info_for_subsidy_request_task
 from enterprise_access.apps.subsidy_request.tests.factories import (
@@ -33,6 +37,7 @@ from enterprise_access.apps.subsidy_request.tests.factories import (
     LicenseRequestFactory,
     SubsidyRequestCustomerConfigurationFactory
 )
+from enterprise_access.utils import localized_utcnow
 from test_utils import TestCaseWithMockedDiscoveryApiClient
 
 now = datetime.utcnow()
@@ -137,6 +142,73 @@ class CouponCodeRequestTests(TestCaseWithMockedDiscoveryApiClient):
         assert self.mock_discovery_client.call_count > original_call_count
 
 
+class SubsidyRequestStateCountsTests(TestCaseWithMockedDiscoveryApiClient):
+    """
+    Tests for the cached per-enterprise state counts of subsidy requests.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(TieredCache.dangerous_clear_all_tiers)
+        self.enterprise_customer_uuid = uuid4()
+        self.learner_credit_requests = LearnerCreditRequestFactory.create_batch(
+            3,
+            enterprise_customer_uuid=self.enterprise_customer_uuid,
+        )
+        # Requests of other enterprises and soft-deleted requests aren't counted.
+        LearnerCreditRequestFactory(enterprise_customer_uuid=uuid4())
+        LearnerCreditRequestFactory(enterprise_customer_uuid=self.enterprise_customer_uuid).delete()
+
+    def test_counts_are_cached(self):
+        expected_counts = [{'state': SubsidyRequestStates.REQUESTED, 'count': 3}]
+        self.assertEqual(LearnerCreditRequest.get_state_counts(self.enterprise_customer_uuid), expected_counts)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                LearnerCreditRequest.get_state_counts(str(self.enterprise_customer_uuid)),
+                expected_counts,
+            )
+
+    def test_state_change_invalidates_counts(self):
+        LearnerCreditRequest.get_state_counts(self.enterprise_customer_uuid)
+
+        self.learner_credit_requests[0].decline(UserFactory())
+
+        self.assertEqual(
+            LearnerCreditRequest.get_state_counts(self.enterprise_customer_uuid),
+            [
+                {'state': SubsidyRequestStates.REQUESTED, 'count': 2},
+                {'state': SubsidyRequestStates.DECLINED, 'count': 1},
+            ],
+        )
+
+    def test_bulk_update_invalidates_counts(self):
+        LearnerCreditRequest.get_state_counts(self.enterprise_customer_uuid)
+
+        reviewer = UserFactory()
+        for learner_credit_request in self.learner_credit_requests:
+            learner_credit_request.state = SubsidyRequestStates.CANCELLED
+            learner_credit_request.reviewer = reviewer
+            learner_credit_request.reviewed_at = now
+        LearnerCreditRequest.bulk_update(self.learner_credit_requests, ['state', 'reviewer', 'reviewed_at'])
+
+        self.assertEqual(
+            LearnerCreditRequest.get_state_counts(self.enterprise_customer_uuid),
+            [{'state': SubsidyRequestStates.CANCELLED, 'count': 3}],
+        )
+
+    def test_delete_invalidates_counts(self):
+        LicenseRequestFactory(enterprise_customer_uuid=self.enterprise_customer_uuid)
+        self.assertEqual(
+            LicenseRequest.get_state_counts(self.enterprise_customer_uuid),
+            [{'state': SubsidyRequestStates.REQUESTED, 'count': 1}],
+        )
+
+        LicenseRequest.objects.get(enterprise_customer_uuid=self.enterprise_customer_uuid).delete(soft=False)
+
+        self.assertEqual(LicenseRequest.get_state_counts(self.enterprise_customer_uuid), [])
+
+
 @ddt.ddt
 class LearnerCreditRequestTests(TestCase):
     """
@@ -380,6 +452,111 @@ class LearnerCreditRequestActionsTests(TestCase):
             LearnerCreditRequestUserMessages.CHOICES[3][0],
         )
 
+    def test_latest_action_fields_synced_on_save(self):
+        """
+        Test that saving an action stores its fields as the latest action of the request.
+        """
+        self.learner_credit_request.refresh_from_db()
+        self.assertEqual(self.learner_credit_request.latest_action_type, SubsidyRequestStates.REQUESTED)
+        self.assertEqual(self.learner_credit_request.latest_action_status, SubsidyRequestStates.REQUESTED)
+        self.assertEqual(self.learner_credit_request.latest_action_time, self.action.created)
+        self.assertEqual(self.learner_credit_request.learner_request_state, SubsidyRequestStates.REQUESTED)
+
+        error_action = LearnerCreditRequestActions.create_action(
+            learner_credit_request=self.learner_credit_request,
+            recent_action=SubsidyRequestStates.APPROVED,
+            status=LearnerCreditRequestUserMessages.CHOICES[3][0],
+            error_reason=LearnerCreditRequestActionErrorReasons.FAILED_APPROVAL,
+        )
+
+        # The in-memory request passed to create_action() is kept in step.
+        self.assertEqual(self.learner_credit_request.latest_action_type, SubsidyRequestStates.APPROVED)
+        self.assertEqual(self.learner_credit_request.latest_action_time, error_action.created)
+        self.assertEqual(
+            self.learner_credit_request.latest_action_error_reason,
+            LearnerCreditRequestActionErrorReasons.FAILED_APPROVAL,
+        )
+        self.assertEqual(self.learner_credit_request.learner_request_state, 'failed')
+
+    def test_latest_action_fields_synced_on_bulk_create(self):
+        """
+        Test that bulk creating actions syncs the latest action fields of every affected request.
+        """
+        other_request = LearnerCreditRequestFactory(state=SubsidyRequestStates.APPROVED)
+        LearnerCreditRequestActions.bulk_create([
+            LearnerCreditRequestActions(
+                learner_credit_request=request,
+                recent_action=SubsidyRequestStates.APPROVED,
+                status=LearnerCreditRequestUserMessages.CHOICES[3][0],
+            )
+            for request in (self.learner_credit_request, other_request)
+        ])
+
+        for request in (self.learner_credit_request, other_request):
+            request.refresh_from_db()
+            self.assertEqual(request.latest_action_type, SubsidyRequestStates.APPROVED)
+            self.assertEqual(request.latest_action_status, LearnerCreditRequestUserMessages.CHOICES[3][0])
+            self.assertEqual(request.learner_request_state, 'waiting')
+
+    def test_saving_stale_request_keeps_latest_action_fields(self):
+        """
+        Test that saving a request loaded before its latest action doesn't overwrite the
+        latest action fields, while its learner_request_state follows the new request state.
+        """
+        stale_request = LearnerCreditRequest.objects.get(uuid=self.learner_credit_request.uuid)
+        LearnerCreditRequestActionsFactory(
+            learner_credit_request=self.learner_credit_request,
+            recent_action=LearnerCreditAdditionalActionStates.REMINDED,
+            status=LearnerCreditAdditionalActionStates.REMINDED,
+        )
+
+        stale_request.state = SubsidyRequestStates.APPROVED
+        stale_request.save()
+
+        self.learner_credit_request.refresh_from_db()
+        self.assertEqual(self.learner_credit_request.state, SubsidyRequestStates.APPROVED)
+        self.assertEqual(
+            self.learner_credit_request.latest_action_type, LearnerCreditAdditionalActionStates.REMINDED,
+        )
+        self.assertEqual(self.learner_credit_request.learner_request_state, 'waiting')
+        self.assertEqual(stale_request.learner_request_state, 'waiting')
+
+    def test_save_writes_learner_request_state_only_when_it_changes(self):
+        """
+        Test that saving a request writes its learner_request_state, computed in Python, only
+        when the request state changes it, in the same UPDATE as the other fields.
+        """
+        self.learner_credit_request.refresh_from_db()
+
+        self.learner_credit_request.course_title = 'A new course title'
+        with CaptureQueriesContext(connection) as captured_queries:
+            self.learner_credit_request.save()
+        updates = [query['sql'] for query in captured_queries if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn('learner_request_state', updates[0])
+
+        self.learner_credit_request.state = SubsidyRequestStates.DECLINED
+        self.learner_credit_request.reviewer = UserFactory()
+        self.learner_credit_request.reviewed_at = localized_utcnow()
+        with CaptureQueriesContext(connection) as captured_queries:
+            self.learner_credit_request.save()
+        updates = [query['sql'] for query in captured_queries if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('learner_request_state', updates[0])
+
+        self.learner_credit_request.refresh_from_db()
+        self.assertEqual(self.learner_credit_request.learner_request_state, SubsidyRequestStates.DECLINED)
+
+    def test_bulk_update_state_recomputes_learner_request_state(self):
+        """
+        Test that bulk updating the state of requests recomputes their learner_request_state.
+        """
+        self.learner_credit_request.state = SubsidyRequestStates.DECLINED
+        LearnerCreditRequest.bulk_update([self.learner_credit_request], ['state'])
+
+        self.learner_credit_request.refresh_from_db()
+        self.assertEqual(self.learner_credit_request.learner_request_state, SubsidyRequestStates.DECLINED)
+
     def test_clean_success_when_learner_credit_config_inactive(self):
         """
         Test that validation passes when learner credit config exists but is inactive.
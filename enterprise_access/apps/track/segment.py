@@ -13,7 +13,8 @@ logger = logging.getLogger(__name__)
 
 def track_event(lms_user_id, event_name, properties):
     """
-    Send a tracking event to segment
+    Send a tracking event to segment or, if the event outbox is enabled, record it in the
+    outbox to be relayed to segment once the current transaction commits.
 
     Args:
         lms_user_id (str): LMS User ID of the user we want tracked with this event for cross-platform tracking.
@@ -24,6 +25,11 @@ def track_event(lms_user_id, event_name, properties):
         None
     """
     if hasattr(settings, "SEGMENT_KEY") and settings.SEGMENT_KEY:
+        if settings.EVENT_OUTBOX_ENABLED:
+            # pylint: disable=import-outside-toplevel
+            from enterprise_access.apps.events.outbox import add_segment_event_to_outbox
+            add_segment_event_to_outbox(lms_user_id, event_name, properties)
+            return
         try:  # We should never raise an exception when not able to send a tracking event.
             analytics.track(user_id=lms_user_id, event=event_name, properties=properties)
         except Exception as exc:  # pylint: disable=broad-except
@@ -32,3 +38,25 @@ def track_event(lms_user_id, event_name, properties):
         logger.warning(
             "Event %s for user_id %s not tracked because SEGMENT_KEY not set", event_name, lms_user_id
         )
+
+
+def track_events(events):
+    """
+    Send several tracking events to segment or, if the event outbox is enabled, record them
+    all in the outbox at once.
+
+    Args:
+        events (list of tuple): The ``(lms_user_id, event_name, properties)`` of each event.
+
+    Returns:
+        None
+    """
+    if not events:
+        return
+    if getattr(settings, "SEGMENT_KEY", None) and settings.EVENT_OUTBOX_ENABLED:
+        # pylint: disable=import-outside-toplevel
+        from enterprise_access.apps.events.outbox import add_segment_events_to_outbox
+        add_segment_events_to_outbox(events)
+        return
+    for lms_user_id, event_name, properties in events:
+        track_event(lms_user_id, event_name, properties)
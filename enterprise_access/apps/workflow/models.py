@@ -1,9 +1,12 @@
 """ Abstract models and classes to support concrete workflows.. """
 
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from uuid import uuid4
 
 from attrs import define, field, make_class
-from django.db import models
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, models, transaction
 from django.utils import timezone
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
@@ -35,6 +38,8 @@ class AbstractUnitOfWork(TimeStampedModel, SoftDeletableModel):
     input_class = Empty
     output_class = Empty
     exception_class = UnitOfWorkException
+    # The fields written by ``execute()``.
+    execution_fields = ('output_data', 'succeeded_at', 'failed_at', 'exception_message')
 
     uuid = models.UUIDField(
         primary_key=True,
@@ -96,6 +101,7 @@ class AbstractUnitOfWork(TimeStampedModel, SoftDeletableModel):
         and time of successful execution.
         On any exception, the exception time and message are stored,
         and a ``self.exception_class`` is raised from the responsible exception.
+        Only the ``execution_fields`` of a previously saved unit of work are written.
 
         Params:
           accumulated_output (obj): An optional accumulator object, which will be
@@ -117,7 +123,7 @@ class AbstractUnitOfWork(TimeStampedModel, SoftDeletableModel):
             self.exception_message = str(exc)
             raise self.exception_class(str(exc)) from exc
         finally:
-            self.save()
+            self.save(update_fields=None if self._state.adding else self.execution_fields)
         return result
 
     def __str__(self):
@@ -144,6 +150,46 @@ class AbstractWorkflowStep(AbstractUnitOfWork):
         help_text='UUID of the preceding workflow step record, if any',
     )
 
+    # Set by ``set_related_records()`` or cached by the getters below.
+    _workflow_record = None
+    _preceding_step_record = None
+
+    def set_related_records(self, workflow_record, preceding_step_record=None):
+        """
+        Caches the workflow record and preceding step record of this step,
+        e.g. as already loaded by the workflow that executes it.
+        """
+        self._workflow_record = workflow_record
+        self._preceding_step_record = preceding_step_record
+
+    def get_workflow_record(self):
+        """
+        Returns the record of the workflow this step belongs to, loading it at most once.
+        """
+        if self._workflow_record is None:
+            self._workflow_record = self.load_workflow_record()  # pylint: disable=assignment-from-none
+        return self._workflow_record
+
+    def get_preceding_step_record(self):
+        """
+        Returns the record of the step preceding this one in its workflow, if any, loading it at most once.
+        """
+        if self._preceding_step_record is None and self.preceding_step_uuid:
+            self._preceding_step_record = self.load_preceding_step_record()  # pylint: disable=assignment-from-none
+        return self._preceding_step_record
+
+    def load_workflow_record(self):
+        """
+        Should be implemented to query the record of the workflow this step belongs to.
+        """
+        return None
+
+    def load_preceding_step_record(self):
+        """
+        Should be implemented to query the record of the step preceding this one.
+        """
+        return None
+
 
 class AbstractWorkflow(AbstractUnitOfWork):
     """
@@ -153,6 +199,9 @@ class AbstractWorkflow(AbstractUnitOfWork):
         abstract = True
 
     steps = []
+    # An optional dict mapping step classes to the step classes whose output they use.
+    # When defined, independent steps may be executed concurrently.
+    step_dependencies = None
 
     @cached_property
     def input_class(self):
@@ -187,14 +236,69 @@ class AbstractWorkflow(AbstractUnitOfWork):
     def get_input_object_for_step_type(self, step_type):
         return getattr(self.input_object, step_type.input_class.KEY, None)
 
+    def get_step_dependencies(self):
+        """
+        Returns a dict mapping each step class to the set of step classes
+        whose output it depends on, per ``step_dependencies``.
+        """
+        dependencies_by_step = {}
+        for index, step_class in enumerate(self.steps):
+            dependencies = set((self.step_dependencies or {}).get(step_class, ()))
+            if not dependencies <= set(self.steps[:index]):
+                # This also guarantees that the dependencies are acyclic, and that ``steps``
+                # is a valid order in which to execute them one at a time.
+                raise ImproperlyConfigured(
+                    f'{self.__class__.__name__}: the dependencies of {step_class.__name__} '
+                    'must all precede it in steps.'
+                )
+            dependencies_by_step[step_class] = dependencies
+        return dependencies_by_step
+
+    def get_step_records(self):
+        """
+        Returns a dict mapping each step class, in the order of ``steps``, to this workflow's
+        existing record of that step, or None. Loads the records with one query per step model.
+        """
+        return {
+            workflow_step_class: workflow_step_class.objects.filter(workflow_record_uuid=self.uuid).first()
+            for workflow_step_class in self.steps
+        }
+
+    def get_or_create_step_records(self):
+        """
+        Returns a dict mapping each step class, in the order of ``steps``, to this workflow's record
+        of that step. Existing records are loaded by ``get_step_records()``, and the others are created.
+        Each step record caches this workflow record and the record of the step preceding it.
+        """
+        step_records = {}
+        preceding_step_record = None
+        for workflow_step_class, step_record in self.get_step_records().items():
+            if not step_record:
+                input_object = self.get_input_object_for_step_type(workflow_step_class)
+                step_record = workflow_step_class.objects.create(
+                    workflow_record_uuid=self.uuid,
+                    input_data=input_object.to_dict() if input_object else {},
+                    preceding_step_uuid=preceding_step_record.uuid if preceding_step_record else None,
+                )
+
+            if preceding_step_record and step_record.preceding_step_uuid == preceding_step_record.uuid:
+                step_record.set_related_records(self, preceding_step_record)
+            else:
+                step_record.set_related_records(self)
+            step_records[workflow_step_class] = preceding_step_record = step_record
+        return step_records
+
     def process_input(self, accumulated_output=None, **kwargs):
         """
         Processes the input for an entire workflow, which consists of:
-        1. Get/creating a step record for each step of the workflow.
+        1. Get/creating a step record for each step of the workflow (see ``get_or_create_step_records()``).
         2. Calling ``execute()`` on each of these steps (unless they've already succeeded).
         3. On success, accumulating the step output and
         passing it along to the next step's ``process_input()`` call.
 
+        When ``step_dependencies`` are defined, steps whose dependencies have all succeeded are
+        executed concurrently (see ``execute_steps_concurrently()``).
+
         Returns:
           An instance of ``self.output_class``, which should just be an accumulation
           of the output of each step in this workflow.
@@ -203,22 +307,15 @@ class AbstractWorkflow(AbstractUnitOfWork):
             return None
 
         accumulated_output = accumulated_output or self.output_class()
+        step_records = self.get_or_create_step_records()
 
-        preceding_step_record = None
-        for workflow_step_class in self.steps:
-            input_object = self.get_input_object_for_step_type(workflow_step_class)
-            input_data = input_object.to_dict() if input_object else {}
-            step_record_kwargs = {
-                'workflow_record_uuid': self.uuid,
-                'defaults': {
-                    'input_data': input_data,
-                }
-            }
-            if preceding_step_record:
-                step_record_kwargs['defaults']['preceding_step_uuid'] = preceding_step_record.uuid
-
-            step_record, _ = workflow_step_class.objects.get_or_create(**step_record_kwargs)
-            preceding_step_record = step_record
+        if self.step_dependencies is not None and self.can_execute_steps_concurrently():
+            return self.execute_steps_concurrently(step_records, accumulated_output)
+
+        # Validate the step dependencies, if any, even when they aren't used.
+        self.get_step_dependencies()
+
+        for workflow_step_class, step_record in step_records.items():
             if step_record.succeeded_at:
                 setattr(
                     accumulated_output,
@@ -235,3 +332,89 @@ class AbstractWorkflow(AbstractUnitOfWork):
             )
 
         return accumulated_output
+
+    def can_execute_steps_concurrently(self):
+        """
+        Steps are executed in worker threads with their own database connections, which can't
+        see the uncommitted writes of a transaction this workflow is executed in, so
+        steps are only executed concurrently outside of any transaction.
+        """
+        if transaction.get_connection().in_atomic_block:
+            return False
+        return settings.WORKFLOW_STEP_MAX_CONCURRENCY > 1
+
+    def execute_steps_concurrently(self, step_records, accumulated_output):
+        """
+        Executes each step that has not already succeeded as soon as all of its dependencies
+        (per ``get_step_dependencies()``) have succeeded, running up to
+        ``WORKFLOW_STEP_MAX_CONCURRENCY`` steps at once.
+
+        Each step is executed via its ``execute()`` method, so it persists its own output or failure.
+        Once any step fails, no further steps are started; the steps already running are
+        allowed to finish, and the exception of the first failed step is raised.
+
+        Params:
+          step_records (dict): This workflow's record of each step, per ``get_or_create_step_records()``.
+
+        Returns:
+          ``accumulated_output``, with the output of each step of this workflow.
+        """
+        dependencies_by_step = self.get_step_dependencies()
+
+        succeeded_steps = set()
+        pending_steps = []
+        for workflow_step_class, step_record in step_records.items():
+            if step_record.succeeded_at:
+                setattr(accumulated_output, workflow_step_class.output_class.KEY, step_record.output_object)
+                succeeded_steps.add(workflow_step_class)
+            else:
+                pending_steps.append(workflow_step_class)
+
+        first_exception = None
+        running_steps = {}
+        with ThreadPoolExecutor(
+            max_workers=settings.WORKFLOW_STEP_MAX_CONCURRENCY,
+            thread_name_prefix='workflow-step',
+        ) as executor:
+            while True:
+                if first_exception is None:
+                    for workflow_step_class in list(pending_steps):
+                        if dependencies_by_step[workflow_step_class] <= succeeded_steps:
+                            pending_steps.remove(workflow_step_class)
+                            future = executor.submit(
+                                _execute_step_in_worker_thread,
+                                step_records[workflow_step_class],
+                                accumulated_output,
+                            )
+                            running_steps[future] = workflow_step_class
+
+                if not running_steps:
+                    break
+
+                done, _ = wait(running_steps, return_when=FIRST_COMPLETED)
+                for future in done:
+                    workflow_step_class = running_steps.pop(future)
+                    try:
+                        step_output = future.result()
+                    except Exception as exc:  # pylint: disable=broad-except
+                        first_exception = first_exception or exc
+                        continue
+                    setattr(accumulated_output, workflow_step_class.output_class.KEY, step_output)
+                    succeeded_steps.add(workflow_step_class)
+
+        if first_exception is not None:
+            raise first_exception
+
+        return accumulated_output
+
+
+def _execute_step_in_worker_thread(step_record, accumulated_output):
+    """
+    Executes the given step record from a worker thread of ``AbstractWorkflow.execute_steps_concurrently()``.
+    """
+    try:
+        return step_record.execute(accumulated_output=accumulated_output)
+    finally:
+        # Unlike those of request/task threads, the database connections
+        # of worker threads are never closed by Django itself.
+        connections.close_all()
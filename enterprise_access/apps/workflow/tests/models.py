@@ -86,3 +86,42 @@ class TestTwoStepWorkflow(AbstractWorkflow):
         TestWorkflowStep,
         TestSquaredWorkflowStep,
     ]
+
+
+@define
+class TestCubeInput(BaseInputOutput):
+    KEY = 'test_cube_input'
+
+
+@define
+class TestCubeOutput(BaseInputOutput):
+    KEY = 'test_cube_output'
+
+    result: int = None
+
+
+class TestCubedWorkflowStep(AbstractWorkflowStep):
+    """
+    Concrete test workflow step that cubes the output of ``TestWorkflowStep``.
+    """
+    input_class = TestCubeInput
+    output_class = TestCubeOutput
+
+    def process_input(self, accumulated_output=None, **kwargs):
+        return self.output_class(result=accumulated_output.test_step_output.result ** 3)
+
+
+class TestFanOutWorkflow(AbstractWorkflow):
+    """
+    Concrete implementation of a workflow with independent steps for unit-testing.
+    Concretely, it does (x + y) ** 2 and (x + y) ** 3.
+    """
+    steps = [
+        TestWorkflowStep,
+        TestSquaredWorkflowStep,
+        TestCubedWorkflowStep,
+    ]
+    step_dependencies = {
+        TestSquaredWorkflowStep: [TestWorkflowStep],
+        TestCubedWorkflowStep: [TestWorkflowStep],
+    }
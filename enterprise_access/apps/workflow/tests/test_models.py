@@ -2,12 +2,23 @@
 Unit tests for the test implementations
 of the abstract workflow models.
 """
+import threading
 from unittest import mock
 
-from django.test import TestCase
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, TransactionTestCase, override_settings
 
 from ..exceptions import UnitOfWorkException
-from .models import TestStepInput, TestTwoStepWorkflow, TestWorkflow, TestWorkflowStep
+from .models import (
+    TestCubedWorkflowStep,
+    TestFanOutWorkflow,
+    TestSquaredWorkflowStep,
+    TestSquareOutput,
+    TestStepInput,
+    TestTwoStepWorkflow,
+    TestWorkflow,
+    TestWorkflowStep
+)
 
 
 class TestWorkflowModels(TestCase):
@@ -62,3 +73,159 @@ class TestWorkflowModels(TestCase):
         )
         output_record = workflow.execute()
         self.assertEqual(output_record.test_square_output.result, 25)
+
+    def test_step_records_cache_related_records(self):
+        """
+        Tests that the steps executed by a workflow can get their workflow
+        and preceding step records without querying for them.
+        """
+        related_records = {}
+
+        def process_input(step, accumulated_output=None, **kwargs):
+            with self.assertNumQueries(0):
+                related_records['workflow'] = step.get_workflow_record()
+                related_records['preceding_step'] = step.get_preceding_step_record()
+            return step.output_class(result=accumulated_output.test_step_output.result ** 2)
+
+        workflow = TestTwoStepWorkflow.objects.create(
+            input_data=self.INPUT_DATA,
+        )
+        with mock.patch.object(TestSquaredWorkflowStep, 'process_input', process_input):
+            workflow.execute()
+
+        self.assertIs(related_records['workflow'], workflow)
+        self.assertEqual(
+            related_records['preceding_step'],
+            TestWorkflowStep.objects.get(workflow_record_uuid=workflow.uuid),
+        )
+
+    def test_retry_workflow_query_count(self):
+        """
+        Tests that retrying a partly finished workflow loads each step record once,
+        and only writes the execution fields of the retried step and the workflow.
+        """
+        workflow = TestTwoStepWorkflow.objects.create(
+            input_data=self.INPUT_DATA,
+        )
+        with mock.patch.object(TestSquaredWorkflowStep, 'process_input', side_effect=Exception('this step failed')):
+            with self.assertRaises(UnitOfWorkException):
+                workflow.execute()
+
+        # One SELECT per step model, then one UPDATE each for the retried step and the workflow.
+        with self.assertNumQueries(4):
+            output_record = workflow.execute()
+
+        self.assertEqual(output_record.test_square_output.result, 25)
+        workflow.refresh_from_db()
+        self.assertIsNotNone(workflow.succeeded_at)
+        self.assertEqual(workflow.output_data[TestSquareOutput.KEY], {'result': 25})
+
+    def test_fan_out_workflow_in_transaction(self):
+        """
+        Tests that the steps of a workflow with step dependencies are executed one at a time,
+        in order, within a transaction.
+        """
+        workflow = TestFanOutWorkflow.objects.create(
+            input_data=self.INPUT_DATA,
+        )
+        with mock.patch.object(TestFanOutWorkflow, 'execute_steps_concurrently') as mock_execute_concurrently:
+            output_record = workflow.execute()
+
+        mock_execute_concurrently.assert_not_called()
+        self.assertEqual(output_record.test_square_output.result, 25)
+        self.assertEqual(output_record.test_cube_output.result, 125)
+
+    def test_step_dependencies_must_precede_step(self):
+        """
+        Tests that a step may only depend on the steps that precede it.
+        """
+        workflow = TestFanOutWorkflow.objects.create(
+            input_data=self.INPUT_DATA,
+        )
+        with mock.patch.object(
+            TestFanOutWorkflow, 'step_dependencies', {TestWorkflowStep: [TestSquaredWorkflowStep]},
+        ):
+            with self.assertRaises(ImproperlyConfigured):
+                workflow.get_step_dependencies()
+
+
+@override_settings(WORKFLOW_STEP_MAX_CONCURRENCY=2)
+class TestConcurrentWorkflowSteps(TransactionTestCase):
+    """
+    Unit tests for executing independent workflow steps concurrently.
+    """
+    INPUT_DATA = TestWorkflowModels.INPUT_DATA
+
+    def test_independent_steps_run_concurrently(self):
+        """
+        Tests that steps whose dependencies have succeeded are executed at the same time.
+        """
+        # Each of the independent steps waits for the other to have started.
+        barrier = threading.Barrier(2, timeout=5)
+        squared_process_input = TestSquaredWorkflowStep.process_input
+        cubed_process_input = TestCubedWorkflowStep.process_input
+
+        def wait_then(process_input):
+            def _process_input(step, *args, **kwargs):
+                barrier.wait()
+                return process_input(step, *args, **kwargs)
+            return _process_input
+
+        workflow = TestFanOutWorkflow.objects.create(
+            input_data=self.INPUT_DATA,
+        )
+        with mock.patch.object(TestSquaredWorkflowStep, 'process_input', wait_then(squared_process_input)), \
+                mock.patch.object(TestCubedWorkflowStep, 'process_input', wait_then(cubed_process_input)):
+            output_record = workflow.execute()
+
+        self.assertEqual(output_record.test_step_output.result, 5)
+        self.assertEqual(output_record.test_square_output.result, 25)
+        self.assertEqual(output_record.test_cube_output.result, 125)
+
+        workflow.refresh_from_db()
+        self.assertIsNotNone(workflow.succeeded_at)
+        for step_class in TestFanOutWorkflow.steps:
+            step = step_class.objects.get(workflow_record_uuid=workflow.uuid)
+            self.assertIsNotNone(step.succeeded_at)
+            self.assertIsNotNone(step.output_data)
+
+    def test_retry_after_failed_step(self):
+        """
+        Tests that a workflow whose step failed can be retried, skipping the steps that already succeeded.
+        """
+        test_exception = Exception('this step failed')
+        workflow = TestFanOutWorkflow.objects.create(
+            input_data=self.INPUT_DATA,
+        )
+        with mock.patch.object(TestCubedWorkflowStep, 'process_input', side_effect=test_exception):
+            with self.assertRaises(UnitOfWorkException):
+                workflow.execute()
+
+        cubed_step = TestCubedWorkflowStep.objects.get(workflow_record_uuid=workflow.uuid)
+        self.assertIsNotNone(cubed_step.failed_at)
+        self.assertEqual(cubed_step.exception_message, str(test_exception))
+        self.assertIsNotNone(workflow.failed_at)
+        self.assertEqual(workflow.exception_message, str(test_exception))
+
+        with mock.patch.object(TestWorkflowStep, 'process_input') as mock_first_step:
+            output_record = workflow.execute()
+
+        mock_first_step.assert_not_called()
+        self.assertEqual(output_record.test_square_output.result, 25)
+        self.assertEqual(output_record.test_cube_output.result, 125)
+
+    def test_failed_dependency_skips_dependent_steps(self):
+        """
+        Tests that no step is executed once a step it depends on has failed.
+        """
+        workflow = TestFanOutWorkflow.objects.create(
+            input_data=self.INPUT_DATA,
+        )
+        with mock.patch.object(TestWorkflowStep, 'process_input', side_effect=Exception('this step failed')):
+            with self.assertRaises(UnitOfWorkException):
+                workflow.execute()
+
+        for step_class in (TestSquaredWorkflowStep, TestCubedWorkflowStep):
+            step = step_class.objects.get(workflow_record_uuid=workflow.uuid)
+            self.assertIsNone(step.succeeded_at)
+            self.assertIsNone(step.failed_at)
@@ -4,7 +4,8 @@ Utils for interacting with cache interfaces.
 import hashlib
 
 from django.conf import settings
-from edx_django_utils.cache import RequestCache
+from django.db import transaction
+from edx_django_utils.cache import RequestCache, TieredCache
 
 from enterprise_access import __version__ as code_version
 
@@ -31,3 +32,19 @@ def request_cache(namespace=DEFAULT_NAMESPACE):
     Helper that returns a namespaced RequestCache instance.
     """
     return RequestCache(namespace=namespace)
+
+
+def delete_tiered_cache_keys_on_commit(cache_keys):
+    """
+    Deletes the given keys from all cache tiers now, and again once the current
+    transaction commits, so that values computed from pre-commit data while the
+    transaction is still open are not served until they expire.
+    """
+    cache_keys = list(cache_keys)
+
+    def _delete_cache_keys():
+        for cache_key in cache_keys:
+            TieredCache.delete_all_tiers(cache_key)
+
+    _delete_cache_keys()
+    transaction.on_commit(_delete_cache_keys)
@@ -447,6 +447,14 @@ CELERY_BROKER_TRANSPORT_OPTIONS = {
 }
 
 TASK_MAX_RETRIES = 5
+
+# License requests are assigned licenses in chunks of this many user emails, with at most
+# this many chunks being sent to license-manager at once.
+LICENSE_ASSIGNMENT_CHUNK_SIZE = 100
+LICENSE_ASSIGNMENT_MAX_CONCURRENCY = 4
+# How long the licenses assigned for each chunk are kept, so that a retried assignment task
+# only sends the chunks that are still unassigned.
+LICENSE_ASSIGNMENT_PROGRESS_TIMEOUT = 60 * 60 * 24  # 1 day
 """############################# END CELERY CONFIG ##################################"""
 
 
@@ -479,6 +487,32 @@ KAFKA_TOPICS = [
     SUBSIDY_REDEMPTION_TOPIC_NAME,
 ]
 
+# librdkafka configuration of the event bus producers, merged into their connection settings. See
+# https://github.com/confluentinc/librdkafka/blob/master/CONFIGURATION.md
+KAFKA_PRODUCER_CONFIG = {
+    'acks': 'all',
+    # Give events produced in bulk a chance to be sent in the same (compressed) message batch.
+    'linger.ms': 20,
+    'batch.size': 128 * 1024,
+    'compression.type': 'lz4',
+}
+# How long batched_event_bus_events() waits for the events of a batch to be delivered.
+KAFKA_PRODUCER_FLUSH_TIMEOUT = 10
+
+# When enabled, event bus and Segment events are recorded in an outbox table within the
+# transaction that produces them, and relayed to their destination in batches by a celery
+# task scheduled on commit (and by the relay_outbox_events command, which should be scheduled).
+EVENT_OUTBOX_ENABLED = False
+EVENT_OUTBOX_BATCH_SIZE = 500
+# Events that failed to be delivered this many times are no longer relayed.
+EVENT_OUTBOX_MAX_ATTEMPTS = 10
+# How long the relay waits for the event bus to acknowledge a batch of events.
+EVENT_OUTBOX_FLUSH_TIMEOUT = 10
+EVENT_OUTBOX_RELAY_LOCK_TIMEOUT = 60 * 5  # 5 minutes
+# How long delivered events, and events that reached EVENT_OUTBOX_MAX_ATTEMPTS, are kept in the
+# outbox before the relay_outbox_events command purges them.
+EVENT_OUTBOX_RETENTION_DAYS = 7
+
 
 ################### End Kafka Related Settings ##############################
 
@@ -564,7 +598,42 @@ ENTERPRISE_COURSE_ENROLLMENTS_CACHE_TIMEOUT = 0  # 0 seconds (no caching, as enr
 SUBSIDY_RECORD_CACHE_TIMEOUT = DEFAULT_CACHE_TIMEOUT
 DEFAULT_ENTERPRISE_ENROLLMENT_INTENTIONS_CACHE_TIMEOUT = DEFAULT_CACHE_TIMEOUT
 ALL_ENTERPRISE_GROUP_MEMBERS_CACHE_TIMEOUT = DEFAULT_CACHE_TIMEOUT
-SECURED_ALGOLIA_API_KEY_CACHE_TIMEOUT = 60 * 30  # 30 minutes
+# Subsidy request state counts and role assignments are invalidated on write; these bound their staleness otherwise.
+SUBSIDY_REQUEST_STATE_COUNTS_CACHE_TIMEOUT = DEFAULT_CACHE_TIMEOUT
+ROLE_ASSIGNMENTS_CACHE_TIMEOUT = 60 * 30  # 30 minutes
+SECURED_ALGOLIA_API_KEY_CACHE_TIMEOUT = 60 * 30  # 30 minutes (only for keys without a `valid_until`)
+# Secured algolia api keys are cached until their `valid_until` less this margin, and renewed in
+# the background once a learner requests a cached key within the renewal window of that point.
+SECURED_ALGOLIA_API_KEY_EXPIRY_MARGIN = 60 * 5  # 5 minutes
+SECURED_ALGOLIA_API_KEY_RENEWAL_WINDOW = 60 * 10  # 10 minutes
+
+# BFF route profiling
+# Per-route latency budgets (in milliseconds), keyed by BFF handler class name, e.g. {'DashboardHandler': 1500}.
+# Routes exceeding their budget are flagged with the `bff_over_latency_budget` custom monitoring attribute.
+BFF_ROUTE_LATENCY_BUDGETS_MS = {}
+# Exposes per-stage BFF timings to staff request users via the `Server-Timing` response header.
+BFF_SERVER_TIMING_HEADER_ENABLED = False
+
+# BFF prefetching (warm-up of learner portal caches at login)
+BFF_PREFETCH_MAX_WORKERS = 4
+# How long prefetched enterprise customer users remain available to the next BFF request.
+BFF_PREFETCH_CACHE_TIMEOUT = 60
+
+# BFF degradation mode. When a loader exceeds its deadline (in seconds), its last-known value (or an empty
+# default) is used instead and a warning is added to the response. The overall request deadline bounds all
+# loaders of a request. Loaders without a deadline run unbounded, as does every loader when both are unset.
+# Loader names: 'subscription_licenses', 'default_enterprise_enrollment_intentions',
+# 'enterprise_course_enrollments'.
+BFF_LOADER_DEADLINES = {}
+BFF_REQUEST_DEADLINE = None
+BFF_LOADER_MAX_WORKERS = 8
+BFF_LAST_KNOWN_VALUE_CACHE_TIMEOUT = 60 * 60 * 24  # 1 day
+
+# Realize default enterprise enrollment intentions in a celery task rather than within the learner
+# portal BFF request, which then reports the realizations as pending.
+ENABLE_ASYNC_DEFAULT_ENTERPRISE_ENROLLMENT_REALIZATION = False
+# How long a pending realization prevents consecutive BFF requests from enqueueing it again.
+PENDING_DEFAULT_ENTERPRISE_ENROLLMENT_REALIZATIONS_TIMEOUT = 60 * 5  # 5 minutes
 
 BRAZE_GROUP_EMAIL_FORCE_REMIND_ALL_PENDING_LEARNERS = False
 BRAZE_GROUPS_EMAIL_AUTO_REMINDER_DAY_5_CAMPAIGN = ''
@@ -624,6 +693,9 @@ PRODUCT_ID_TO_CATALOG_QUERY_ID_MAPPING = {
 PROVISIONING_PAID_SUBSCRIPTION_PRODUCT_ID = 1
 PROVISIONING_TRIAL_SUBSCRIPTION_PRODUCT_ID = 2
 
+# The most steps of a single workflow with ``step_dependencies`` that are executed at once.
+WORKFLOW_STEP_MAX_CONCURRENCY = 4
+
 CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
 CRISPY_TEMPLATE_PACK = "bootstrap5"
 
@@ -660,14 +732,37 @@ DEFAULT_SSP_PRICE_LOOKUP_KEY = 'teams_subscription_license_yearly'
 
 DEFAULT_STRIPE_CACHE_TIMEOUT = 60
 
+# Cache timeout of the Stripe objects (and data derived from them) which the Stripe webhook keeps
+# up to date. Raise it once the webhook endpoint receives the events of every synced object type,
+# i.e. subscription, invoice, customer, payment_method, payment_intent and checkout.session events.
+SYNCED_STRIPE_CACHE_TIMEOUT = DEFAULT_STRIPE_CACHE_TIMEOUT
+
 # How long we consider Stripe prices valid for
 STRIPE_PRICE_DATA_CACHE_TIMEOUT = 300
 
+# Read Stripe prices from the latest versioned pricing snapshot, rather than listing them from Stripe
+# on each cache miss. Snapshots are refreshed by the refresh_stripe_pricing_snapshot management command
+# (which should be scheduled) and on Stripe price/product events.
+ENABLE_STRIPE_PRICING_SNAPSHOT = False
+STRIPE_PRICING_SNAPSHOT_CACHE_TIMEOUT = 60 * 60 * 24  # 1 day
+
+# How long the existence (or absence) of an enterprise customer with a given slug or name is cached
+# while validating checkout form fields.
+CHECKOUT_EXISTING_ENTERPRISE_CUSTOMER_CACHE_TIMEOUT = 60
+
 ENABLE_STRIPE_EVENT_SUMMARIES = False
 
 # Allows us to do per-environment exception raising vs. returning in our event handlers
 STRIPE_GRACEFUL_EXCEPTION_MODE = False
 
+# When enabled, the Stripe webhook only persists each event and returns, and celery workers handle
+# the persisted events in order per subscription (and concurrently across subscriptions).
+# Enabled by default: it is a prerequisite for trial-to-paid renewals, which otherwise run one by one
+# inside the webhook request. Requires ``enqueue_unhandled_stripe_events_task`` to be scheduled.
+ENABLE_ASYNC_STRIPE_EVENT_HANDLING = True
+# Upper bound on how long a worker may hold a subscription's event queue.
+STRIPE_EVENT_QUEUE_LOCK_TIMEOUT = 60 * 5  # 5 minutes
+
 ################# End Self-Service Purchasing (SSP) settings #################
 
 